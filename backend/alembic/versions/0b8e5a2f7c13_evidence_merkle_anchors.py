@@ -0,0 +1,53 @@
+"""evidence_merkle_anchors
+
+Revision ID: 0b8e5a2f7c13
+Revises: f2c7d91b4e06
+Create Date: 2026-10-18 17:12:48.906325
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b8e5a2f7c13'
+down_revision: Union[str, Sequence[str], None] = 'f2c7d91b4e06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'evidence_anchors',
+        sa.Column('sequence', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('root_hash', sa.String(length=64), nullable=False),
+        sa.Column('previous_chain_hash', sa.String(length=64), nullable=False),
+        sa.Column('chain_hash', sa.String(length=64), nullable=False),
+        sa.Column('leaf_count', sa.Integer(), nullable=False),
+        sa.Column('last_created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_record_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('sequence')
+    )
+    op.create_table(
+        'evidence_merkle_nodes',
+        sa.Column('anchor_sequence', sa.Integer(), nullable=False),
+        sa.Column('level', sa.SmallInteger(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.Column('record_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.ForeignKeyConstraint(['anchor_sequence'], ['evidence_anchors.sequence'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('anchor_sequence', 'level', 'position')
+    )
+    op.create_index('ix_evidence_merkle_nodes_record_id', 'evidence_merkle_nodes', ['record_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_evidence_merkle_nodes_record_id', table_name='evidence_merkle_nodes')
+    op.drop_table('evidence_merkle_nodes')
+    op.drop_table('evidence_anchors')
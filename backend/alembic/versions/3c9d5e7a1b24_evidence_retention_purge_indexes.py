@@ -0,0 +1,37 @@
+"""evidence_retention_purge_indexes
+
+Revision ID: 3c9d5e7a1b24
+Revises: 7e3a9c4d1f58
+Create Date: 2026-10-18 19:12:47.208314
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d5e7a1b24'
+down_revision: Union[str, Sequence[str], None] = '7e3a9c4d1f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_evidence_records_retention_expiry_id', 'evidence_records', ['retention_expiry', 'id'], unique=False
+    )
+    op.create_index('ix_evidence_records_hash', 'evidence_records', ['hash'], unique=False)
+    op.create_index(
+        'ix_evidence_blobs_unreferenced', 'evidence_blobs', ['hash'], unique=False,
+        postgresql_where=sa.text('ref_count <= 0')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_evidence_blobs_unreferenced', table_name='evidence_blobs')
+    op.drop_index('ix_evidence_records_hash', table_name='evidence_records')
+    op.drop_index('ix_evidence_records_retention_expiry_id', table_name='evidence_records')
@@ -0,0 +1,32 @@
+"""filing_case_version
+
+Revision ID: 5d2e8a41c9f7
+Revises: c3b1f0a7d2e4
+Create Date: 2026-10-18 14:22:09.531407
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8a41c9f7'
+down_revision: Union[str, Sequence[str], None] = 'c3b1f0a7d2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Optimistic concurrency token for state transitions; existing rows start at 1
+    op.add_column(
+        'filing_cases',
+        sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('filing_cases', 'version')
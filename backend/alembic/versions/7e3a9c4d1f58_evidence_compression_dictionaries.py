@@ -0,0 +1,41 @@
+"""evidence_compression_dictionaries
+
+Revision ID: 7e3a9c4d1f58
+Revises: 0b8e5a2f7c13
+Create Date: 2026-10-18 18:31:02.417760
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e3a9c4d1f58'
+down_revision: Union[str, Sequence[str], None] = '0b8e5a2f7c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'evidence_compression_dictionaries',
+        sa.Column('id', sa.String(length=16), nullable=False),
+        sa.Column('action_type', sa.String(length=100), nullable=False),
+        sa.Column('content', sa.LargeBinary(), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        op.f('ix_evidence_compression_dictionaries_action_type'),
+        'evidence_compression_dictionaries', ['action_type'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_evidence_compression_dictionaries_action_type'), table_name='evidence_compression_dictionaries')
+    op.drop_table('evidence_compression_dictionaries')
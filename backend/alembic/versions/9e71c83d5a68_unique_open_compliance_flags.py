@@ -0,0 +1,49 @@
+"""unique_open_compliance_flags
+
+Revision ID: 9e71c83d5a68
+Revises: 15f96afde2b3
+Create Date: 2026-10-18 09:12:44.301527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e71c83d5a68'
+down_revision: Union[str, Sequence[str], None] = '15f96afde2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 1. Collapse duplicate unresolved flags left by racing evaluations (keep the oldest)
+    op.execute(
+        """
+        DELETE FROM compliance_flags a
+        USING compliance_flags b
+        WHERE NOT a.is_resolved
+          AND NOT b.is_resolved
+          AND a.user_id = b.user_id
+          AND a.financial_year = b.financial_year
+          AND a.flag_code = b.flag_code
+          AND (a.created_at, a.id) > (b.created_at, b.id)
+        """
+    )
+
+    # 2. Partial unique index backing INSERT ... ON CONFLICT DO NOTHING
+    op.create_index(
+        'uq_compliance_flags_open',
+        'compliance_flags',
+        ['user_id', 'financial_year', 'flag_code'],
+        unique=True,
+        postgresql_where=sa.text('NOT is_resolved')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_compliance_flags_open', table_name='compliance_flags')
@@ -0,0 +1,45 @@
+"""content_addressed_evidence_blobs
+
+Revision ID: a71c5e09d3b8
+Revises: e8f41b6a3c20
+Create Date: 2026-10-18 16:35:12.842930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71c5e09d3b8'
+down_revision: Union[str, Sequence[str], None] = 'e8f41b6a3c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'evidence_blobs',
+        sa.Column('hash', sa.Text(), nullable=False),
+        sa.Column('storage_location', sa.Text(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('hash')
+    )
+    # Existing records keep their date-partitioned blobs; each hash is
+    # registered once with the number of records that reference it
+    op.execute(
+        """
+        INSERT INTO evidence_blobs (hash, storage_location, ref_count)
+        SELECT hash, MIN(storage_location), COUNT(*)
+        FROM evidence_records
+        GROUP BY hash
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('evidence_blobs')
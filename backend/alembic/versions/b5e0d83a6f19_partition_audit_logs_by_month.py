@@ -0,0 +1,82 @@
+"""partition_audit_logs_by_month
+
+Revision ID: b5e0d83a6f19
+Revises: 3c9d5e7a1b24
+Create Date: 2026-10-18 19:48:21.903517
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e0d83a6f19'
+down_revision: Union[str, Sequence[str], None] = '3c9d5e7a1b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created beyond the current month; AuditPartitionWorker keeps this horizon
+MONTHS_AHEAD = 3
+
+AUDIT_LOG_COLUMNS = """
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    actor_id UUID REFERENCES users(id) ON DELETE SET NULL,
+    actor_role VARCHAR(20),
+    action TEXT NOT NULL,
+    before_value JSONB,
+    after_value JSONB,
+    ip_address INET,
+    device_id TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+"""
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    op.execute("ALTER TABLE audit_logs_unpartitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey")
+    op.execute(f"""
+        CREATE TABLE audit_logs ({AUDIT_LOG_COLUMNS},
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    # Catches rows outside every monthly partition (e.g. a badly skewed clock)
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    now = datetime.now(timezone.utc)
+    current = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM audit_logs_unpartitioned")).scalar()
+    month = datetime(oldest.year, oldest.month, 1, tzinfo=timezone.utc) if oldest else current
+    month = min(month, current)
+    while month <= _add_months(current, MONTHS_AHEAD):
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE audit_logs_p{month:%Y_%m} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_unpartitioned")
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+    op.create_index('ix_audit_logs_actor_id_created_at', 'audit_logs', ['actor_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+    op.execute("ALTER INDEX ix_audit_logs_actor_id_created_at RENAME TO ix_audit_logs_partitioned_actor_id_created_at")
+    op.execute(f"CREATE TABLE audit_logs ({AUDIT_LOG_COLUMNS}, CONSTRAINT audit_logs_pkey PRIMARY KEY (id))")
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_partitioned")
+    # Drops the partitions with it (detached ones are left alone)
+    op.execute("DROP TABLE audit_logs_partitioned")
+    op.create_index(op.f('ix_audit_logs_actor_id'), 'audit_logs', ['actor_id'], unique=False)
@@ -0,0 +1,50 @@
+"""ledger_versions_and_itr_memo
+
+Revision ID: c3b1f0a7d2e4
+Revises: 9e71c83d5a68
+Create Date: 2026-10-18 11:04:37.918265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3b1f0a7d2e4'
+down_revision: Union[str, Sequence[str], None] = '9e71c83d5a68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 1. Per-(user, FY) ledger version counter
+    op.create_table(
+        'ledger_versions',
+        sa.Column('user_id', sa.UUID(as_uuid=True), nullable=False),
+        sa.Column('financial_year', sa.String(length=9), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'financial_year')
+    )
+
+    # 2. Seed a version for every ledger that already has entries
+    op.execute(
+        """
+        INSERT INTO ledger_versions (user_id, financial_year, version)
+        SELECT DISTINCT user_id, financial_year, 1
+        FROM financial_entries
+        """
+    )
+
+    # 3. Memoization key on determinations (NULL = computed before versioning, always stale)
+    op.add_column('itr_determinations', sa.Column('ledger_version', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('itr_determinations', 'ledger_version')
+    op.drop_table('ledger_versions')
@@ -0,0 +1,32 @@
+"""audit_log_search_indexes
+
+Revision ID: d42f6b1e8a07
+Revises: b5e0d83a6f19
+Create Date: 2026-10-18 20:17:05.664120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd42f6b1e8a07'
+down_revision: Union[str, Sequence[str], None] = 'b5e0d83a6f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Created on audit_logs, so every partition (current and future) gets them
+    op.create_index('ix_audit_logs_created_at_id', 'audit_logs', ['created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_audit_logs_action_created_at_id', 'audit_logs', ['action', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_audit_logs_action_created_at_id', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_created_at_id', table_name='audit_logs')
@@ -0,0 +1,46 @@
+"""log_archive_segments
+
+Revision ID: e6a1c47b9d32
+Revises: d42f6b1e8a07
+Create Date: 2026-10-18 20:41:38.115902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a1c47b9d32'
+down_revision: Union[str, Sequence[str], None] = 'd42f6b1e8a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'log_archive_segments',
+        sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('uuid_generate_v4()'), nullable=False),
+        sa.Column('source_table', sa.String(length=64), nullable=False),
+        sa.Column('storage_location', sa.Text(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False),
+        sa.Column('first_created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('storage_location')
+    )
+    op.create_index(
+        'ix_log_archive_segments_source_table_range', 'log_archive_segments',
+        ['source_table', 'first_created_at', 'last_created_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_log_archive_segments_source_table_range', table_name='log_archive_segments')
+    op.drop_table('log_archive_segments')
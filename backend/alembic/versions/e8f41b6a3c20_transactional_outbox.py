@@ -0,0 +1,51 @@
+"""transactional_outbox
+
+Revision ID: e8f41b6a3c20
+Revises: 5d2e8a41c9f7
+Create Date: 2026-10-18 15:47:31.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8f41b6a3c20'
+down_revision: Union[str, Sequence[str], None] = '5d2e8a41c9f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.UUID(as_uuid=True), server_default=sa.text('uuid_generate_v4()'), nullable=False),
+        sa.Column('event_type', sa.String(length=30), nullable=False),
+        sa.Column('dedup_key', sa.Text(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('available_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('dispatched_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('dedup_key')
+    )
+    # Partial index: the dispatcher only ever scans pending events
+    op.create_index(
+        'ix_outbox_events_pending',
+        'outbox_events',
+        ['available_at'],
+        unique=False,
+        postgresql_where=sa.text('dispatched_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_events_pending', table_name='outbox_events', postgresql_where=sa.text('dispatched_at IS NULL'))
+    op.drop_table('outbox_events')
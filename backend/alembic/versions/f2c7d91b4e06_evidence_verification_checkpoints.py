@@ -0,0 +1,47 @@
+"""evidence_verification_checkpoints
+
+Revision ID: f2c7d91b4e06
+Revises: a71c5e09d3b8
+Create Date: 2026-10-18 16:05:37.284119
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c7d91b4e06'
+down_revision: Union[str, Sequence[str], None] = 'a71c5e09d3b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset order for streaming scans; existing rows share the migration timestamp
+    # and are ordered among themselves by id
+    op.add_column(
+        'evidence_records',
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False)
+    )
+    op.create_index('ix_evidence_records_created_at_id', 'evidence_records', ['created_at', 'id'], unique=False)
+
+    op.create_table(
+        'evidence_verification_checkpoints',
+        sa.Column('job_name', sa.String(length=64), nullable=False),
+        sa.Column('last_created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_record_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('verified_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('job_name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('evidence_verification_checkpoints')
+    op.drop_index('ix_evidence_records_created_at_id', table_name='evidence_records')
+    op.drop_column('evidence_records', 'created_at')
@@ -0,0 +1,33 @@
+"""audit_logs_actor_keyset_index
+
+Revision ID: f8c2d5a93e17
+Revises: e6a1c47b9d32
+Create Date: 2026-10-19 09:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8c2d5a93e17'
+down_revision: Union[str, Sequence[str], None] = 'e6a1c47b9d32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Extends (actor_id, created_at) with the id tie-break, so each actor's
+    # branch of the audit search is one ordered index walk stopping after a page
+    op.create_index(
+        'ix_audit_logs_actor_id_created_at_id', 'audit_logs', ['actor_id', 'created_at', 'id'], unique=False
+    )
+    op.drop_index('ix_audit_logs_actor_id_created_at', table_name='audit_logs')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_audit_logs_actor_id_created_at', 'audit_logs', ['actor_id', 'created_at'], unique=False)
+    op.drop_index('ix_audit_logs_actor_id_created_at_id', table_name='audit_logs')
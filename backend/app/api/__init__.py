@@ -6,3 +6,5 @@ from .compliance import router as compliance
 from .itr import router as itr
 from .filing import router as filing
 from .consent import router as consent
+from .evidence import router as evidence
+from .audit import router as audit
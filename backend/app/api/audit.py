@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.config import settings
+from app.core.dependencies import get_unit_of_work
+from app.models.user import User
+from app.schemas.audit import AuditLogPage
+from app.services.audit_service import AuditService
+
+router = APIRouter()
+
+def check_audit_access(user: User):
+    """
+    Only Admins and Chartered Accountants can search audit logs.
+    """
+    if user.primary_role not in (deps.UserRole.ADMIN.value, deps.UserRole.CA.value):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied. Only Admins and Chartered Accountants can search audit logs."
+        )
+
+@router.get("/logs", response_model=AuditLogPage, status_code=status.HTTP_200_OK)
+async def search_audit_logs(
+    limit: int = Query(50, ge=1, le=settings.AUDIT_QUERY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    actor_id: Optional[UUID] = Query(None),
+    action: Optional[str] = Query(None, max_length=100),
+    actor_role: Optional[str] = Query(None, max_length=20),
+    since: Optional[datetime] = Query(None, description="inclusive lower bound on created_at"),
+    until: Optional[datetime] = Query(None, description="exclusive upper bound on created_at"),
+    current_user: User = Depends(deps.get_current_user),
+    service: AuditService = Depends(deps.get_audit_service),
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
+):
+    """
+    Search audit logs, newest first, with keyset pagination.
+    Admins see every log; a CA sees their own and their actively consented clients' logs.
+    """
+    check_audit_access(current_user)
+    items, next_cursor = await service.search_logs(
+        session,
+        requester_id=current_user.id,
+        requester_role=current_user.primary_role,
+        limit=limit,
+        cursor=cursor,
+        actor_id=actor_id,
+        action=action,
+        actor_role=actor_role,
+        since=since,
+        until=until
+    )
+    return AuditLogPage(items=items, next_cursor=next_cursor, limit=limit)
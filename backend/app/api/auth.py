@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.dependencies import get_db
+from app.core.dependencies import get_unit_of_work
 from app.schemas.user import UserCreate, UserLogin, UserResponse, PasswordChange, CAResponse
 from app.schemas.token import Token
 from app.services.auth_service import AuthService
@@ -46,7 +46,7 @@ async def rate_limit_password_change(current_user: User = Depends(require_active
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit_register)])
 async def register(
     user_in: UserCreate,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_unit_of_work, scope="function"),
     service: AuthService = Depends(get_auth_service)
 ):
     """
@@ -58,7 +58,7 @@ async def register(
 @router.post("/login", response_model=Token, dependencies=[Depends(rate_limit_login)])
 async def login(
     user_in: UserLogin,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_unit_of_work, scope="function"),
     service: AuthService = Depends(get_auth_service)
 ):
     """
@@ -70,7 +70,7 @@ async def login(
 @router.post("/refresh", response_model=Token, dependencies=[Depends(rate_limit_refresh)])
 async def refresh_token_endpoint(
     req: RefreshRequest,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_unit_of_work, scope="function"),
     service: AuthService = Depends(get_auth_service)
 ):
     """
@@ -82,7 +82,7 @@ async def refresh_token_endpoint(
 @router.post("/logout", status_code=status.HTTP_200_OK)
 async def logout_endpoint(
     req: RefreshRequest,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_unit_of_work, scope="function"),
     service: AuthService = Depends(get_auth_service)
 ):
     """
@@ -98,7 +98,7 @@ async def logout_endpoint(
 @router.post("/change-password", status_code=status.HTTP_200_OK, dependencies=[Depends(rate_limit_password_change)])
 async def change_password(
     req: PasswordChange,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_unit_of_work, scope="function"),
     service: AuthService = Depends(get_auth_service),
     current_user: User = Depends(require_active_session)
 ):
@@ -119,7 +119,7 @@ async def change_password(
 @router.get("/cas", response_model=list[CAResponse], status_code=status.HTTP_200_OK)
 async def list_cas(
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Allow taxpayers to discover registered CA accounts.
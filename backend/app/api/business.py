@@ -5,7 +5,7 @@ from typing import Any
 from app.api.deps import get_business_service, require_role, UserRole
 from app.schemas.business import BusinessProfileCreate, BusinessProfileResponse
 from app.services.business_service import BusinessProfileService
-from app.core.dependencies import get_db
+from app.core.dependencies import get_unit_of_work
 from app.models.user import User
 
 router = APIRouter()
@@ -14,7 +14,7 @@ router = APIRouter()
 async def create_business_profile(
     profile_in: BusinessProfileCreate,
     service: BusinessProfileService = Depends(get_business_service),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_unit_of_work, scope="function"),
     current_user: User = Depends(require_role(UserRole.BUSINESS))
 ) -> Any:
     """
@@ -26,7 +26,7 @@ async def create_business_profile(
 @router.get("/profile", response_model=BusinessProfileResponse)
 async def get_business_profile(
     service: BusinessProfileService = Depends(get_business_service),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_unit_of_work, scope="function"),
     current_user: User = Depends(require_role(UserRole.BUSINESS))
 ) -> Any:
     """
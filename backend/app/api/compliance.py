@@ -1,9 +1,10 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.core.http_cache import make_etag, etag_matches, not_modified
 from app.models.user import User
 from app.schemas.compliance import (
     ComplianceEvaluationRequest,
@@ -11,7 +12,7 @@ from app.schemas.compliance import (
     ComplianceResolutionRequest
 )
 from app.services.compliance_service import ComplianceEngineService
-from app.core.dependencies import get_db
+from app.core.dependencies import get_unit_of_work
 
 router = APIRouter()
 
@@ -31,7 +32,7 @@ async def evaluate_compliance(
     request: ComplianceEvaluationRequest,
     current_user: User = Depends(deps.get_current_user),
     service: ComplianceEngineService = Depends(deps.get_compliance_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Trigger compliance evaluation for a specific financial year.
@@ -48,16 +49,25 @@ async def evaluate_compliance(
 
 @router.get("/", response_model=List[ComplianceFlagResponse])
 async def get_compliance_flags(
+    request: Request,
+    response: Response,
     financial_year: Optional[str] = None,
     current_user: User = Depends(deps.get_current_user),
     service: ComplianceEngineService = Depends(deps.get_compliance_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Retrieve compliance flags for the current user.
     Optionally filter by financial year.
+    Supports conditional GET (ETag / If-None-Match).
     """
     check_compliance_access(current_user)
+    flags_state = await service.get_flags_state(session, current_user.id, financial_year)
+    etag = make_etag("compliance_flags", current_user.id, financial_year, *flags_state)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     return await service.get_user_flags(session, current_user.id, financial_year)
 
 @router.post("/{flag_id}/resolve", response_model=ComplianceFlagResponse)
@@ -66,7 +76,7 @@ async def resolve_flag(
     request: ComplianceResolutionRequest,
     current_user: User = Depends(deps.get_current_user),
     service: ComplianceEngineService = Depends(deps.get_compliance_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Mark a compliance flag as resolved.
@@ -1,12 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from app.api import deps
 from app.models.user import User
-from app.schemas.consent import ConsentCreate, ConsentResponse, CAAssignmentCreate, CAAssignmentResponse
+from app.schemas.consent import ConsentCreate, ConsentResponse, CAAssignmentCreate, CAAssignmentResponse, CAPortfolioPage
 from app.services.consent_service import ConsentService
 from app.services.ca_assignment_service import CAAssignmentService
-from app.core.dependencies import get_db
+from app.core.dependencies import get_unit_of_work
 from app.core.exceptions import NotFoundError, UnauthorizedError, ValidationError
 
 router = APIRouter()
@@ -21,31 +21,35 @@ def check_taxpayer_access(user: User):
             detail="Access denied. Only Taxpayers can perform this action."
         )
 
+def check_ca_access(user: User):
+    """
+    Enforce that only CA roles can view the CA portfolio.
+    """
+    if user.primary_role != "CA":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied. Only Chartered Accountants can perform this action."
+        )
+
 @router.post("/", response_model=ConsentResponse, status_code=status.HTTP_201_CREATED)
 async def grant_consent(
     request: ConsentCreate,
     current_user: User = Depends(deps.get_current_user),
     service: ConsentService = Depends(deps.get_consent_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Grant a new Consent Artifact.
     """
     check_taxpayer_access(current_user)
     
-    try:
-        res = await service.grant_consent(
-            session=session,
-            user_id=current_user.id,
-            purpose=request.purpose,
-            scope=request.scope,
-            expiry_at=request.expiry_at
-        )
-        await session.commit()
-        return res
-    except Exception:
-        await session.rollback()
-        raise
+    return await service.grant_consent(
+        session=session,
+        user_id=current_user.id,
+        purpose=request.purpose,
+        scope=request.scope,
+        expiry_at=request.expiry_at
+    )
 
 @router.post("/{consent_id}/revoke", status_code=status.HTTP_204_NO_CONTENT)
 async def revoke_consent(
@@ -53,57 +57,46 @@ async def revoke_consent(
     reason: str = Body(..., embed=True),
     current_user: User = Depends(deps.get_current_user),
     service: ConsentService = Depends(deps.get_consent_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Revoke an existing Consent.
     """
     check_taxpayer_access(current_user)
     
-    try:
-        await service.revoke_consent(
-            session=session,
-            consent_id=consent_id,
-            user_id=current_user.id,
-            reason=reason
-        )
-        await session.commit()
-    except Exception:
-        await session.rollback()
-        raise
+    await service.revoke_consent(
+        session=session,
+        consent_id=consent_id,
+        user_id=current_user.id,
+        reason=reason
+    )
 
 @router.post("/assignments", response_model=CAAssignmentResponse, status_code=status.HTTP_201_CREATED)
 async def assign_ca(
     request: CAAssignmentCreate,
     current_user: User = Depends(deps.get_current_user),
     service: CAAssignmentService = Depends(deps.get_ca_assignment_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Assign a CA to a Filing Case.
     """
     check_taxpayer_access(current_user)
     
-    try:
-        res = await service.assign_ca(
-            session=session,
-            filing_id=request.filing_id,
-            taxpayer_id=current_user.id,
-            ca_user_id=request.ca_user_id,
-            consent_id=request.consent_id
-        )
-        await session.commit()
-        return res
-    except Exception:
-        await session.rollback()
-        raise
+    return await service.assign_ca(
+        session=session,
+        filing_id=request.filing_id,
+        taxpayer_id=current_user.id,
+        ca_user_id=request.ca_user_id,
+        consent_id=request.consent_id
+    )
 
 
 @router.get("/", response_model=list[ConsentResponse], status_code=status.HTTP_200_OK)
 async def list_consents(
     current_user: User = Depends(deps.get_current_user),
     service: ConsentService = Depends(deps.get_consent_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Return all consent artifacts belonging to the authenticated taxpayer.
@@ -112,12 +105,30 @@ async def list_consents(
     return await service.consent_repo.get_by_user(session, current_user.id)
 
 
+@router.get("/ca/portfolio", response_model=CAPortfolioPage, status_code=status.HTTP_200_OK)
+async def get_ca_portfolio(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(deps.get_current_user),
+    service: CAAssignmentService = Depends(deps.get_ca_assignment_service),
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
+):
+    """
+    Return the authenticated CA's actively assigned filings, newest assignment first.
+    Each item carries client name, filing state, ITR type, open compliance flags
+    and consent expiry.
+    """
+    check_ca_access(current_user)
+    items, total = await service.get_portfolio(session, current_user.id, limit, offset)
+    return CAPortfolioPage(items=items, total=total, limit=limit, offset=offset)
+
+
 @router.get("/{consent_id}", response_model=ConsentResponse, status_code=status.HTTP_200_OK)
 async def get_consent(
     consent_id: UUID,
     current_user: User = Depends(deps.get_current_user),
     service: ConsentService = Depends(deps.get_consent_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Return details for a single consent artifact.
@@ -15,22 +15,38 @@ from app.core.exceptions import NotFoundError, UnauthorizedError, ValidationErro
 
 # Evidence Module Dependencies
 from app.repositories.evidence_repository import EvidenceRepository
-from app.services.file_storage_service import FileStorageService
+from app.services.storage_backends import StorageService, get_storage_service
 from app.services.evidence_service import EvidenceService
+from app.repositories.outbox_repository import OutboxRepository
+from app.repositories.evidence_anchor_repository import EvidenceAnchorRepository
+from app.services.evidence_anchor_service import EvidenceAnchorService
 
 
 # Evidence Dependency Factories
 def get_evidence_repository() -> EvidenceRepository:
     return EvidenceRepository()
 
-def get_file_storage_service() -> FileStorageService:
-    return FileStorageService()
+def get_file_storage_service() -> StorageService:
+    return get_storage_service()
+
+def get_outbox_repository() -> OutboxRepository:
+    return OutboxRepository()
 
 def get_evidence_service(
     repo: EvidenceRepository = Depends(get_evidence_repository),
-    storage: FileStorageService = Depends(get_file_storage_service)
+    storage: StorageService = Depends(get_file_storage_service),
+    outbox_repo: OutboxRepository = Depends(get_outbox_repository)
 ) -> EvidenceService:
-    return EvidenceService(repo, storage)
+    return EvidenceService(repo, storage, outbox_repo)
+
+def get_evidence_anchor_repository() -> EvidenceAnchorRepository:
+    return EvidenceAnchorRepository()
+
+def get_evidence_anchor_service(
+    anchor_repo: EvidenceAnchorRepository = Depends(get_evidence_anchor_repository),
+    repo: EvidenceRepository = Depends(get_evidence_repository)
+) -> EvidenceAnchorService:
+    return EvidenceAnchorService(anchor_repo, repo)
 
 
 # OAuth2 Scheme
@@ -125,14 +141,20 @@ def require_role(role: UserRole) -> RoleChecker:
 # Audit Module Dependencies (Moved up for availability)
 from app.repositories.audit_repository import AuditLogRepository
 from app.services.audit_service import AuditService
+from app.services.audit_sink import AuditSinkQueue, audit_sink_queue
 
 def get_audit_repository() -> AuditLogRepository:
     return AuditLogRepository()
 
+def get_audit_sink() -> AuditSinkQueue:
+    return audit_sink_queue
+
 def get_audit_service(
-    repo: AuditLogRepository = Depends(get_audit_repository)
+    repo: AuditLogRepository = Depends(get_audit_repository),
+    outbox_repo: OutboxRepository = Depends(get_outbox_repository),
+    sink: AuditSinkQueue = Depends(get_audit_sink)
 ) -> AuditService:
-    return AuditService(repo)
+    return AuditService(repo, outbox_repo, sink)
 
 # Taxpayer Module Dependencies
 from app.repositories.taxpayer_repository import TaxpayerRepository
@@ -160,15 +182,20 @@ def get_business_service(
 # Financial Module Dependencies
 from app.repositories.financial_repository import FinancialEntryRepository
 from app.services.financial_service import FinancialEntryService
+from app.services.compliance_reevaluation import ComplianceDirtySet, compliance_dirty_set
 
 def get_financial_repository() -> FinancialEntryRepository:
     return FinancialEntryRepository()
 
+def get_compliance_dirty_set() -> ComplianceDirtySet:
+    return compliance_dirty_set
+
 def get_financial_service(
     financial_repo: FinancialEntryRepository = Depends(get_financial_repository),
-    auth_repo: AuthRepository = Depends(get_auth_repository)
+    auth_repo: AuthRepository = Depends(get_auth_repository),
+    dirty_set: ComplianceDirtySet = Depends(get_compliance_dirty_set)
 ) -> FinancialEntryService:
-    return FinancialEntryService(financial_repo, auth_repo)
+    return FinancialEntryService(financial_repo, auth_repo, dirty_set)
 
 # Compliance Module Dependencies
 from app.repositories.compliance_repository import ComplianceFlagRepository
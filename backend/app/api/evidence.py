@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Path
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from app.api import deps
+from app.models.user import User
+from app.schemas.evidence import EvidenceAnchorResponse, EvidenceInclusionProofResponse
+from app.services.evidence_anchor_service import EvidenceAnchorService
+from app.core.dependencies import get_unit_of_work
+
+router = APIRouter()
+
+@router.get("/anchors/latest", response_model=EvidenceAnchorResponse)
+async def get_latest_anchor(
+    current_user: User = Depends(deps.require_role(deps.UserRole.ADMIN)),
+    service: EvidenceAnchorService = Depends(deps.get_evidence_anchor_service),
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
+):
+    """
+    Head of the anchor chain.
+    """
+    anchor = await service.anchor_repo.get_latest_anchor(session)
+    if not anchor:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No evidence has been anchored yet")
+    return anchor
+
+@router.get("/{evidence_id}/proof", response_model=EvidenceInclusionProofResponse)
+async def get_inclusion_proof(
+    evidence_id: UUID = Path(...),
+    current_user: User = Depends(deps.require_role(deps.UserRole.ADMIN)),
+    service: EvidenceAnchorService = Depends(deps.get_evidence_anchor_service),
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
+):
+    """
+    Merkle inclusion proof of an evidence record against its anchored root.
+    """
+    return await service.get_inclusion_proof(session, evidence_id)
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from app.api import deps
+from app.core.http_cache import make_etag, etag_matches, not_modified
 from app.models.user import User
 from app.schemas.filing import FilingCaseCreate, FilingCaseResponse, FilingCaseTransition, YEAR_REGEX
 from app.services.filing_service import FilingCaseService
-from app.core.dependencies import get_db
+from app.core.dependencies import get_unit_of_work
 
 router = APIRouter()
 
@@ -24,7 +25,7 @@ async def create_filing_case(
     request: FilingCaseCreate,
     current_user: User = Depends(deps.get_current_user),
     service: FilingCaseService = Depends(deps.get_filing_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Initialize a new Filing Case.
@@ -41,35 +42,39 @@ async def create_filing_case(
 
 @router.get("/", response_model=FilingCaseResponse)
 async def get_filing_case(
+    request: Request,
+    response: Response,
     financial_year: str = Query(..., pattern=YEAR_REGEX, description="Financial Year (YYYY-YY)"),
     current_user: User = Depends(deps.get_current_user),
     service: FilingCaseService = Depends(deps.get_filing_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Retrieve existing Filing Case.
+    Supports conditional GET (ETag / If-None-Match).
     """
     check_access(current_user)
-    
+
+    # A CA sees the case assigned to them for the year
     if current_user.primary_role == "CA":
-        # Hack for demo: Find an assignment for this CA
-        from sqlalchemy import select
-        from app.models.consent import CAAssignment
-        from app.models.filing import FilingCase
-        
-        stmt = select(FilingCase).join(CAAssignment, CAAssignment.filing_id == FilingCase.id).where(
-            CAAssignment.ca_user_id == current_user.id,
-            FilingCase.financial_year == financial_year,
-            CAAssignment.status == "ACTIVE"
-        )
-        res = await session.execute(stmt)
-        case = res.scalars().first()
+        state = await service.get_assigned_case_state(session, current_user.id, financial_year)
+    else:
+        state = await service.get_case_state(session, current_user.id, financial_year)
+    if not state:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Filing Case not found")
+    etag = make_etag("filing", *state)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    if current_user.primary_role == "CA":
+        case = await service.get_assigned_case(session, current_user.id, financial_year)
     else:
         case = await service.get_case(session, current_user.id, financial_year)
-        
+
     if not case:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Filing Case not found")
-        
+
     # Fetch client name for better UX
     from sqlalchemy import select
     user_res = await session.execute(select(User.legal_name).where(User.id == case.user_id))
@@ -83,7 +88,7 @@ async def transition_state(
     financial_year: str = Path(..., pattern=YEAR_REGEX),
     current_user: User = Depends(deps.get_current_user),
     service: FilingCaseService = Depends(deps.get_filing_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Transition Filing Case to next state.
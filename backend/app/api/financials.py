@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from typing import List, Optional
 from uuid import UUID
 
 from app.api import deps
+from app.core.dependencies import get_unit_of_work
+from app.core.http_cache import make_etag, etag_matches, not_modified
 from app.models.user import User
 from app.schemas.financials import FinancialEntryCreate, FinancialEntryResponse
 from app.services.financial_service import FinancialEntryService
@@ -28,7 +30,7 @@ async def create_financial_entry(
     entry_in: FinancialEntryCreate,
     current_user: User = Depends(deps.get_current_user),
     service: FinancialEntryService = Depends(deps.get_financial_service),
-    session = Depends(deps.get_db)
+    session = Depends(get_unit_of_work, scope="function")
 ):
     """
     Create a new financial entry (Income or Expense).
@@ -41,16 +43,25 @@ async def create_financial_entry(
 
 @router.get("/", response_model=List[FinancialEntryResponse])
 async def get_financial_entries(
+    request: Request,
+    response: Response,
     entry_type: Optional[str] = Query(None, pattern="^(INCOME|EXPENSE)$"),
     current_user: User = Depends(deps.get_current_user),
     service: FinancialEntryService = Depends(deps.get_financial_service),
-    session = Depends(deps.get_db)
+    session = Depends(get_unit_of_work, scope="function")
 ):
     """
     Retrieve financial entries.
     Allowed Roles: INDIVIDUAL, BUSINESS.
+    Supports conditional GET (ETag / If-None-Match) keyed on the ledger version.
     """
     check_financial_access(current_user)
+    ledger_version = await service.get_ledger_version(session, current_user.id)
+    etag = make_etag("ledger", current_user.id, entry_type, ledger_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     if entry_type:
         return await service.get_user_entries_by_type(session, current_user.id, entry_type)
     else:
@@ -61,7 +72,7 @@ async def delete_financial_entry(
     entry_id: UUID,
     current_user: User = Depends(deps.get_current_user),
     service: FinancialEntryService = Depends(deps.get_financial_service),
-    session = Depends(deps.get_db)
+    session = Depends(get_unit_of_work, scope="function")
 ):
     """
     Delete a financial entry by ID.
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from app.api import deps
+from app.core.http_cache import make_etag, etag_matches, not_modified
 from app.models.user import User
-from app.schemas.itr import ITRDeterminationRequest, ITRDeterminationResponse
+from app.schemas.itr import ITRDeterminationRequest, ITRDeterminationResponse, ITRBatchDeterminationResponse
 from app.services.itr_service import ITRDeterminationService
-from app.core.dependencies import get_db
+from app.services.ca_assignment_service import CAAssignmentService
+from app.core.dependencies import get_unit_of_work
 
 router = APIRouter()
 
@@ -27,7 +29,7 @@ async def determine_itr(
     force: bool = Query(False, description="Bypass lock and force re-determination"),
     current_user: User = Depends(deps.get_current_user),
     service: ITRDeterminationService = Depends(deps.get_itr_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Trigger ITR determination for a specific financial year.
@@ -42,18 +44,55 @@ async def determine_itr(
         bypass_lock=force
     )
 
+@router.post("/batch-determine", response_model=ITRBatchDeterminationResponse)
+async def batch_determine_itr(
+    request: ITRDeterminationRequest,
+    current_user: User = Depends(deps.get_current_user),
+    service: ITRDeterminationService = Depends(deps.get_itr_service),
+    assignment_service: CAAssignmentService = Depends(deps.get_ca_assignment_service),
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
+):
+    """
+    Determine ITR forms for every client the calling CA is actively assigned
+    to for the requested financial year. Locked determinations are left untouched.
+    """
+    if current_user.primary_role != "CA":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied. Only Chartered Accountants can run batch ITR determination."
+        )
+
+    client_ids = await assignment_service.get_accessible_client_ids(
+        session, current_user.id, request.financial_year
+    )
+    return await service.determine_batch(
+        session, client_ids, request.financial_year,
+        actor_id=current_user.id, actor_role=current_user.primary_role
+    )
+
 @router.get("/", response_model=ITRDeterminationResponse)
 async def get_determination(
+    request: Request,
+    response: Response,
     financial_year: str = Query(..., pattern=YEAR_REGEX, description="Financial Year (YYYY-YY)"),
     current_user: User = Depends(deps.get_current_user),
     service: ITRDeterminationService = Depends(deps.get_itr_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Retrieve existing ITR determination for the user.
+    Supports conditional GET (ETag / If-None-Match).
     """
     check_itr_access(current_user)
-    
+
+    state = await service.get_determination_state(session, current_user.id, financial_year)
+    if not state:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ITR Determination not found")
+    etag = make_etag("itr", *state)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     determination = await service.get_determination(session, current_user.id, financial_year)
     if not determination:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ITR Determination not found")
@@ -65,7 +104,7 @@ async def lock_determination(
     financial_year: str = Path(..., pattern=YEAR_REGEX, description="Financial Year (YYYY-YY)"),
     current_user: User = Depends(deps.get_current_user),
     service: ITRDeterminationService = Depends(deps.get_itr_service),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_unit_of_work, scope="function")
 ):
     """
     Lock the ITR determination for a specific financial year.
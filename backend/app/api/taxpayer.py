@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Any
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_unit_of_work
 from app.api.deps import get_current_user, require_role, UserRole, get_taxpayer_service
 from app.models.user import User
 from app.schemas.taxpayer import TaxpayerProfileCreate, TaxpayerProfileResponse
@@ -19,7 +19,7 @@ router = APIRouter()
 async def create_taxpayer_profile(
     profile_in: TaxpayerProfileCreate,
     current_user: User = Depends(require_role(UserRole.INDIVIDUAL)),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_unit_of_work, scope="function"),
     service: TaxpayerProfileService = Depends(get_taxpayer_service)
 ) -> Any:
     """
@@ -42,7 +42,7 @@ async def create_taxpayer_profile(
 )
 async def get_my_taxpayer_profile(
     current_user: User = Depends(require_role(UserRole.INDIVIDUAL)),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_unit_of_work, scope="function"),
     service: TaxpayerProfileService = Depends(get_taxpayer_service)
 ) -> Any:
     """
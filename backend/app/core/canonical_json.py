@@ -0,0 +1,47 @@
+import json
+from typing import Any
+
+import orjson
+
+# Containers and scalars that orjson encodes byte-identically to the stdlib
+# canonical form. Floats are excluded (orjson writes 1e16 / 0.00001 / null for
+# NaN where json writes 1e+16 / 1e-05 / NaN), as is anything json.dumps would
+# reject (UUID, datetime, ...) so the same error is still raised.
+_FAST_SCALARS = frozenset({str, int, bool, type(None)})
+
+
+def _fast_path_safe(value: Any) -> bool:
+    kind = type(value)
+    if kind is dict:
+        for item in value.values():
+            if not _fast_path_safe(item):
+                return False
+        return True
+    if kind is list or kind is tuple:
+        for item in value:
+            if not _fast_path_safe(item):
+                return False
+        return True
+    return kind in _FAST_SCALARS
+
+
+def canonical_json_stdlib(data: Any) -> bytes:
+    """
+    Reference canonical form: sorted keys, UTF-8, no whitespace.
+    """
+    return json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def canonical_json(data: Any) -> bytes:
+    """
+    Canonical JSON bytes, identical to canonical_json_stdlib for every input.
+    Float-free payloads of plain JSON types are encoded by orjson; anything
+    else (floats, non-string keys, >64-bit ints, lone surrogates, custom
+    types) goes through the stdlib encoder, with its output or its error.
+    """
+    if _fast_path_safe(data):
+        try:
+            return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return canonical_json_stdlib(data)
@@ -30,6 +30,123 @@ class Settings(BaseSettings):
     # Must be in format: postgresql+asyncpg://...
     DATABASE_URL: PostgresDsn
 
+    # Compliance Re-evaluation Worker
+    # A dirty (user, FY) ledger is re-evaluated once it has been quiet for the
+    # debounce window, or after the max delay under a continuous stream of edits.
+    # A failing pair is retried with exponential backoff (base * 2^(failure-1))
+    # and dropped after MAX_ATTEMPTS consecutive failures.
+    COMPLIANCE_REEVAL_DEBOUNCE_SECONDS: float = 5.0
+    COMPLIANCE_REEVAL_MAX_DELAY_SECONDS: float = 60.0
+    COMPLIANCE_REEVAL_POLL_SECONDS: float = 1.0
+    COMPLIANCE_REEVAL_RETRY_BASE_SECONDS: float = 5.0
+    COMPLIANCE_REEVAL_MAX_ATTEMPTS: int = 5
+
+    # Transactional Outbox Dispatcher
+    # Failed events are retried with exponential backoff (base * 2^(attempt-1))
+    # until OUTBOX_MAX_ATTEMPTS, then left in the table for inspection.
+    # Dispatched events drop their evidence content at once and are deleted
+    # OUTBOX_RETENTION_SECONDS later (checked every OUTBOX_PRUNE_INTERVAL_SECONDS).
+    OUTBOX_POLL_SECONDS: float = 0.5
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_RETRY_BASE_SECONDS: float = 2.0
+    OUTBOX_RETENTION_SECONDS: float = 86_400.0
+    OUTBOX_PRUNE_INTERVAL_SECONDS: float = 300.0
+
+    # Fire-and-forget audit sink (non-critical audit actions)
+    # Entries are written in batches outside the request transaction; once the
+    # queue is full new entries are dropped. A failed batch is retried row by
+    # row; an entry failing AUDIT_SINK_MAX_ATTEMPTS passes goes to the error log.
+    AUDIT_SINK_MAX_QUEUE: int = 10_000
+    AUDIT_SINK_BATCH_SIZE: int = 500
+    AUDIT_SINK_POLL_SECONDS: float = 1.0
+    AUDIT_SINK_MAX_ATTEMPTS: int = 3
+
+    # CA access check cache (per process)
+    # A successful check for (CA, filing) is reused until the TTL or the
+    # consent's expiry, whichever comes first; revocations and assignment
+    # changes in this process drop it at commit.
+    CA_ACCESS_CACHE_TTL_SECONDS: float = 30.0
+    CA_ACCESS_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Audit log search: hard cap on rows per page
+    AUDIT_QUERY_MAX_PAGE_SIZE: int = 200
+
+    # Monthly audit_logs partitions
+    # Partitions are kept MONTHS_AHEAD ahead of the clock; with RETENTION_MONTHS
+    # set, older partitions are detached (and dropped if DROP_DETACHED).
+    AUDIT_PARTITION_MONTHS_AHEAD: int = 3
+    AUDIT_PARTITION_INTERVAL_SECONDS: float = 86400.0
+    AUDIT_PARTITION_RETENTION_MONTHS: Optional[int] = None
+    AUDIT_PARTITION_DROP_DETACHED: bool = False
+
+    # Evidence blob existence index (Bloom filter warmed at startup)
+    # Memory is ~1.2 bytes per hash of capacity at a 1% false-positive rate.
+    EVIDENCE_BLOOM_CAPACITY: int = 1_000_000
+    EVIDENCE_BLOOM_ERROR_RATE: float = 0.01
+
+    # Evidence blob storage backend
+    # "file": one file per blob under STORAGE_ROOT (Phase 1 layout)
+    # "pack": append-only segment files with an offset index under STORAGE_ROOT/packs
+    # "s3": S3-compatible object store (S3_* settings), keeps API nodes stateless
+    EVIDENCE_STORAGE_BACKEND: Literal["file", "pack", "s3"] = "file"
+    STORAGE_ROOT: str = "storage"
+    PACK_SEGMENT_MAX_BYTES: int = 64 * 1024 * 1024
+    PACK_SEGMENT_MAX_AGE_SECONDS: float = 3600.0
+    PACK_FSYNC: bool = True
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_BUCKET: Optional[str] = None
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[SecretStr] = None
+    S3_REGION: str = "us-east-1"
+    S3_PREFIX: str = ""
+    S3_MAX_CONNECTIONS: int = 50
+    S3_MULTIPART_THRESHOLD_BYTES: int = 8 * 1024 * 1024
+    S3_PART_SIZE_BYTES: int = 8 * 1024 * 1024  # S3 minimum for all but the last part is 5 MiB
+    S3_MAX_CONCURRENCY: int = 4
+    S3_MAX_RETRIES: int = 3
+    S3_RETRY_BASE_SECONDS: float = 0.2
+    S3_TIMEOUT_SECONDS: float = 10.0
+
+    # Evidence blob compression (deflate with per-action-type trained dictionaries)
+    # Hashes stay over the canonical bytes; reads decompress transparently.
+    EVIDENCE_COMPRESSION_ENABLED: bool = False
+    EVIDENCE_COMPRESSION_LEVEL: int = 9
+    EVIDENCE_DICTIONARY_SIZE: int = 16 * 1024
+    EVIDENCE_DICTIONARY_SAMPLES: int = 1000
+
+    # Evidence integrity verification job
+    # Workers default to the CPU count; records younger than the settle window
+    # (e.g. blobs still queued in the outbox) are left for the next run.
+    EVIDENCE_VERIFY_WORKERS: Optional[int] = None
+    EVIDENCE_VERIFY_CHUNK_SIZE: int = 5000
+    EVIDENCE_VERIFY_SETTLE_SECONDS: float = 300.0
+
+    # Evidence Merkle anchoring
+    # New records are anchored every interval, at most MAX_LEAVES per tree.
+    # Each pass also sweeps SWEEP_SECONDS behind the cursor for records that
+    # committed after the cursor passed them.
+    EVIDENCE_ANCHOR_INTERVAL_SECONDS: float = 3600.0
+    EVIDENCE_ANCHOR_MAX_LEAVES: int = 100_000
+    EVIDENCE_ANCHOR_SETTLE_SECONDS: float = 300.0
+    EVIDENCE_ANCHOR_SWEEP_SECONDS: float = 86400.0
+
+    # Evidence retention purge
+    # Expired records are purged BATCH_SIZE per transaction, with a pause between
+    # batches; blob deletes are paced to MAX_DELETES_PER_SECOND (0 = unpaced).
+    EVIDENCE_PURGE_INTERVAL_SECONDS: float = 3600.0
+    EVIDENCE_PURGE_BATCH_SIZE: int = 500
+    EVIDENCE_PURGE_BATCH_PAUSE_SECONDS: float = 0.5
+    EVIDENCE_PURGE_MAX_DELETES_PER_SECOND: float = 200.0
+
+    # Cold archival of audit_logs / consent_audit_logs
+    # Rows older than AFTER_DAYS are moved, BATCH_SIZE rows per gzip NDJSON
+    # segment, into evidence storage under archive/. Unset = not archived.
+    LOG_ARCHIVE_AFTER_DAYS: Optional[int] = None
+    LOG_ARCHIVE_BATCH_SIZE: int = 5000
+    LOG_ARCHIVE_BATCH_PAUSE_SECONDS: float = 0.5
+    LOG_ARCHIVE_INTERVAL_SECONDS: float = 86400.0
+
     @computed_field
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
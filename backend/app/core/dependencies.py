@@ -2,7 +2,24 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import AsyncGenerator
 from .database import async_session_factory
+from app.repositories.unit_of_work import complete
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
         yield session
+
+async def get_unit_of_work(session: AsyncSession = Depends(get_db)) -> AsyncGenerator[AsyncSession, None]:
+    """
+    The request's session, committed exactly once after the endpoint returns
+    (rolled back if it raises). Declare with scope="function" so the commit
+    happens before the response is sent and a failed commit is reported:
+        session: AsyncSession = Depends(get_unit_of_work, scope="function")
+    Dependencies sharing the request's get_db session (e.g. get_current_user)
+    see the same identity map, so entities they loaded are not fetched again.
+    """
+    try:
+        yield session
+    except Exception:
+        await complete(session, failed=True)
+        raise
+    await complete(session, failed=False)
@@ -0,0 +1,140 @@
+import hashlib
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+# Compressed blob layout: MAGIC | dictionary id length (1 byte) | dictionary id | raw deflate
+# Canonical JSON never starts with NUL, so uncompressed blobs are told apart by the first byte.
+MAGIC = b"\x00MVZ"
+NO_DICTIONARY = ""
+
+# JSON string literals, bare scalars, and punctuation of canonical JSON
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[^",:{}\[\]]+|[,:{}\[\]]')
+_MAX_NGRAM = 6
+_MAX_CANDIDATES = 5000
+
+
+class UnknownDictionaryError(KeyError):
+    """
+    A compressed blob references a dictionary this process has not loaded.
+    """
+
+
+def evidence_action_type(action_urn: Optional[str]) -> str:
+    """
+    Action type of an evidence URN (urn:entity:id:action -> "entity:action").
+    """
+    parts = (action_urn or "").split(":")
+    if len(parts) >= 4 and parts[0] == "urn":
+        return f"{parts[1]}:{parts[-1]}"
+    return "unknown"
+
+
+def dictionary_id(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+def train_dictionary(samples: List[bytes], size: int) -> bytes:
+    """
+    Build a preset deflate dictionary from sample documents.
+    Token n-grams (keys with their punctuation, recurring values) are scored by
+    document frequency x length; the best ones are packed up to `size` bytes,
+    highest score last, since deflate finds matches near the window end cheapest.
+    """
+    if not samples:
+        return b""
+    document_frequency: Counter = Counter()
+    for sample in samples:
+        tokens = _TOKEN.findall(sample)
+        grams = set()
+        for n in range(1, _MAX_NGRAM + 1):
+            for i in range(len(tokens) - n + 1):
+                grams.add(b"".join(tokens[i:i + n]))
+        document_frequency.update(grams)
+
+    min_df = max(2, math.ceil(len(samples) * 0.05))
+    candidates = sorted(
+        (gram for gram, df in document_frequency.items() if df >= min_df and len(gram) > 2),
+        key=lambda gram: document_frequency[gram] * len(gram),
+        reverse=True
+    )[:_MAX_CANDIDATES]
+
+    selected: List[bytes] = []
+    used = 0
+    for gram in candidates:
+        if used + len(gram) > size:
+            continue
+        if any(gram in chosen for chosen in selected):
+            continue
+        selected.append(gram)
+        used += len(gram)
+    return b"".join(reversed(selected))
+
+
+class EvidenceCodec:
+    """
+    Optional compression of canonical evidence bytes.
+    Each action type compresses with its active trained dictionary (or plain
+    deflate if none); every dictionary ever used stays loaded for decoding.
+    Hashes are always over the canonical bytes, never the stored ones.
+    """
+
+    def __init__(self, level: int = 9):
+        self.level = level
+        self.dictionaries: Dict[str, bytes] = {}
+        self.active: Dict[str, str] = {}
+
+    def add_dictionary(self, content: bytes, action_type: Optional[str] = None) -> str:
+        """
+        Register a dictionary; with an action type it becomes that type's active one.
+        Returns its id.
+        """
+        dict_id = dictionary_id(content)
+        self.dictionaries[dict_id] = content
+        if action_type is not None:
+            self.active[action_type] = dict_id
+        return dict_id
+
+    def encode(self, data: bytes, action_type: Optional[str] = None) -> bytes:
+        """
+        Compressed form of data, or data itself when compression does not pay off.
+        """
+        dict_id = self.active.get(action_type, NO_DICTIONARY)
+        if dict_id:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15, zdict=self.dictionaries[dict_id])
+        else:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+        header = MAGIC + bytes([len(dict_id)]) + dict_id.encode("ascii")
+        encoded = header + compressor.compress(data) + compressor.flush()
+        return encoded if len(encoded) < len(data) else data
+
+    @staticmethod
+    def is_compressed(data: bytes) -> bool:
+        return data[:len(MAGIC)] == MAGIC
+
+    @staticmethod
+    def dictionary_of(data: bytes) -> str:
+        id_length = data[len(MAGIC)]
+        return bytes(data[len(MAGIC) + 1:len(MAGIC) + 1 + id_length]).decode("ascii")
+
+    def decode(self, data: bytes) -> bytes:
+        """
+        Canonical bytes of a stored blob (compressed or not).
+        Raises UnknownDictionaryError if its dictionary is not loaded.
+        """
+        if not self.is_compressed(data):
+            return bytes(data)
+        dict_id = self.dictionary_of(data)
+        body = data[len(MAGIC) + 1 + len(dict_id):]
+        if dict_id:
+            if dict_id not in self.dictionaries:
+                raise UnknownDictionaryError(dict_id)
+            decompressor = zlib.decompressobj(-15, zdict=self.dictionaries[dict_id])
+        else:
+            decompressor = zlib.decompressobj(-15)
+        return decompressor.decompress(body) + decompressor.flush()
+
+    def compressed_size(self, samples: Iterable[bytes], action_type: Optional[str] = None) -> int:
+        return sum(len(self.encode(sample, action_type)) for sample in samples)
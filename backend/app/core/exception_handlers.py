@@ -2,7 +2,7 @@ from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from app.core.exceptions import ValidationError, UnauthorizedError, NotFoundError
+from app.core.exceptions import ValidationError, UnauthorizedError, NotFoundError, ConflictError
 from app.core.logging import logger
 from datetime import datetime, timezone
 import traceback
@@ -58,6 +58,14 @@ def register_exception_handlers(app: FastAPI):
             content=create_error_envelope("NOT_FOUND", str(exc), request.url.path),
         )
 
+    @app.exception_handler(ConflictError)
+    async def conflict_error_handler(request: Request, exc: ConflictError):
+        logger.info(f"ConflictError on {request.url.path}: {str(exc)}")
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content=create_error_envelope("CONFLICT", str(exc), request.url.path),
+        )
+
     @app.exception_handler(RequestValidationError)
     async def request_validation_error_handler(request: Request, exc: RequestValidationError):
         logger.info(f"RequestValidationError on {request.url.path}")
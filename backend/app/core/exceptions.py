@@ -9,3 +9,7 @@ class UnauthorizedError(Exception):
 class ValidationError(Exception):
     """Raised when a business rule or validation fails."""
     pass
+
+class ConflictError(Exception):
+    """Raised when a write loses a race against a concurrent update."""
+    pass
@@ -0,0 +1,34 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*validators: Any) -> str:
+    """
+    Build a strong ETag from the validators that fully determine a representation
+    (resource kind, owner, version counters, timestamps...).
+    """
+    digest = hashlib.sha256("|".join(str(v) for v in validators).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Evaluate If-None-Match against the current ETag.
+    If-None-Match uses weak comparison (RFC 9110 13.1.2), so a W/ prefix is ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Empty 304 response carrying the current ETag.
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,84 @@
+import hashlib
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+# Domain separation (RFC 6962): leaves and interior nodes never hash alike
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+GENESIS_CHAIN_HASH = "0" * 64
+
+# (sibling side, sibling hash) from the leaf upwards; side is "left" or "right"
+ProofStep = Tuple[str, str]
+
+
+def leaf_hash(record_id: UUID, evidence_hash: str) -> str:
+    """
+    Leaf of an evidence record: binds the record id to its content hash,
+    so both altering and deleting a record break the proof.
+    """
+    return hashlib.sha256(LEAF_PREFIX + f"{record_id}:{evidence_hash}".encode("utf-8")).hexdigest()
+
+
+def node_hash(left: str, right: str) -> str:
+    return hashlib.sha256(NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def chain_hash(previous_chain_hash: str, root_hash: str) -> str:
+    """
+    Link a tree root to every root before it.
+    """
+    return hashlib.sha256(bytes.fromhex(previous_chain_hash) + bytes.fromhex(root_hash)).hexdigest()
+
+
+def build_levels(leaves: List[str]) -> List[List[str]]:
+    """
+    All levels of the tree, leaves first and the root last.
+    A node without a sibling is promoted to the next level unchanged.
+    """
+    if not leaves:
+        raise ValueError("A Merkle tree needs at least one leaf")
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def level_sizes(leaf_count: int) -> List[int]:
+    sizes = [leaf_count]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+
+def proof_positions(leaf_index: int, leaf_count: int) -> List[Tuple[int, int]]:
+    """
+    (level, position) of each sibling on the path from a leaf to the root.
+    Levels where the path node was promoted have no sibling and are skipped.
+    """
+    positions = []
+    position = leaf_index
+    for level, size in enumerate(level_sizes(leaf_count)[:-1]):
+        sibling = position ^ 1
+        if sibling < size:
+            positions.append((level, sibling))
+        position //= 2
+    return positions
+
+
+def root_from_proof(leaf: str, proof: List[ProofStep]) -> Optional[str]:
+    """
+    Recompute the root from a leaf and its proof (None if the proof is malformed).
+    """
+    current = leaf
+    for side, sibling in proof:
+        if side == "left":
+            current = node_hash(sibling, current)
+        elif side == "right":
+            current = node_hash(current, sibling)
+        else:
+            return None
+    return current
@@ -0,0 +1,156 @@
+"""
+Columnar Ledger Snapshot
+Phase 1: Vectorized view of a user's financial year ledger.
+
+A snapshot holds one NumPy array per column instead of one ORM object per
+entry, so rule primitives run as array operations:
+- amounts_paise: int64 amounts in paise (exact, no Decimal/float arithmetic)
+- entry_types: int8 codes (INCOME / EXPENSE)
+- category_codes: int32 indices into the `categories` vocabulary
+- entry_dates: datetime64[D]
+
+This module is pure logic and never touches the database; snapshots are
+built by FinancialEntryRepository.get_ledger_snapshot from a Core query.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+INCOME = 0
+EXPENSE = 1
+ENTRY_TYPE_CODES = {"INCOME": INCOME, "EXPENSE": EXPENSE}
+
+# Financial year starts in April: bucket 0 = April ... bucket 11 = March
+FY_START_MONTH_INDEX = 3
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def paise_to_rupees(paise: int) -> Decimal:
+    """
+    Convert an integer paise amount back to a 2-decimal rupee Decimal.
+    """
+    return Decimal(int(paise)).scaleb(-2)
+
+
+class LedgerSnapshot:
+    """
+    Columnar snapshot of a ledger (treat as read-only).
+    All arrays share the same length (one slot per entry).
+    """
+    __slots__ = ("amounts_paise", "entry_types", "category_codes", "categories", "entry_dates")
+
+    def __init__(
+        self,
+        amounts_paise: np.ndarray,
+        entry_types: np.ndarray,
+        category_codes: np.ndarray,
+        categories: Tuple[str, ...],
+        entry_dates: np.ndarray
+    ):
+        self.amounts_paise = amounts_paise
+        self.entry_types = entry_types
+        self.category_codes = category_codes
+        self.categories = categories
+        self.entry_dates = entry_dates
+
+    @classmethod
+    def from_columns(
+        cls,
+        entry_types: Sequence[str],
+        categories: Sequence[str],
+        amounts_paise: Sequence[int],
+        entry_dates: Sequence[date]
+    ) -> "LedgerSnapshot":
+        """
+        Build a snapshot from parallel column sequences.
+        """
+        # Category vocabulary in first-seen order; one dict probe per entry
+        vocabulary: Dict[str, int] = {}
+        codes = [vocabulary.setdefault(c, len(vocabulary)) for c in categories]
+        # datetime64[D] counts days from 1970-01-01; converting via ordinals
+        # avoids NumPy's slow per-object date parsing
+        day_numbers = np.fromiter((d.toordinal() for d in entry_dates), dtype=np.int64, count=len(entry_dates))
+        return cls(
+            amounts_paise=np.asarray(amounts_paise, dtype=np.int64),
+            entry_types=np.fromiter((ENTRY_TYPE_CODES[t] for t in entry_types), dtype=np.int8, count=len(entry_types)),
+            category_codes=np.asarray(codes, dtype=np.int32),
+            categories=tuple(vocabulary),
+            entry_dates=(day_numbers - EPOCH_ORDINAL).astype("datetime64[D]")
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Tuple[str, str, int, date]]) -> "LedgerSnapshot":
+        """
+        Build a snapshot from (entry_type, category, amount_paise, entry_date) rows.
+        """
+        if not rows:
+            return cls.from_columns([], [], [], [])
+        entry_types, categories, amounts_paise, entry_dates = zip(*rows)
+        return cls.from_columns(entry_types, categories, amounts_paise, entry_dates)
+
+    def __len__(self) -> int:
+        return int(self.amounts_paise.shape[0])
+
+    # ------------------------------------------------------------------
+    # Masks
+    # ------------------------------------------------------------------
+    def type_mask(self, entry_type: str) -> np.ndarray:
+        """
+        Boolean mask of entries with the given entry_type (INCOME / EXPENSE).
+        """
+        return self.entry_types == ENTRY_TYPE_CODES[entry_type]
+
+    def category_mask(self, categories: Iterable[str]) -> np.ndarray:
+        """
+        Boolean mask of entries whose category (trimmed, upper-cased) is in `categories`.
+        Normalization runs once per distinct category, not once per entry.
+        """
+        wanted = {c.strip().upper() for c in categories}
+        matching_codes = [
+            code for code, label in enumerate(self.categories)
+            if label.strip().upper() in wanted
+        ]
+        return np.isin(self.category_codes, matching_codes)
+
+    # ------------------------------------------------------------------
+    # Aggregations (all amounts in paise)
+    # ------------------------------------------------------------------
+    def masked_sum(self, mask: Optional[np.ndarray] = None) -> int:
+        """
+        Sum of amounts selected by `mask` (all entries if None).
+        """
+        amounts = self.amounts_paise if mask is None else self.amounts_paise[mask]
+        return int(amounts.sum())
+
+    def total(self, entry_type: str) -> int:
+        """
+        Total amount for an entry type.
+        """
+        return self.masked_sum(self.type_mask(entry_type))
+
+    def sum_by_category(self, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """
+        Group-by-category sum of the selected entries.
+        Categories without selected entries are omitted.
+        """
+        codes = self.category_codes if mask is None else self.category_codes[mask]
+        amounts = self.amounts_paise if mask is None else self.amounts_paise[mask]
+        totals = np.zeros(len(self.categories), dtype=np.int64)
+        np.add.at(totals, codes, amounts)
+        present = np.bincount(codes, minlength=len(self.categories)) > 0
+        return {self.categories[i]: int(totals[i]) for i in np.flatnonzero(present)}
+
+    def monthly_totals(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Twelve financial-year month buckets (index 0 = April, 11 = March).
+        """
+        dates = self.entry_dates if mask is None else self.entry_dates[mask]
+        amounts = self.amounts_paise if mask is None else self.amounts_paise[mask]
+        calendar_month = dates.astype("datetime64[M]").astype(np.int64) % 12
+        fy_month = (calendar_month - FY_START_MONTH_INDEX) % 12
+        totals = np.zeros(12, dtype=np.int64)
+        np.add.at(totals, fy_month, amounts)
+        return totals
@@ -5,8 +5,18 @@ from sqlalchemy import text
 from .core.config import settings
 from .core.logging import logger
 from .core.dependencies import get_db
+from .core.database import async_session_factory
 from .core.exception_handlers import register_exception_handlers
-from .api import auth, taxpayer, business, financials, compliance, itr, filing, consent
+from .api import auth, taxpayer, business, financials, compliance, itr, filing, consent, evidence, audit
+from .services.compliance_reevaluation import ComplianceReevaluationWorker, compliance_dirty_set
+from .services.outbox_dispatcher import OutboxDispatcher
+from .services.audit_sink import AuditSinkWorker, audit_sink_queue
+from .services.audit_partition_service import AuditPartitionWorker
+from .services.evidence_blob_store import warm_evidence_blob_index, load_evidence_dictionaries
+from .services.evidence_anchor_service import EvidenceAnchorWorker
+from .services.evidence_purge_service import EvidencePurgeWorker
+from .services.log_archive_service import LogArchiveWorker
+from .services.storage_backends import close_storage_service, open_storage_service
 
 app_configs = {}
 if settings.APP_ENV in ["staging", "production"]:
@@ -25,8 +35,8 @@ app.add_middleware(
     allow_origins=settings.BACKEND_CORS_ORIGINS,
     allow_credentials=False,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-    allow_headers=["Authorization", "Content-Type", "Accept"],
-    expose_headers=[],
+    allow_headers=["Authorization", "Content-Type", "Accept", "If-None-Match"],
+    expose_headers=["ETag"],
     max_age=600,
 )
 
@@ -40,6 +50,8 @@ app.include_router(compliance, prefix="/api/v1/compliance", tags=["Compliance En
 app.include_router(itr, prefix="/api/v1/itr", tags=["ITR Determination"])
 app.include_router(filing, prefix="/api/v1/filing", tags=["Filing Case Workflow"])
 app.include_router(consent, prefix="/api/v1/consent", tags=["CA Assignment & Consent"])
+app.include_router(evidence, prefix="/api/v1/evidence", tags=["Evidence Integrity"])
+app.include_router(audit, prefix="/api/v1/audit", tags=["Audit Logs"])
 
 @app.get("/api/v1/health")
 async def health_check(db: AsyncSession = Depends(get_db)):
@@ -64,10 +76,51 @@ async def health_check(db: AsyncSession = Depends(get_db)):
             detail="Service Unavailable" if settings.APP_ENV in ["staging", "production"] else f"Database connection failed: {e}"
         )
 
+# Background re-evaluation of ledgers touched by financial entry writes
+compliance_worker = ComplianceReevaluationWorker(compliance_dirty_set, async_session_factory)
+
+# Materializes evidence blobs and audit rows written to the transactional outbox
+outbox_dispatcher = OutboxDispatcher(async_session_factory)
+
+# Writes fire-and-forget (non-critical) audit entries in batches
+audit_sink_worker = AuditSinkWorker(audit_sink_queue, async_session_factory)
+
+# Keeps monthly audit_logs partitions created ahead of time
+audit_partition_worker = AuditPartitionWorker(async_session_factory)
+
+# Periodically anchors new evidence records into chained Merkle trees
+evidence_anchor_worker = EvidenceAnchorWorker(async_session_factory)
+
+# Purges evidence records and blobs past their retention expiry
+evidence_purge_worker = EvidencePurgeWorker(async_session_factory)
+
+# Moves old audit and consent audit rows into compressed archive segments
+log_archive_worker = LogArchiveWorker(async_session_factory)
+
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting up MaaV Solutions Phase-1 API...")
+    await open_storage_service()
+    loaded = await warm_evidence_blob_index(async_session_factory)
+    logger.info(f"Evidence blob index warmed with {loaded} hashes")
+    dictionaries = await load_evidence_dictionaries(async_session_factory)
+    logger.info(f"Loaded {dictionaries} evidence compression dictionaries")
+    compliance_worker.start()
+    outbox_dispatcher.start()
+    audit_sink_worker.start()
+    audit_partition_worker.start()
+    evidence_anchor_worker.start()
+    evidence_purge_worker.start()
+    log_archive_worker.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down MaaV Solutions Phase-1 API...")
+    await compliance_worker.stop()
+    await outbox_dispatcher.stop()
+    await audit_sink_worker.stop()
+    await audit_partition_worker.stop()
+    await evidence_anchor_worker.stop()
+    await evidence_purge_worker.stop()
+    await log_archive_worker.stop()
+    await close_storage_service()
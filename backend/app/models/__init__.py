@@ -2,9 +2,12 @@ from .base import Base
 from .user import User, UserCredentials, AuthSession
 from .taxpayer import TaxpayerProfile
 from .business import BusinessProfile
-from .financials import FinancialEntry
+from .financials import FinancialEntry, LedgerVersion
 from .compliance import ComplianceFlag
 from .itr import ITRDetermination
 from .filing import FilingCase
 from .audit import AuditLog
 from .consent import ConsentArtifact, CAAssignment, ConsentAuditLog
+from .outbox import OutboxEvent
+from .evidence import EvidenceRecord, EvidenceBlob, EvidenceVerificationCheckpoint, EvidenceAnchor, EvidenceMerkleNode, EvidenceCompressionDictionary
+from .archive import LogArchiveSegment
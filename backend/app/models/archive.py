@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import text, func
+from .base import Base
+
+class LogArchiveSegment(Base):
+    """
+    Manifest entry for one archived NDJSON segment.
+    The segment holds rows of source_table created in
+    [first_created_at, last_created_at], gzip-compressed in evidence storage;
+    sha256 is the digest of the stored (compressed) bytes.
+    """
+    __tablename__ = "log_archive_segments"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+    source_table = Column(String(64), nullable=False)
+    storage_location = Column(Text, nullable=False, unique=True)
+    sha256 = Column(String(64), nullable=False)
+    row_count = Column(Integer, nullable=False)
+    first_created_at = Column(DateTime(timezone=True), nullable=False)
+    last_created_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_log_archive_segments_source_table_range", "source_table", "first_created_at", "last_created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB, INET
 from sqlalchemy.sql import func, text
 from .base import Base
@@ -7,12 +7,15 @@ class AuditLog(Base):
     """
     Audit Log Model.
     Aligned to existing schema.
+    Range-partitioned by month on created_at (audit_logs_pYYYY_MM partitions),
+    so the primary key includes created_at and rows are always inserted with
+    an explicit timestamp.
     """
     __tablename__ = "audit_logs"
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
     
-    actor_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    actor_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     actor_role = Column(String(20), nullable=True)
     
     action = Column(Text, nullable=False)
@@ -23,4 +26,12 @@ class AuditLog(Base):
     ip_address = Column(INET, nullable=True)
     device_id = Column(Text, nullable=True)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Keyset pagination of the audit search: by actor (an actor's history
+        # in time order), unfiltered, and by action
+        Index("ix_audit_logs_actor_id_created_at_id", "actor_id", "created_at", "id"),
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        Index("ix_audit_logs_action_created_at_id", "action", "created_at", "id"),
+    )
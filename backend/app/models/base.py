@@ -1,3 +1,11 @@
 from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base()
+
+class _EagerDefaults:
+    # Server-generated values (ids, created_at, onupdate timestamps) are fetched
+    # with INSERT/UPDATE ... RETURNING during flush instead of being expired and
+    # reloaded by a second SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_EagerDefaults)
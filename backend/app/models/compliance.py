@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Boolean, Text, DateTime, ForeignKey, CheckConstraint, UUID
+from sqlalchemy import Column, String, Boolean, Text, DateTime, ForeignKey, CheckConstraint, Index, UUID
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.models.base import Base
 
 class ComplianceFlag(Base):
@@ -45,4 +45,13 @@ class ComplianceFlag(Base):
             "severity IN ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')",
             name="check_severity_level"
         ),
+        # At most one unresolved flag per (user, FY, code).
+        # Resolved flags fall outside the index so a violation can recur.
+        Index(
+            "uq_compliance_flags_open",
+            "user_id", "financial_year", "flag_code",
+            unique=True,
+            postgresql_where=text("NOT is_resolved"),
+            sqlite_where=text("NOT is_resolved")
+        ),
     )
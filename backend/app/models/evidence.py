@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Text, Date
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Text, Date, Integer, SmallInteger, DateTime, Index, ForeignKey, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import text
+from sqlalchemy.sql import text, func
 from .base import Base
 
 class EvidenceRecord(Base):
@@ -22,5 +23,107 @@ class EvidenceRecord(Base):
     # Relative path to blob storage
     storage_location = Column(Text, nullable=False)
     
-    # Date when the evidence can be purged (policy driven)
+    # Date when the evidence can be purged (policy driven); the retention purge
+    # walks (retention_expiry, id) and checks remaining references by hash
     retention_expiry = Column(Date, nullable=True)
+
+    # Microsecond capture time; (created_at, id) is the keyset order for
+    # streaming scans such as integrity verification
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_evidence_records_created_at_id", "created_at", "id"),
+        Index("ix_evidence_records_retention_expiry_id", "retention_expiry", "id"),
+        Index("ix_evidence_records_hash", "hash"),
+    )
+
+
+class EvidenceBlob(Base):
+    """
+    Content-addressed Evidence Blob.
+    One row per distinct SHA-256; ref_count is the number of evidence records
+    sharing the blob, so retention purges only delete unreferenced blobs.
+    """
+    __tablename__ = "evidence_blobs"
+
+    hash = Column(Text, primary_key=True)
+    storage_location = Column(Text, nullable=False)
+    ref_count = Column(Integer, nullable=False, server_default=text("0"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Only blobs awaiting deletion by the retention purge
+        Index("ix_evidence_blobs_unreferenced", "hash", postgresql_where=text("ref_count <= 0")),
+    )
+
+
+class EvidenceVerificationCheckpoint(Base):
+    """
+    Progress of an evidence integrity verification job.
+    Incremental runs resume after (last_created_at, last_record_id).
+    """
+    __tablename__ = "evidence_verification_checkpoints"
+
+    job_name = Column(String(64), primary_key=True)
+    last_created_at = Column(DateTime(timezone=True), nullable=False)
+    last_record_id = Column(UUID(as_uuid=True), nullable=False)
+    verified_count = Column(Integer, nullable=False, server_default=text("0"))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class EvidenceAnchor(Base):
+    """
+    Merkle root over one batch of evidence records.
+    Batches advance a (created_at, id) cursor, ending at last_created_at /
+    last_record_id, plus any records that committed behind it late; chain_hash
+    links each root to all earlier ones, so dropping or rewriting an anchor is
+    detectable.
+    """
+    __tablename__ = "evidence_anchors"
+
+    sequence = Column(Integer, primary_key=True, autoincrement=False)
+    root_hash = Column(String(64), nullable=False)
+    previous_chain_hash = Column(String(64), nullable=False)
+    chain_hash = Column(String(64), nullable=False)
+    leaf_count = Column(Integer, nullable=False)
+    last_created_at = Column(DateTime(timezone=True), nullable=False)
+    last_record_id = Column(UUID(as_uuid=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class EvidenceMerkleNode(Base):
+    """
+    One node of an anchored Merkle tree (level 0 = leaves).
+    Leaves carry their record id; an inclusion proof reads one sibling per level.
+    """
+    __tablename__ = "evidence_merkle_nodes"
+
+    anchor_sequence = Column(Integer, ForeignKey("evidence_anchors.sequence", ondelete="CASCADE"), primary_key=True)
+    level = Column(SmallInteger, primary_key=True)
+    position = Column(Integer, primary_key=True)
+    hash = Column(String(64), nullable=False)
+    record_id = Column(UUID(as_uuid=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_evidence_merkle_nodes_record_id", "record_id", unique=True),
+    )
+
+
+class EvidenceCompressionDictionary(Base):
+    """
+    Trained deflate dictionary for one evidence action type.
+    The newest dictionary of a type compresses new blobs; older ones are kept
+    because the blobs compressed with them reference them by id.
+    """
+    __tablename__ = "evidence_compression_dictionaries"
+
+    id = Column(String(16), primary_key=True)
+    action_type = Column(String(100), nullable=False, index=True)
+    content = Column(LargeBinary, nullable=False)
+    sample_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -18,6 +18,8 @@ class FilingCase(Base):
     itr_determination_id = Column(UUID(as_uuid=True), ForeignKey("itr_determinations.id"), nullable=False, index=True)
     
     current_state = Column(String(30), nullable=False)
+    # Optimistic concurrency token, incremented by every state change
+    version = Column(Integer, default=1, server_default=text("1"), nullable=False)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, ForeignKey, DateTime, Date, Text, CheckConstraint
+from sqlalchemy import Column, String, Numeric, ForeignKey, DateTime, Date, Text, CheckConstraint, BigInteger
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func, text
@@ -34,3 +34,16 @@ class FinancialEntry(Base):
 
     # Relationships
     user = relationship("User", backref="financial_entries")
+
+class LedgerVersion(Base):
+    """
+    Per-(user, financial year) ledger version counter.
+    Bumped on every ledger write so derived results (ITR determination,
+    compliance flags) can tell whether the ledger changed since they were computed.
+    """
+    __tablename__ = "ledger_versions"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    financial_year = Column(String(9), primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default=text("0"))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
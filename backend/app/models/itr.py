@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, Text, CheckConstraint, UniqueConstraint, DateTime
+from sqlalchemy import Column, String, Boolean, ForeignKey, Text, CheckConstraint, UniqueConstraint, DateTime, BigInteger
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -20,6 +20,8 @@ class ITRDetermination(Base):
     
     is_locked = Column(Boolean, default=False, nullable=False)
     determined_at = Column(DateTime(timezone=True), nullable=False)
+    # Ledger version the determination was computed against (memoization key)
+    ledger_version = Column(BigInteger, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     user = relationship("User", back_populates="itr_determinations")
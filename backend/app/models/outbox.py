@@ -0,0 +1,40 @@
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func, text
+from .base import Base
+
+class OutboxEvent(Base):
+    """
+    Transactional Outbox Event.
+    Written in the same transaction as the state change that produced it;
+    side effects (evidence blobs, audit records) are materialized later by
+    the OutboxDispatcher with at-least-once delivery.
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
+
+    # EVIDENCE_BLOB | AUDIT_LOG
+    event_type = Column(String(30), nullable=False)
+
+    # Idempotency key (e.g. the evidence action URN); one event per key
+    dedup_key = Column(Text, nullable=False, unique=True)
+
+    payload = Column(JSONB, nullable=False)
+
+    attempts = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    last_error = Column(Text, nullable=True)
+
+    # Earliest time the dispatcher may (re)try the event
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    dispatched_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_outbox_events_pending",
+            "available_at",
+            postgresql_where=text("dispatched_at IS NULL"),
+            sqlite_where=text("dispatched_at IS NULL")
+        ),
+    )
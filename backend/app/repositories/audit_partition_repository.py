@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+PARENT_TABLE = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+
+
+class AuditPartitionRepository:
+    """
+    Partition maintenance for the month-partitioned audit_logs table (PostgreSQL).
+    Partition names and bounds are generated by the caller, never user input.
+    """
+
+    async def get_partitions(self, session: AsyncSession) -> List[str]:
+        """
+        Names of the partitions currently attached to audit_logs.
+        """
+        result = await session.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass) ORDER BY c.relname"
+        ), {"parent": PARENT_TABLE})
+        return list(result.scalars().all())
+
+    async def create_partition(self, session: AsyncSession, name: str, start: datetime, end: datetime) -> int:
+        """
+        Create and attach the partition for [start, end).
+        Rows already caught by the default partition for that range are moved
+        into it first, so the attach succeeds. Returns the number of rows moved.
+        """
+        bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        await session.execute(text(
+            f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        moved = await session.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ), {"start": start, "end": end})
+        await session.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+        return moved.rowcount
+
+    async def detach_partition(self, session: AsyncSession, name: str) -> None:
+        """
+        Detach a partition: it becomes a standalone table, out of audit_logs queries.
+        """
+        await session.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+
+    async def drop_table(self, session: AsyncSession, name: str) -> None:
+        """
+        Drop a detached partition.
+        """
+        await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
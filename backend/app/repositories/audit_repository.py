@@ -1,8 +1,99 @@
-from uuid import UUID
-from typing import Sequence, Optional
+import json
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+from typing import Sequence, Optional, Dict, Any, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from sqlalchemy import Select, and_, bindparam, func, insert, literal_column, select, true, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from app.models.audit import AuditLog
+from app.repositories.sql_helpers import chunked, dialect_insert
+from app.repositories.write_buffer import buffer_insert, flush_buffered
+
+AUDIT_LOG_COLUMNS = (
+    "id", "actor_id", "actor_role", "action", "before_value", "after_value", "ip_address", "device_id", "created_at"
+)
+
+
+def audit_log_values(log: AuditLog) -> Dict[str, Any]:
+    """
+    Column values of an AuditLog, with the id and timestamp assigned client-side.
+    """
+    values = {column: getattr(log, column) for column in AUDIT_LOG_COLUMNS}
+    values["id"] = values["id"] or uuid4()
+    values["created_at"] = values["created_at"] or datetime.now(timezone.utc)
+    return values
+
+def search_statement(
+    dialect_name: str,
+    limit: int,
+    before: Optional[Tuple[datetime, UUID]] = None,
+    actor_ids: Optional[List[UUID]] = None,
+    action: Optional[str] = None,
+    actor_role: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> Select:
+    """
+    The audit search query, with a fixed number of bind parameters however
+    many actor_ids there are.
+    On PostgreSQL several actors drive the page: a LATERAL subquery over
+    unnest(:actor_ids) walks each actor's (actor_id, created_at, id) index
+    range for at most `limit` keys, and only those are merged, so the cost is
+    actors x page rather than a scan of the time-ordered index past other
+    actors' rows. SQLite (test harness only) has no LATERAL and filters on
+    the ids passed as one JSON array.
+    """
+    def filters_on(log) -> list:
+        filters = []
+        if before is not None:
+            filters.append(tuple_(log.created_at, log.id) < tuple_(*before))
+        if action is not None:
+            filters.append(log.action == action)
+        if actor_role is not None:
+            filters.append(log.actor_role == actor_role)
+        if since is not None:
+            filters.append(log.created_at >= since)
+        if until is not None:
+            filters.append(log.created_at < until)
+        return filters
+
+    filters = filters_on(AuditLog)
+    newest_first = (AuditLog.created_at.desc(), AuditLog.id.desc())
+
+    if actor_ids is None:
+        stmt = select(AuditLog).where(*filters)
+    elif len(actor_ids) == 1:
+        stmt = select(AuditLog).where(AuditLog.actor_id == actor_ids[0], *filters)
+    elif dialect_name == "postgresql":
+        actors = (
+            func.unnest(bindparam("actor_ids", actor_ids, type_=ARRAY(PG_UUID(as_uuid=True))))
+            .table_valued("actor_id")
+            .render_derived(name="actors")
+        )
+        # The inner walk gets its own alias so it is not correlated to the outer AuditLog
+        walked = aliased(AuditLog)
+        per_actor = (
+            select(walked.created_at, walked.id)
+            .where(walked.actor_id == actors.c.actor_id, *filters_on(walked))
+            .order_by(walked.created_at.desc(), walked.id.desc())
+            .limit(limit)
+            .lateral("per_actor")
+        )
+        stmt = (
+            select(AuditLog)
+            .select_from(actors)
+            .join(per_actor, true())
+            .join(AuditLog, and_(AuditLog.created_at == per_actor.c.created_at, AuditLog.id == per_actor.c.id))
+        )
+    else:
+        # SQLite stores UUIDs as 32-digit hex
+        ids = select(literal_column("value")).select_from(
+            func.json_each(bindparam("actor_ids", json.dumps([actor.hex for actor in actor_ids])))
+        )
+        stmt = select(AuditLog).where(AuditLog.actor_id.in_(ids), *filters)
+    return stmt.order_by(*newest_first).limit(limit)
+
 
 class AuditLogRepository:
     """
@@ -10,25 +101,74 @@ class AuditLogRepository:
     Handles persistence for system audit logs.
     """
 
-    async def create_log(self, session: AsyncSession, log: AuditLog) -> AuditLog:
+    async def create_log(self, session: AsyncSession, log: AuditLog) -> None:
         """
-        Persist a new Audit Log entry.
+        Buffer a new Audit Log entry; the transaction's entries are written as
+        one multi-row INSERT when it commits (nothing is written on rollback).
         """
-        session.add(log)
-        await session.flush()
-        await session.refresh(log)
-        return log
+        buffer_insert(session, AuditLog.__table__, audit_log_values(log))
 
-    async def get_by_user(self, session: AsyncSession, actor_id: UUID) -> Sequence[AuditLog]:
+    async def create_logs(self, session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
         """
-        Retrieve audit logs for a specific actor (user).
+        Insert Audit Log rows (complete column values) with multi-row INSERTs.
         """
-        result = await session.execute(
-            select(AuditLog)
-            .where(AuditLog.actor_id == actor_id)
-            .order_by(AuditLog.created_at.desc())
+        for chunk in chunked(rows):
+            await session.execute(insert(AuditLog).values(chunk))
+
+    async def create_log_if_absent(self, session: AsyncSession, values: Dict[str, Any]) -> None:
+        """
+        Insert an Audit Log entry with a caller-chosen id; a replay with the
+        same id (and timestamp) is ignored (idempotent outbox delivery).
+        """
+        await session.execute(
+            dialect_insert(session, AuditLog)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[AuditLog.id, AuditLog.created_at])
         )
+
+    async def get_by_user(
+        self,
+        session: AsyncSession,
+        actor_id: UUID,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Sequence[AuditLog]:
+        """
+        Retrieve audit logs for a specific actor (user), newest first.
+        A [since, until) window on created_at limits the scan to the monthly
+        partitions it overlaps.
+        """
+        await flush_buffered(session)
+        stmt = select(AuditLog).where(AuditLog.actor_id == actor_id)
+        if since is not None:
+            stmt = stmt.where(AuditLog.created_at >= since)
+        if until is not None:
+            stmt = stmt.where(AuditLog.created_at < until)
+        result = await session.execute(stmt.order_by(AuditLog.created_at.desc()))
         return result.scalars().all()
 
+    async def search(
+        self,
+        session: AsyncSession,
+        limit: int,
+        before: Optional[Tuple[datetime, UUID]] = None,
+        actor_ids: Optional[List[UUID]] = None,
+        action: Optional[str] = None,
+        actor_role: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> List[AuditLog]:
+        """
+        One page of audit logs, newest first in (created_at, id) keyset order,
+        starting strictly after the `before` key of the previous page.
+        All filters are optional; a time window prunes partitions.
+        """
+        await flush_buffered(session)
+        stmt = search_statement(
+            session.get_bind().dialect.name, limit, before, actor_ids, action, actor_role, since, until
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
     # NOTE: get_by_entity is omitted because 'entity_type' and 'entity_id' 
     # columns do not exist in the current schema (as per strict revert instructions).
@@ -2,6 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
 from app.models.user import User, UserCredentials, AuthSession
+from app.repositories.sql_helpers import flush_returning
 
 class AuthRepository:
     """
@@ -20,10 +21,10 @@ class AuthRepository:
     async def get_user_by_id(self, session: AsyncSession, user_id: UUID) -> User | None:
         """
         Retrieve a user by their unique ID.
+        A user already loaded in this session (e.g. by get_current_user) is
+        returned from the identity map without a query.
         """
-        stmt = select(User).where(User.id == user_id)
-        result = await session.execute(stmt)
-        return result.scalars().first()
+        return await session.get(User, user_id)
 
     async def get_user_by_pan(self, session: AsyncSession, pan: str) -> User | None:
         """
@@ -37,10 +38,7 @@ class AuthRepository:
         """
         Persist a new User entity.
         """
-        session.add(user)
-        await session.flush()  # Generate ID and populate defaults
-        await session.refresh(user)
-        return user
+        return await flush_returning(session, user)
 
     async def get_credentials_by_user_id(self, session: AsyncSession, user_id: UUID) -> UserCredentials | None:
         """
@@ -62,19 +60,13 @@ class AuthRepository:
         """
         Persist new UserCredentials.
         """
-        session.add(credentials)
-        await session.flush()
-        await session.refresh(credentials)
-        return credentials
+        return await flush_returning(session, credentials)
 
     async def create_auth_session(self, session: AsyncSession, auth_session: AuthSession) -> AuthSession:
         """
         Persist a new AuthSession.
         """
-        session.add(auth_session)
-        await session.flush()
-        await session.refresh(auth_session)
-        return auth_session
+        return await flush_returning(session, auth_session)
 
     async def get_session_by_hash(self, session: AsyncSession, token_hash: str) -> AuthSession | None:
         """
@@ -2,6 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
 from app.models.business import BusinessProfile
+from app.repositories.sql_helpers import flush_returning
 
 class BusinessRepository:
     """
@@ -22,17 +23,11 @@ class BusinessRepository:
         Persist a new BusinessProfile entity.
         Warning: Caller must ensure profile doesn't already exist (1:1 constraint).
         """
-        session.add(profile)
-        await session.flush()  # Generate ID and populate defaults
-        await session.refresh(profile)
-        return profile
+        return await flush_returning(session, profile)
 
     async def update_profile(self, session: AsyncSession, profile: BusinessProfile) -> BusinessProfile:
         """
         Persist changes to an existing BusinessProfile entity.
         The entity object must be attached to the session.
         """
-        session.add(profile) # Ensure it's in the session (idempotent if already attached)
-        await session.flush()
-        await session.refresh(profile)
-        return profile
+        return await flush_returning(session, profile)
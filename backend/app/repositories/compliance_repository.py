@@ -1,9 +1,10 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, text, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.compliance import ComplianceFlag
+from app.repositories.sql_helpers import dialect_insert, flush_returning
 
 class ComplianceFlagRepository:
     """
@@ -24,10 +25,29 @@ class ComplianceFlagRepository:
             user_id=user_id,
             **flag_data
         )
-        session.add(flag)
-        await session.flush()
-        await session.refresh(flag)
-        return flag
+        return await flush_returning(session, flag)
+
+    async def create_flags_if_absent(self, session: AsyncSession, user_id: UUID, flags_data: List[Dict[str, Any]]) -> List[ComplianceFlag]:
+        """
+        Insert flags in a single multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING.
+        Rows that collide with an existing unresolved flag (uq_compliance_flags_open)
+        are skipped by the database, so concurrent evaluations cannot duplicate flags.
+        Returns only the flags that were actually created.
+        """
+        if not flags_data:
+            return []
+
+        stmt = (
+            dialect_insert(session, ComplianceFlag)
+            .values([{"user_id": user_id, **flag_data} for flag_data in flags_data])
+            .on_conflict_do_nothing(
+                index_elements=["user_id", "financial_year", "flag_code"],
+                index_where=text("NOT is_resolved")
+            )
+            .returning(ComplianceFlag)
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
 
     async def get_by_user_id(self, session: AsyncSession, user_id: UUID) -> List[ComplianceFlag]:
         """
@@ -48,6 +68,23 @@ class ComplianceFlagRepository:
         result = await session.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_flags_state(self, session: AsyncSession, user_id: UUID, financial_year: Optional[str] = None) -> Tuple[Any, ...]:
+        """
+        Cheap aggregate that changes whenever the user's flag list changes:
+        (flag count, latest created_at, resolved count, latest resolved_at).
+        Flags are only ever inserted or resolved, never edited otherwise.
+        """
+        stmt = select(
+            func.count(ComplianceFlag.id),
+            func.max(ComplianceFlag.created_at),
+            func.count(ComplianceFlag.resolved_at),
+            func.max(ComplianceFlag.resolved_at)
+        ).where(ComplianceFlag.user_id == user_id)
+        if financial_year:
+            stmt = stmt.where(ComplianceFlag.financial_year == financial_year)
+        result = await session.execute(stmt)
+        return tuple(result.one())
+
     async def get_by_id(self, session: AsyncSession, flag_id: UUID) -> Optional[ComplianceFlag]:
         """
         Retrieve a specific compliance flag by ID.
@@ -73,6 +110,5 @@ class ComplianceFlagRepository:
                 flag.resolution_notes = notes
             
             await session.flush()
-            await session.refresh(flag)
             
         return flag
@@ -3,6 +3,7 @@ from uuid import UUID
 from sqlalchemy import select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.filing import UserConfirmation
+from app.repositories.sql_helpers import flush_returning
 
 class ConfirmationRepository:
     """
@@ -13,10 +14,7 @@ class ConfirmationRepository:
         """
         Creates a new confirmation record.
         """
-        session.add(confirmation)
-        await session.flush()
-        await session.refresh(confirmation)
-        return confirmation
+        return await flush_returning(session, confirmation)
 
     async def get_latest_by_filing(self, session: AsyncSession, filing_id: UUID) -> Optional[UserConfirmation]:
         """
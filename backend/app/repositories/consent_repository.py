@@ -1,18 +1,22 @@
-from typing import List, Optional
-from uuid import UUID
-from sqlalchemy import select
+from typing import List, Optional, Tuple, Any
+from uuid import UUID, uuid4
+from datetime import datetime, timezone
+from sqlalchemy import select, func, not_
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.consent import ConsentArtifact, CAAssignment, ConsentAuditLog
+from app.models.filing import FilingCase
+from app.models.itr import ITRDetermination
+from app.models.compliance import ComplianceFlag
+from app.models.user import User
+from app.repositories.write_buffer import buffer_insert, flush_buffered
+from app.repositories.sql_helpers import flush_returning
 
 class ConsentRepository:
     """
     Repository for Consent Artifacts.
     """
     async def create_consent(self, session: AsyncSession, consent: ConsentArtifact) -> ConsentArtifact:
-        session.add(consent)
-        await session.flush()
-        await session.refresh(consent)
-        return consent
+        return await flush_returning(session, consent)
 
     async def get_by_id(self, session: AsyncSession, consent_id: UUID) -> Optional[ConsentArtifact]:
         result = await session.execute(
@@ -37,10 +41,7 @@ class CAAssignmentRepository:
     Repository for CA Assignments.
     """
     async def create_assignment(self, session: AsyncSession, assignment: CAAssignment) -> CAAssignment:
-        session.add(assignment)
-        await session.flush()
-        await session.refresh(assignment)
-        return assignment
+        return await flush_returning(session, assignment)
 
     async def get_by_filing_id(self, session: AsyncSession, filing_id: UUID) -> Optional[CAAssignment]:
         result = await session.execute(
@@ -48,12 +49,186 @@ class CAAssignmentRepository:
         )
         return result.scalars().first()
 
+    async def get_access_by_filing_id(self, session: AsyncSession, filing_id: UUID) -> Optional[Any]:
+        """
+        A filing's assignment with its consent's status and expiry, in one
+        joined query. consent_status and consent_expiry_at are None if the
+        consent row is missing.
+        """
+        result = await session.execute(
+            select(
+                CAAssignment,
+                ConsentArtifact.status.label("consent_status"),
+                ConsentArtifact.expiry_at.label("consent_expiry_at")
+            )
+            .outerjoin(ConsentArtifact, ConsentArtifact.id == CAAssignment.consent_id)
+            .where(CAAssignment.filing_id == filing_id)
+        )
+        return result.first()
+
+    async def get_assignment_checks(
+        self,
+        session: AsyncSession,
+        filing_id: UUID,
+        ca_user_id: UUID,
+        consent_id: UUID
+    ) -> Any:
+        """
+        Everything assign_ca validates, in one round trip: the filing's owner
+        and state, the CA user's role, the consent's owner, status and expiry,
+        and whether the filing already has an active assignment.
+        One CTE per lookup, each read back as a scalar subquery, so a missing
+        filing, user or consent yields NULL columns rather than no row.
+        """
+        filing = (
+            select(FilingCase.user_id, FilingCase.current_state)
+            .where(FilingCase.id == filing_id)
+            .cte("filing")
+        )
+        ca_user = select(User.primary_role).where(User.id == ca_user_id).cte("ca_user")
+        consent = (
+            select(ConsentArtifact.user_id, ConsentArtifact.status, ConsentArtifact.expiry_at)
+            .where(ConsentArtifact.id == consent_id)
+            .cte("consent")
+        )
+        active_assignment = (
+            select(CAAssignment.id)
+            .where(CAAssignment.filing_id == filing_id, CAAssignment.status == "ACTIVE")
+            .cte("active_assignment")
+        )
+        result = await session.execute(
+            select(
+                select(filing.c.user_id).scalar_subquery().label("filing_user_id"),
+                select(filing.c.current_state).scalar_subquery().label("filing_state"),
+                select(ca_user.c.primary_role).scalar_subquery().label("ca_role"),
+                select(consent.c.user_id).scalar_subquery().label("consent_user_id"),
+                select(consent.c.status).scalar_subquery().label("consent_status"),
+                select(consent.c.expiry_at).scalar_subquery().label("consent_expiry_at"),
+                select(active_assignment).exists().label("has_active_assignment")
+            )
+        )
+        return result.one()
+
     async def get_by_ca_user(self, session: AsyncSession, ca_user_id: UUID) -> List[CAAssignment]:
         result = await session.execute(
             select(CAAssignment).where(CAAssignment.ca_user_id == ca_user_id)
         )
         return list(result.scalars().all())
 
+    async def get_accessible_client_ids(
+        self,
+        session: AsyncSession,
+        ca_user_id: UUID,
+        as_of: datetime,
+        financial_year: Optional[str] = None
+    ) -> List[UUID]:
+        """
+        Distinct taxpayers with at least one active assignment to the CA
+        backed by an active, unexpired consent; with financial_year, only
+        assignments to that year's filings count.
+        """
+        stmt = (
+            select(FilingCase.user_id)
+            .select_from(CAAssignment)
+            .join(FilingCase, FilingCase.id == CAAssignment.filing_id)
+            .join(ConsentArtifact, ConsentArtifact.id == CAAssignment.consent_id)
+            .where(
+                CAAssignment.ca_user_id == ca_user_id,
+                CAAssignment.status == "ACTIVE",
+                ConsentArtifact.status == "ACTIVE",
+                ConsentArtifact.expiry_at > as_of
+            )
+            .distinct()
+        )
+        if financial_year is not None:
+            stmt = stmt.where(FilingCase.financial_year == financial_year)
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_portfolio(
+        self,
+        session: AsyncSession,
+        ca_user_id: UUID,
+        as_of: datetime,
+        limit: int,
+        offset: int
+    ) -> Tuple[List[Any], int]:
+        """
+        One page of a CA's actively assigned filings (active assignment, active and
+        unexpired consent) with client name, state, ITR type, open-flag count and
+        consent expiry, plus the total row count.
+        Single query; the total comes from a COUNT(*) OVER () window. Open
+        flags are counted per row of the page only (correlated subquery on the
+        uq_compliance_flags_open partial index), never across all flags.
+        """
+        filters = (
+            CAAssignment.ca_user_id == ca_user_id,
+            CAAssignment.status == "ACTIVE",
+            ConsentArtifact.status == "ACTIVE",
+            ConsentArtifact.expiry_at > as_of
+        )
+        page = (
+            select(
+                FilingCase.id.label("filing_id"),
+                FilingCase.user_id.label("client_id"),
+                User.legal_name.label("client_name"),
+                FilingCase.financial_year,
+                FilingCase.current_state,
+                ITRDetermination.itr_type,
+                ConsentArtifact.expiry_at.label("consent_expiry_at"),
+                CAAssignment.assigned_at,
+                func.count().over().label("total")
+            )
+            .select_from(CAAssignment)
+            .join(FilingCase, FilingCase.id == CAAssignment.filing_id)
+            .join(ConsentArtifact, ConsentArtifact.id == CAAssignment.consent_id)
+            .join(User, User.id == FilingCase.user_id)
+            .join(ITRDetermination, ITRDetermination.id == FilingCase.itr_determination_id)
+            .where(*filters)
+            .order_by(CAAssignment.assigned_at.desc(), FilingCase.id)
+            .limit(limit)
+            .offset(offset)
+            .subquery("page")
+        )
+        open_flag_count = (
+            select(func.count())
+            .where(
+                ComplianceFlag.user_id == page.c.client_id,
+                ComplianceFlag.financial_year == page.c.financial_year,
+                not_(ComplianceFlag.is_resolved)
+            )
+            .scalar_subquery()
+        )
+        stmt = (
+            select(
+                page.c.filing_id,
+                page.c.client_id,
+                page.c.client_name,
+                page.c.financial_year,
+                page.c.current_state,
+                page.c.itr_type,
+                open_flag_count.label("open_flag_count"),
+                page.c.consent_expiry_at,
+                page.c.assigned_at,
+                page.c.total
+            )
+            .order_by(page.c.assigned_at.desc(), page.c.filing_id)
+        )
+        rows = list((await session.execute(stmt)).all())
+        if rows:
+            return rows, rows[0].total
+        if offset == 0:
+            return rows, 0
+
+        # Page past the end: the window total is unavailable, count separately
+        total = await session.execute(
+            select(func.count())
+            .select_from(CAAssignment)
+            .join(ConsentArtifact, ConsentArtifact.id == CAAssignment.consent_id)
+            .where(*filters)
+        )
+        return rows, int(total.scalar())
+
     async def update_status(self, session: AsyncSession, assignment_id: UUID, new_status: str) -> None:
         # Fetch directly to update
         result = await session.execute(
@@ -68,13 +243,22 @@ class ConsentAuditRepository:
     """
     Repository for Consent Audit Logs.
     """
-    async def create_log(self, session: AsyncSession, log: ConsentAuditLog) -> ConsentAuditLog:
-        session.add(log)
-        await session.flush()
-        await session.refresh(log)
-        return log
+    async def create_log(self, session: AsyncSession, log: ConsentAuditLog) -> None:
+        """
+        Buffer a consent audit entry; written with the transaction's other
+        buffered rows as one multi-row INSERT at commit.
+        """
+        buffer_insert(session, ConsentAuditLog.__table__, {
+            "id": log.id or uuid4(),
+            "consent_id": log.consent_id,
+            "action": log.action,
+            "actor_id": log.actor_id,
+            "reason": log.reason,
+            "created_at": log.created_at or datetime.now(timezone.utc)
+        })
 
     async def get_by_consent(self, session: AsyncSession, consent_id: UUID) -> List[ConsentAuditLog]:
+        await flush_buffered(session)
         result = await session.execute(
             select(ConsentAuditLog).where(ConsentAuditLog.consent_id == consent_id).order_by(ConsentAuditLog.created_at)
         )
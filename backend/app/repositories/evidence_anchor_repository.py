@@ -0,0 +1,67 @@
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.evidence import EvidenceAnchor, EvidenceMerkleNode
+
+class EvidenceAnchorRepository:
+    """
+    Repository for Merkle anchors of evidence records.
+    Pure Data Access Layer. Transaction management is handled by the caller.
+    """
+
+    # Rows per multi-row INSERT when persisting tree nodes
+    INSERT_CHUNK_SIZE = 5000
+
+    async def get_latest_anchor(self, session: AsyncSession) -> Optional[EvidenceAnchor]:
+        """
+        Most recent anchor (head of the chain).
+        """
+        result = await session.execute(
+            select(EvidenceAnchor).order_by(EvidenceAnchor.sequence.desc()).limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_anchor(self, session: AsyncSession, sequence: int) -> Optional[EvidenceAnchor]:
+        return await session.get(EvidenceAnchor, sequence)
+
+    async def create_anchor(
+        self, session: AsyncSession, anchor: EvidenceAnchor, nodes: List[Dict[str, Any]]
+    ) -> EvidenceAnchor:
+        """
+        Persist an anchor and all of its tree nodes.
+        """
+        session.add(anchor)
+        await session.flush()
+        for i in range(0, len(nodes), self.INSERT_CHUNK_SIZE):
+            await session.execute(insert(EvidenceMerkleNode), nodes[i:i + self.INSERT_CHUNK_SIZE])
+        return anchor
+
+    async def get_leaf(self, session: AsyncSession, record_id: UUID) -> Optional[EvidenceMerkleNode]:
+        """
+        Leaf node of an anchored record (None if not anchored yet).
+        """
+        result = await session.execute(
+            select(EvidenceMerkleNode).where(EvidenceMerkleNode.record_id == record_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_nodes(
+        self, session: AsyncSession, anchor_sequence: int, positions: List[Tuple[int, int]]
+    ) -> Dict[Tuple[int, int], str]:
+        """
+        Hashes of the given (level, position) nodes of one tree, in a single query.
+        """
+        if not positions:
+            return {}
+        result = await session.execute(
+            select(EvidenceMerkleNode.level, EvidenceMerkleNode.position, EvidenceMerkleNode.hash)
+            .where(
+                EvidenceMerkleNode.anchor_sequence == anchor_sequence,
+                or_(*[
+                    and_(EvidenceMerkleNode.level == level, EvidenceMerkleNode.position == position)
+                    for level, position in positions
+                ])
+            )
+        )
+        return {(row.level, row.position): row.hash for row in result}
@@ -1,8 +1,13 @@
-from typing import Optional
+from collections import defaultdict
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import delete, exists, func, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.evidence import EvidenceRecord
+from app.models.evidence import (
+    EvidenceRecord, EvidenceBlob, EvidenceVerificationCheckpoint, EvidenceCompressionDictionary, EvidenceMerkleNode
+)
+from app.repositories.sql_helpers import dialect_insert, flush_returning
 
 class EvidenceRepository:
     """
@@ -15,10 +20,7 @@ class EvidenceRepository:
         Persist a new Evidence Record.
         Transaction management is handled by the caller.
         """
-        session.add(evidence)
-        await session.flush()
-        await session.refresh(evidence)
-        return evidence
+        return await flush_returning(session, evidence)
 
     async def get_by_id(self, session: AsyncSession, evidence_id: UUID) -> Optional[EvidenceRecord]:
         """
@@ -37,3 +39,226 @@ class EvidenceRepository:
             select(EvidenceRecord).where(EvidenceRecord.related_action == action_urn)
         )
         return result.scalars().first()
+
+    async def acquire_blob(self, session: AsyncSession, file_hash: str, storage_location: str) -> Tuple[str, int]:
+        """
+        Add a reference to the blob with this hash, registering it on first use.
+        Single upsert: returns (storage_location of the blob, new ref_count);
+        a ref_count of 1 means the blob is new and still has to be written.
+        """
+        stmt = dialect_insert(session, EvidenceBlob).values(
+            hash=file_hash,
+            storage_location=storage_location,
+            ref_count=1
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EvidenceBlob.hash],
+            set_={"ref_count": EvidenceBlob.ref_count + 1}
+        ).returning(EvidenceBlob.storage_location, EvidenceBlob.ref_count)
+        row = (await session.execute(stmt)).one()
+        return row[0], row[1]
+
+    async def stream_hashes(self, session: AsyncSession, chunk_size: int = 10000) -> AsyncIterator[str]:
+        """
+        Stream every distinct evidence hash (for warming in-memory indexes).
+        """
+        result = await session.stream_scalars(
+            select(EvidenceRecord.hash).distinct().execution_options(yield_per=chunk_size)
+        )
+        async for file_hash in result:
+            yield file_hash
+
+    async def get_records_after(
+        self,
+        session: AsyncSession,
+        after: Optional[Tuple[datetime, UUID]],
+        created_before: datetime,
+        limit: int
+    ) -> List[EvidenceRecord]:
+        """
+        Next page of records in (created_at, id) keyset order.
+        """
+        stmt = select(EvidenceRecord).where(EvidenceRecord.created_at < created_before)
+        if after is not None:
+            stmt = stmt.where(tuple_(EvidenceRecord.created_at, EvidenceRecord.id) > tuple_(*after))
+        stmt = stmt.order_by(EvidenceRecord.created_at, EvidenceRecord.id).limit(limit)
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_unanchored_behind(
+        self,
+        session: AsyncSession,
+        upto: Tuple[datetime, UUID],
+        created_since: datetime,
+        limit: int
+    ) -> List[EvidenceRecord]:
+        """
+        Records at or before the `upto` key, created since created_since, that
+        have no Merkle leaf, in (created_at, id) order: rows whose transaction
+        committed after the anchor cursor had already passed them.
+        """
+        result = await session.execute(
+            select(EvidenceRecord)
+            .where(
+                tuple_(EvidenceRecord.created_at, EvidenceRecord.id) <= tuple_(*upto),
+                EvidenceRecord.created_at >= created_since,
+                ~exists().where(EvidenceMerkleNode.record_id == EvidenceRecord.id)
+            )
+            .order_by(EvidenceRecord.created_at, EvidenceRecord.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_verification_checkpoint(
+        self, session: AsyncSession, job_name: str
+    ) -> Optional[EvidenceVerificationCheckpoint]:
+        """
+        Retrieve a verification job's checkpoint.
+        """
+        return await session.get(EvidenceVerificationCheckpoint, job_name, populate_existing=True)
+
+    async def save_verification_checkpoint(
+        self,
+        session: AsyncSession,
+        job_name: str,
+        last_created_at: datetime,
+        last_record_id: UUID,
+        verified: int
+    ) -> None:
+        """
+        Advance a verification job's checkpoint (upsert).
+        """
+        stmt = dialect_insert(session, EvidenceVerificationCheckpoint).values(
+            job_name=job_name,
+            last_created_at=last_created_at,
+            last_record_id=last_record_id,
+            verified_count=verified
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EvidenceVerificationCheckpoint.job_name],
+            set_={
+                "last_created_at": stmt.excluded.last_created_at,
+                "last_record_id": stmt.excluded.last_record_id,
+                "verified_count": EvidenceVerificationCheckpoint.verified_count + verified,
+                "updated_at": func.now()
+            }
+        )
+        await session.execute(stmt)
+
+    async def get_recent_by_action_type(
+        self, session: AsyncSession, entity: str, action: str, limit: int
+    ) -> List[EvidenceRecord]:
+        """
+        Most recent records whose URN matches urn:{entity}:*:{action}.
+        """
+        result = await session.execute(
+            select(EvidenceRecord)
+            .where(EvidenceRecord.related_action.like(f"urn:{entity}:%:{action}"))
+            .order_by(EvidenceRecord.created_at.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def create_dictionary(
+        self, session: AsyncSession, dictionary: EvidenceCompressionDictionary
+    ) -> EvidenceCompressionDictionary:
+        """
+        Persist a compression dictionary (ids are content hashes; re-adding one is a no-op).
+        """
+        existing = await session.get(EvidenceCompressionDictionary, dictionary.id)
+        if existing:
+            return existing
+        session.add(dictionary)
+        await session.flush()
+        return dictionary
+
+    async def get_dictionaries(self, session: AsyncSession) -> List[EvidenceCompressionDictionary]:
+        """
+        All compression dictionaries, oldest first.
+        """
+        result = await session.execute(
+            select(EvidenceCompressionDictionary).order_by(EvidenceCompressionDictionary.created_at)
+        )
+        return list(result.scalars().all())
+
+    async def get_expired_records(self, session: AsyncSession, as_of: date, limit: int) -> List[EvidenceRecord]:
+        """
+        Oldest records whose retention expired on or before as_of, in
+        (retention_expiry, id) order. Rows are locked for the caller's
+        transaction; rows locked by a concurrent purge are skipped.
+        """
+        result = await session.execute(
+            select(EvidenceRecord)
+            .where(EvidenceRecord.retention_expiry <= as_of)
+            .order_by(EvidenceRecord.retention_expiry, EvidenceRecord.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    async def delete_records(self, session: AsyncSession, evidence_ids: List[UUID]) -> int:
+        """
+        Delete evidence records by id. Returns the number deleted.
+        """
+        result = await session.execute(
+            delete(EvidenceRecord).where(EvidenceRecord.id.in_(evidence_ids))
+        )
+        return result.rowcount
+
+    async def release_blobs(self, session: AsyncSession, released: Dict[str, int]) -> None:
+        """
+        Drop references to blobs (hash -> number of references released).
+        One UPDATE per distinct release count, so a typical batch costs one or two
+        statements. Unreferenced blobs keep their row until their bytes are deleted.
+        """
+        by_count: Dict[int, List[str]] = defaultdict(list)
+        for file_hash, count in released.items():
+            by_count[count].append(file_hash)
+        for count, hashes in by_count.items():
+            await session.execute(
+                update(EvidenceBlob)
+                .where(EvidenceBlob.hash.in_(hashes))
+                .values(ref_count=EvidenceBlob.ref_count - count)
+                .execution_options(synchronize_session=False)
+            )
+
+    async def get_unreferenced_blobs(self, session: AsyncSession, limit: int) -> List[EvidenceBlob]:
+        """
+        Blobs no record references any more, locked for the caller's transaction
+        (a concurrent capture of the same content waits for it to finish).
+        """
+        result = await session.execute(
+            select(EvidenceBlob)
+            .where(EvidenceBlob.ref_count <= 0)
+            .order_by(EvidenceBlob.hash)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    async def delete_blobs(self, session: AsyncSession, hashes: List[str]) -> int:
+        """
+        Unregister unreferenced blobs. Returns the number deleted.
+        """
+        result = await session.execute(
+            delete(EvidenceBlob).where(EvidenceBlob.hash.in_(hashes), EvidenceBlob.ref_count <= 0)
+        )
+        return result.rowcount
+
+    async def get_referenced_locations(
+        self, session: AsyncSession, hashes: List[str], locations: List[str]
+    ) -> Set[str]:
+        """
+        Which of these storage locations (of blobs with these hashes) are still
+        referenced by an evidence record or a registered blob.
+        """
+        records = await session.execute(
+            select(EvidenceRecord.storage_location)
+            .where(EvidenceRecord.hash.in_(hashes), EvidenceRecord.storage_location.in_(locations))
+            .distinct()
+        )
+        blobs = await session.execute(
+            select(EvidenceBlob.storage_location)
+            .where(EvidenceBlob.hash.in_(hashes), EvidenceBlob.storage_location.in_(locations))
+        )
+        return set(records.scalars().all()) | set(blobs.scalars().all())
@@ -1,8 +1,10 @@
 from uuid import UUID
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from app.models.consent import CAAssignment
 from app.models.filing import FilingCase
+from app.repositories.sql_helpers import flush_returning
 
 class FilingCaseRepository:
     """
@@ -11,10 +13,16 @@ class FilingCaseRepository:
     Strictly no business logic.
     """
 
-    async def get_by_id(self, session: AsyncSession, filing_id: UUID) -> Optional[FilingCase]:
-        result = await session.execute(
-            select(FilingCase).where(FilingCase.id == filing_id)
-        )
+    async def get_by_id(self, session: AsyncSession, filing_id: UUID, populate_existing: bool = False) -> Optional[FilingCase]:
+        """
+        Retrieve a Filing Case by ID.
+        populate_existing overwrites an already-loaded instance with the database row
+        (used to re-read after losing an optimistic update).
+        """
+        stmt = select(FilingCase).where(FilingCase.id == filing_id)
+        if populate_existing:
+            stmt = stmt.execution_options(populate_existing=True)
+        result = await session.execute(stmt)
         return result.scalars().first()
 
     async def get_by_user_and_year(self, session: AsyncSession, user_id: UUID, financial_year: str) -> Optional[FilingCase]:
@@ -29,14 +37,73 @@ class FilingCaseRepository:
         )
         return result.scalars().first()
 
+    async def get_state_by_user_and_year(self, session: AsyncSession, user_id: UUID, financial_year: str) -> Optional[Tuple[Any, ...]]:
+        """
+        Columns that change whenever the case changes (id, version); None if absent.
+        """
+        result = await session.execute(
+            select(FilingCase.id, FilingCase.version).where(
+                FilingCase.user_id == user_id,
+                FilingCase.financial_year == financial_year
+            )
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
+    async def get_assigned_to_ca(self, session: AsyncSession, ca_user_id: UUID, financial_year: str) -> Optional[FilingCase]:
+        """
+        A Filing Case actively assigned to a CA for a financial year.
+        """
+        result = await session.execute(
+            select(FilingCase).join(CAAssignment, CAAssignment.filing_id == FilingCase.id).where(
+                CAAssignment.ca_user_id == ca_user_id,
+                FilingCase.financial_year == financial_year,
+                CAAssignment.status == "ACTIVE"
+            )
+        )
+        return result.scalars().first()
+
+    async def get_assigned_state(self, session: AsyncSession, ca_user_id: UUID, financial_year: str) -> Optional[Tuple[Any, ...]]:
+        """
+        (id, version) of the case get_assigned_to_ca returns; None if absent.
+        """
+        result = await session.execute(
+            select(FilingCase.id, FilingCase.version).join(CAAssignment, CAAssignment.filing_id == FilingCase.id).where(
+                CAAssignment.ca_user_id == ca_user_id,
+                FilingCase.financial_year == financial_year,
+                CAAssignment.status == "ACTIVE"
+            )
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
     async def create_case(self, session: AsyncSession, filing_case: FilingCase) -> FilingCase:
         """
         Persist a new Filing Case.
         """
-        session.add(filing_case)
-        await session.flush()
-        await session.refresh(filing_case)
-        return filing_case
+        return await flush_returning(session, filing_case)
+
+    async def update_case_if_version(
+        self,
+        session: AsyncSession,
+        filing_id: UUID,
+        expected_version: int,
+        updated_data: Dict[str, Any]
+    ) -> Optional[FilingCase]:
+        """
+        Compare-and-set update: applies updated_data and increments version only if
+        the row still has expected_version. One UPDATE ... RETURNING statement.
+        Returns the updated case, or None if the version moved on (or the row is gone).
+        """
+        stmt = (
+            update(FilingCase)
+            .where(FilingCase.id == filing_id, FilingCase.version == expected_version)
+            .values(**updated_data, version=FilingCase.version + 1)
+            .returning(FilingCase)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().first()
 
     async def update_case(self, session: AsyncSession, filing_case: FilingCase, updated_data: Dict[str, Any]) -> FilingCase:
         """
@@ -46,5 +113,4 @@ class FilingCaseRepository:
             setattr(filing_case, field, value)
         
         await session.flush()
-        await session.refresh(filing_case)
         return filing_case
@@ -1,8 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func, case, and_, BigInteger
 from uuid import UUID
-from typing import List, Dict, Any
-from app.models.financials import FinancialEntry
+from typing import List, Dict, Any, Iterable, Sequence, Tuple
+from app.models.financials import FinancialEntry, LedgerVersion
+from app.engines.ledger_snapshot import LedgerSnapshot
+from app.repositories.sql_helpers import dialect_insert, flush_returning
 
 class FinancialEntryRepository:
     """
@@ -16,11 +18,39 @@ class FinancialEntryRepository:
         entry_data: Dictionary containing fields like entry_type, amount, category, etc.
         """
         entry = FinancialEntry(user_id=user_id, **entry_data)
-        session.add(entry)
-        await session.flush()
-        await session.refresh(entry)
+        await flush_returning(session, entry)
+        await self.bump_ledger_version(session, user_id, entry.financial_year)
         return entry
 
+    async def bump_ledger_version(self, session: AsyncSession, user_id: UUID, financial_year: str) -> int:
+        """
+        Increment the (user, FY) ledger version in one upsert and return the new value.
+        Runs in the caller's transaction, so the bump commits or rolls back with the write.
+        """
+        stmt = dialect_insert(session, LedgerVersion).values(
+            user_id=user_id,
+            financial_year=financial_year,
+            version=1
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LedgerVersion.user_id, LedgerVersion.financial_year],
+            set_={"version": LedgerVersion.version + 1, "updated_at": func.now()}
+        ).returning(LedgerVersion.version)
+        result = await session.execute(stmt)
+        return result.scalar_one()
+
+    async def get_ledger_version(self, session: AsyncSession, user_id: UUID, financial_year: str) -> int:
+        """
+        Current ledger version for a user and financial year (0 if never written).
+        """
+        result = await session.execute(
+            select(LedgerVersion.version).where(
+                LedgerVersion.user_id == user_id,
+                LedgerVersion.financial_year == financial_year
+            )
+        )
+        return result.scalar() or 0
+
     async def get_by_user_id(self, session: AsyncSession, user_id: UUID) -> List[FinancialEntry]:
         """
         Retrieve all financial entries for a specific user, ordered by date descending.
@@ -53,6 +83,107 @@ class FinancialEntryRepository:
         result = await session.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_ledger_snapshot(self, session: AsyncSession, user_id: UUID, financial_year: str) -> LedgerSnapshot:
+        """
+        Build a columnar LedgerSnapshot for a user and financial year.
+        Core query (no ORM objects); amounts are converted to integer paise in SQL.
+        """
+        stmt = select(
+            FinancialEntry.entry_type,
+            FinancialEntry.category,
+            func.round(FinancialEntry.amount * 100).cast(BigInteger),
+            FinancialEntry.entry_date
+        ).where(
+            FinancialEntry.user_id == user_id,
+            FinancialEntry.financial_year == financial_year
+        )
+        result = await session.execute(stmt)
+        return LedgerSnapshot.from_rows(result.all())
+
+    async def get_total_ledger_version(self, session: AsyncSession, user_id: UUID) -> int:
+        """
+        Sum of a user's ledger versions across all financial years.
+        Monotonic (every write bumps one counter), so it validates the full ledger.
+        """
+        result = await session.execute(
+            select(func.coalesce(func.sum(LedgerVersion.version), 0)).where(LedgerVersion.user_id == user_id)
+        )
+        return int(result.scalar())
+
+    async def get_income_sources(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        financial_year: str,
+        business_categories: Iterable[str],
+        salary_categories: Iterable[str]
+    ) -> Tuple[bool, bool, bool]:
+        """
+        Classify INCOME entries for a user and financial year in one aggregate query.
+        Returns (has_business_income, has_salary_income, has_other_income).
+        Categories are compared trimmed and upper-cased.
+        MAX(CASE ...) is used as a portable bool_or.
+        """
+        category = func.upper(func.trim(FinancialEntry.category))
+        business = list(business_categories)
+        salary = list(salary_categories)
+
+        stmt = select(
+            func.max(case((category.in_(business), 1), else_=0)),
+            func.max(case((category.in_(salary), 1), else_=0)),
+            func.max(case((category.in_(business + salary), 0), else_=1))
+        ).where(
+            FinancialEntry.user_id == user_id,
+            FinancialEntry.financial_year == financial_year,
+            FinancialEntry.entry_type == "INCOME"
+        )
+        row = (await session.execute(stmt)).one()
+        return bool(row[0]), bool(row[1]), bool(row[2])
+
+    async def get_income_sources_batch(
+        self,
+        session: AsyncSession,
+        user_ids: Sequence[UUID],
+        financial_year: str,
+        business_categories: Iterable[str],
+        salary_categories: Iterable[str]
+    ) -> Dict[UUID, Tuple[int, bool, bool, bool]]:
+        """
+        Batch form of get_income_sources plus the ledger version, in one grouped query.
+        Returns {user_id: (ledger_version, has_business, has_salary, has_other)};
+        users without ledger writes for the year are absent (version 0, no income).
+        """
+        category = func.upper(func.trim(FinancialEntry.category))
+        business = list(business_categories)
+        salary = list(salary_categories)
+
+        stmt = (
+            select(
+                LedgerVersion.user_id,
+                LedgerVersion.version,
+                func.max(case((category.in_(business), 1), else_=0)),
+                func.max(case((category.in_(salary), 1), else_=0)),
+                func.max(case((category.in_(business + salary), 0), else_=1))
+            )
+            .select_from(LedgerVersion)
+            .outerjoin(FinancialEntry, and_(
+                FinancialEntry.user_id == LedgerVersion.user_id,
+                FinancialEntry.financial_year == LedgerVersion.financial_year,
+                FinancialEntry.entry_type == "INCOME"
+            ))
+            .where(
+                LedgerVersion.user_id.in_(user_ids),
+                LedgerVersion.financial_year == financial_year
+            )
+            .group_by(LedgerVersion.user_id, LedgerVersion.version)
+        )
+        result = await session.execute(stmt)
+        # MAX over an all-NULL group (no income rows) is NULL -> False
+        return {
+            row[0]: (int(row[1]), bool(row[2]), bool(row[3]), bool(row[4]))
+            for row in result.all()
+        }
+
     async def get_by_id(self, session: AsyncSession, entry_id: UUID) -> FinancialEntry | None:
         """
         Retrieve a financial entry by its ID.
@@ -66,6 +197,15 @@ class FinancialEntryRepository:
         Delete a financial entry by its ID.
         Returns True if a record was deleted, False otherwise.
         """
-        stmt = delete(FinancialEntry).where(FinancialEntry.id == entry_id)
+        stmt = (
+            delete(FinancialEntry)
+            .where(FinancialEntry.id == entry_id)
+            .returning(FinancialEntry.user_id, FinancialEntry.financial_year)
+        )
         result = await session.execute(stmt)
-        return result.rowcount > 0
+        deleted = result.first()
+        if deleted is None:
+            return False
+
+        await self.bump_ledger_version(session, deleted.user_id, deleted.financial_year)
+        return True
@@ -1,8 +1,10 @@
 from uuid import UUID
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, not_
 from app.models.itr import ITRDetermination
+from app.models.financials import LedgerVersion
+from app.repositories.sql_helpers import dialect_insert, flush_returning
 
 class ITRDeterminationRepository:
     """
@@ -32,14 +34,99 @@ class ITRDeterminationRepository:
         )
         return result.scalars().first()
 
+    async def get_state(self, session: AsyncSession, user_id: UUID, financial_year: str) -> Optional[Tuple[Any, ...]]:
+        """
+        Columns that change whenever the determination changes
+        (id, ledger_version, determined_at, is_locked); None if absent.
+        """
+        result = await session.execute(
+            select(
+                ITRDetermination.id,
+                ITRDetermination.ledger_version,
+                ITRDetermination.determined_at,
+                ITRDetermination.is_locked
+            ).where(
+                ITRDetermination.user_id == user_id,
+                ITRDetermination.financial_year == financial_year
+            )
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
+    async def get_with_ledger_version(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        financial_year: str
+    ) -> Optional[Tuple[ITRDetermination, int]]:
+        """
+        Retrieve the determination together with the current ledger version
+        for the same (user, FY) in a single query.
+        Returns None if no determination exists yet.
+        """
+        current_version = (
+            select(LedgerVersion.version)
+            .where(
+                LedgerVersion.user_id == user_id,
+                LedgerVersion.financial_year == financial_year
+            )
+            .scalar_subquery()
+        )
+        result = await session.execute(
+            select(ITRDetermination, func.coalesce(current_version, 0)).where(
+                ITRDetermination.user_id == user_id,
+                ITRDetermination.financial_year == financial_year
+            )
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return row[0], row[1]
+
+    async def get_memo_batch(
+        self,
+        session: AsyncSession,
+        user_ids: Sequence[UUID],
+        financial_year: str
+    ) -> Dict[UUID, Tuple[bool, Optional[int]]]:
+        """
+        (is_locked, ledger_version) of existing determinations for many users.
+        """
+        result = await session.execute(
+            select(ITRDetermination.user_id, ITRDetermination.is_locked, ITRDetermination.ledger_version).where(
+                ITRDetermination.user_id.in_(user_ids),
+                ITRDetermination.financial_year == financial_year
+            )
+        )
+        return {row[0]: (row[1], row[2]) for row in result.all()}
+
+    async def upsert_determinations(self, session: AsyncSession, rows: List[Dict[str, Any]]) -> List[UUID]:
+        """
+        Insert or refresh many determinations in one statement.
+        Locked determinations are never overwritten (conflict update is filtered).
+        Returns the user_ids of the rows written.
+        """
+        if not rows:
+            return []
+        stmt = dialect_insert(session, ITRDetermination).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ITRDetermination.user_id, ITRDetermination.financial_year],
+            set_={
+                "itr_type": stmt.excluded.itr_type,
+                "reason": stmt.excluded.reason,
+                "determined_at": stmt.excluded.determined_at,
+                "ledger_version": stmt.excluded.ledger_version
+            },
+            where=not_(ITRDetermination.is_locked)
+        ).returning(ITRDetermination.user_id)
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
     async def create_determination(self, session: AsyncSession, determination: ITRDetermination) -> ITRDetermination:
         """
         Persist a new ITR determination.
         """
-        session.add(determination)
-        await session.flush()
-        await session.refresh(determination)
-        return determination
+        return await flush_returning(session, determination)
 
     async def update_determination(self, session: AsyncSession, determination: ITRDetermination, updated_data: Dict[str, Any]) -> ITRDetermination:
         """
@@ -49,5 +136,4 @@ class ITRDeterminationRepository:
             setattr(determination, field, value)
         
         await session.flush()
-        await session.refresh(determination)
         return determination
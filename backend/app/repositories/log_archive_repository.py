@@ -0,0 +1,82 @@
+from datetime import datetime
+from typing import List, Optional, Type, Union
+from uuid import UUID
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.archive import LogArchiveSegment
+from app.models.audit import AuditLog
+from app.models.consent import ConsentAuditLog
+from app.repositories.write_buffer import flush_buffered
+
+ArchivableLog = Union[Type[AuditLog], Type[ConsentAuditLog]]
+
+
+class LogArchiveRepository:
+    """
+    Repository for archiving append-only log tables and the segment manifest.
+    """
+
+    async def get_oldest_before(
+        self, session: AsyncSession, model: ArchivableLog, cutoff: datetime, limit: int
+    ) -> List[Union[AuditLog, ConsentAuditLog]]:
+        """
+        Oldest rows created before cutoff, in (created_at, id) order, locked
+        (skipping rows a concurrent archiver holds).
+        """
+        await flush_buffered(session)
+        result = await session.execute(
+            select(model)
+            .where(model.created_at < cutoff)
+            .order_by(model.created_at, model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    async def delete_rows(
+        self,
+        session: AsyncSession,
+        model: ArchivableLog,
+        ids: List[UUID],
+        first_created_at: datetime,
+        last_created_at: datetime
+    ) -> int:
+        """
+        Delete archived rows by id. The created_at range confines the delete to
+        the partitions the rows live in. Returns the number deleted.
+        """
+        result = await session.execute(
+            delete(model)
+            .where(
+                model.id.in_(ids),
+                model.created_at >= first_created_at,
+                model.created_at <= last_created_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def create_segment(self, session: AsyncSession, segment: LogArchiveSegment) -> None:
+        """
+        Record an archived segment in the manifest.
+        """
+        session.add(segment)
+        await session.flush()
+
+    async def get_segments(
+        self,
+        session: AsyncSession,
+        source_table: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> List[LogArchiveSegment]:
+        """
+        Segments of a table overlapping [since, until), oldest first.
+        """
+        stmt = select(LogArchiveSegment).where(LogArchiveSegment.source_table == source_table)
+        if since is not None:
+            stmt = stmt.where(LogArchiveSegment.last_created_at >= since)
+        if until is not None:
+            stmt = stmt.where(LogArchiveSegment.first_created_at < until)
+        result = await session.execute(stmt.order_by(LogArchiveSegment.first_created_at))
+        return list(result.scalars().all())
@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.outbox import OutboxEvent
+from app.repositories.sql_helpers import dialect_insert
+
+class OutboxRepository:
+    """
+    Repository for Transactional Outbox Events.
+    Pure Data Access Layer. Transaction management is handled by the caller.
+    """
+
+    async def enqueue(
+        self,
+        session: AsyncSession,
+        event_type: str,
+        dedup_key: str,
+        payload: Dict[str, Any]
+    ) -> Optional[UUID]:
+        """
+        Add an event to the outbox in the caller's transaction.
+        An event with the same dedup_key is kept as-is (idempotent enqueue).
+        Returns the new event id, or None if the key already existed.
+        """
+        stmt = (
+            dialect_insert(session, OutboxEvent)
+            .values(event_type=event_type, dedup_key=dedup_key, payload=payload, attempts=0)
+            .on_conflict_do_nothing(index_elements=[OutboxEvent.dedup_key])
+            .returning(OutboxEvent.id)
+        )
+        result = await session.execute(stmt)
+        return result.scalar()
+
+    async def claim_batch(self, session: AsyncSession, now: datetime, limit: int, max_attempts: int) -> List[OutboxEvent]:
+        """
+        Oldest pending events that are due.
+        Rows are locked with SKIP LOCKED, so concurrent dispatchers split the work.
+        """
+        result = await session.execute(
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.dispatched_at.is_(None),
+                OutboxEvent.available_at <= now,
+                OutboxEvent.attempts < max_attempts
+            )
+            .order_by(OutboxEvent.available_at, OutboxEvent.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    async def mark_dispatched(
+        self, session: AsyncSession, event_id: UUID, at: datetime, payload: Dict[str, Any]
+    ) -> None:
+        """
+        Record delivery, replacing the payload with `payload` (the delivered
+        one minus its bulky parts, such as evidence content now in the blob store).
+        """
+        await session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event_id)
+            .values(dispatched_at=at, attempts=OutboxEvent.attempts + 1, last_error=None, payload=payload)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def mark_failed(self, session: AsyncSession, event_id: UUID, error: str, retry_at: datetime) -> None:
+        await session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event_id)
+            .values(attempts=OutboxEvent.attempts + 1, last_error=error, available_at=retry_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def delete_dispatched_before(self, session: AsyncSession, cutoff: datetime, limit: int) -> int:
+        """
+        Delete up to `limit` events dispatched before cutoff. Returns the number deleted.
+        Undispatched events, including those out of attempts, are kept.
+        """
+        batch = (
+            select(OutboxEvent.id)
+            .where(OutboxEvent.dispatched_at < cutoff)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        result = await session.execute(
+            delete(OutboxEvent)
+            .where(OutboxEvent.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def rearm_undispatched(
+        self, session: AsyncSession, event_type: str, payload_key: str, payload_values: List[str], at: datetime
+    ) -> int:
+        """
+        Give undispatched events of this type with payload[payload_key] in
+        payload_values a fresh set of attempts, due at `at` (including events
+        that had run out of attempts). Returns the number re-armed.
+        """
+        if not payload_values:
+            return 0
+        result = await session.execute(
+            update(OutboxEvent)
+            .where(
+                OutboxEvent.event_type == event_type,
+                OutboxEvent.payload[payload_key].astext.in_(payload_values),
+                OutboxEvent.dispatched_at.is_(None)
+            )
+            .values(attempts=0, last_error=None, available_at=at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def get_by_dedup_key(self, session: AsyncSession, dedup_key: str) -> Optional[OutboxEvent]:
+        result = await session.execute(
+            select(OutboxEvent).where(OutboxEvent.dedup_key == dedup_key)
+        )
+        return result.scalars().first()
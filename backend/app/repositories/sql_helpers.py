@@ -0,0 +1,39 @@
+from typing import Any, Dict, Iterator, List, TypeVar
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+
+async def flush_returning(session: AsyncSession, entity: T) -> T:
+    """
+    Add an entity and flush it. Its server-generated columns come back in the
+    same INSERT/UPDATE via RETURNING (eager_defaults on Base), so the entity
+    is fully loaded without a refresh round trip.
+    """
+    session.add(entity)
+    await session.flush()
+    return entity
+
+
+def dialect_insert(session: AsyncSession, entity):
+    """
+    Dialect-specific INSERT construct (exposes on_conflict_* clauses).
+    PostgreSQL in deployments; SQLite only under the integration test harness.
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(entity)
+    return postgresql.insert(entity)
+
+
+# Rows per multi-row INSERT: keeps bind parameters well under PostgreSQL's 32767 limit
+MAX_ROWS_PER_INSERT = 1000
+
+
+def chunked(rows: List[Dict[str, Any]], size: int = MAX_ROWS_PER_INSERT) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Split rows into consecutive chunks of at most `size`.
+    """
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
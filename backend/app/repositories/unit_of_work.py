@@ -0,0 +1,81 @@
+"""
+Request-scoped unit of work.
+
+Services and repositories only flush; a request's transaction is committed
+once, after the endpoint returns (see get_unit_of_work). A request that raises
+is rolled back if it wrote anything, unless a service asked with
+keep_on_error() for its writes to persist although the request fails (e.g. a
+failed-login counter). Work that must only happen once the writes are durable
+is registered with after_commit().
+"""
+from typing import Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
+
+from app.repositories.write_buffer import BUFFER_KEY
+
+WRITES_KEY = "uow_writes"
+KEEP_ON_ERROR_KEY = "uow_keep_on_error"
+AFTER_COMMIT_KEY = "uow_after_commit"
+
+
+def keep_on_error(session: AsyncSession) -> None:
+    """
+    Commit the transaction's writes even if the request then raises.
+    """
+    session.info[KEEP_ON_ERROR_KEY] = True
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Run callback once the current transaction commits (dropped if it rolls back).
+    """
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+def has_writes(session: AsyncSession) -> bool:
+    """
+    Whether the current transaction has flushed, executed or buffered any write.
+    """
+    return bool(
+        session.info.get(WRITES_KEY)
+        or session.info.get(BUFFER_KEY)
+        or session.new or session.dirty or session.deleted
+    )
+
+
+async def complete(session: AsyncSession, failed: bool) -> None:
+    """
+    End a request's transaction: commit it, or roll back the writes of a failed request.
+    """
+    if not failed or session.info.get(KEEP_ON_ERROR_KEY):
+        await session.commit()
+    elif has_writes(session) or not session.is_active:
+        await session.rollback()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session: Session, flush_context) -> None:
+    session.info[WRITES_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_executed(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    callbacks: List[Callable[[], None]] = session.info.pop(AFTER_COMMIT_KEY, [])
+    for callback in callbacks:
+        callback()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _reset(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        for key in (WRITES_KEY, KEEP_ON_ERROR_KEY, AFTER_COMMIT_KEY):
+            session.info.pop(key, None)
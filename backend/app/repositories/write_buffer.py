@@ -0,0 +1,64 @@
+"""
+Per-transaction write buffer.
+
+Rows queued with buffer_insert() are written as one multi-row INSERT per table
+when the session commits (after the ORM flush, so foreign keys to objects
+added in the same transaction resolve), and discarded if it rolls back.
+Readers that must see their own transaction's buffered rows call flush_buffered().
+"""
+from typing import Any, Dict, List
+
+from sqlalchemy import Table, event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.repositories.sql_helpers import chunked
+
+BUFFER_KEY = "buffered_inserts"
+
+
+def buffer_insert(session: AsyncSession, table: Table, values: Dict[str, Any]) -> None:
+    """
+    Queue one row for insertion at commit. Every row of a table must set the same columns.
+    """
+    buffered: Dict[Table, List[Dict[str, Any]]] = session.info.setdefault(BUFFER_KEY, {})
+    buffered.setdefault(table, []).append(values)
+
+
+def write_buffered(session: Session) -> int:
+    """
+    Write (and clear) the session's buffered rows. Returns the number written.
+    """
+    buffered = session.info.pop(BUFFER_KEY, None)
+    if not buffered:
+        return 0
+    written = 0
+    for table, rows in buffered.items():
+        for chunk in chunked(rows):
+            session.execute(insert(table).values(chunk))
+            written += len(chunk)
+    return written
+
+
+async def flush_buffered(session: AsyncSession) -> int:
+    """
+    Write the session's buffered rows now, inside the current transaction.
+    """
+    if not session.info.get(BUFFER_KEY):
+        return 0
+    await session.flush()
+    return await session.run_sync(write_buffered)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_buffered_on_commit(session: Session) -> None:
+    if session.info.get(BUFFER_KEY):
+        session.flush()
+        write_buffered(session)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_buffered(session: Session, transaction: SessionTransaction) -> None:
+    # Reached with rows still buffered only if the transaction was rolled back or closed
+    if transaction.parent is None:
+        session.info.pop(BUFFER_KEY, None)
@@ -0,0 +1,24 @@
+from pydantic import BaseModel, ConfigDict, IPvAnyAddress
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from datetime import datetime
+
+class AuditLogResponse(BaseModel):
+    id: UUID
+    actor_id: Optional[UUID] = None
+    actor_role: Optional[str] = None
+    action: str
+    before_value: Optional[Dict[str, Any]] = None
+    after_value: Optional[Dict[str, Any]] = None
+    ip_address: Optional[IPvAnyAddress] = None
+    device_id: Optional[str] = None
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class AuditLogPage(BaseModel):
+    """
+    Pass next_cursor back as `cursor` for the following page; null on the last page.
+    """
+    items: List[AuditLogResponse]
+    next_cursor: Optional[str] = None
+    limit: int
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 
@@ -31,3 +31,21 @@ class CAAssignmentResponse(BaseModel):
     status: str
     assigned_at: datetime
     model_config = ConfigDict(from_attributes=True)
+
+class CAPortfolioItem(BaseModel):
+    filing_id: UUID
+    client_id: UUID
+    client_name: str
+    financial_year: str
+    current_state: str
+    itr_type: str
+    open_flag_count: int
+    consent_expiry_at: datetime
+    assigned_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class CAPortfolioPage(BaseModel):
+    items: List[CAPortfolioItem]
+    total: int
+    limit: int
+    offset: int
@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import List, Literal
+from uuid import UUID
+from datetime import datetime
+
+class EvidenceAnchorResponse(BaseModel):
+    sequence: int
+    root_hash: str
+    previous_chain_hash: str
+    chain_hash: str
+    leaf_count: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class MerkleProofStep(BaseModel):
+    side: Literal["left", "right"]
+    hash: str
+
+class EvidenceInclusionProofResponse(BaseModel):
+    """
+    Leaf = SHA-256(0x00 || "{evidence_id}:{evidence_hash}");
+    node = SHA-256(0x01 || left || right), folding the proof from the leaf up.
+    """
+    evidence_id: UUID
+    evidence_hash: str
+    leaf_hash: str
+    leaf_index: int
+    proof: List[MerkleProofStep]
+    anchor: EvidenceAnchorResponse
+    verified: bool
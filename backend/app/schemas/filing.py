@@ -19,6 +19,7 @@ class FilingCaseResponse(BaseModel):
     financial_year: str
     itr_determination_id: UUID
     current_state: str
+    version: int
     created_at: datetime
     updated_at: datetime
     submitted_at: Optional[datetime] = None
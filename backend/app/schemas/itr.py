@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, Dict
 from uuid import UUID
 from datetime import datetime
 
@@ -18,3 +18,11 @@ class ITRDeterminationResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class ITRBatchDeterminationResponse(BaseModel):
+    financial_year: str
+    total_clients: int
+    determined: int
+    unchanged: int
+    locked: int
+    itr_type_counts: Dict[str, int]
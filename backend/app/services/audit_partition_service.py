@@ -0,0 +1,177 @@
+"""
+Audit log partition maintenance.
+
+audit_logs is range-partitioned by month (audit_logs_pYYYY_MM, UTC months).
+Partitions are created ahead of time; partitions older than the retention
+window can be detached (and optionally dropped) without touching live rows.
+
+The app's AuditPartitionWorker keeps partitions ahead of the clock; the CLI
+is for one-off maintenance such as detaching old months ahead of an archive:
+    python -m app.services.audit_partition_service [--months-ahead N] [--detach-before YYYY-MM] [--drop]
+Prints the partitions created and detached.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.audit_partition_repository import AuditPartitionRepository
+from app.services.periodic_worker import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME = re.compile(r"^audit_logs_p(\d{4})_(\d{2})$")
+
+
+def month_start(moment: datetime) -> datetime:
+    """
+    First instant (UTC) of the month containing `moment`.
+    """
+    moment = moment.astimezone(timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"audit_logs_p{month:%Y_%m}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """
+    Month covered by a monthly partition, or None for any other table (e.g. the default partition).
+    """
+    match = PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+
+
+class AuditPartitionService:
+    """
+    Creates upcoming monthly audit_logs partitions and detaches expired ones.
+    A no-op on databases without declarative partitioning (the SQLite test harness).
+    """
+
+    def __init__(self, repo: AuditPartitionRepository):
+        self.repo = repo
+
+    @staticmethod
+    def _supported(session: AsyncSession) -> bool:
+        return session.get_bind().dialect.name == "postgresql"
+
+    async def ensure_partitions(
+        self, session: AsyncSession, now: datetime, months_ahead: int = settings.AUDIT_PARTITION_MONTHS_AHEAD
+    ) -> List[str]:
+        """
+        Create any missing partition from the current month to months_ahead. Returns the names created.
+        """
+        if not self._supported(session):
+            return []
+        existing = set(await self.repo.get_partitions(session))
+        created = []
+        current = month_start(now)
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            moved = await self.repo.create_partition(session, name, month, add_months(month, 1))
+            if moved:
+                logger.warning(f"Moved {moved} audit rows from the default partition into {name}")
+            created.append(name)
+        await session.commit()
+        return created
+
+    async def detach_partitions_before(self, session: AsyncSession, cutoff: datetime, drop: bool = False) -> List[str]:
+        """
+        Detach every monthly partition that ends on or before `cutoff` (dropping it
+        if `drop`). Detached partitions stay as standalone tables for archival.
+        Returns the names detached.
+        """
+        if not self._supported(session):
+            return []
+        detached = []
+        for name in await self.repo.get_partitions(session):
+            month = partition_month(name)
+            if month is None or add_months(month, 1) > cutoff:
+                continue
+            await self.repo.detach_partition(session, name)
+            if drop:
+                await self.repo.drop_table(session, name)
+            detached.append(name)
+        await session.commit()
+        return detached
+
+
+class AuditPartitionWorker(PeriodicWorker):
+    """
+    Background worker keeping the partition horizon ahead of the clock, and
+    detaching partitions past AUDIT_PARTITION_RETENTION_MONTHS when it is set.
+    Runs once at startup, then every interval.
+    """
+
+    name = "Audit partition worker"
+    run_at_start = True
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        service: Optional[AuditPartitionService] = None,
+        interval_seconds: float = settings.AUDIT_PARTITION_INTERVAL_SECONDS,
+        months_ahead: int = settings.AUDIT_PARTITION_MONTHS_AHEAD,
+        retention_months: Optional[int] = settings.AUDIT_PARTITION_RETENTION_MONTHS,
+        drop_detached: bool = settings.AUDIT_PARTITION_DROP_DETACHED
+    ):
+        super().__init__(interval_seconds)
+        self.session_factory = session_factory
+        self.service = service or AuditPartitionService(AuditPartitionRepository())
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.drop_detached = drop_detached
+
+    async def run_once(self) -> Dict[str, List[str]]:
+        """
+        One maintenance pass. Returns the partitions created and detached.
+        """
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            created = await self.service.ensure_partitions(session, now, self.months_ahead)
+            detached = []
+            if self.retention_months is not None:
+                cutoff = add_months(month_start(now), -self.retention_months)
+                detached = await self.service.detach_partitions_before(session, cutoff, self.drop_detached)
+        if created or detached:
+            logger.info(f"Audit partitions created: {created}; detached: {detached}")
+        return {"created": created, "detached": detached}
+
+
+async def _main(args: argparse.Namespace) -> Dict[str, Any]:
+    from app.core.database import async_session_factory
+
+    service = AuditPartitionService(AuditPartitionRepository())
+    async with async_session_factory() as session:
+        report: Dict[str, Any] = {
+            "created": await service.ensure_partitions(session, datetime.now(timezone.utc), args.months_ahead)
+        }
+        if args.detach_before:
+            cutoff = datetime.strptime(args.detach_before, "%Y-%m").replace(tzinfo=timezone.utc)
+            report["detached"] = await service.detach_partitions_before(session, cutoff, args.drop)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain monthly audit_logs partitions.")
+    parser.add_argument("--months-ahead", type=int, default=settings.AUDIT_PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--detach-before", help="detach partitions for months before YYYY-MM")
+    parser.add_argument("--drop", action="store_true", help="drop detached partitions instead of keeping them")
+    print(json.dumps(asyncio.run(_main(parser.parse_args())), indent=2))
@@ -1,20 +1,54 @@
-from typing import Optional, Any, Dict, Union
-from uuid import UUID
+import base64
+from typing import Optional, Any, Dict, List, Tuple, Union
+from uuid import UUID, uuid4
 from ipaddress import IPv4Address, IPv6Address
 from datetime import datetime, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.exceptions import ValidationError
 from app.models.audit import AuditLog
-from app.repositories.audit_repository import AuditLogRepository
+from app.repositories.audit_repository import AuditLogRepository, audit_log_values
+from app.repositories.consent_repository import CAAssignmentRepository
+from app.repositories.outbox_repository import OutboxRepository
+from app.services.audit_sink import AuditSinkQueue
+
+AUDIT_LOG_EVENT = "AUDIT_LOG"
+
+
+def encode_audit_cursor(created_at: datetime, log_id: UUID) -> str:
+    """
+    Opaque page cursor: the (created_at, id) key of the last row returned.
+    """
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{log_id}".encode("utf-8")).decode("ascii")
+
+
+def decode_audit_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        created_at, log_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), UUID(log_id)
+    except (ValueError, UnicodeError):
+        raise ValidationError("Invalid audit log cursor")
 
 class AuditService:
     """
     Audit Service.
     Wraps repository to provide a clean logging interface.
+    Entries are buffered and written with the caller's transaction at commit;
+    non-critical ones can go to a fire-and-forget sink instead.
     """
 
-    def __init__(self, audit_repo: AuditLogRepository):
+    def __init__(
+        self,
+        audit_repo: AuditLogRepository,
+        outbox_repo: Optional[OutboxRepository] = None,
+        sink: Optional[AuditSinkQueue] = None,
+        assignment_repo: Optional[CAAssignmentRepository] = None
+    ):
         self.audit_repo = audit_repo
+        self.outbox_repo = outbox_repo
+        self.sink = sink
+        self.assignment_repo = assignment_repo or CAAssignmentRepository()
 
     async def log_action(
         self,
@@ -25,10 +59,14 @@ class AuditService:
         before_value: Optional[Dict[str, Any]] = None,
         after_value: Optional[Dict[str, Any]] = None,
         ip_address: Optional[Union[str, IPv4Address, IPv6Address]] = None,
-        device_id: Optional[str] = None
-    ) -> AuditLog:
+        device_id: Optional[str] = None,
+        critical: bool = True
+    ) -> None:
         """
         Log an action in the system.
+        Critical entries commit or roll back with the caller's transaction.
+        Non-critical ones (critical=False) are handed to the audit sink, if one
+        is configured, and written in the background regardless of the outcome.
         """
         # Ensure IP is string if provided, although SQLAlchemy INET/String handles it.
         # String conversion is safer for INET fields if passing ipaddress objects.
@@ -45,10 +83,132 @@ class AuditService:
             created_at=datetime.now(timezone.utc)
         )
 
-        return await self.audit_repo.create_log(session, log_entry)
+        if not critical and self.sink is not None:
+            self.sink.submit(audit_log_values(log_entry))
+            return
+        await self.audit_repo.create_log(session, log_entry)
 
-    async def get_user_logs(self, session: AsyncSession, user_id: UUID):
-         """
-         Retrieve logs for a user.
-         """
-         return await self.audit_repo.get_by_user(session, user_id)
+    async def enqueue_action(
+        self,
+        session: AsyncSession,
+        actor_id: Optional[UUID],
+        actor_role: Optional[str],
+        action: str,
+        before_value: Optional[Dict[str, Any]] = None,
+        after_value: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[Union[str, IPv4Address, IPv6Address]] = None,
+        device_id: Optional[str] = None,
+        dedup_key: Optional[str] = None
+    ) -> None:
+        """
+        Log an action through the transactional outbox: the audit row is
+        written by the OutboxDispatcher after commit.
+        dedup_key makes repeated enqueues of the same action a no-op.
+        Falls back to an inline insert when no outbox is configured.
+        """
+        if self.outbox_repo is None:
+            await self.log_action(
+                session, actor_id, actor_role, action, before_value, after_value, ip_address, device_id
+            )
+            return
+
+        await self.outbox_repo.enqueue(
+            session,
+            event_type=AUDIT_LOG_EVENT,
+            dedup_key=dedup_key or f"audit:{uuid4()}",
+            payload={
+                "actor_id": str(actor_id) if actor_id else None,
+                "actor_role": actor_role,
+                "action": action,
+                "before_value": before_value,
+                "after_value": after_value,
+                "ip_address": str(ip_address) if ip_address else None,
+                "device_id": device_id,
+                "created_at": datetime.now(timezone.utc).isoformat()
+            }
+        )
+
+    async def get_user_logs(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = settings.AUDIT_QUERY_MAX_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[AuditLog], Optional[str]]:
+        """
+        One page of a user's logs, newest first, optionally within [since, until),
+        plus the cursor of the next page (None on the last page).
+        Page size is capped at AUDIT_QUERY_MAX_PAGE_SIZE.
+        """
+        limit = max(1, min(limit, settings.AUDIT_QUERY_MAX_PAGE_SIZE))
+        before = decode_audit_cursor(cursor) if cursor else None
+        # One extra row tells whether another page follows
+        rows = await self.audit_repo.search(
+            session, limit + 1, before, actor_ids=[user_id], since=since, until=until
+        )
+        if len(rows) <= limit:
+            return rows, None
+        last = rows[limit - 1]
+        return rows[:limit], encode_audit_cursor(last.created_at, last.id)
+
+    async def search_logs(
+        self,
+        session: AsyncSession,
+        requester_id: UUID,
+        requester_role: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        actor_id: Optional[UUID] = None,
+        action: Optional[str] = None,
+        actor_role: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Tuple[List[AuditLog], Optional[str]]:
+        """
+        One page of audit logs, newest first, plus the cursor of the next page
+        (None on the last page). Page size is capped at AUDIT_QUERY_MAX_PAGE_SIZE.
+        Admins search every log; a CA only their own and their actively
+        consented clients' logs.
+        """
+        limit = max(1, min(limit, settings.AUDIT_QUERY_MAX_PAGE_SIZE))
+        before = decode_audit_cursor(cursor) if cursor else None
+
+        actor_ids: Optional[List[UUID]] = [actor_id] if actor_id is not None else None
+        if requester_role != "ADMIN":
+            visible = set(await self.assignment_repo.get_accessible_client_ids(
+                session, requester_id, datetime.now(timezone.utc)
+            ))
+            visible.add(requester_id)
+            actor_ids = [a for a in actor_ids if a in visible] if actor_ids is not None else list(visible)
+
+        rows: List[AuditLog] = []
+        next_cursor = None
+        if actor_ids is None or actor_ids:
+            # One extra row tells whether another page follows
+            rows = await self.audit_repo.search(
+                session, limit + 1, before, actor_ids, action, actor_role, since, until
+            )
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_audit_cursor(rows[-1].created_at, rows[-1].id)
+
+        # Access trail of who searched for what; nothing changed, so it goes to the sink
+        await self.log_action(
+            session,
+            actor_id=requester_id,
+            actor_role=requester_role,
+            action="AUDIT_LOGS_SEARCHED",
+            after_value={
+                "actor_id": str(actor_id) if actor_id else None,
+                "action": action,
+                "actor_role": actor_role,
+                "since": since.isoformat() if since else None,
+                "until": until.isoformat() if until else None,
+                "cursor": cursor,
+                "returned": len(rows)
+            },
+            critical=False
+        )
+        return rows, next_cursor
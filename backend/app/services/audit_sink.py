@@ -0,0 +1,155 @@
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.audit_repository import AuditLogRepository
+from app.services.periodic_worker import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+# Failures that say nothing about the entries themselves (database unreachable)
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, OSError)
+
+
+class AuditSinkQueue:
+    """
+    In-memory queue of fire-and-forget audit entries (complete audit_logs rows).
+    Bounded: once full, new entries are dropped with a warning rather than
+    slowing the request that produced them.
+    """
+
+    def __init__(self, max_entries: int = settings.AUDIT_SINK_MAX_QUEUE):
+        self.max_entries = max_entries
+        self._entries: Deque[Dict[str, Any]] = deque()
+        self.dropped = 0
+
+    def submit(self, values: Dict[str, Any]) -> bool:
+        """
+        Queue an entry. Returns False if it was dropped because the queue is full.
+        """
+        if len(self._entries) >= self.max_entries:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"Audit sink queue full; {self.dropped} entries dropped so far")
+            return False
+        self._entries.append(values)
+        return True
+
+    def pop_batch(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Remove and return up to `limit` entries, oldest first.
+        """
+        return [self._entries.popleft() for _ in range(min(limit, len(self._entries)))]
+
+    def requeue(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Put entries back at the front of the queue (after a failed write).
+        """
+        self._entries.extendleft(reversed(entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AuditSinkWorker(PeriodicWorker):
+    """
+    Background worker draining the AuditSinkQueue.
+    Each batch is one multi-row INSERT in its own session, independent of the
+    transactions that produced the entries. A batch that fails on bad data is
+    retried row by row, so one poison entry cannot hold up the rest; an entry
+    failing max_attempts passes is dead-lettered to the error log and dropped.
+    Connection errors put the batch back untouched for the next pass.
+    Entries still queued when the process dies are lost.
+    """
+
+    name = "Audit sink worker"
+
+    def __init__(
+        self,
+        queue: AuditSinkQueue,
+        session_factory: Callable[[], AsyncSession],
+        audit_repo: Optional[AuditLogRepository] = None,
+        batch_size: int = settings.AUDIT_SINK_BATCH_SIZE,
+        poll_interval_seconds: float = settings.AUDIT_SINK_POLL_SECONDS,
+        max_attempts: int = settings.AUDIT_SINK_MAX_ATTEMPTS
+    ):
+        super().__init__(poll_interval_seconds)
+        self.queue = queue
+        self.session_factory = session_factory
+        self.audit_repo = audit_repo or AuditLogRepository()
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        # entry id -> failed single-row writes so far
+        self._failures: Dict[Any, int] = {}
+        self.dead_lettered = 0
+
+    async def _write(self, entries: List[Dict[str, Any]]) -> None:
+        async with self.session_factory() as session:
+            await self.audit_repo.create_logs(session, entries)
+            await session.commit()
+
+    def _record_failure(self, values: Dict[str, Any], error: Exception) -> bool:
+        """
+        Count a failed single-row write. Returns True if the entry should be
+        retried, False once it has been dead-lettered.
+        """
+        attempts = self._failures.get(values["id"], 0) + 1
+        if attempts < self.max_attempts:
+            self._failures[values["id"]] = attempts
+            return True
+        self._failures.pop(values["id"], None)
+        self.dead_lettered += 1
+        logger.error(f"Audit sink dead-lettered entry after {attempts} attempts ({error}): {values!r}")
+        return False
+
+    async def run_once(self) -> int:
+        """
+        Write everything queued, batch_size rows per INSERT. Returns the number written.
+        Entries that failed this pass go to the back of the queue for the next one.
+        """
+        written = 0
+        retry: List[Dict[str, Any]] = []
+        try:
+            while True:
+                batch = self.queue.pop_batch(self.batch_size)
+                if not batch:
+                    return written
+                try:
+                    await self._write(batch)
+                    written += len(batch)
+                    continue
+                except TRANSIENT_ERRORS:
+                    self.queue.requeue(batch)
+                    raise
+                except Exception as e:
+                    logger.warning(f"Audit sink batch of {len(batch)} failed ({e}); retrying row by row")
+
+                for position, values in enumerate(batch):
+                    try:
+                        await self._write([values])
+                    except TRANSIENT_ERRORS:
+                        self.queue.requeue(batch[position:])
+                        raise
+                    except Exception as e:
+                        if self._record_failure(values, e):
+                            retry.append(values)
+                        continue
+                    self._failures.pop(values["id"], None)
+                    written += 1
+        finally:
+            for values in retry:
+                self.queue.submit(values)
+
+    async def stop(self) -> None:
+        """
+        Cancel the polling loop and write whatever is still queued.
+        """
+        await super().stop()
+        await self.run_once()
+
+
+audit_sink_queue = AuditSinkQueue()
@@ -8,6 +8,7 @@ from app.core.config import settings
 from datetime import datetime, timedelta, timezone
 from jose import jwt
 from app.core.exceptions import NotFoundError, UnauthorizedError, ValidationError
+from app.repositories.unit_of_work import keep_on_error
 import secrets
 import hashlib
 from uuid import uuid4, UUID
@@ -50,30 +51,25 @@ class AuthService:
         hashed_pwd = hash_password(user_create.password)
 
         # 3. Transactional Write
-        try:
-            # Create User
-            new_user = User(
-                email=user_create.email,
-                legal_name=user_create.legal_name,
-                mobile=user_create.mobile,
-                pan=user_create.pan,
-                primary_role=user_create.primary_role
-            )
-            saved_user = await self.auth_repo.create_user(session, new_user)
-
-            # Create Credentials
-            credentials = UserCredentials(
-                user_id=saved_user.id,
-                auth_provider="PASSWORD",
-                password_hash=hashed_pwd
-            )
-            await self.auth_repo.create_user_credentials(session, credentials)
+        # Create User
+        new_user = User(
+            email=user_create.email,
+            legal_name=user_create.legal_name,
+            mobile=user_create.mobile,
+            pan=user_create.pan,
+            primary_role=user_create.primary_role
+        )
+        saved_user = await self.auth_repo.create_user(session, new_user)
+
+        # Create Credentials
+        credentials = UserCredentials(
+            user_id=saved_user.id,
+            auth_provider="PASSWORD",
+            password_hash=hashed_pwd
+        )
+        await self.auth_repo.create_user_credentials(session, credentials)
             
-            await session.commit()
-            return saved_user
-        except Exception as e:
-            await session.rollback()
-            raise e
+        return saved_user
 
     async def login_user(self, session: AsyncSession, user_login: UserLogin) -> Token:
         """
@@ -109,21 +105,18 @@ class AuthService:
         is_valid = verify_password(user_login.password, credentials.password_hash)
 
         if not is_valid:
-            # 4. Handle Failed Attempt (Atomic Write with Row Lock)
-            try:
-                # Re-fetch credentials inside transaction with a row-level lock to prevent lost updates
-                tx_credentials = await self.auth_repo.get_credentials_by_user_id_for_update(session, user.id)
-                # Reset counter if previous cooldown expired
-                if tx_credentials.failed_attempts >= max_attempts:
-                    tx_credentials.failed_attempts = 1
-                else:
-                    tx_credentials.failed_attempts += 1
-                
-                tx_credentials.last_failed_login_at = now_utc
-                # NOTE: Audit logging (LOGIN_FAILED / TEMPORARY_LOCKOUT_TRIGGERED) should hook here
-                await session.commit()
-            except Exception:
-                await session.rollback()
+            # 4. Handle Failed Attempt (Atomic Write with Row Lock, kept although the login fails)
+            # Re-fetch credentials inside transaction with a row-level lock to prevent lost updates
+            tx_credentials = await self.auth_repo.get_credentials_by_user_id_for_update(session, user.id)
+            # Reset counter if previous cooldown expired
+            if tx_credentials.failed_attempts >= max_attempts:
+                tx_credentials.failed_attempts = 1
+            else:
+                tx_credentials.failed_attempts += 1
+
+            tx_credentials.last_failed_login_at = now_utc
+            # NOTE: Audit logging (LOGIN_FAILED / TEMPORARY_LOCKOUT_TRIGGERED) should hook here
+            keep_on_error(session)
             raise UnauthorizedError(generic_error_msg)
 
         # 5. Handle Successful Login & Session Creation (Atomic Write with Row Lock)
@@ -131,25 +124,20 @@ class AuthService:
         raw_refresh_token = secrets.token_hex(64)
         refresh_token_hash = hashlib.sha256(raw_refresh_token.encode()).hexdigest()
         
-        try:
-            # Apply row-level lock for consistency
-            tx_credentials = await self.auth_repo.get_credentials_by_user_id_for_update(session, user.id)
-            tx_credentials.failed_attempts = 0
-            tx_credentials.last_failed_login_at = None
-            tx_credentials.last_login_at = now_utc
-
-            auth_session = AuthSession(
-                user_id=user.id,
-                auth_method="PASSWORD",
-                session_expiry=session_expiry,
-                refresh_token_hash=refresh_token_hash,
-                status="ACTIVE"
-            )
-            created_session = await self.auth_repo.create_auth_session(session, auth_session)
-            await session.commit()
-        except Exception as e:
-            await session.rollback()
-            raise e
+        # Apply row-level lock for consistency
+        tx_credentials = await self.auth_repo.get_credentials_by_user_id_for_update(session, user.id)
+        tx_credentials.failed_attempts = 0
+        tx_credentials.last_failed_login_at = None
+        tx_credentials.last_login_at = now_utc
+
+        auth_session = AuthSession(
+            user_id=user.id,
+            auth_method="PASSWORD",
+            session_expiry=session_expiry,
+            refresh_token_hash=refresh_token_hash,
+            status="ACTIVE"
+        )
+        created_session = await self.auth_repo.create_auth_session(session, auth_session)
 
         full_refresh_token = f"{created_session.id}:{raw_refresh_token}"
 
@@ -184,44 +172,39 @@ class AuthService:
             raise UnauthorizedError("Invalid refresh token format")
 
         token_hash = hashlib.sha256(raw_refresh_token.encode()).hexdigest()
-        
-        try:
-            auth_session = await self.auth_repo.get_session_by_id(session, sid)
-            
-            if not auth_session:
-                raise UnauthorizedError("Invalid refresh token")
-                
-            if auth_session.status != 'ACTIVE':
-                raise UnauthorizedError("Session is revoked or expired")
-                
-            # Replay Detection
-            if auth_session.refresh_token_hash != token_hash:
-                auth_session.status = "REVOKED"
-                await session.commit()
-                raise UnauthorizedError("Refresh token reuse detected")
-                
-            if auth_session.session_expiry < datetime.now(timezone.utc):
-                auth_session.status = "EXPIRED"
-                await session.commit()
-                raise UnauthorizedError("Refresh token expired")
-                
-            user = await self.auth_repo.get_user_by_id(session, auth_session.user_id)
-            if not user or user.account_status != 'ACTIVE':
-                raise UnauthorizedError("User inactive or not found")
-                
-            # 1. Rotate
-            new_raw_refresh = secrets.token_hex(64)
-            new_hash = hashlib.sha256(new_raw_refresh.encode()).hexdigest()
-            session_expiry = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-            
-            auth_session.refresh_token_hash = new_hash
-            auth_session.session_expiry = session_expiry
-            await session.commit()
-        except Exception as e:
-            await session.rollback()
-            raise e
-            
-        # Outside transaction, generate JWT
+
+        auth_session = await self.auth_repo.get_session_by_id(session, sid)
+
+        if not auth_session:
+            raise UnauthorizedError("Invalid refresh token")
+
+        if auth_session.status != 'ACTIVE':
+            raise UnauthorizedError("Session is revoked or expired")
+
+        # Replay Detection
+        if auth_session.refresh_token_hash != token_hash:
+            auth_session.status = "REVOKED"
+            keep_on_error(session)
+            raise UnauthorizedError("Refresh token reuse detected")
+
+        if auth_session.session_expiry < datetime.now(timezone.utc):
+            auth_session.status = "EXPIRED"
+            keep_on_error(session)
+            raise UnauthorizedError("Refresh token expired")
+
+        user = await self.auth_repo.get_user_by_id(session, auth_session.user_id)
+        if not user or user.account_status != 'ACTIVE':
+            raise UnauthorizedError("User inactive or not found")
+
+        # 1. Rotate
+        new_raw_refresh = secrets.token_hex(64)
+        new_hash = hashlib.sha256(new_raw_refresh.encode()).hexdigest()
+        session_expiry = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+        auth_session.refresh_token_hash = new_hash
+        auth_session.session_expiry = session_expiry
+
+        # Generate JWT (no I/O)
         access_token = self.create_access_token(
             data={
                 "sub": str(user.id),
@@ -233,7 +216,7 @@ class AuthService:
             },
             expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         )
-        
+
         return Token(
             access_token=access_token,
             token_type="bearer",
@@ -253,15 +236,11 @@ class AuthService:
 
         token_hash = hashlib.sha256(raw_refresh_token.encode()).hexdigest()
         
-        try:
-            auth_session = await self.auth_repo.get_session_by_id(session, sid)
-            
-            if auth_session and auth_session.status == 'ACTIVE':
-                if auth_session.refresh_token_hash == token_hash:
-                    auth_session.status = "REVOKED"
-                    await session.commit()
-        except Exception:
-            await session.rollback()
+        auth_session = await self.auth_repo.get_session_by_id(session, sid)
+
+        if auth_session and auth_session.status == 'ACTIVE':
+            if auth_session.refresh_token_hash == token_hash:
+                auth_session.status = "REVOKED"
 
     async def change_password(
         self, 
@@ -283,18 +262,12 @@ class AuthService:
             
         hashed_new_pwd = hash_password(new_password)
         
-        try:
-            # 1. Update password
-            tx_credentials = await self.auth_repo.get_credentials_by_user_id(session, user_id)
-            tx_credentials.password_hash = hashed_new_pwd
+        # 1. Update password (credentials loaded above; same transaction)
+        credentials.password_hash = hashed_new_pwd
             
-            # 2. Invalidate all other active sessions
-            active_sessions = await self.auth_repo.get_active_sessions_by_user_id(session, user_id)
-            for s in active_sessions:
-                if s.id != active_session_id:
-                    s.status = 'REVOKED'
-            # NOTE: Logging for SESSIONS_REVOKED / PASSWORD_CHANGED should hook here
-            await session.commit()
-        except Exception as e:
-            await session.rollback()
-            raise e
+        # 2. Invalidate all other active sessions
+        active_sessions = await self.auth_repo.get_active_sessions_by_user_id(session, user_id)
+        for s in active_sessions:
+            if s.id != active_session_id:
+                s.status = 'REVOKED'
+        # NOTE: Logging for SESSIONS_REVOKED / PASSWORD_CHANGED should hook here
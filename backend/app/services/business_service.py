@@ -75,30 +75,25 @@ class BusinessProfileService:
              raise ValueError(f"Constitution '{input_const}' does not match PAN Type '{pan_char_4}'. Expected one of: {valid_types}")
 
         # 4. Transactional Persistence
-        try:
-            new_profile = BusinessProfile(
-                user_id=user_id,
-                constitution_type=profile_data.constitution_type,
-                business_name=profile_data.business_name,
-                date_of_incorporation=profile_data.date_of_incorporation,
-                # Explicit assignment of booleans
-                gst_registered=profile_data.gst_registered,
-                gstin=profile_data.gstin,
-                tan_available=profile_data.tan_available,
-                msme_registered=profile_data.msme_registered,
-                iec_available=profile_data.iec_available,
-                turnover_bracket=profile_data.turnover_bracket,
-                books_maintained=profile_data.books_maintained,
-                accounting_method=profile_data.accounting_method,
-                registered_state=profile_data.registered_state
-            )
+        new_profile = BusinessProfile(
+            user_id=user_id,
+            constitution_type=profile_data.constitution_type,
+            business_name=profile_data.business_name,
+            date_of_incorporation=profile_data.date_of_incorporation,
+            # Explicit assignment of booleans
+            gst_registered=profile_data.gst_registered,
+            gstin=profile_data.gstin,
+            tan_available=profile_data.tan_available,
+            msme_registered=profile_data.msme_registered,
+            iec_available=profile_data.iec_available,
+            turnover_bracket=profile_data.turnover_bracket,
+            books_maintained=profile_data.books_maintained,
+            accounting_method=profile_data.accounting_method,
+            registered_state=profile_data.registered_state
+        )
             
-            saved_profile = await self.business_repo.create_profile(session, new_profile)
-            await session.commit()
-            return saved_profile
-        except Exception:
-            await session.rollback()
-            raise
+        saved_profile = await self.business_repo.create_profile(session, new_profile)
+        return saved_profile
 
     async def update_profile(self, session: AsyncSession, user_id: UUID, profile_data: BusinessProfileUpdate) -> BusinessProfile:
          # Placeholder for update logic
@@ -0,0 +1,100 @@
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+
+AccessKey = Tuple[UUID, UUID]
+
+
+class CAAccessCache:
+    """
+    In-memory cache of successful CA access checks, keyed by (ca_user_id, filing_id).
+    An entry holds the assignment's column values and lives until the TTL or
+    the consent's expiry, whichever comes first. Revoking a consent or changing
+    an assignment invalidates it in this process; other processes see the change
+    once their entry's TTL runs out.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = settings.CA_ACCESS_CACHE_TTL_SECONDS,
+        max_entries: int = settings.CA_ACCESS_CACHE_MAX_ENTRIES
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (expires_at on the monotonic clock, assignment column values)
+        self._entries: Dict[AccessKey, Tuple[float, Dict[str, Any]]] = {}
+        # Bumped by every invalidation, so a check that read the database
+        # before an invalidation does not store its (possibly stale) result
+        self.generation = 0
+
+    def get(self, ca_user_id: UUID, filing_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Cached assignment values for a CA and filing, or None.
+        """
+        key = (ca_user_id, filing_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, assignment = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        return assignment
+
+    def put(
+        self,
+        ca_user_id: UUID,
+        filing_id: UUID,
+        assignment: Dict[str, Any],
+        consent_expiry_at: datetime,
+        generation: int
+    ) -> None:
+        """
+        Cache a successful check. Skipped if anything was invalidated since
+        `generation` was read, or if the consent has already expired.
+        """
+        if generation != self.generation:
+            return
+        if consent_expiry_at.tzinfo is None:
+            consent_expiry_at = consent_expiry_at.replace(tzinfo=timezone.utc)
+        ttl = min(self.ttl_seconds, (consent_expiry_at - datetime.now(timezone.utc)).total_seconds())
+        if ttl <= 0:
+            return
+
+        now = time.monotonic()
+        if len(self._entries) >= self.max_entries:
+            for key in [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[key]
+            if len(self._entries) >= self.max_entries:
+                # Still full: evict the oldest insertion
+                del self._entries[next(iter(self._entries))]
+        self._entries[(ca_user_id, filing_id)] = (now + ttl, assignment)
+
+    def invalidate_consent(self, consent_id: UUID) -> None:
+        """
+        Drop every entry backed by the consent.
+        """
+        self.generation += 1
+        for key in [key for key, (_, assignment) in self._entries.items() if assignment["consent_id"] == consent_id]:
+            del self._entries[key]
+
+    def invalidate_filing(self, filing_id: UUID) -> None:
+        """
+        Drop every entry for the filing.
+        """
+        self.generation += 1
+        for key in [key for key in self._entries if key[1] == filing_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+ca_access_cache = CAAccessCache()
@@ -1,14 +1,16 @@
 from datetime import datetime, timezone
 from uuid import UUID
-from typing import Optional
+from typing import Optional, List, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.consent import CAAssignment, ConsentAuditLog
 from app.repositories.consent_repository import ConsentRepository, CAAssignmentRepository, ConsentAuditRepository
 from app.repositories.auth_repository import AuthRepository
 from app.repositories.auth_repository import AuthRepository
 from app.repositories.filing_repository import FilingCaseRepository
+from app.repositories.unit_of_work import after_commit
 from app.core.exceptions import NotFoundError, UnauthorizedError, ValidationError
 
+from app.services.ca_access_cache import CAAccessCache, ca_access_cache
 from app.services.evidence_service import EvidenceService
 
 class CAAssignmentService:
@@ -24,7 +26,8 @@ class CAAssignmentService:
         audit_repo: ConsentAuditRepository,
         auth_repo: AuthRepository,
         filing_repo: FilingCaseRepository,
-        evidence_service: EvidenceService
+        evidence_service: EvidenceService,
+        access_cache: CAAccessCache = ca_access_cache
     ):
         self.consent_repo = consent_repo
         self.assignment_repo = assignment_repo
@@ -32,6 +35,7 @@ class CAAssignmentService:
         self.auth_repo = auth_repo
         self.filing_repo = filing_repo
         self.evidence_service = evidence_service
+        self.access_cache = access_cache
 
     async def assign_ca(
         self,
@@ -45,43 +49,41 @@ class CAAssignmentService:
         Assigns a CA to a Filing Case.
         Validated Consent, Roles, and Filing Ownership.
         """
-        # 1. Fetch & Validate Filing using Repository
-        filing = await self.filing_repo.get_by_id(session, filing_id)
-        
-        if not filing:
+        # Filing, CA user, consent and existing assignment in one round trip
+        checks = await self.assignment_repo.get_assignment_checks(session, filing_id, ca_user_id, consent_id)
+
+        # 1. Validate Filing
+        if checks.filing_user_id is None:
             raise NotFoundError("Filing Case not found")
         
-        if filing.user_id != taxpayer_id:
+        if checks.filing_user_id != taxpayer_id:
             raise UnauthorizedError("Unauthorized to assign CA for this filing")
 
-        if filing.current_state not in ["DRAFT", "READY_FOR_REVIEW"]:
+        if checks.filing_state not in ["DRAFT", "READY_FOR_REVIEW"]:
                 raise ValidationError("Cannot assign CA in current state")
 
         # 2. Validate CA User
-        ca_user = await self.auth_repo.get_user_by_id(session, ca_user_id)
-        if not ca_user:
+        if checks.ca_role is None:
             raise NotFoundError("CA User not found")
         
-        if ca_user.primary_role != "CA":
+        if checks.ca_role != "CA":
             raise ValidationError("Assigned user is not a Chartered Accountant")
 
         # 3. Validate Consent
-        consent = await self.consent_repo.get_by_id(session, consent_id)
-        if not consent:
+        if checks.consent_user_id is None:
             raise NotFoundError("Consent not found")
         
-        if consent.user_id != taxpayer_id:
+        if checks.consent_user_id != taxpayer_id:
             raise UnauthorizedError("Consent does not belong to taxpayer")
             
-        if consent.status != "ACTIVE":
+        if checks.consent_status != "ACTIVE":
             raise ValidationError("Consent is not active")
             
-        if consent.expiry_at <= datetime.now(timezone.utc):
+        if checks.consent_expiry_at <= datetime.now(timezone.utc):
             raise ValidationError("Consent has expired")
 
         # 4. Check Duplicate
-        existing = await self.assignment_repo.get_by_filing_id(session, filing_id)
-        if existing and existing.status == "ACTIVE":
+        if checks.has_active_assignment:
             raise ValidationError("An active CA assignment already exists for this filing")
 
         # 5. Create Assignment
@@ -94,6 +96,7 @@ class CAAssignmentService:
         )
         
         created_assignment = await self.assignment_repo.create_assignment(session, assignment)
+        after_commit(session, lambda: self.access_cache.invalidate_filing(filing_id))
         
         # Evidence Capture (Atomic)
         await self.evidence_service.capture_evidence(
@@ -119,6 +122,35 @@ class CAAssignmentService:
         
         return created_assignment
 
+    async def get_portfolio(
+        self,
+        session: AsyncSession,
+        ca_user_id: UUID,
+        limit: int,
+        offset: int
+    ) -> Tuple[List[Any], int]:
+        """
+        Page of filings the CA can currently access, with dashboard columns.
+        Uses the same access rules as validate_ca_access.
+        """
+        return await self.assignment_repo.get_portfolio(
+            session, ca_user_id, datetime.now(timezone.utc), limit, offset
+        )
+
+    async def get_accessible_client_ids(
+        self,
+        session: AsyncSession,
+        ca_user_id: UUID,
+        financial_year: Optional[str] = None
+    ) -> List[UUID]:
+        """
+        Taxpayers the CA can currently act for (same rules as validate_ca_access),
+        optionally only through filings of one financial year.
+        """
+        return await self.assignment_repo.get_accessible_client_ids(
+            session, ca_user_id, datetime.now(timezone.utc), financial_year
+        )
+
     async def validate_ca_access(
         self,
         session: AsyncSession,
@@ -131,11 +163,20 @@ class CAAssignmentService:
         - Active Assignment Exists
         - Assigned to THIS CA
         - Underyling Consent is ACTIVE and UNEXPIRED within validation window
+        Assignment and consent are read in one joined query; a successful check
+        is cached (see CAAccessCache), and a cache hit returns a transient
+        CAAssignment that is not attached to the session.
         """
-        # 1. Fetch Assignment
-        assignment = await self.assignment_repo.get_by_filing_id(session, filing_id)
-        if not assignment:
+        cached = self.access_cache.get(ca_user_id, filing_id)
+        if cached is not None:
+            return CAAssignment(**cached)
+        generation = self.access_cache.generation
+
+        # 1. Fetch Assignment with its Consent
+        row = await self.assignment_repo.get_access_by_filing_id(session, filing_id)
+        if not row:
             raise UnauthorizedError("No assignment found for this filing")
+        assignment, consent_status, consent_expiry_at = row
 
         if assignment.ca_user_id != ca_user_id:
             raise UnauthorizedError("Not assigned to this filing")
@@ -143,15 +184,21 @@ class CAAssignmentService:
         if assignment.status != "ACTIVE":
             raise UnauthorizedError("Assignment is inactive")
 
-        # 2. Fetch & Validate Consent
-        consent = await self.consent_repo.get_by_id(session, assignment.consent_id)
-        if not consent:
+        # 2. Validate Consent
+        if consent_status is None:
             raise UnauthorizedError("Underlying consent missing")
 
-        if consent.status != "ACTIVE":
+        if consent_status != "ACTIVE":
             raise UnauthorizedError("Consent has been revoked or is inactive")
 
-        if consent.expiry_at <= datetime.now(timezone.utc):
+        if consent_expiry_at <= datetime.now(timezone.utc):
             raise UnauthorizedError("Consent has expired")
 
+        self.access_cache.put(
+            ca_user_id,
+            filing_id,
+            {column.key: getattr(assignment, column.key) for column in CAAssignment.__table__.columns},
+            consent_expiry_at,
+            generation
+        )
         return assignment
@@ -0,0 +1,173 @@
+import logging
+import time
+from typing import Callable, Dict, List, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.audit_repository import AuditLogRepository
+from app.repositories.compliance_repository import ComplianceFlagRepository
+from app.repositories.financial_repository import FinancialEntryRepository
+from app.services.audit_service import AuditService
+from app.services.compliance_service import ComplianceEngineService
+from app.services.periodic_worker import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+LedgerKey = Tuple[UUID, str]
+
+
+class ComplianceDirtySet:
+    """
+    In-memory set of (user_id, financial_year) pairs whose ledger changed
+    since their last compliance evaluation.
+    One slot per pair: repeated marks only refresh its timestamps.
+    Pairs whose evaluation failed wait out an exponential backoff before
+    they are settled again.
+    """
+
+    def __init__(self):
+        # key -> (first_marked_at, last_marked_at) on the monotonic clock
+        self._pending: Dict[LedgerKey, Tuple[float, float]] = {}
+        # key -> consecutive failed evaluations / end of the current backoff
+        self._failures: Dict[LedgerKey, int] = {}
+        self._retry_at: Dict[LedgerKey, float] = {}
+
+    def mark_dirty(self, user_id: UUID, financial_year: str) -> None:
+        """
+        Record a ledger change for a user and financial year.
+        """
+        now = time.monotonic()
+        key = (user_id, financial_year)
+        first_marked_at, _ = self._pending.get(key, (now, now))
+        self._pending[key] = (first_marked_at, now)
+
+    def mark_failed(
+        self, user_id: UUID, financial_year: str, retry_base_seconds: float, max_attempts: int
+    ) -> bool:
+        """
+        Record a failed evaluation. The pair is queued again behind a backoff of
+        retry_base_seconds * 2^(failures-1); after max_attempts consecutive
+        failures it is dropped instead. Returns whether it was queued again.
+        """
+        key = (user_id, financial_year)
+        failures = self._failures.get(key, 0) + 1
+        if failures >= max_attempts:
+            self._failures.pop(key, None)
+            self._retry_at.pop(key, None)
+            return False
+        self._failures[key] = failures
+        self._retry_at[key] = time.monotonic() + retry_base_seconds * 2 ** (failures - 1)
+        self.mark_dirty(user_id, financial_year)
+        return True
+
+    def mark_succeeded(self, user_id: UUID, financial_year: str) -> None:
+        """
+        Reset the failure count of a pair after a successful evaluation.
+        """
+        self._failures.pop((user_id, financial_year), None)
+
+    def pop_settled(
+        self, quiet_seconds: float, max_delay_seconds: float, ignore_backoff: bool = False
+    ) -> List[LedgerKey]:
+        """
+        Remove and return pairs that are ready for re-evaluation.
+        A pair is ready once no change arrived for quiet_seconds (debounce),
+        or once it has waited max_delay_seconds under a continuous burst,
+        and its retry backoff (if any) has run out.
+        """
+        now = time.monotonic()
+        ready = [
+            key for key, (first_marked_at, last_marked_at) in self._pending.items()
+            if (now - last_marked_at >= quiet_seconds or now - first_marked_at >= max_delay_seconds)
+            and (ignore_backoff or self._retry_at.get(key, now) <= now)
+        ]
+        for key in ready:
+            del self._pending[key]
+            self._retry_at.pop(key, None)
+        return ready
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+def _build_compliance_service() -> ComplianceEngineService:
+    return ComplianceEngineService(
+        FinancialEntryRepository(),
+        ComplianceFlagRepository(),
+        AuditService(AuditLogRepository())
+    )
+
+
+class ComplianceReevaluationWorker(PeriodicWorker):
+    """
+    Background worker draining the ComplianceDirtySet.
+    Each settled pair is evaluated once in its own session, so a burst of
+    ledger edits costs a single evaluation.
+    """
+
+    name = "Compliance re-evaluation worker"
+
+    def __init__(
+        self,
+        dirty_set: ComplianceDirtySet,
+        session_factory: Callable[[], AsyncSession],
+        service_factory: Callable[[], ComplianceEngineService] = _build_compliance_service,
+        debounce_seconds: float = settings.COMPLIANCE_REEVAL_DEBOUNCE_SECONDS,
+        max_delay_seconds: float = settings.COMPLIANCE_REEVAL_MAX_DELAY_SECONDS,
+        poll_interval_seconds: float = settings.COMPLIANCE_REEVAL_POLL_SECONDS,
+        retry_base_seconds: float = settings.COMPLIANCE_REEVAL_RETRY_BASE_SECONDS,
+        max_attempts: int = settings.COMPLIANCE_REEVAL_MAX_ATTEMPTS
+    ):
+        super().__init__(poll_interval_seconds)
+        self.dirty_set = dirty_set
+        self.session_factory = session_factory
+        self.service_factory = service_factory
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.max_attempts = max_attempts
+
+    async def run_once(self, flush: bool = False) -> int:
+        """
+        Evaluate every settled pair (every pending pair if flush is set).
+        Returns the number of evaluations run.
+        Failed pairs are retried with exponential backoff, and dropped after
+        max_attempts consecutive failures (a later ledger change queues them again).
+        """
+        if flush:
+            pairs = self.dirty_set.pop_settled(0, 0, ignore_backoff=True)
+        else:
+            pairs = self.dirty_set.pop_settled(self.debounce_seconds, self.max_delay_seconds)
+        if not pairs:
+            return 0
+
+        service = self.service_factory()
+        for user_id, financial_year in pairs:
+            try:
+                async with self.session_factory() as session:
+                    await service.evaluate_user(session, user_id, financial_year)
+                    await session.commit()
+            except Exception as e:
+                logger.error(f"Compliance re-evaluation failed for {user_id}/{financial_year}: {e}")
+                if not self.dirty_set.mark_failed(
+                    user_id, financial_year, self.retry_base_seconds, self.max_attempts
+                ):
+                    logger.error(
+                        f"Compliance re-evaluation for {user_id}/{financial_year} "
+                        f"given up after {self.max_attempts} attempts"
+                    )
+            else:
+                self.dirty_set.mark_succeeded(user_id, financial_year)
+        return len(pairs)
+
+    async def stop(self) -> None:
+        """
+        Cancel the polling loop and flush whatever is still pending.
+        """
+        await super().stop()
+        await self.run_once(flush=True)
+
+
+compliance_dirty_set = ComplianceDirtySet()
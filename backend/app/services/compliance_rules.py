@@ -2,14 +2,16 @@ from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
 from decimal import Decimal
 from app.models.financials import FinancialEntry
+from app.engines.ledger_snapshot import LedgerSnapshot, paise_to_rupees
 
 class BaseComplianceRule(ABC):
     """
     Abstract Base Class for Compliance Rules.
     Rules must be pure evaluators:
-    - Input: List of FinancialEntry objects.
+    - Input: List of FinancialEntry objects, or a columnar LedgerSnapshot.
     - Output: Violation Dict or None.
     - No DB access allowed.
+    Both evaluate paths must return identical results.
     """
     rule_code: str
     severity: str
@@ -22,6 +24,13 @@ class BaseComplianceRule(ABC):
         """
         pass
 
+    @abstractmethod
+    def evaluate_snapshot(self, snapshot: LedgerSnapshot) -> Optional[Dict[str, Any]]:
+        """
+        Vectorized equivalent of evaluate() over a LedgerSnapshot.
+        """
+        pass
+
 class HighTotalExpenseRule(BaseComplianceRule):
     """
     Flag if total expenses exceed a specific threshold (e.g., 50 Lakhs).
@@ -29,6 +38,7 @@ class HighTotalExpenseRule(BaseComplianceRule):
     rule_code = "C001"
     severity = "HIGH"
     THRESHOLD = Decimal("5000000.00")  # 50 Lakhs
+    THRESHOLD_PAISE = int(THRESHOLD * 100)
 
     def evaluate(self, entries: List[FinancialEntry]) -> Optional[Dict[str, Any]]:
         total_expenses = sum(
@@ -44,6 +54,17 @@ class HighTotalExpenseRule(BaseComplianceRule):
             }
         return None
 
+    def evaluate_snapshot(self, snapshot: LedgerSnapshot) -> Optional[Dict[str, Any]]:
+        total_expenses_paise = snapshot.total("EXPENSE")
+
+        if total_expenses_paise > self.THRESHOLD_PAISE:
+            return {
+                "flag_code": self.rule_code,
+                "severity": self.severity,
+                "description": f"Total expenses ({paise_to_rupees(total_expenses_paise)}) exceed high value threshold ({self.THRESHOLD})."
+            }
+        return None
+
 class ExpenseWithoutIncomeRule(BaseComplianceRule):
     """
     Flag if expenses exist but no income is recorded for the financial year.
@@ -65,3 +86,15 @@ class ExpenseWithoutIncomeRule(BaseComplianceRule):
                 "description": "Expenses recorded without any corresponding income for the financial year."
             }
         return None
+
+    def evaluate_snapshot(self, snapshot: LedgerSnapshot) -> Optional[Dict[str, Any]]:
+        has_expenses = bool(snapshot.type_mask("EXPENSE").any())
+        total_income = snapshot.total("INCOME")
+
+        if has_expenses and total_income == 0:
+            return {
+                "flag_code": self.rule_code,
+                "severity": self.severity,
+                "description": "Expenses recorded without any corresponding income for the financial year."
+            }
+        return None
@@ -1,4 +1,4 @@
-from typing import List, Type, Set, Optional
+from typing import List, Type, Optional, Dict, Any
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.compliance import ComplianceFlagResponse
@@ -36,48 +36,31 @@ class ComplianceEngineService:
         """
         Evaluate all registered rules for a user for a specific financial year.
         Persists flags if violations are found.
-        Idempotent: Checks for existing unresolved flags to prevent duplicates.
+        Idempotent: the partial unique index on unresolved flags makes the
+        database skip codes that are already open (resolved codes recur).
         """
-        # 1. Fetch Data (Pure Data for Rules)
-        entries = await self.financial_repo.get_by_user_id_and_year(session, user_id, financial_year)
-        
-        # 2. Fetch Existing Flags (Optimization: Fetch once)
-        existing_flags = await self.compliance_repo.get_by_user_id_and_year(session, user_id, financial_year)
-        
-        # Build set of unresolved flag codes
-        # Logic: If an unresolved flag exists for this code, we do NOT recreate it.
-        # If a resolved flag exists, we DO recreate it (recurrence).
-        existing_unresolved_codes: Set[str] = {
-            f.flag_code for f in existing_flags if not f.is_resolved
-        }
+        # 1. Fetch Data (Columnar Snapshot for Rules)
+        snapshot = await self.financial_repo.get_ledger_snapshot(session, user_id, financial_year)
+
+        # 2. Evaluate Rules (keyed by code so one batch never repeats a code)
+        violations: Dict[str, Dict[str, Any]] = {}
+        for RuleClass in self.rules:
+            rule = RuleClass()
+            violation = rule.evaluate_snapshot(snapshot)
+
+            if violation and violation['flag_code'] not in violations:
+                violations[violation['flag_code']] = {
+                    "financial_year": financial_year,
+                    "flag_code": violation['flag_code'],
+                    "description": violation['description'],
+                    "severity": violation['severity']
+                }
 
-        # 3. Explicit Transaction Block for Writes
-        try:
-            # 4. Iterate and Evaluate
-            for RuleClass in self.rules:
-                rule = RuleClass()
-                violation = rule.evaluate(entries)
+        if not violations:
+            return
 
-                if violation:
-                    flag_code = violation['flag_code']
-                    
-                    # 5. Check for Duplicates
-                    if flag_code not in existing_unresolved_codes:
-                        # Persist Flag
-                        flag_data = {
-                            "financial_year": financial_year,
-                            "flag_code": flag_code,
-                            "description": violation['description'],
-                            "severity": violation['severity']
-                        }
-                        await self.compliance_repo.create_flag(session, user_id, flag_data)
-                        
-                        # Add to local set to prevent duplicate inserts within same request (unlikely but safe)
-                        existing_unresolved_codes.add(flag_code)
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+        # 3. Persist in one round trip; conflicts with open flags are skipped
+        await self.compliance_repo.create_flags_if_absent(session, user_id, list(violations.values()))
 
     async def get_user_flags(self, session: AsyncSession, user_id: UUID, financial_year: str | None = None) -> List[ComplianceFlagResponse]: # Type hint will need import or just 'list'
         """
@@ -87,6 +70,12 @@ class ComplianceEngineService:
             return await self.compliance_repo.get_by_user_id_and_year(session, user_id, financial_year)
         return await self.compliance_repo.get_by_user_id(session, user_id)
 
+    async def get_flags_state(self, session: AsyncSession, user_id: UUID, financial_year: str | None = None) -> tuple:
+        """
+        Aggregate state of the user's flags (ETag validator).
+        """
+        return await self.compliance_repo.get_flags_state(session, user_id, financial_year)
+
     async def resolve_flag(
         self, 
         session: AsyncSession, 
@@ -98,41 +87,36 @@ class ComplianceEngineService:
         """
         Resolve a flag. Enforces ownership.
         """
-        try:
-            # 1. Fetch Flag
-            flag = await self.compliance_repo.get_by_id(session, flag_id)
+        # 1. Fetch Flag
+        flag = await self.compliance_repo.get_by_id(session, flag_id)
             
-            if not flag:
-                raise ValueError("Flag not found")
+        if not flag:
+            raise ValueError("Flag not found")
                 
-            if flag.user_id != user_id:
-                raise ValueError("Unauthorized to resolve this flag")
+        if flag.user_id != user_id:
+            raise ValueError("Unauthorized to resolve this flag")
             
-            # Capture state before
-            before_value = {
-                "id": str(flag.id),
-                "is_resolved": flag.is_resolved
-            }
+        # Capture state before
+        before_value = {
+            "id": str(flag.id),
+            "is_resolved": flag.is_resolved
+        }
 
-            # 2. Mark Resolved
-            resolved_flag = await self.compliance_repo.mark_resolved(session, flag_id, notes)
+        # 2. Mark Resolved
+        resolved_flag = await self.compliance_repo.mark_resolved(session, flag_id, notes)
             
-            # Audit Log
-            await self.audit_service.log_action(
-                session=session,
-                actor_id=user_id,
-                actor_role=actor_role,
-                action="COMPLIANCE_FLAG_RESOLVED",
-                before_value=before_value,
-                after_value={
-                    "id": str(resolved_flag.id),
-                    "is_resolved": True,
-                    "resolution_notes": notes
-                }
-            )
+        # Audit Log
+        await self.audit_service.log_action(
+            session=session,
+            actor_id=user_id,
+            actor_role=actor_role,
+            action="COMPLIANCE_FLAG_RESOLVED",
+            before_value=before_value,
+            after_value={
+                "id": str(resolved_flag.id),
+                "is_resolved": True,
+                "resolution_notes": notes
+            }
+        )
             
-            await session.commit()
-            return resolved_flag
-        except Exception:
-            await session.rollback()
-            raise
+        return resolved_flag
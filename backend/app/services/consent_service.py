@@ -5,8 +5,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.consent import ConsentArtifact, ConsentAuditLog
 from app.models.consent import ConsentArtifact, ConsentAuditLog
 from app.repositories.consent_repository import ConsentRepository, ConsentAuditRepository
+from app.repositories.unit_of_work import after_commit
 from app.core.exceptions import NotFoundError, UnauthorizedError, ValidationError
 
+from app.services.ca_access_cache import CAAccessCache, ca_access_cache
 from app.services.evidence_service import EvidenceService
 
 class ConsentService:
@@ -19,11 +21,13 @@ class ConsentService:
         self,
         consent_repo: ConsentRepository,
         audit_repo: ConsentAuditRepository,
-        evidence_service: EvidenceService
+        evidence_service: EvidenceService,
+        access_cache: CAAccessCache = ca_access_cache
     ):
         self.consent_repo = consent_repo
         self.audit_repo = audit_repo
         self.evidence_service = evidence_service
+        self.access_cache = access_cache
 
     async def grant_consent(
         self,
@@ -101,6 +105,8 @@ class ConsentService:
             raise ValidationError("Consent is not active")
 
         await self.consent_repo.update_status(session, consent_id, "REVOKED")
+        # Cached CA access checks backed by this consent end with the commit
+        after_commit(session, lambda: self.access_cache.invalidate_consent(consent_id))
         
         # Evidence Capture (Atomic)
         await self.evidence_service.capture_evidence(
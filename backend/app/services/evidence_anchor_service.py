@@ -0,0 +1,167 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import merkle
+from app.core.config import settings
+from app.core.exceptions import NotFoundError
+from app.models.evidence import EvidenceAnchor
+from app.repositories.evidence_anchor_repository import EvidenceAnchorRepository
+from app.repositories.evidence_repository import EvidenceRepository
+from app.services.periodic_worker import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+
+class EvidenceAnchorService:
+    """
+    Merkle anchoring of evidence records.
+    Records are batched in (created_at, id) order into trees whose roots are
+    chained, with records that committed behind the cursor swept into the
+    next batch; any single record can then be checked against its root with an
+    O(log n) inclusion proof instead of re-hashing the whole store.
+    """
+
+    def __init__(self, anchor_repo: EvidenceAnchorRepository, evidence_repo: EvidenceRepository):
+        self.anchor_repo = anchor_repo
+        self.evidence_repo = evidence_repo
+
+    async def anchor_pending(
+        self,
+        session: AsyncSession,
+        created_before: datetime,
+        max_leaves: int,
+        sweep_seconds: float = settings.EVIDENCE_ANCHOR_SWEEP_SECONDS
+    ) -> Optional[EvidenceAnchor]:
+        """
+        Anchor up to max_leaves records: first those up to sweep_seconds behind
+        the previous anchor's cursor that are still unanchored (their
+        transaction committed after the cursor passed them), then those after it.
+        Returns the new anchor, or None if nothing is pending.
+        """
+        previous = await self.anchor_repo.get_latest_anchor(session)
+        after = (previous.last_created_at, previous.last_record_id) if previous else None
+        late = []
+        if previous:
+            late = await self.evidence_repo.get_unanchored_behind(
+                session, after, previous.last_created_at - timedelta(seconds=sweep_seconds), max_leaves
+            )
+        new = []
+        if len(late) < max_leaves:
+            new = await self.evidence_repo.get_records_after(session, after, created_before, max_leaves - len(late))
+        records = late + new
+        if not records:
+            return None
+        # Late records sit behind the cursor, which only moves forward
+        last_created_at, last_record_id = (new[-1].created_at, new[-1].id) if new else after
+
+        levels = merkle.build_levels([merkle.leaf_hash(r.id, r.hash) for r in records])
+        root = levels[-1][0]
+        previous_chain_hash = previous.chain_hash if previous else merkle.GENESIS_CHAIN_HASH
+        sequence = previous.sequence + 1 if previous else 1
+
+        anchor = EvidenceAnchor(
+            sequence=sequence,
+            root_hash=root,
+            previous_chain_hash=previous_chain_hash,
+            chain_hash=merkle.chain_hash(previous_chain_hash, root),
+            leaf_count=len(records),
+            last_created_at=last_created_at,
+            last_record_id=last_record_id
+        )
+        nodes = [
+            {
+                "anchor_sequence": sequence,
+                "level": level,
+                "position": position,
+                "hash": node,
+                "record_id": records[position].id if level == 0 else None
+            }
+            for level, hashes in enumerate(levels)
+            for position, node in enumerate(hashes)
+        ]
+        # A concurrent anchorer claiming the same sequence fails on the primary key
+        await self.anchor_repo.create_anchor(session, anchor, nodes)
+        await session.commit()
+        return anchor
+
+    async def get_inclusion_proof(self, session: AsyncSession, evidence_id: UUID) -> Dict[str, Any]:
+        """
+        Inclusion proof of one record in its anchored tree.
+        'verified' reports whether the record's current hash still reproduces the root.
+        """
+        record = await self.evidence_repo.get_by_id(session, evidence_id)
+        if not record:
+            raise NotFoundError("Evidence record not found")
+        leaf = await self.anchor_repo.get_leaf(session, evidence_id)
+        if not leaf:
+            raise NotFoundError("Evidence record has not been anchored yet")
+        anchor = await self.anchor_repo.get_anchor(session, leaf.anchor_sequence)
+
+        positions = merkle.proof_positions(leaf.position, anchor.leaf_count)
+        siblings = await self.anchor_repo.get_nodes(session, anchor.sequence, positions)
+        proof = [
+            {"side": "left" if position < position ^ 1 else "right", "hash": siblings[(level, position)]}
+            for level, position in positions
+        ]
+
+        current_leaf = merkle.leaf_hash(record.id, record.hash)
+        computed_root = merkle.root_from_proof(current_leaf, [(step["side"], step["hash"]) for step in proof])
+        return {
+            "evidence_id": record.id,
+            "evidence_hash": record.hash,
+            "leaf_hash": current_leaf,
+            "leaf_index": leaf.position,
+            "proof": proof,
+            "anchor": anchor,
+            "verified": current_leaf == leaf.hash and computed_root == anchor.root_hash
+        }
+
+
+class EvidenceAnchorWorker(PeriodicWorker):
+    """
+    Background worker anchoring new evidence records every interval.
+    Records younger than the settle window wait for the next pass, so most
+    transactions commit before the cursor reaches them; the sweep behind the
+    cursor anchors those that commit later still.
+    Records still pending at stop() are anchored after the next start.
+    """
+
+    name = "Evidence anchor worker"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        service: Optional[EvidenceAnchorService] = None,
+        interval_seconds: float = settings.EVIDENCE_ANCHOR_INTERVAL_SECONDS,
+        max_leaves: int = settings.EVIDENCE_ANCHOR_MAX_LEAVES,
+        settle_seconds: float = settings.EVIDENCE_ANCHOR_SETTLE_SECONDS,
+        sweep_seconds: float = settings.EVIDENCE_ANCHOR_SWEEP_SECONDS
+    ):
+        super().__init__(interval_seconds)
+        self.session_factory = session_factory
+        self.service = service or EvidenceAnchorService(EvidenceAnchorRepository(), EvidenceRepository())
+        self.max_leaves = max_leaves
+        self.settle_seconds = settle_seconds
+        self.sweep_seconds = sweep_seconds
+
+    async def run_once(self) -> int:
+        """
+        Anchor everything pending, max_leaves per tree. Returns the number of anchors created.
+        """
+        created_before = datetime.now(timezone.utc) - timedelta(seconds=self.settle_seconds)
+        created = 0
+        while True:
+            async with self.session_factory() as session:
+                anchor = await self.service.anchor_pending(
+                    session, created_before, self.max_leaves, self.sweep_seconds
+                )
+            if anchor is None:
+                return created
+            created += 1
+            logger.info(f"Anchored {anchor.leaf_count} evidence records as #{anchor.sequence} (root {anchor.root_hash})")
+            if anchor.leaf_count < self.max_leaves:
+                return created
@@ -0,0 +1,108 @@
+import logging
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.core.evidence_codec import EvidenceCodec
+from app.repositories.evidence_repository import EvidenceRepository
+from app.services.storage_backends import StorageService
+
+logger = logging.getLogger(__name__)
+
+
+def evidence_blob_path(file_hash: str) -> str:
+    """
+    Content-addressed location of an evidence blob.
+    Structure: evidence/blobs/{hash[:2]}/{hash}.json
+    """
+    return f"evidence/blobs/{file_hash[:2]}/{file_hash}.json"
+
+
+class EvidenceBlobStore:
+    """
+    Content-addressed writes on top of the configured storage backend.
+    An in-memory Bloom filter of known hashes decides whether an existence
+    check is worth making: unseen content is written straight away, likely
+    duplicates cost one stat instead of a rewrite.
+
+    With compression on, blobs are stored through the EvidenceCodec using the
+    action type's trained dictionary; get() always returns the canonical bytes.
+    """
+
+    def __init__(
+        self,
+        storage_service: StorageService,
+        index: Optional[BloomFilter] = None,
+        codec: Optional[EvidenceCodec] = None,
+        compress: Optional[bool] = None
+    ):
+        self.storage_service = storage_service
+        self.index = index if index is not None else evidence_blob_index
+        self.codec = codec if codec is not None else evidence_codec
+        self.compress = settings.EVIDENCE_COMPRESSION_ENABLED if compress is None else compress
+
+    async def put(self, relative_path: str, file_hash: str, data: bytes, action_type: Optional[str] = None) -> bool:
+        """
+        Store a blob unless identical content is already at relative_path.
+        `data` is the canonical content (what file_hash is computed over).
+        Returns True if bytes were written.
+        """
+        if file_hash in self.index and await self.storage_service.exists(relative_path):
+            return False
+        stored = self.codec.encode(data, action_type) if self.compress else data
+        await self.storage_service.write_blob(relative_path, stored)
+        self.index.add(file_hash)
+        return True
+
+    async def get(self, relative_path: str) -> bytes:
+        """
+        Canonical content of a blob, decompressed if it was stored compressed.
+        """
+        return self.codec.decode(await self.storage_service.read_blob(relative_path))
+
+
+async def warm_evidence_blob_index(
+    session_factory: Callable[[], AsyncSession],
+    index: Optional[BloomFilter] = None,
+    repo: Optional[EvidenceRepository] = None
+) -> int:
+    """
+    Load every known evidence hash into the Bloom filter. Returns the number loaded.
+    """
+    index = index if index is not None else evidence_blob_index
+    repo = repo or EvidenceRepository()
+    loaded = 0
+    async with session_factory() as session:
+        async for file_hash in repo.stream_hashes(session):
+            index.add(file_hash)
+            loaded += 1
+    if loaded > index.capacity:
+        logger.warning(
+            f"Evidence blob index holds {loaded} hashes, above its capacity of {index.capacity}; "
+            "raise EVIDENCE_BLOOM_CAPACITY to keep the false-positive rate down"
+        )
+    return loaded
+
+
+async def load_evidence_dictionaries(
+    session_factory: Callable[[], AsyncSession],
+    codec: Optional[EvidenceCodec] = None,
+    repo: Optional[EvidenceRepository] = None
+) -> int:
+    """
+    Load every compression dictionary; the newest per action type becomes active.
+    Returns the number loaded.
+    """
+    codec = codec if codec is not None else evidence_codec
+    repo = repo or EvidenceRepository()
+    async with session_factory() as session:
+        dictionaries = await repo.get_dictionaries(session)
+    for dictionary in dictionaries:
+        codec.add_dictionary(dictionary.content, dictionary.action_type)
+    return len(dictionaries)
+
+
+evidence_blob_index = BloomFilter(settings.EVIDENCE_BLOOM_CAPACITY, settings.EVIDENCE_BLOOM_ERROR_RATE)
+evidence_codec = EvidenceCodec(settings.EVIDENCE_COMPRESSION_LEVEL)
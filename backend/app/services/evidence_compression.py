@@ -0,0 +1,123 @@
+"""
+Evidence compression dictionaries.
+
+Trains a deflate dictionary per evidence action type from recently stored
+blobs, persists it, and activates it for new blobs of that type.
+
+Train once enough evidence of a type exists, and again when its payloads change
+shape; existing blobs keep the dictionary they were written with:
+    python -m app.services.evidence_compression [--action-type consent:grant ...] [--samples N]
+Prints one report per dictionary trained; types without enough samples are skipped.
+"""
+import argparse
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.evidence_codec import EvidenceCodec, dictionary_id, train_dictionary
+from app.models.evidence import EvidenceCompressionDictionary
+from app.repositories.evidence_repository import EvidenceRepository
+from app.services.evidence_blob_store import EvidenceBlobStore, evidence_codec, load_evidence_dictionaries
+from app.services.storage_backends import StorageService, get_storage_service
+
+logger = logging.getLogger(__name__)
+
+# Action types captured by the services (urn:{entity}:{id}:{action})
+EVIDENCE_ACTION_TYPES = (
+    "consent:grant",
+    "consent:revoke",
+    "assignment:assign",
+    "filing:approval",
+    "filing:submission",
+)
+
+
+class EvidenceDictionaryTrainer:
+    """
+    Trains, persists and activates per-action-type compression dictionaries.
+    """
+
+    def __init__(
+        self,
+        repo: EvidenceRepository,
+        storage_service: StorageService,
+        codec: Optional[EvidenceCodec] = None
+    ):
+        self.repo = repo
+        self.codec = codec if codec is not None else evidence_codec
+        self.blob_store = EvidenceBlobStore(storage_service, codec=self.codec, compress=False)
+
+    async def _load_samples(self, session: AsyncSession, action_type: str, sample_size: int) -> List[bytes]:
+        entity, action = action_type.split(":", 1)
+        records = await self.repo.get_recent_by_action_type(session, entity, action, sample_size)
+        samples = []
+        for location in dict.fromkeys(record.storage_location for record in records):
+            try:
+                samples.append(await self.blob_store.get(location))
+            except FileNotFoundError:
+                logger.warning(f"Skipping missing evidence blob {location}")
+        return samples
+
+    async def train(
+        self,
+        session: AsyncSession,
+        action_type: str,
+        sample_size: int = settings.EVIDENCE_DICTIONARY_SAMPLES,
+        dictionary_size: int = settings.EVIDENCE_DICTIONARY_SIZE
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Train and activate a dictionary for one action type.
+        Returns the sizes of the sample set stored raw, with plain deflate and
+        with the new dictionary; None if there are too few samples to train on.
+        """
+        samples = await self._load_samples(session, action_type, sample_size)
+        if len(samples) < 2:
+            return None
+
+        content = train_dictionary(samples, dictionary_size)
+        plain_bytes = EvidenceCodec(self.codec.level).compressed_size(samples)
+        await self.repo.create_dictionary(session, EvidenceCompressionDictionary(
+            id=dictionary_id(content),
+            action_type=action_type,
+            content=content,
+            sample_count=len(samples)
+        ))
+        await session.commit()
+        dict_id = self.codec.add_dictionary(content, action_type)
+
+        return {
+            "action_type": action_type,
+            "dictionary_id": dict_id,
+            "dictionary_bytes": len(content),
+            "samples": len(samples),
+            "raw_bytes": sum(len(sample) for sample in samples),
+            "plain_deflate_bytes": plain_bytes,
+            "dictionary_deflate_bytes": self.codec.compressed_size(samples, action_type)
+        }
+
+
+async def _main(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from app.core.database import async_session_factory
+
+    await load_evidence_dictionaries(async_session_factory)
+    trainer = EvidenceDictionaryTrainer(EvidenceRepository(), get_storage_service())
+    reports = []
+    async with async_session_factory() as session:
+        for action_type in args.action_type or EVIDENCE_ACTION_TYPES:
+            report = await trainer.train(session, action_type, args.samples)
+            if report is None:
+                logger.warning(f"Not enough evidence to train a dictionary for {action_type}")
+            else:
+                reports.append(report)
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train evidence compression dictionaries.")
+    parser.add_argument("--action-type", action="append", help="entity:action (repeatable); defaults to all known types")
+    parser.add_argument("--samples", type=int, default=settings.EVIDENCE_DICTIONARY_SAMPLES)
+    print(json.dumps(asyncio.run(_main(parser.parse_args())), indent=2))
@@ -0,0 +1,204 @@
+"""
+Evidence retention purge.
+
+Deletes evidence records whose retention has expired, then the blobs no
+remaining record references.
+
+The app's EvidencePurgeWorker runs this on an interval; to purge by hand
+(e.g. before a storage migration) run, from backend/:
+    python -m app.services.evidence_purge_service [--as-of YYYY-MM-DD] [--batch-size N]
+An interrupted run is safe to repeat. Prints the run's totals.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.evidence_repository import EvidenceRepository
+from app.services.periodic_worker import PeriodicWorker
+from app.services.storage_backends import StorageService, get_storage_service
+
+logger = logging.getLogger(__name__)
+
+
+class _Pacer:
+    """
+    Spaces calls at least 1/rate seconds apart (rate <= 0 disables pacing).
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self._next > now:
+            await asyncio.sleep(self._next - now)
+            now = self._next
+        self._next = now + self.interval
+
+
+class EvidencePurgeService:
+    """
+    Purges evidence past its retention_expiry, in bounded transactions.
+
+    1. Records: each batch locks up to batch_size expired records (skipping
+       rows a concurrent purge holds), deletes them and releases their blob
+       references in one transaction. Legacy per-record files left unreferenced
+       are deleted once it commits.
+    2. Blobs: unreferenced blobs are locked a batch at a time, their bytes
+       deleted and their rows removed in one transaction. A capture of the same
+       content waits on the row lock and then registers (and writes) it afresh,
+       and an interrupted batch is simply picked up again by the next run.
+
+    Storage deletes are paced to max_deletes_per_second, with a pause between batches.
+    """
+
+    def __init__(
+        self,
+        repo: EvidenceRepository,
+        storage_service: StorageService,
+        batch_size: int = settings.EVIDENCE_PURGE_BATCH_SIZE,
+        batch_pause_seconds: float = settings.EVIDENCE_PURGE_BATCH_PAUSE_SECONDS,
+        max_deletes_per_second: float = settings.EVIDENCE_PURGE_MAX_DELETES_PER_SECOND
+    ):
+        self.repo = repo
+        self.storage_service = storage_service
+        self.batch_size = batch_size
+        self.batch_pause_seconds = batch_pause_seconds
+        self.pacer = _Pacer(max_deletes_per_second)
+
+    async def _delete_from_storage(self, locations: Iterable[str]) -> Dict[str, int]:
+        counts = {"deleted": 0, "missing": 0}
+        for location in locations:
+            await self.pacer.wait()
+            if await self.storage_service.delete_blob(location):
+                counts["deleted"] += 1
+            else:
+                counts["missing"] += 1
+        return counts
+
+    async def purge_expired_records(self, session: AsyncSession, as_of: date) -> Optional[Dict[str, int]]:
+        """
+        Purge one batch of expired records. Returns its counts, or None if nothing has expired.
+        """
+        records = await self.repo.get_expired_records(session, as_of, self.batch_size)
+        if not records:
+            return None
+        released = Counter(record.hash for record in records)
+        locations = {record.storage_location for record in records}
+
+        await self.repo.delete_records(session, [record.id for record in records])
+        await self.repo.release_blobs(session, released)
+        await session.commit()
+
+        # Shared blobs stay registered (ref_count 0 at worst) and are left to
+        # purge_unreferenced_blobs; only stray legacy files are deleted here
+        referenced = await self.repo.get_referenced_locations(session, list(released), list(locations))
+        await session.commit()
+        files = await self._delete_from_storage(sorted(locations - referenced))
+        return {"records": len(records), "legacy_files_deleted": files["deleted"]}
+
+    async def purge_unreferenced_blobs(self, session: AsyncSession) -> Optional[Dict[str, int]]:
+        """
+        Delete one batch of unreferenced blobs. Returns its counts, or None if there are none.
+        """
+        blobs = await self.repo.get_unreferenced_blobs(session, self.batch_size)
+        if not blobs:
+            return None
+        counts = await self._delete_from_storage(blob.storage_location for blob in blobs)
+        await self.repo.delete_blobs(session, [blob.hash for blob in blobs])
+        await session.commit()
+        return {"blobs_deleted": counts["deleted"], "blobs_missing": counts["missing"]}
+
+    async def run(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        as_of: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Purge everything expired as of `as_of` (default today), batch by batch.
+        Progress is logged per batch; returns the totals.
+        """
+        as_of = as_of or date.today()
+        started = time.monotonic()
+        totals = {"records": 0, "legacy_files_deleted": 0, "blobs_deleted": 0, "blobs_missing": 0, "batches": 0}
+
+        for step in (
+            lambda session: self.purge_expired_records(session, as_of),
+            self.purge_unreferenced_blobs
+        ):
+            while True:
+                async with session_factory() as session:
+                    batch = await step(session)
+                if batch is None:
+                    break
+                totals["batches"] += 1
+                for key, value in batch.items():
+                    totals[key] += value
+                elapsed = time.monotonic() - started
+                logger.info(
+                    f"Evidence purge progress: {totals['records']} records, "
+                    f"{totals['blobs_deleted'] + totals['legacy_files_deleted']} blobs deleted "
+                    f"in {totals['batches']} batches ({totals['records'] / max(elapsed, 1e-9):.0f} records/s)"
+                )
+                if self.batch_pause_seconds:
+                    await asyncio.sleep(self.batch_pause_seconds)
+
+        totals["elapsed_seconds"] = round(time.monotonic() - started, 3)
+        if totals["blobs_missing"]:
+            logger.warning(f"Evidence purge: {totals['blobs_missing']} unreferenced blobs were already missing from storage")
+        return totals
+
+
+class EvidencePurgeWorker(PeriodicWorker):
+    """
+    Background worker running the retention purge every interval.
+    The totals of the last completed run are kept in last_report. Blobs of
+    a batch interrupted by stop() are deleted on the next run.
+    """
+
+    name = "Evidence purge worker"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        service: Optional[EvidencePurgeService] = None,
+        interval_seconds: float = settings.EVIDENCE_PURGE_INTERVAL_SECONDS
+    ):
+        super().__init__(interval_seconds)
+        self.session_factory = session_factory
+        self.service = service or EvidencePurgeService(EvidenceRepository(), get_storage_service())
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    async def run_once(self) -> Dict[str, Any]:
+        """
+        Purge everything currently expired. Returns the run's totals.
+        """
+        self.last_report = await self.service.run(self.session_factory)
+        if self.last_report["records"] or self.last_report["blobs_deleted"]:
+            logger.info(f"Evidence purge finished: {self.last_report}")
+        return self.last_report
+
+
+async def _main(args: argparse.Namespace) -> Dict[str, Any]:
+    from app.core.database import async_session_factory
+
+    service = EvidencePurgeService(EvidenceRepository(), get_storage_service(), batch_size=args.batch_size)
+    return await service.run(async_session_factory, args.as_of)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Purge evidence past its retention expiry.")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None, help="purge records expiring on or before this date")
+    parser.add_argument("--batch-size", type=int, default=settings.EVIDENCE_PURGE_BATCH_SIZE)
+    print(json.dumps(asyncio.run(_main(parser.parse_args())), indent=2))
@@ -1,28 +1,43 @@
-import json
 import hashlib
-from datetime import datetime, timedelta, date, timezone
-from typing import Any, Dict, Union
+from datetime import timedelta, date
+from typing import Any, Dict, Optional, Union
 from uuid import UUID
 
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.canonical_json import canonical_json
+from app.core.evidence_codec import UnknownDictionaryError, evidence_action_type
+from app.core.exceptions import NotFoundError
 from app.models.evidence import EvidenceRecord
 from app.repositories.evidence_repository import EvidenceRepository
-from app.services.file_storage_service import FileStorageService
+from app.repositories.outbox_repository import OutboxRepository
+from app.services.storage_backends import StorageService
+from app.services.evidence_blob_store import EvidenceBlobStore, evidence_blob_path
+
+EVIDENCE_BLOB_EVENT = "EVIDENCE_BLOB"
 
 class EvidenceService:
     """
     Service for capturing and verifying evidence.
     Core Logic: Canonicalization, Hashing, Persistence.
+    Blobs are content-addressed and reference counted: identical payloads share
+    one blob and only the first reference writes it. Nothing in the request
+    path checks storage; a lost blob is found by the integrity verification
+    job, which re-arms its outbox write if that write gave up.
+    With an outbox repository, blob writes are deferred to the OutboxDispatcher
+    (same transaction as the record); without one they are written inline.
     """
     def __init__(
         self, 
         repo: EvidenceRepository, 
-        storage_service: FileStorageService
+        storage_service: StorageService,
+        outbox_repo: Optional[OutboxRepository] = None
     ):
         self.repo = repo
         self.storage_service = storage_service
+        self.outbox_repo = outbox_repo
+        self.blob_store = EvidenceBlobStore(storage_service)
 
     def _canonicalize(self, payload: Union[Dict[str, Any], BaseModel]) -> bytes:
         """
@@ -30,20 +45,15 @@ class EvidenceService:
         - Sorts keys
         - UTF-8 encoding
         - Ensures no whitespace around separators
+        Byte-identical to json.dumps(sort_keys=True, ensure_ascii=False,
+        separators=(',', ':')), so existing hashes stay valid.
         """
         if isinstance(payload, BaseModel):
             data = payload.model_dump(mode='json')
         else:
             data = payload
 
-        # sort_keys=True is critical for deterministic hashing
-        json_str = json.dumps(
-            data, 
-            sort_keys=True, 
-            ensure_ascii=False, 
-            separators=(',', ':')
-        )
-        return json_str.encode('utf-8')
+        return canonical_json(data)
 
     def _compute_hash(self, data: bytes) -> str:
         """
@@ -73,17 +83,31 @@ class EvidenceService:
         # 1. Canonicalize & Hash
         canonical_bytes = self._canonicalize(payload)
         file_hash = self._compute_hash(canonical_bytes)
+        action_type = evidence_action_type(action_urn)
         
         # 2. Determine Retention
         expiry_date = date.today() + timedelta(days=365 * retention_years)
         
-        # 3. Determine Storage Path
-        # Structure: evidence/{YYYY}/{MM}/{hash}.json
-        now = datetime.now(timezone.utc)
-        relative_path = f"evidence/{now.year}/{now.month:02d}/{file_hash}.json"
+        # 3. Reference the content-addressed blob (shared by identical payloads)
+        relative_path, ref_count = await self.repo.acquire_blob(session, file_hash, evidence_blob_path(file_hash))
         
-        # 4. Write Blob (File System)
-        await self.storage_service.write_blob(relative_path, canonical_bytes)
+        # 4. First reference: write the blob (File System), or enqueue it for
+        # the dispatcher. Later references write nothing.
+        if ref_count == 1:
+            if self.outbox_repo is not None:
+                await self.outbox_repo.enqueue(
+                    session,
+                    event_type=EVIDENCE_BLOB_EVENT,
+                    dedup_key=action_urn,
+                    payload={
+                        "storage_location": relative_path,
+                        "hash": file_hash,
+                        "action_type": action_type,
+                        "content": canonical_bytes.decode("utf-8")
+                    }
+                )
+            else:
+                await self.blob_store.put(relative_path, file_hash, canonical_bytes, action_type)
         
         # 5. Persist Metadata (Database)
         evidence = EvidenceRecord(
@@ -94,3 +118,18 @@ class EvidenceService:
         )
         
         return await self.repo.create_record(session, evidence)
+
+    async def read_evidence(self, session: AsyncSession, evidence_id: UUID) -> bytes:
+        """
+        Canonical bytes of an evidence record's blob (decompressed if stored compressed).
+        A dictionary trained on another host since startup is loaded on demand.
+        """
+        evidence = await self.repo.get_by_id(session, evidence_id)
+        if not evidence:
+            raise NotFoundError("Evidence record not found")
+        try:
+            return await self.blob_store.get(evidence.storage_location)
+        except UnknownDictionaryError:
+            for dictionary in await self.repo.get_dictionaries(session):
+                self.blob_store.codec.add_dictionary(dictionary.content)
+            return await self.blob_store.get(evidence.storage_location)
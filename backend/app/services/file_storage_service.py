@@ -1,6 +1,7 @@
 import os
 import aiofiles
 from pathlib import Path
+from typing import Optional, Tuple
 
 class FileStorageService:
     """
@@ -23,3 +24,36 @@ class FileStorageService:
             await f.write(data)
             
         return str(full_path)
+
+    async def read_blob(self, relative_path: str) -> bytes:
+        """
+        Read a blob's bytes. Raises FileNotFoundError if absent.
+        """
+        async with aiofiles.open(self.storage_root / relative_path, 'rb') as f:
+            return await f.read()
+
+    async def exists(self, relative_path: str) -> bool:
+        """
+        Check whether a blob is present.
+        """
+        return (self.storage_root / relative_path).is_file()
+
+    async def delete_blob(self, relative_path: str) -> bool:
+        """
+        Remove a blob. Returns False if it was already absent.
+        """
+        try:
+            (self.storage_root / relative_path).unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def locate(self, relative_path: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Physical location of a blob as (file path, offset, length), or None if absent.
+        """
+        full_path = self.storage_root / relative_path
+        try:
+            return str(full_path), 0, full_path.stat().st_size
+        except FileNotFoundError:
+            return None
@@ -9,7 +9,7 @@ from app.repositories.itr_repository import ITRDeterminationRepository
 from app.services.audit_service import AuditService
 from app.services.evidence_service import EvidenceService
 
-from app.core.exceptions import NotFoundError, UnauthorizedError, ValidationError
+from app.core.exceptions import NotFoundError, UnauthorizedError, ValidationError, ConflictError
 from app.repositories.confirmation_repository import ConfirmationRepository
 from app.models.filing import UserConfirmation
 
@@ -25,6 +25,9 @@ class FilingCaseService:
     STATE_LOCKED = "LOCKED"
     STATE_SUBMITTED = "SUBMITTED"
 
+    # Version-conflict retries before a transition gives up with ConflictError
+    TRANSITION_MAX_ATTEMPTS = 3
+
     def __init__(
         self, 
         filing_repo: FilingCaseRepository,
@@ -53,6 +56,24 @@ class FilingCaseService:
         """
         return await self.filing_repo.get_by_user_and_year(session, user_id, financial_year)
 
+    async def get_case_state(self, session: AsyncSession, user_id: UUID, financial_year: str) -> Optional[tuple]:
+        """
+        Version columns of a filing case (ETag validator).
+        """
+        return await self.filing_repo.get_state_by_user_and_year(session, user_id, financial_year)
+
+    async def get_assigned_case(self, session: AsyncSession, ca_user_id: UUID, financial_year: str) -> Optional[FilingCase]:
+        """
+        Retrieve the filing case assigned to a CA.
+        """
+        return await self.filing_repo.get_assigned_to_ca(session, ca_user_id, financial_year)
+
+    async def get_assigned_case_state(self, session: AsyncSession, ca_user_id: UUID, financial_year: str) -> Optional[tuple]:
+        """
+        Version columns of the filing case assigned to a CA (ETag validator).
+        """
+        return await self.filing_repo.get_assigned_state(session, ca_user_id, financial_year)
+
     async def create_case(
         self, 
         session: AsyncSession, 
@@ -86,37 +107,32 @@ class FilingCaseService:
             raise ValidationError(f"Filing Case already exists for {financial_year}")
 
         # 3. Create New Case
-        try:
-            new_case = FilingCase(
-                user_id=user_id,
-                financial_year=financial_year,
-                itr_determination_id=itr_determination_id,
-                current_state=self.STATE_DRAFT,
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc)
-            )
+        new_case = FilingCase(
+            user_id=user_id,
+            financial_year=financial_year,
+            itr_determination_id=itr_determination_id,
+            current_state=self.STATE_DRAFT,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc)
+        )
             
-            created_case = await self.filing_repo.create_case(session, new_case)
+        created_case = await self.filing_repo.create_case(session, new_case)
             
-            # 4. Audit Log
-            await self.audit_service.log_action(
-                session=session,
-                actor_id=user_id,
-                actor_role=actor_role,
-                action="FILING_CASE_CREATED",
-                after_value={
-                    "id": str(created_case.id),
-                    "financial_year": financial_year,
-                    "itr_determination_id": str(itr_determination_id),
-                    "current_state": self.STATE_DRAFT
-                }
-            )
+        # 4. Audit Log
+        await self.audit_service.log_action(
+            session=session,
+            actor_id=user_id,
+            actor_role=actor_role,
+            action="FILING_CASE_CREATED",
+            after_value={
+                "id": str(created_case.id),
+                "financial_year": financial_year,
+                "itr_determination_id": str(itr_determination_id),
+                "current_state": self.STATE_DRAFT
+            }
+        )
             
-            await session.commit()
-            return created_case
-        except Exception:
-            await session.rollback()
-            raise
+        return created_case
 
     async def approve_filing(
         self,
@@ -144,76 +160,69 @@ class FilingCaseService:
              raise ValidationError("Filing is not ready for approval")
 
         # 4. Create Confirmation Artifact
-        try:
-            confirmation = UserConfirmation(
-                filing_id=filing_id,
-                confirmation_type="FILING_APPROVAL",
-                confirmed_by=user_id,
-                ip_address=ip_address,
-                confirmed_at=datetime.now(timezone.utc)
-            )
+        confirmation = UserConfirmation(
+            filing_id=filing_id,
+            confirmation_type="FILING_APPROVAL",
+            confirmed_by=user_id,
+            ip_address=ip_address,
+            confirmed_at=datetime.now(timezone.utc)
+        )
             
-            await self.confirmation_repo.create_confirmation(session, confirmation)
+        await self.confirmation_repo.create_confirmation(session, confirmation)
             
-            # 5. Transition to LOCKED (via internal helper to reuse logic/audit)
-            # We manually call transition here because this IS the transition
-            before_value = {"id": str(case.id), "current_state": case.current_state}
+        # 5. Transition to LOCKED (via internal helper to reuse logic/audit)
+        # We manually call transition here because this IS the transition
+        before_value = {"id": str(case.id), "current_state": case.current_state}
             
-            updates = {
-                 "current_state": self.STATE_LOCKED,
-                 "updated_at": datetime.now(timezone.utc)
-            }
+        updates = {
+             "current_state": self.STATE_LOCKED,
+             "updated_at": datetime.now(timezone.utc)
+        }
             
-            updated_case = await self.filing_repo.update_case(session, case, updates)
+        updated_case = await self.filing_repo.update_case_if_version(session, case.id, case.version, updates)
+        if not updated_case:
+            raise ConflictError("Filing Case was modified concurrently. Please retry.")
 
-            # 6. Capture Evidence of Approval
-            await self.evidence_service.capture_evidence(
-                session=session,
-                payload={
-                    "filing_id": str(updated_case.id),
-                    "action": "TAXPAYER_APPROVAL",
-                    "confirmed_by": str(user_id),
-                    "ip_address": ip_address,
-                    "timestamp": confirmation.confirmed_at.isoformat()
-                },
-                action_urn=f"urn:filing:{updated_case.id}:approval"
-            )
+        # 6. Capture Evidence of Approval
+        await self.evidence_service.capture_evidence(
+            session=session,
+            payload={
+                "filing_id": str(updated_case.id),
+                "action": "TAXPAYER_APPROVAL",
+                "confirmed_by": str(user_id),
+                "ip_address": ip_address,
+                "timestamp": confirmation.confirmed_at.isoformat()
+            },
+            action_urn=f"urn:filing:{updated_case.id}:approval"
+        )
             
-            # 7. Audit Log
-            await self.audit_service.log_action(
-                session=session,
-                actor_id=user_id,
-                actor_role="INDIVIDUAL", # Taxpayer is always INDIVIDUAL/BUSINESS owner
-                action="FILING_APPROVED",
-                before_value=before_value,
-                after_value={"id": str(updated_case.id), "current_state": self.STATE_LOCKED}
-            )
+        # 7. Audit Log (via outbox; one entry per case version)
+        await self.audit_service.enqueue_action(
+            session=session,
+            actor_id=user_id,
+            actor_role="INDIVIDUAL", # Taxpayer is always INDIVIDUAL/BUSINESS owner
+            action="FILING_APPROVED",
+            before_value=before_value,
+            after_value={"id": str(updated_case.id), "current_state": self.STATE_LOCKED},
+            dedup_key=f"urn:filing:{updated_case.id}:v{updated_case.version}:audit"
+        )
             
-            await session.commit()
-            return updated_case
-        except Exception:
-            await session.rollback()
-            raise
+        return updated_case
 
 
-    async def transition_state(
-        self, 
-        session: AsyncSession, 
-        filing_id: UUID,
-        actor_id: UUID, 
+    async def _authorize_transition(
+        self,
+        session: AsyncSession,
+        case: FilingCase,
+        actor_id: UUID,
         next_state: str,
         actor_role: str
-    ) -> FilingCase:
+    ) -> Optional[str]:
         """
-        Move the case to the next state.
-        Enforces Strict State Machine Logic.
+        Validate a transition of `case` (as currently loaded) to next_state.
+        Raises on a disallowed move; returns the approval confirmation reference
+        required for CA submissions (None otherwise).
         """
-        # 1. Fetch
-        case = await self.filing_repo.get_by_id(session, filing_id)
-        if not case:
-            raise NotFoundError("Filing Case not found")
-
-        # 2. Strict Role Enforcement & Transitions
         current_state = case.current_state
 
         # A. DRAFT -> READY_FOR_REVIEW
@@ -250,7 +259,7 @@ class FilingCaseService:
              pass # Logic covered by strict state machine below
 
         
-        # 3. Validate Transition Path
+        # Validate Transition Path
         allowed_next = self._transitions.get(current_state, set())
         
         if next_state not in allowed_next:
@@ -266,71 +275,96 @@ class FilingCaseService:
                 if not confirmation:
                     raise ValidationError("Missing Taxpayer Approval Confirmation for this filing")
                 
-                submission_confirmation_ref = str(confirmation.id)
-        else:
-                submission_confirmation_ref = None
+                return str(confirmation.id)
+        return None
 
+    async def transition_state(
+        self, 
+        session: AsyncSession, 
+        filing_id: UUID,
+        actor_id: UUID, 
+        next_state: str,
+        actor_role: str
+    ) -> FilingCase:
+        """
+        Move the case to the next state.
+        Enforces Strict State Machine Logic.
+        Optimistic concurrency: the state change is a single version-checked
+        UPDATE ... RETURNING. If a concurrent writer bumped the version, the case is
+        re-read and re-validated, up to TRANSITION_MAX_ATTEMPTS; then ConflictError (409).
+        No row lock is held while evidence is captured.
+        """
+        for attempt in range(self.TRANSITION_MAX_ATTEMPTS):
+            # 1. Fetch (re-read from the database after a lost race)
+            case = await self.filing_repo.get_by_id(session, filing_id, populate_existing=attempt > 0)
+            if not case:
+                raise NotFoundError("Filing Case not found")
 
-        # Capture state before update
-        before_value = {
-            "id": str(case.id),
-            "current_state": current_state
-        }
+            # 2. Strict Role Enforcement & Transitions
+            current_state = case.current_state
+            submission_confirmation_ref = await self._authorize_transition(
+                session, case, actor_id, next_state, actor_role
+            )
 
-        # 4. Apply Updates
-        try:
+            # 3. Conditional Update (compare-and-set on version)
             updates = {
                 "current_state": next_state,
                 "updated_at": datetime.now(timezone.utc)
             }
-            
+
             # Special handling for submission
             if next_state == self.STATE_SUBMITTED:
                 updates["submitted_at"] = datetime.now(timezone.utc)
 
-            updated_case = await self.filing_repo.update_case(session, case, updates)
-            
-            # Evidence Capture (Atomic) for SUBMISSION
-            if next_state == self.STATE_SUBMITTED:
-                determination = await self.itr_repo.get_by_id(session, case.itr_determination_id)
-                await self.evidence_service.capture_evidence(
-                    session=session,
-                    payload={
-                        "filing_case": {
-                            "id": str(updated_case.id),
-                            "financial_year": updated_case.financial_year,
-                            "submitted_at": updated_case.submitted_at.isoformat() if updated_case.submitted_at else None,
-                        },
-                        "itr_determination": {
-                            "id": str(determination.id) if determination else None,
-                            "itr_type": determination.itr_type if determination else None
-                        },
-                        "actor_id": str(actor_id),
-                        "actor_role": actor_role,
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                        "confirmation_ref": submission_confirmation_ref # Link to approval
-                    },
-                    action_urn=f"urn:filing:{updated_case.id}:submission",
-                    retention_years=7
-                )
-            
-            # 5. Audit Log
-            await self.audit_service.log_action(
+            updated_case = await self.filing_repo.update_case_if_version(session, case.id, case.version, updates)
+            if updated_case:
+                break
+        else:
+            raise ConflictError("Filing Case was modified concurrently. Please retry.")
+
+        # Capture state before update
+        before_value = {
+            "id": str(updated_case.id),
+            "current_state": current_state
+        }
+
+        # 4. Evidence Capture (Atomic) for SUBMISSION
+        if next_state == self.STATE_SUBMITTED:
+            determination = await self.itr_repo.get_by_id(session, updated_case.itr_determination_id)
+            await self.evidence_service.capture_evidence(
                 session=session,
-                actor_id=actor_id,
-                actor_role=actor_role,
-                action="FILING_STATE_TRANSITION",
-                before_value=before_value,
-                after_value={
-                    "id": str(updated_case.id),
-                    "current_state": next_state,
-                    "previous_state": current_state
-                }
+                payload={
+                    "filing_case": {
+                        "id": str(updated_case.id),
+                        "financial_year": updated_case.financial_year,
+                        "submitted_at": updated_case.submitted_at.isoformat() if updated_case.submitted_at else None,
+                    },
+                    "itr_determination": {
+                        "id": str(determination.id) if determination else None,
+                        "itr_type": determination.itr_type if determination else None
+                    },
+                    "actor_id": str(actor_id),
+                    "actor_role": actor_role,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "confirmation_ref": submission_confirmation_ref # Link to approval
+                },
+                action_urn=f"urn:filing:{updated_case.id}:submission",
+                retention_years=7
             )
+            
+        # 5. Audit Log (via outbox; one entry per case version)
+        await self.audit_service.enqueue_action(
+            session=session,
+            actor_id=actor_id,
+            actor_role=actor_role,
+            action="FILING_STATE_TRANSITION",
+            before_value=before_value,
+            after_value={
+                "id": str(updated_case.id),
+                "current_state": next_state,
+                "previous_state": current_state
+            },
+            dedup_key=f"urn:filing:{updated_case.id}:v{updated_case.version}:audit"
+        )
 
-            await session.commit()
-            return updated_case
-        except Exception:
-            await session.rollback()
-            raise
-
+        return updated_case
@@ -1,15 +1,29 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uuid import UUID
 import re
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.financial_repository import FinancialEntryRepository
 from app.repositories.auth_repository import AuthRepository
+from app.repositories.unit_of_work import after_commit
 from app.models.financials import FinancialEntry
+from app.services.compliance_reevaluation import ComplianceDirtySet
 
 class FinancialEntryService:
-    def __init__(self, financial_repo: FinancialEntryRepository, auth_repo: AuthRepository):
+    def __init__(
+        self,
+        financial_repo: FinancialEntryRepository,
+        auth_repo: AuthRepository,
+        dirty_set: Optional[ComplianceDirtySet] = None
+    ):
         self.financial_repo = financial_repo
         self.auth_repo = auth_repo
+        # Ledger writes mark (user, FY) for background compliance re-evaluation
+        self.dirty_set = dirty_set
+
+    def _mark_dirty(self, session: AsyncSession, user_id: UUID, financial_year: str) -> None:
+        # Only once the write is committed, so the worker never re-evaluates a stale ledger
+        if self.dirty_set is not None:
+            after_commit(session, lambda: self.dirty_set.mark_dirty(user_id, financial_year))
 
     async def create_entry(self, session: AsyncSession, user_id: UUID, entry_data: Dict[str, Any]) -> FinancialEntry:
         """
@@ -36,14 +50,11 @@ class FinancialEntryService:
         if not financial_year or not re.match(r'^\d{4}-\d{2}$', financial_year):
             raise ValueError(f"Invalid financial_year format '{financial_year}'. Must be 'YYYY-YY'.")
 
-        # 4. Create Entry in Transaction
-        try:
-            new_entry = await self.financial_repo.create_entry(session, user_id, entry_data)
-            await session.commit()
-            return new_entry
-        except Exception:
-            await session.rollback()
-            raise
+        # 4. Create Entry (committed with the request)
+        new_entry = await self.financial_repo.create_entry(session, user_id, entry_data)
+
+        self._mark_dirty(session, user_id, financial_year)
+        return new_entry
 
     async def get_user_entries(self, session: AsyncSession, user_id: UUID) -> List[FinancialEntry]:
         """
@@ -51,6 +62,12 @@ class FinancialEntryService:
         """
         return await self.financial_repo.get_by_user_id(session, user_id)
 
+    async def get_ledger_version(self, session: AsyncSession, user_id: UUID) -> int:
+        """
+        Version covering all of a user's ledger entries (ETag validator).
+        """
+        return await self.financial_repo.get_total_ledger_version(session, user_id)
+
     async def get_user_entries_by_type(self, session: AsyncSession, user_id: UUID, entry_type: str) -> List[FinancialEntry]:
         """
         Retrieve financial entries filtered by type.
@@ -65,20 +82,18 @@ class FinancialEntryService:
         Delete a financial entry.
         Strictly enforces ownership: entry.user_id must match request user_id.
         """
-        try:
-            # 1. Fetch Entry
-            entry = await self.financial_repo.get_by_id(session, entry_id)
-            if not entry:
-                return False
+        # 1. Fetch Entry
+        entry = await self.financial_repo.get_by_id(session, entry_id)
+        if not entry:
+            return False
+
+        # 2. Check Ownership
+        if entry.user_id != user_id:
+            raise ValueError("Unauthorized access to financial entry.")
 
-            # 2. Check Ownership
-            if entry.user_id != user_id:
-                raise ValueError("Unauthorized access to financial entry.")
+        # 3. Delete
+        deleted = await self.financial_repo.delete_entry_by_id(session, entry_id)
 
-            # 3. Delete
-            deleted = await self.financial_repo.delete_entry_by_id(session, entry_id)
-            await session.commit()
-            return deleted
-        except Exception:
-            await session.rollback()
-            raise
+        if deleted:
+            self._mark_dirty(session, user_id, entry.financial_year)
+        return deleted
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
-from typing import Optional
+from collections import Counter
+from typing import Optional, Sequence, Tuple, Dict, Any
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,6 +20,9 @@ class ITRDeterminationService:
     SALARY_CATEGORIES = {'SALARY', 'PENSION'}
     # Other is implicit (anything not in business/salary)
 
+    # Clients per batch round trip / transaction (bounds memory for large portfolios)
+    BATCH_CHUNK_SIZE = 500
+
     def __init__(
         self,
         financial_repo: FinancialEntryRepository,
@@ -29,84 +33,156 @@ class ITRDeterminationService:
         self.itr_repo = itr_repo
         self.audit_service = audit_service
 
+    @staticmethod
+    def classify_income_sources(has_business_income: bool, has_salary_income: bool, has_other_income: bool) -> Tuple[str, str]:
+        """
+        Deterministic ITR form rules. Returns (itr_type, reason).
+        """
+        if has_business_income:
+            return "ITR-3", "Business/Profession Income detected."
+        if has_salary_income and has_other_income:
+            return "ITR-2", "Salary and Other Sources (Non-Business) detected."
+        if has_salary_income:
+            return "ITR-1", "Salary Income only."
+        if has_other_income:
+            return "ITR-1", "Other Sources only (e.g. Interest/Dividends)."
+        return "ITR-1", "No income sources found. Defaulting to ITR-1."
+
     async def determine_itr(self, session: AsyncSession, user_id: UUID, financial_year: str, bypass_lock: bool = False) -> ITRDetermination:
         """
         Determine the applicable ITR form based on financial entries.
-        Wrap entire logic in a single transaction for consistency.
+        Memoized on the (user, FY) ledger version: if the ledger has not changed
+        since the stored determination, it is returned as-is (one read, no write).
+        Runs in the request's single transaction (committed by the unit of work).
         """
-        try:
-            # 1. Fetch Data
-            entries = await self.financial_repo.get_by_user_id_and_year(session, user_id, financial_year)
-            
-            # 2. Analyze Income Sources
-            has_business_income = False
-            has_salary_income = False
-            has_other_income = False
+        # 1. Check Existing Determination (+ current ledger version, one query)
+        existing = None
+        memo = await self.itr_repo.get_with_ledger_version(session, user_id, financial_year)
+        if memo:
+            existing, ledger_version = memo
+
+            if existing.is_locked and not bypass_lock:
+                return existing
+
+            if existing.ledger_version == ledger_version:
+                return existing
+        else:
+            ledger_version = await self.financial_repo.get_ledger_version(session, user_id, financial_year)
+
+        # 2. Analyze Income Sources (single aggregate query)
+        has_business_income, has_salary_income, has_other_income = await self.financial_repo.get_income_sources(
+            session,
+            user_id,
+            financial_year,
+            self.BUSINESS_CATEGORIES,
+            self.SALARY_CATEGORIES
+        )
+
+        # 3. Apply Deterministic Rules
+        itr_type, reason = self.classify_income_sources(
+            has_business_income, has_salary_income, has_other_income
+        )
+
+        # 4. Update Existing
+        if existing:
+            res = await self.itr_repo.update_determination(session, existing, {
+                "itr_type": itr_type,
+                "reason": reason,
+                "determined_at": datetime.now(timezone.utc),
+                "ledger_version": ledger_version
+            })
+            return res
+
+        # 5. Create New
+        new_determination = ITRDetermination(
+            user_id=user_id,
+            financial_year=financial_year,
+            itr_type=itr_type,
+            reason=reason,
+            determined_at=datetime.now(timezone.utc),
+            is_locked=False,
+            ledger_version=ledger_version
+        )
             
-            for entry in entries:
-                if entry.entry_type == 'INCOME':
-                    # Normalize category
-                    category = (entry.category or "").strip().upper()
-                    
-                    if category in self.BUSINESS_CATEGORIES:
-                        has_business_income = True
-                    elif category in self.SALARY_CATEGORIES:
-                        has_salary_income = True
-                    else:
-                        has_other_income = True
-
-            # 3. Apply Deterministic Rules
-            itr_type = "ITR-1"
-            reason = "Standard Salary/Interest Income case."
-
-            if has_business_income:
-                itr_type = "ITR-3"
-                reason = "Business/Profession Income detected."
-            elif has_salary_income and has_other_income:
-                itr_type = "ITR-2"
-                reason = "Salary and Other Sources (Non-Business) detected."
-            elif has_salary_income:
-                itr_type = "ITR-1"
-                reason = "Salary Income only."
-            elif has_other_income:
-                 itr_type = "ITR-1"
-                 reason = "Other Sources only (e.g. Interest/Dividends)."
-            else:
-                 itr_type = "ITR-1"
-                 reason = "No income sources found. Defaulting to ITR-1."
-
-            # 4. Check Existing Determination
-            existing = await self.itr_repo.get_by_user_and_year(session, user_id, financial_year)
-
-            if existing:
-                if existing.is_locked and not bypass_lock:
-                    return existing
-                
-                # Update Existing
-                res = await self.itr_repo.update_determination(session, existing, {
+        res = await self.itr_repo.create_determination(session, new_determination)
+        return res
+
+    async def determine_batch(
+        self,
+        session: AsyncSession,
+        user_ids: Sequence[UUID],
+        financial_year: str,
+        actor_id: Optional[UUID] = None,
+        actor_role: str = "SYSTEM"
+    ) -> Dict[str, Any]:
+        """
+        Determine ITR forms for many users (e.g. a CA's clients) for one financial year.
+        Works in chunks of BATCH_CHUNK_SIZE: per chunk, one grouped ledger query,
+        one memo/lock read and one bulk upsert; the whole run commits with the request.
+        Locked determinations are skipped; memo hits (unchanged ledger) are not rewritten.
+        Every determination written gets an ITR_DETERMINED audit entry by the actor
+        (buffered, so a chunk's entries go out as one multi-row INSERT).
+        Returns a summary of the run.
+        """
+        summary = {
+            "financial_year": financial_year,
+            "total_clients": len(user_ids),
+            "determined": 0,
+            "unchanged": 0,
+            "locked": 0
+        }
+        itr_type_counts: Counter = Counter()
+
+        for start in range(0, len(user_ids), self.BATCH_CHUNK_SIZE):
+            chunk = user_ids[start:start + self.BATCH_CHUNK_SIZE]
+            sources = await self.financial_repo.get_income_sources_batch(
+                session, chunk, financial_year, self.BUSINESS_CATEGORIES, self.SALARY_CATEGORIES
+            )
+            memo = await self.itr_repo.get_memo_batch(session, chunk, financial_year)
+
+            determined_at = datetime.now(timezone.utc)
+            rows = []
+            for user_id in chunk:
+                ledger_version, *income_flags = sources.get(user_id, (0, False, False, False))
+                is_locked, stored_version = memo.get(user_id, (False, None))
+                if is_locked:
+                    summary["locked"] += 1
+                    continue
+                if user_id in memo and stored_version == ledger_version:
+                    summary["unchanged"] += 1
+                    continue
+                itr_type, reason = self.classify_income_sources(*income_flags)
+                itr_type_counts[itr_type] += 1
+                rows.append({
+                    "user_id": user_id,
+                    "financial_year": financial_year,
                     "itr_type": itr_type,
                     "reason": reason,
-                    "determined_at": datetime.now(timezone.utc)
+                    "is_locked": False,
+                    "determined_at": determined_at,
+                    "ledger_version": ledger_version
                 })
-                await session.commit()
-                return res
-
-            # 5. Create New
-            new_determination = ITRDetermination(
-                user_id=user_id,
-                financial_year=financial_year,
-                itr_type=itr_type,
-                reason=reason,
-                determined_at=datetime.now(timezone.utc),
-                is_locked=False
-            )
-            
-            res = await self.itr_repo.create_determination(session, new_determination)
-            await session.commit()
-            return res
-        except Exception:
-            await session.rollback()
-            raise
+
+            written = set(await self.itr_repo.upsert_determinations(session, rows))
+            summary["determined"] += len(written)
+            for row in rows:
+                if row["user_id"] not in written:
+                    continue
+                await self.audit_service.log_action(
+                    session=session,
+                    actor_id=actor_id,
+                    actor_role=actor_role,
+                    action="ITR_DETERMINED",
+                    after_value={
+                        "user_id": str(row["user_id"]),
+                        "financial_year": financial_year,
+                        "itr_type": row["itr_type"],
+                        "ledger_version": row["ledger_version"]
+                    }
+                )
+
+        summary["itr_type_counts"] = dict(itr_type_counts)
+        return summary
 
     async def get_determination(self, session: AsyncSession, user_id: UUID, financial_year: str) -> Optional[ITRDetermination]:
         """
@@ -114,6 +190,12 @@ class ITRDeterminationService:
         """
         return await self.itr_repo.get_by_user_and_year(session, user_id, financial_year)
 
+    async def get_determination_state(self, session: AsyncSession, user_id: UUID, financial_year: str) -> Optional[tuple]:
+        """
+        Version columns of the determination (ETag validator).
+        """
+        return await self.itr_repo.get_state(session, user_id, financial_year)
+
     async def lock_determination(
         self, 
         session: AsyncSession, 
@@ -125,40 +207,35 @@ class ITRDeterminationService:
         Lock an existing determination.
         Enforces ownership via get_by_user_and_year (implicitly checks user_id).
         """
-        try:
-            existing = await self.itr_repo.get_by_user_and_year(session, user_id, financial_year)
+        existing = await self.itr_repo.get_by_user_and_year(session, user_id, financial_year)
             
-            if not existing:
-                raise ValueError("Determination not found")
+        if not existing:
+            raise ValueError("Determination not found")
             
-            if existing.is_locked:
-                return existing
+        if existing.is_locked:
+            return existing
             
-            # Capture state before update
-            before_value = {
-                "id": str(existing.id),
-                "is_locked": False,
-                "itr_type": existing.itr_type
-            }
+        # Capture state before update
+        before_value = {
+            "id": str(existing.id),
+            "is_locked": False,
+            "itr_type": existing.itr_type
+        }
 
-            locked_determination = await self.itr_repo.update_determination(session, existing, {"is_locked": True})
-
-            # Audit Log
-            await self.audit_service.log_action(
-                session=session,
-                actor_id=user_id,
-                actor_role=actor_role,
-                action="ITR_LOCKED",
-                before_value=before_value,
-                after_value={
-                    "id": str(locked_determination.id),
-                    "is_locked": True,
-                    "itr_type": locked_determination.itr_type
-                }
-            )
+        locked_determination = await self.itr_repo.update_determination(session, existing, {"is_locked": True})
+
+        # Audit Log
+        await self.audit_service.log_action(
+            session=session,
+            actor_id=user_id,
+            actor_role=actor_role,
+            action="ITR_LOCKED",
+            before_value=before_value,
+            after_value={
+                "id": str(locked_determination.id),
+                "is_locked": True,
+                "itr_type": locked_determination.itr_type
+            }
+        )
 
-            await session.commit()
-            return locked_determination
-        except Exception:
-            await session.rollback()
-            raise
+        return locked_determination
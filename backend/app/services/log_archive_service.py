@@ -0,0 +1,339 @@
+"""
+Cold archival of audit_logs and consent_audit_logs.
+
+Rows older than a cutoff are moved, a batch at a time, into gzip-compressed
+NDJSON segments in evidence storage. Each segment is recorded in
+log_archive_segments with its SHA-256, and can be searched back without
+restoring it to the database.
+
+Archiving normally runs in the app's LogArchiveWorker (LOG_ARCHIVE_AFTER_DAYS).
+By hand, --batch-size goes before the subcommand:
+    python -m app.services.log_archive_service [--batch-size N] archive --before YYYY-MM-DD
+Searching streams matching archived rows to stdout as NDJSON, one per line:
+    python -m app.services.log_archive_service search --table audit_logs [--since ...] [--until ...] [--actor-id ...] [--action ...]
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+from uuid import UUID
+
+import aiofiles
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.canonical_json import canonical_json
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.models.archive import LogArchiveSegment
+from app.models.audit import AuditLog
+from app.models.consent import ConsentAuditLog
+from app.repositories.log_archive_repository import LogArchiveRepository
+from app.services.periodic_worker import PeriodicWorker
+from app.services.storage_backends import StorageService, get_storage_service
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_TABLES = {
+    AuditLog.__tablename__: AuditLog,
+    ConsentAuditLog.__tablename__: ConsentAuditLog,
+}
+
+# Compressed bytes fed to the decompressor per step when reading a segment back
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ArchiveIntegrityError(Exception):
+    """
+    A segment's stored bytes no longer match the SHA-256 in its manifest entry.
+    """
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def archive_segment_path(source_table: str, first_created_at: datetime, digest: str) -> str:
+    """
+    Storage location of a segment.
+    Structure: archive/{table}/{YYYY}/{MM}/{first created_at}-{sha256[:16]}.ndjson.gz
+    """
+    first = _as_utc(first_created_at)
+    return f"archive/{source_table}/{first:%Y}/{first:%m}/{first:%Y%m%dT%H%M%S%fZ}-{digest[:16]}.ndjson.gz"
+
+
+def _json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool, dict, list)):
+        return value
+    if isinstance(value, datetime):
+        return _as_utc(value).isoformat()
+    # UUID, INET addresses
+    return str(value)
+
+
+def archive_record(row: Union[AuditLog, ConsentAuditLog]) -> Dict[str, Any]:
+    """
+    JSON form of a log row: every column, timestamps in UTC ISO-8601.
+    """
+    return {column.name: _json_value(getattr(row, column.key)) for column in row.__table__.columns}
+
+
+def encode_segment(records: List[Dict[str, Any]]) -> bytes:
+    """
+    One canonical JSON object per line, gzip-compressed. The gzip header
+    carries no timestamp, so the same rows always give the same bytes.
+    """
+    return gzip.compress(b"".join(canonical_json(record) + b"\n" for record in records), mtime=0)
+
+
+
+async def _held_chunks(data: bytes) -> AsyncIterator[bytes]:
+    """
+    Already fetched segment bytes, READ_CHUNK_SIZE at a time.
+    """
+    for offset in range(0, len(data), READ_CHUNK_SIZE):
+        yield data[offset:offset + READ_CHUNK_SIZE]
+
+class LogArchiveService:
+    """
+    Archives old log rows and reads archived segments back.
+
+    Each batch locks up to batch_size of a table's oldest rows, writes them as
+    one segment, then records the segment and deletes the rows in a single
+    transaction. Segment bytes are deterministic, so a batch whose transaction
+    failed after the write rewrites the same object on the next run.
+    """
+
+    def __init__(
+        self,
+        repo: LogArchiveRepository,
+        storage_service: StorageService,
+        batch_size: int = settings.LOG_ARCHIVE_BATCH_SIZE,
+        batch_pause_seconds: float = settings.LOG_ARCHIVE_BATCH_PAUSE_SECONDS
+    ):
+        self.repo = repo
+        self.storage_service = storage_service
+        self.batch_size = batch_size
+        self.batch_pause_seconds = batch_pause_seconds
+
+    @staticmethod
+    def _model(source_table: str):
+        if source_table not in ARCHIVED_TABLES:
+            raise ValidationError(f"Unknown archived table: {source_table}")
+        return ARCHIVED_TABLES[source_table]
+
+    async def archive_batch(
+        self, session: AsyncSession, source_table: str, before: datetime
+    ) -> Optional[LogArchiveSegment]:
+        """
+        Archive one batch of rows created before `before`.
+        Returns the new segment, or None if nothing is left to archive.
+        """
+        model = self._model(source_table)
+        rows = await self.repo.get_oldest_before(session, model, before, self.batch_size)
+        if not rows:
+            return None
+
+        data = encode_segment([archive_record(row) for row in rows])
+        digest = hashlib.sha256(data).hexdigest()
+        first_created_at, last_created_at = rows[0].created_at, rows[-1].created_at
+        location = archive_segment_path(source_table, first_created_at, digest)
+        await self.storage_service.write_blob(location, data)
+
+        segment = LogArchiveSegment(
+            source_table=source_table,
+            storage_location=location,
+            sha256=digest,
+            row_count=len(rows),
+            first_created_at=first_created_at,
+            last_created_at=last_created_at
+        )
+        await self.repo.create_segment(session, segment)
+        await self.repo.delete_rows(session, model, [row.id for row in rows], first_created_at, last_created_at)
+        await session.commit()
+        return segment
+
+    async def run(self, session_factory: Callable[[], AsyncSession], before: datetime) -> Dict[str, Any]:
+        """
+        Archive every row of both tables created before `before`, batch by batch.
+        Returns rows archived per table and the number of segments written.
+        """
+        started = time.monotonic()
+        totals: Dict[str, Any] = {table: 0 for table in ARCHIVED_TABLES}
+        totals["segments"] = 0
+
+        for source_table in ARCHIVED_TABLES:
+            while True:
+                async with session_factory() as session:
+                    segment = await self.archive_batch(session, source_table, before)
+                if segment is None:
+                    break
+                totals[source_table] += segment.row_count
+                totals["segments"] += 1
+                logger.info(
+                    f"Log archive progress: {totals[source_table]} {source_table} rows "
+                    f"in {totals['segments']} segments"
+                )
+                if self.batch_pause_seconds:
+                    await asyncio.sleep(self.batch_pause_seconds)
+
+        totals["elapsed_seconds"] = round(time.monotonic() - started, 3)
+        return totals
+
+    async def _read_file_chunks(self, location: str, path: str, offset: int, remaining: int) -> AsyncIterator[bytes]:
+        """
+        Stored bytes of a locally kept segment, READ_CHUNK_SIZE at a time.
+        """
+        async with aiofiles.open(path, "rb") as f:
+            await f.seek(offset)
+            while remaining > 0:
+                chunk = await f.read(min(READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ArchiveIntegrityError(f"Archive segment {location} is truncated")
+                remaining -= len(chunk)
+                yield chunk
+
+    async def read_segment(self, segment: LogArchiveSegment) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Records of one segment, in created_at order. A first pass over the
+        stored bytes checks them against the manifest hash; a second inflates
+        them a chunk at a time. A local segment is read from its file on each
+        pass, so neither holds more than one chunk in memory; a remote store's
+        segment is fetched once with read_blob and both passes run over it.
+        """
+        location = segment.storage_location
+        region = self.storage_service.locate(location)
+        if region is None:
+            chunks = partial(_held_chunks, await self.storage_service.read_blob(location))
+        else:
+            chunks = partial(self._read_file_chunks, location, *region)
+
+        digest = hashlib.sha256()
+        async for chunk in chunks():
+            digest.update(chunk)
+        if digest.hexdigest() != segment.sha256:
+            raise ArchiveIntegrityError(f"Archive segment {location} does not match its hash")
+
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        pending = b""
+        async for chunk in chunks():
+            pending += decompressor.decompress(chunk)
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                yield orjson.loads(line)
+        pending += decompressor.flush()
+        if pending.strip():
+            yield orjson.loads(pending)
+
+    async def search(
+        self,
+        session: AsyncSession,
+        source_table: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        actor_id: Optional[UUID] = None,
+        action: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream archived records of a table, oldest first, matching every given
+        filter (created_at in [since, until), actor_id, action). Only segments
+        overlapping the time range are read.
+        """
+        self._model(source_table)
+        since = _as_utc(since) if since else None
+        until = _as_utc(until) if until else None
+        segments = await self.repo.get_segments(session, source_table, since, until)
+
+        for segment in segments:
+            async for record in self.read_segment(segment):
+                created_at = datetime.fromisoformat(record["created_at"])
+                if since is not None and created_at < since:
+                    continue
+                if until is not None and created_at >= until:
+                    continue
+                if actor_id is not None and record.get("actor_id") != str(actor_id):
+                    continue
+                if action is not None and record.get("action") != action:
+                    continue
+                yield record
+
+
+class LogArchiveWorker(PeriodicWorker):
+    """
+    Background worker archiving rows older than after_days every interval.
+    Not started when after_days is unset. A batch interrupted by stop() is
+    archived again on the next run.
+    """
+
+    name = "Log archive worker"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        service: Optional[LogArchiveService] = None,
+        after_days: Optional[int] = settings.LOG_ARCHIVE_AFTER_DAYS,
+        interval_seconds: float = settings.LOG_ARCHIVE_INTERVAL_SECONDS
+    ):
+        super().__init__(interval_seconds)
+        self.session_factory = session_factory
+        self.service = service or LogArchiveService(LogArchiveRepository(), get_storage_service())
+        self.after_days = after_days
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    async def run_once(self) -> Dict[str, Any]:
+        """
+        Archive everything older than the configured age. Returns the run's totals.
+        """
+        before = datetime.now(timezone.utc) - timedelta(days=self.after_days)
+        self.last_report = await self.service.run(self.session_factory, before)
+        if self.last_report["segments"]:
+            logger.info(f"Log archive finished: {self.last_report}")
+        return self.last_report
+
+    def start(self) -> None:
+        if self.after_days is not None:
+            super().start()
+
+
+def _timestamp(value: str) -> datetime:
+    return _as_utc(datetime.fromisoformat(value))
+
+
+async def _main(args: argparse.Namespace) -> Optional[Dict[str, Any]]:
+    from app.core.database import async_session_factory
+
+    service = LogArchiveService(LogArchiveRepository(), get_storage_service(), batch_size=args.batch_size)
+    if args.command == "archive":
+        return await service.run(async_session_factory, args.before)
+
+    async with async_session_factory() as session:
+        async for record in service.search(
+            session, args.table, args.since, args.until, args.actor_id, args.action
+        ):
+            sys.stdout.write(json.dumps(record, sort_keys=True) + "\n")
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old audit log rows, or search the archive.")
+    parser.add_argument("--batch-size", type=int, default=settings.LOG_ARCHIVE_BATCH_SIZE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive = commands.add_parser("archive", help="move rows created before --before into archive segments")
+    archive.add_argument("--before", type=_timestamp, required=True)
+    search = commands.add_parser("search", help="stream matching archived records as NDJSON")
+    search.add_argument("--table", choices=sorted(ARCHIVED_TABLES), default=AuditLog.__tablename__)
+    search.add_argument("--since", type=_timestamp, default=None)
+    search.add_argument("--until", type=_timestamp, default=None)
+    search.add_argument("--actor-id", type=UUID, default=None)
+    search.add_argument("--action", default=None)
+    report = asyncio.run(_main(parser.parse_args()))
+    if report is not None:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,165 @@
+import hashlib
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.outbox import OutboxEvent
+from app.repositories.audit_repository import AuditLogRepository
+from app.repositories.outbox_repository import OutboxRepository
+from app.services.audit_service import AUDIT_LOG_EVENT
+from app.services.evidence_service import EVIDENCE_BLOB_EVENT
+from app.services.periodic_worker import PeriodicWorker
+from app.services.storage_backends import StorageService, get_storage_service
+from app.services.evidence_blob_store import EvidenceBlobStore
+
+logger = logging.getLogger(__name__)
+
+# Payload keys dropped once an event is delivered (the evidence bytes live in the blob store)
+BULKY_PAYLOAD_KEYS = frozenset({"content"})
+
+
+class OutboxDispatcher(PeriodicWorker):
+    """
+    Background dispatcher for the transactional outbox.
+    Claims due events in batches and materializes their side effects:
+    - EVIDENCE_BLOB: writes the canonical evidence bytes to the content-addressed store
+    - AUDIT_LOG: inserts the audit row (id = event id)
+
+    Delivery is at-least-once; both handlers are idempotent (content-addressed
+    blobs, conflict-ignoring audit insert), so a replay after a crash is harmless.
+    Failures are retried with exponential backoff up to max_attempts.
+    Delivered events lose their bulky payload parts at once and are deleted
+    after retention_seconds; undelivered ones stay for inspection.
+    """
+
+    name = "Outbox dispatcher"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        storage_service: Optional[StorageService] = None,
+        outbox_repo: Optional[OutboxRepository] = None,
+        audit_repo: Optional[AuditLogRepository] = None,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+        retry_base_seconds: float = settings.OUTBOX_RETRY_BASE_SECONDS,
+        poll_interval_seconds: float = settings.OUTBOX_POLL_SECONDS,
+        retention_seconds: float = settings.OUTBOX_RETENTION_SECONDS,
+        prune_interval_seconds: float = settings.OUTBOX_PRUNE_INTERVAL_SECONDS
+    ):
+        super().__init__(poll_interval_seconds)
+        self.session_factory = session_factory
+        self.blob_store = EvidenceBlobStore(storage_service or get_storage_service())
+        self.outbox_repo = outbox_repo or OutboxRepository()
+        self.audit_repo = audit_repo or AuditLogRepository()
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retention_seconds = retention_seconds
+        self.prune_interval_seconds = prune_interval_seconds
+        self._last_pruned = float("-inf")
+        self._handlers: Dict[str, Callable[[AsyncSession, OutboxEvent], Awaitable[None]]] = {
+            EVIDENCE_BLOB_EVENT: self._write_evidence_blob,
+            AUDIT_LOG_EVENT: self._insert_audit_log
+        }
+
+    async def _write_evidence_blob(self, session: AsyncSession, event: OutboxEvent) -> None:
+        payload = event.payload
+        data = payload["content"].encode("utf-8")
+        if hashlib.sha256(data).hexdigest() != payload["hash"]:
+            raise ValueError(f"Evidence content does not match hash {payload['hash']}")
+        await self.blob_store.put(payload["storage_location"], payload["hash"], data, payload.get("action_type"))
+
+    async def _insert_audit_log(self, session: AsyncSession, event: OutboxEvent) -> None:
+        payload = event.payload
+        await self.audit_repo.create_log_if_absent(session, {
+            "id": event.id,
+            "actor_id": UUID(payload["actor_id"]) if payload["actor_id"] else None,
+            "actor_role": payload["actor_role"],
+            "action": payload["action"],
+            "before_value": payload["before_value"],
+            "after_value": payload["after_value"],
+            "ip_address": payload["ip_address"],
+            "device_id": payload["device_id"],
+            "created_at": datetime.fromisoformat(payload["created_at"])
+        })
+
+    async def run_once(self) -> int:
+        """
+        Dispatch one batch of due events. Returns the number dispatched successfully.
+        Each event runs in its own savepoint, so one failure does not undo the others.
+        """
+        dispatched = 0
+        async with self.session_factory() as session:
+            now = datetime.now(timezone.utc)
+            events = await self.outbox_repo.claim_batch(session, now, self.batch_size, self.max_attempts)
+            for event in events:
+                handler = self._handlers.get(event.event_type)
+                try:
+                    if handler is None:
+                        raise ValueError(f"Unknown outbox event type {event.event_type}")
+                    async with session.begin_nested():
+                        await handler(session, event)
+                    delivered = {key: value for key, value in event.payload.items() if key not in BULKY_PAYLOAD_KEYS}
+                    await self.outbox_repo.mark_dispatched(session, event.id, datetime.now(timezone.utc), delivered)
+                    dispatched += 1
+                except Exception as e:
+                    attempts = event.attempts + 1
+                    retry_at = now + timedelta(seconds=self.retry_base_seconds * 2 ** (attempts - 1))
+                    if attempts >= self.max_attempts:
+                        logger.error(f"Outbox event {event.id} ({event.dedup_key}) gave up after {attempts} attempts: {e}")
+                    else:
+                        logger.warning(f"Outbox event {event.id} ({event.dedup_key}) failed, retrying: {e}")
+                    await self.outbox_repo.mark_failed(session, event.id, str(e), retry_at)
+            await session.commit()
+        return dispatched
+
+    async def drain(self) -> int:
+        """
+        Dispatch batches until nothing is due. Returns the total dispatched.
+        """
+        total = 0
+        while True:
+            dispatched = await self.run_once()
+            total += dispatched
+            if dispatched == 0:
+                return total
+
+    async def prune(self) -> int:
+        """
+        Delete events dispatched more than retention_seconds ago, batch_size
+        rows per transaction. Returns the number deleted.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.retention_seconds)
+        total = 0
+        while True:
+            async with self.session_factory() as session:
+                deleted = await self.outbox_repo.delete_dispatched_before(session, cutoff, self.batch_size)
+                await session.commit()
+            total += deleted
+            if deleted < self.batch_size:
+                if total:
+                    logger.info(f"Pruned {total} dispatched outbox events")
+                return total
+
+    async def poll(self) -> None:
+        """
+        Each pass drains every due batch, and prunes old dispatched events
+        at most every prune_interval_seconds.
+        """
+        await self.drain()
+        if time.monotonic() - self._last_pruned >= self.prune_interval_seconds:
+            await self.prune()
+            self._last_pruned = time.monotonic()
+
+    async def stop(self) -> None:
+        """
+        Cancel the polling loop and dispatch whatever is already due.
+        """
+        await super().stop()
+        await self.drain()
@@ -0,0 +1,352 @@
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts fall back to the in-process lock only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Record layout: header | key (utf-8) | data
+# header = magic, key length, data length, CRC32 of data
+# A tombstone (no data) marks its key deleted; the bytes of the deleted blob
+# stay in their segment until it is compacted.
+RECORD_MAGIC = b"MVPK"
+TOMBSTONE_MAGIC = b"MVPD"
+RECORD_HEADER = struct.Struct("<4sHII")
+SEGMENT_SUFFIX = ".pack"
+
+# key -> (segment number, data offset, data length)
+IndexEntry = Tuple[int, int, int]
+
+
+class PackFileStorageService:
+    """
+    Append-only Pack-File Storage Service.
+    Blobs are appended as records to numbered segment files under {storage_root}/packs,
+    and located through an in-memory offset index (key -> segment, offset, length).
+
+    - Writes: one append per blob (no per-blob file or mkdir); the active segment
+      is rolled once it exceeds max_segment_bytes or max_segment_age_seconds.
+    - Reads: zero-copy memoryview slices of mmap'ed segments.
+    - Recovery: the index is built by scanning CRC-checked records, once at
+      startup (open(), in a worker thread). A lookup miss rescans only segments
+      that grew since their last scan, to pick up other processes' appends;
+      async callers do that off the event loop. A torn tail left by a crash is
+      truncated before the next append; damage before the tail is skipped and
+      seals the segment.
+    - Deletes: a tombstone record drops the key from the index (space is not
+      reclaimed in place).
+
+    Appends take an exclusive flock on the segment, so several processes can share
+    one storage root; readers pick up other processes' appends on an index miss.
+    Same interface as FileStorageService (keys are relative blob paths).
+    """
+
+    def __init__(
+        self,
+        storage_root: str = "storage",
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        max_segment_age_seconds: float = 3600.0,
+        fsync: bool = True
+    ):
+        self.pack_dir = Path(storage_root) / "packs"
+        self.pack_dir.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age_seconds = max_segment_age_seconds
+        self.fsync = fsync
+
+        self._index: Dict[str, IndexEntry] = {}
+        # segment number -> byte offset up to which records have been indexed
+        self._scanned: Dict[int, int] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        # Segments with damage before their tail: never appended to again
+        self._damaged: Set[int] = set()
+        self._active_segment: Optional[int] = None
+        self._active_opened_at = 0.0
+        self._lock = asyncio.Lock()
+        # Guards the index and scan offsets against scans in worker threads
+        self._index_lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Segments & index
+    # ------------------------------------------------------------------
+    def _segment_path(self, segment: int) -> Path:
+        return self.pack_dir / f"segment-{segment:08d}{SEGMENT_SUFFIX}"
+
+    def _segment_numbers(self) -> List[int]:
+        return sorted(
+            int(path.stem.split("-", 1)[1])
+            for path in self.pack_dir.glob(f"segment-*{SEGMENT_SUFFIX}")
+        )
+
+    @staticmethod
+    def _parse_record(buf, position: int, size: int) -> Tuple[str, Optional[Tuple[bytes, str, int, int]]]:
+        """
+        Classify the bytes at position as a COMPLETE record (magic known, fits
+        in the file, CRC matches), an INCOMPLETE one (runs past EOF) or an
+        INVALID one (unknown magic or CRC mismatch).
+        COMPLETE comes with (magic, key, data offset, data length).
+        """
+        if size - position < RECORD_HEADER.size:
+            return "INCOMPLETE", None
+        magic, key_length, data_length, crc = RECORD_HEADER.unpack_from(buf, position)
+        if magic not in (RECORD_MAGIC, TOMBSTONE_MAGIC):
+            return "INVALID", None
+        data_offset = position + RECORD_HEADER.size + key_length
+        if data_offset + data_length > size:
+            return "INCOMPLETE", None
+        if zlib.crc32(buf[data_offset:data_offset + data_length]) != crc:
+            return "INVALID", None
+        try:
+            key = bytes(buf[position + RECORD_HEADER.size:data_offset]).decode("utf-8")
+        except UnicodeDecodeError:
+            return "INVALID", None
+        return "COMPLETE", (magic, key, data_offset, data_length)
+
+    def _next_record(self, buf, position: int, size: int) -> Optional[int]:
+        """
+        Offset of the next complete record at or after position, or None.
+        """
+        while position < size:
+            candidates = [
+                offset for offset in (buf.find(RECORD_MAGIC, position), buf.find(TOMBSTONE_MAGIC, position))
+                if offset != -1
+            ]
+            if not candidates:
+                return None
+            position = min(candidates)
+            if self._parse_record(buf, position, size)[0] == "COMPLETE":
+                return position
+            position += 1
+        return None
+
+    def _scan_segment(self, segment: int) -> int:
+        """
+        Index complete records beyond the last scanned offset.
+        A record that does not parse is a torn tail if no complete record
+        follows it, and is left for the next append to truncate. Otherwise it
+        is damage inside the segment: it is skipped (logged, and the segment
+        is sealed against further appends) and scanning resumes at the next
+        complete record, so one bad header never hides the records behind it.
+        Returns the offset just past the last complete record.
+        """
+        with self._index_lock:
+            return self._scan_segment_locked(segment)
+
+    def _scan_segment_locked(self, segment: int) -> int:
+        position = self._scanned.get(segment, 0)
+        with open(self._segment_path(segment), "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size <= position:
+                return position
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                while position < size:
+                    status, record = self._parse_record(buf, position, size)
+                    if status != "COMPLETE":
+                        resume = self._next_record(buf, position + 1, size)
+                        if resume is None:
+                            break
+                        logger.error(
+                            f"Pack segment {segment} is corrupt at offset {position}; "
+                            f"skipped to the next record at {resume}"
+                        )
+                        self._damaged.add(segment)
+                        position = resume
+                        continue
+                    magic, key, data_offset, data_length = record
+                    if magic == TOMBSTONE_MAGIC:
+                        self._index.pop(key, None)
+                    else:
+                        self._index[key] = (segment, data_offset, data_length)
+                    position = data_offset + data_length
+        self._scanned[segment] = position
+        return position
+
+    def _refresh_index(self) -> None:
+        """
+        Pick up records appended since the last scan (including other processes').
+        Only segments larger than their scanned offset are opened, so a miss
+        on an unchanged store costs a directory listing and a stat per segment.
+        """
+        for segment in self._segment_numbers():
+            try:
+                size = self._segment_path(segment).stat().st_size
+            except FileNotFoundError:
+                continue
+            if size > self._scanned.get(segment, 0):
+                self._scan_segment(segment)
+
+    async def open(self) -> None:
+        """
+        Build the index from the segments on disk, off the event loop.
+        Called once at startup so request-path lookups start warm.
+        """
+        await asyncio.to_thread(self._refresh_index)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def _choose_segment(self) -> int:
+        if self._active_segment is None:
+            segments = self._segment_numbers()
+            self._active_segment = segments[-1] if segments else 0
+            self._active_opened_at = time.monotonic()
+        else:
+            path = self._segment_path(self._active_segment)
+            size = path.stat().st_size if path.exists() else 0
+            too_old = time.monotonic() - self._active_opened_at >= self.max_segment_age_seconds
+            if size >= self.max_segment_bytes or (too_old and size > 0):
+                self._roll_segment()
+
+        # A damaged segment is sealed: never append behind its damage
+        if self._segment_path(self._active_segment).exists():
+            self._scan_segment(self._active_segment)
+        if self._active_segment in self._damaged:
+            self._roll_segment()
+        return self._active_segment
+
+    def _roll_segment(self) -> None:
+        segments = self._segment_numbers()
+        self._active_segment = max(segments[-1] if segments else 0, self._active_segment) + 1
+        self._active_opened_at = time.monotonic()
+
+    def _append_sync(self, key: str, data: bytes, magic: bytes = RECORD_MAGIC) -> IndexEntry:
+        key_bytes = key.encode("utf-8")
+        record = RECORD_HEADER.pack(magic, len(key_bytes), len(data), zlib.crc32(data)) + key_bytes + data
+        segment = self._choose_segment()
+
+        with open(self._segment_path(segment), "ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                # Under the lock nobody else is mid-append: anything after the
+                # last complete record is a torn write from a crash (damage
+                # before the tail seals the segment instead, see _scan_segment)
+                valid_end = self._scan_segment(segment)
+                if os.fstat(f.fileno()).st_size > valid_end:
+                    logger.warning(f"Truncating torn tail of pack segment {segment} at offset {valid_end}")
+                    f.truncate(valid_end)
+                f.write(record)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+        entry = (segment, valid_end + RECORD_HEADER.size + len(key_bytes), len(data))
+        with self._index_lock:
+            if magic == TOMBSTONE_MAGIC:
+                self._index.pop(key, None)
+            else:
+                self._index[key] = entry
+            self._scanned[segment] = max(self._scanned.get(segment, 0), valid_end + len(record))
+        return entry
+
+    async def write_blob(self, relative_path: str, data: bytes) -> str:
+        """
+        Append a blob to the active segment.
+        Returns the blob's pack location ("{segment file}:{offset}:{length}").
+        """
+        async with self._lock:
+            segment, offset, length = await asyncio.to_thread(self._append_sync, relative_path, data)
+        return f"{self._segment_path(segment).name}:{offset}:{length}"
+
+    async def delete_blob(self, relative_path: str) -> bool:
+        """
+        Append a tombstone for a blob. Returns False if it was already absent.
+        """
+        async with self._lock:
+            if await self._lookup_async(relative_path) is None:
+                return False
+            await asyncio.to_thread(self._append_sync, relative_path, b"", TOMBSTONE_MAGIC)
+        return True
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def _lookup(self, relative_path: str) -> Optional[IndexEntry]:
+        entry = self._index.get(relative_path)
+        if entry is None:
+            self._refresh_index()
+            entry = self._index.get(relative_path)
+        return entry
+
+    async def _lookup_async(self, relative_path: str) -> Optional[IndexEntry]:
+        """
+        _lookup with the miss rescan run in a worker thread.
+        """
+        entry = self._index.get(relative_path)
+        if entry is None:
+            await asyncio.to_thread(self._refresh_index)
+            entry = self._index.get(relative_path)
+        return entry
+
+    def _view(self, entry: IndexEntry) -> memoryview:
+        segment, offset, length = entry
+        mapped = self._maps.get(segment)
+        if mapped is None or len(mapped) < offset + length:
+            # (Re)map to cover appends made since the segment was last mapped;
+            # the previous map is released once no views reference it
+            with open(self._segment_path(segment), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = mapped
+        return memoryview(mapped)[offset:offset + length]
+
+    def read_blob_view(self, relative_path: str) -> memoryview:
+        """
+        Zero-copy view of a blob's bytes. Raises FileNotFoundError if absent.
+        """
+        entry = self._lookup(relative_path)
+        if entry is None:
+            raise FileNotFoundError(relative_path)
+        return self._view(entry)
+
+    async def read_blob(self, relative_path: str) -> bytes:
+        """
+        Read a blob's bytes. Raises FileNotFoundError if absent.
+        """
+        entry = await self._lookup_async(relative_path)
+        if entry is None:
+            raise FileNotFoundError(relative_path)
+        return bytes(self._view(entry))
+
+    async def exists(self, relative_path: str) -> bool:
+        """
+        Check whether a blob is present.
+        """
+        return await self._lookup_async(relative_path) is not None
+
+    def locate(self, relative_path: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Physical location of a blob as (segment path, offset, length), or None if absent.
+        """
+        entry = self._lookup(relative_path)
+        if entry is None:
+            return None
+        segment, offset, length = entry
+        return str(self._segment_path(segment)), offset, length
+
+    def verify_checksums(self) -> List[str]:
+        """
+        Keys whose stored bytes no longer match their record CRC32.
+        """
+        self._refresh_index()
+        corrupt = []
+        for key, (segment, offset, length) in self._index.items():
+            header_offset = offset - len(key.encode("utf-8")) - RECORD_HEADER.size
+            view = self._view((segment, header_offset, RECORD_HEADER.size))
+            _, _, _, crc = RECORD_HEADER.unpack(view)
+            if zlib.crc32(self._view((segment, offset, length))) != crc:
+                corrupt.append(key)
+        return corrupt
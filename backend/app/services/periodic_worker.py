@@ -0,0 +1,63 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+
+class PeriodicWorker(ABC):
+    """
+    Base for the background workers started with the app.
+    start() runs poll() every interval_seconds in an asyncio task until stop();
+    an error is logged and the loop carries on with the next pass.
+    Subclasses implement the abstract run_once() (poll() calls it unless overridden), set
+    name for the log, and set run_at_start to run a pass before the first sleep.
+    Workers that hold pending work extend stop() to finish it after the loop ends.
+    """
+
+    name = "Periodic worker"
+    run_at_start = False
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        # Errors are logged under the subclass's module
+        self._logger = logging.getLogger(type(self).__module__)
+
+    @abstractmethod
+    async def run_once(self) -> Any:
+        """
+        One unit of the worker's work.
+        """
+        pass
+
+    async def poll(self) -> None:
+        """
+        One pass of the loop.
+        """
+        await self.run_once()
+
+    async def _run(self) -> None:
+        if not self.run_at_start:
+            await asyncio.sleep(self.interval_seconds)
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                self._logger.error(f"{self.name} error: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Cancel the loop, waiting for it to finish.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
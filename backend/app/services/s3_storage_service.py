@@ -0,0 +1,243 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, urlsplit
+from xml.etree import ElementTree
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+EMPTY_PAYLOAD_HASH = hashlib.sha256(b"").hexdigest()
+
+
+class S3StorageError(Exception):
+    """
+    Non-retryable (or retries exhausted) failure from the object store.
+    """
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _uri_encode(value: str, safe: str = "-_.~") -> str:
+    return quote(value, safe=safe)
+
+
+class S3StorageService:
+    """
+    S3-compatible Object Storage Service (AWS S3, MinIO, ...).
+    Same interface as FileStorageService, so API nodes keep no local evidence.
+
+    - One pooled httpx.AsyncClient per process (keep-alive connections reused).
+    - Requests are signed with AWS Signature V4 (path-style addressing).
+    - Blobs at or above multipart_threshold are uploaded as concurrent
+      multipart parts; a failed upload is aborted so no parts are left behind.
+    - Transport errors and 429/5xx responses are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        access_key_id: str,
+        secret_access_key: str,
+        region: str = "us-east-1",
+        prefix: str = "",
+        max_connections: int = 50,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_base_seconds: float = 0.2,
+        timeout_seconds: float = 10.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.host = urlsplit(self.endpoint_url).netloc
+        self.bucket = bucket
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.region = region
+        self.prefix = prefix.strip("/")
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.client = httpx.AsyncClient(
+            transport=transport,
+            timeout=timeout_seconds,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+
+    # ------------------------------------------------------------------
+    # Signing & transport
+    # ------------------------------------------------------------------
+    def _key(self, relative_path: str) -> str:
+        return f"{self.prefix}/{relative_path}" if self.prefix else relative_path
+
+    def _sign(
+        self, method: str, canonical_uri: str, canonical_query: str, payload_hash: str, now: datetime
+    ) -> Dict[str, str]:
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = now.strftime("%Y%m%d")
+        headers = {"host": self.host, "x-amz-content-sha256": payload_hash, "x-amz-date": amz_date}
+        signed_headers = ";".join(sorted(headers))
+        canonical_headers = "".join(f"{name}:{headers[name]}\n" for name in sorted(headers))
+        canonical_request = "\n".join([
+            method, canonical_uri, canonical_query, canonical_headers, signed_headers, payload_hash
+        ])
+        scope = f"{date_stamp}/{self.region}/s3/aws4_request"
+        string_to_sign = "\n".join([
+            "AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()
+        ])
+
+        key = f"AWS4{self.secret_access_key}".encode("utf-8")
+        for part in (date_stamp, self.region, "s3", "aws4_request"):
+            key = hmac.new(key, part.encode("utf-8"), hashlib.sha256).digest()
+        signature = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+
+        headers["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key_id}/{scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+        del headers["host"]
+        return headers
+
+    async def _request(
+        self,
+        method: str,
+        relative_path: str,
+        query: Optional[Dict[str, str]] = None,
+        data: bytes = b"",
+        expected: Tuple[int, ...] = (200,)
+    ) -> httpx.Response:
+        """
+        Signed request against one object, retried on transport errors and 429/5xx.
+        Returns the response if its status is in `expected` (404 is returned as-is
+        when listed there); raises S3StorageError otherwise.
+        """
+        canonical_uri = "/" + "/".join(
+            _uri_encode(segment) for segment in f"{self.bucket}/{self._key(relative_path)}".split("/")
+        )
+        canonical_query = "&".join(
+            f"{_uri_encode(k)}={_uri_encode(v)}" for k, v in sorted((query or {}).items())
+        )
+        url = f"{self.endpoint_url}{canonical_uri}" + (f"?{canonical_query}" if canonical_query else "")
+        payload_hash = hashlib.sha256(data).hexdigest() if data else EMPTY_PAYLOAD_HASH
+
+        attempt = 0
+        while True:
+            headers = self._sign(method, canonical_uri, canonical_query, payload_hash, datetime.now(timezone.utc))
+            try:
+                response = await self.client.request(method, url, content=data or None, headers=headers)
+                if response.status_code in expected:
+                    return response
+                if response.status_code not in RETRYABLE_STATUS:
+                    raise S3StorageError(
+                        f"{method} {relative_path} failed with {response.status_code}: {response.text[:200]}",
+                        response.status_code
+                    )
+                failure = f"status {response.status_code}"
+            except httpx.TransportError as e:
+                failure = repr(e)
+
+            attempt += 1
+            if attempt > self.max_retries:
+                raise S3StorageError(f"{method} {relative_path} failed after {attempt} attempts: {failure}")
+            delay = self.retry_base_seconds * 2 ** (attempt - 1)
+            logger.warning(f"S3 {method} {relative_path} failed ({failure}); retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    async def _upload_multipart(self, relative_path: str, data: bytes) -> None:
+        response = await self._request("POST", relative_path, {"uploads": ""})
+        upload_id = self._find_text(response.content, "UploadId")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def upload_part(number: int, chunk: bytes) -> Tuple[int, str]:
+            async with semaphore:
+                part = await self._request(
+                    "PUT", relative_path, {"partNumber": str(number), "uploadId": upload_id}, chunk
+                )
+                return number, part.headers["etag"]
+
+        try:
+            parts = await asyncio.gather(*[
+                upload_part(i // self.part_size + 1, data[i:i + self.part_size])
+                for i in range(0, len(data), self.part_size)
+            ])
+            body = "<CompleteMultipartUpload>" + "".join(
+                f"<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>"
+                for number, etag in sorted(parts)
+            ) + "</CompleteMultipartUpload>"
+            completed = await self._request("POST", relative_path, {"uploadId": upload_id}, body.encode("utf-8"))
+            # S3 can report a failed completion in a 200 body
+            if ElementTree.fromstring(completed.content).tag.rsplit("}", 1)[-1] == "Error":
+                raise S3StorageError(f"Completing multipart upload of {relative_path} failed: {completed.text[:200]}")
+        except Exception:
+            try:
+                await self._request("DELETE", relative_path, {"uploadId": upload_id}, expected=(204, 404))
+            except S3StorageError as e:
+                logger.error(f"Failed to abort multipart upload {upload_id} for {relative_path}: {e}")
+            raise
+
+    @staticmethod
+    def _find_text(xml: bytes, tag: str) -> str:
+        for element in ElementTree.fromstring(xml).iter():
+            if element.tag.rsplit("}", 1)[-1] == tag:
+                return element.text or ""
+        raise S3StorageError(f"Malformed S3 response: no {tag}")
+
+    async def write_blob(self, relative_path: str, data: bytes) -> str:
+        """
+        Upload a blob (multipart above the threshold).
+        Returns its object URI.
+        """
+        if len(data) >= self.multipart_threshold:
+            await self._upload_multipart(relative_path, data)
+        else:
+            await self._request("PUT", relative_path, data=data)
+        return f"s3://{self.bucket}/{self._key(relative_path)}"
+
+    async def delete_blob(self, relative_path: str) -> bool:
+        """
+        Delete an object. S3 reports success whether or not it existed.
+        """
+        await self._request("DELETE", relative_path, expected=(200, 204, 404))
+        return True
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    async def read_blob(self, relative_path: str) -> bytes:
+        """
+        Download a blob's bytes. Raises FileNotFoundError if absent.
+        """
+        response = await self._request("GET", relative_path, expected=(200, 404))
+        if response.status_code == 404:
+            raise FileNotFoundError(relative_path)
+        return response.content
+
+    async def exists(self, relative_path: str) -> bool:
+        """
+        Check whether a blob is present.
+        """
+        response = await self._request("HEAD", relative_path, expected=(200, 404))
+        return response.status_code == 200
+
+    def locate(self, relative_path: str) -> None:
+        """
+        Objects have no local file region; callers fall back to read_blob.
+        """
+        return None
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,104 @@
+from typing import Optional, Protocol, Tuple
+
+from app.core.config import settings
+from app.services.file_storage_service import FileStorageService
+from app.services.pack_storage_service import PackFileStorageService
+from app.services.s3_storage_service import S3StorageService
+
+
+class StorageService(Protocol):
+    """
+    Evidence blob storage backend, keyed by relative blob path.
+    """
+
+    async def write_blob(self, relative_path: str, data: bytes) -> str: ...
+
+    async def read_blob(self, relative_path: str) -> bytes: ...
+
+    async def exists(self, relative_path: str) -> bool: ...
+
+    async def delete_blob(self, relative_path: str) -> bool: ...
+
+    def locate(self, relative_path: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Local (file path, offset, length) of a blob, or None if it has none
+        (absent, or held by a remote store).
+        """
+        ...
+
+
+_storage_service: Optional[StorageService] = None
+
+
+def create_storage_service(backend: Optional[str] = None, storage_root: Optional[str] = None) -> StorageService:
+    """
+    Build the storage backend selected by EVIDENCE_STORAGE_BACKEND ("file" | "pack" | "s3").
+    """
+    backend = backend or settings.EVIDENCE_STORAGE_BACKEND
+    storage_root = storage_root or settings.STORAGE_ROOT
+    if backend == "pack":
+        return PackFileStorageService(
+            storage_root,
+            max_segment_bytes=settings.PACK_SEGMENT_MAX_BYTES,
+            max_segment_age_seconds=settings.PACK_SEGMENT_MAX_AGE_SECONDS,
+            fsync=settings.PACK_FSYNC
+        )
+    if backend == "s3":
+        if not (settings.S3_ENDPOINT_URL and settings.S3_BUCKET and settings.S3_ACCESS_KEY_ID and settings.S3_SECRET_ACCESS_KEY):
+            raise ValueError(
+                "The s3 storage backend requires S3_ENDPOINT_URL, S3_BUCKET, "
+                "S3_ACCESS_KEY_ID and S3_SECRET_ACCESS_KEY"
+            )
+        return S3StorageService(
+            settings.S3_ENDPOINT_URL,
+            settings.S3_BUCKET,
+            settings.S3_ACCESS_KEY_ID,
+            settings.S3_SECRET_ACCESS_KEY.get_secret_value(),
+            region=settings.S3_REGION,
+            prefix=settings.S3_PREFIX,
+            max_connections=settings.S3_MAX_CONNECTIONS,
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD_BYTES,
+            part_size=settings.S3_PART_SIZE_BYTES,
+            max_concurrency=settings.S3_MAX_CONCURRENCY,
+            max_retries=settings.S3_MAX_RETRIES,
+            retry_base_seconds=settings.S3_RETRY_BASE_SECONDS,
+            timeout_seconds=settings.S3_TIMEOUT_SECONDS
+        )
+    if backend == "file":
+        return FileStorageService(storage_root)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def get_storage_service() -> StorageService:
+    """
+    Process-wide storage backend. The pack backend holds its offset index and
+    segment maps in memory, and the S3 backend its connection pool, so it is
+    built once and shared.
+    """
+    global _storage_service
+    if _storage_service is None:
+        _storage_service = create_storage_service()
+    return _storage_service
+
+
+async def open_storage_service() -> StorageService:
+    """
+    Build the shared backend and let it prepare at startup (e.g. the pack
+    backend loads its offset index off the event loop).
+    """
+    storage = get_storage_service()
+    open_ = getattr(storage, "open", None)
+    if open_ is not None:
+        await open_()
+    return storage
+
+
+async def close_storage_service() -> None:
+    """
+    Release the shared backend's resources (e.g. pooled connections) on shutdown.
+    """
+    global _storage_service
+    close = getattr(_storage_service, "close", None)
+    if close is not None:
+        await close()
+    _storage_service = None
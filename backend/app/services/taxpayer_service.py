@@ -49,26 +49,19 @@ class TaxpayerProfileService:
         # 3. All residential statuses (RESIDENT, RNOR, NRI) are now fully supported.
         # NRI taxpayers are taxed only on Indian-sourced income per Section 5(2).
 
-        # 4. Transactional Persistence
-        # We rely on the caller or framework to handle exceptions. 
-        # async with session.begin() ensures atomicity.
-        try:
-            new_profile = TaxpayerProfile(
-                user_id=user_id,
-                residential_status=res_status.value,
-                days_in_india_current_fy=profile_data.days_in_india_current_fy,
-                days_in_india_last_4_years=profile_data.days_in_india_last_4_years,
-                has_foreign_income=profile_data.has_foreign_income,
-                default_tax_regime=profile_data.default_tax_regime,
-                aadhaar_link_status=profile_data.aadhaar_link_status
-            )
+        # 4. Persistence (committed, or rolled back on error, by the request's unit of work)
+        new_profile = TaxpayerProfile(
+            user_id=user_id,
+            residential_status=res_status.value,
+            days_in_india_current_fy=profile_data.days_in_india_current_fy,
+            days_in_india_last_4_years=profile_data.days_in_india_last_4_years,
+            has_foreign_income=profile_data.has_foreign_income,
+            default_tax_regime=profile_data.default_tax_regime,
+            aadhaar_link_status=profile_data.aadhaar_link_status
+        )
             
-            saved_profile = await self.taxpayer_repo.create_profile(session, new_profile)
-            await session.commit()
-            return saved_profile
-        except Exception:
-            await session.rollback()
-            raise
+        saved_profile = await self.taxpayer_repo.create_profile(session, new_profile)
+        return saved_profile
 
     async def update_profile(self, session: AsyncSession, user_id: UUID, profile_data: TaxpayerProfileUpdate) -> TaxpayerProfile:
          # Placeholder for update logic (re-calculation needed if days change)
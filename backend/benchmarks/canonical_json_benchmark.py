@@ -0,0 +1,54 @@
+"""
+Benchmark: Canonical JSON encoding for evidence hashing.
+
+Compares the stdlib canonical form (json.dumps with sorted keys, no
+whitespace, UTF-8) with canonical_json on the payload shapes passed to
+EvidenceService.capture_evidence, and checks both produce identical bytes.
+
+Usage (from backend/, with the usual .env in place):
+    python -m benchmarks.canonical_json_benchmark [--number 100000] [--repeat 5]
+"""
+import argparse
+import timeit
+
+from app.core.canonical_json import canonical_json, canonical_json_stdlib
+
+ID = "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+TS = "2025-07-01T10:00:00.123456+00:00"
+
+PAYLOADS = {
+    "consent:grant": {
+        "id": ID, "user_id": ID, "purpose": "ITR Filing FY 2024-25", "scope": "FULL_ACCESS",
+        "expiry_at": TS, "status": "ACTIVE"
+    },
+    "filing:approval": {
+        "filing_id": ID, "action": "TAXPAYER_APPROVAL", "confirmed_by": ID,
+        "ip_address": "10.0.0.1", "timestamp": TS
+    },
+    "filing:submission": {
+        "filing_case": {"id": ID, "financial_year": "2024-25", "submitted_at": TS},
+        "itr_determination": {"id": ID, "itr_type": "ITR-3"},
+        "actor_id": ID, "actor_role": "INDIVIDUAL", "timestamp": TS, "confirmation_ref": "a" * 64
+    },
+    "with floats (stdlib path)": {"amount": 125000.5, "rate": 0.1, "id": ID},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'payload':<28}{'stdlib us':>11}{'canonical us':>14}{'speedup':>9}")
+    for name, payload in PAYLOADS.items():
+        assert canonical_json(payload) == canonical_json_stdlib(payload), f"{name}: outputs differ"
+        t_std = min(timeit.repeat(lambda: canonical_json_stdlib(payload), number=args.number, repeat=args.repeat))
+        t_fast = min(timeit.repeat(lambda: canonical_json(payload), number=args.number, repeat=args.repeat))
+        per_std = t_std / args.number * 1e6
+        per_fast = t_fast / args.number * 1e6
+        print(f"{name:<28}{per_std:>11.2f}{per_fast:>14.2f}{per_std / per_fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
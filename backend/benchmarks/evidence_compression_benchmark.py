@@ -0,0 +1,98 @@
+"""
+Benchmark: Storage savings of evidence compression.
+
+Generates a synthetic corpus shaped like the payloads passed to
+EvidenceService.capture_evidence (consent grant/revoke, CA assignment,
+filing approval/submission), trains one dictionary per action type on a
+training split, and reports stored bytes on a held-out split for:
+raw canonical JSON, plain deflate, and deflate with the trained dictionary.
+Every compressed blob is round-tripped back to its canonical bytes.
+
+Usage (from backend/, with the usual .env in place):
+    python -m benchmarks.evidence_compression_benchmark [--per-type 5000] [--train 1000]
+"""
+import argparse
+import hashlib
+import json
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.evidence_codec import EvidenceCodec, train_dictionary
+
+BASE_TIME = datetime(2025, 7, 1, tzinfo=timezone.utc)
+PURPOSES = ["ITR Filing FY 2024-25", "Tax planning review", "GST reconciliation", "Notice response"]
+REASONS = ["Engagement completed", "Changed CA", "Consent no longer required", None]
+ITR_TYPES = ["ITR-1", "ITR-2", "ITR-3", "ITR-4"]
+
+
+def canonical(payload: dict) -> bytes:
+    return json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+
+
+def _ts(rng: random.Random) -> str:
+    return (BASE_TIME + timedelta(seconds=rng.randint(0, 365 * 86400), microseconds=rng.randint(0, 999999))).isoformat()
+
+
+def _id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+GENERATORS = {
+    "consent:grant": lambda rng: {
+        "id": _id(rng), "user_id": _id(rng), "purpose": rng.choice(PURPOSES),
+        "scope": rng.choice(["FULL_ACCESS", "READ_ONLY"]), "expiry_at": _ts(rng), "status": "ACTIVE"
+    },
+    "consent:revoke": lambda rng: {
+        "consent_id": _id(rng), "revoked_by": _id(rng), "reason": rng.choice(REASONS), "timestamp": _ts(rng)
+    },
+    "assignment:assign": lambda rng: {
+        "id": _id(rng), "filing_id": _id(rng), "ca_user_id": _id(rng), "consent_id": _id(rng),
+        "status": "ACTIVE", "assigned_at": _ts(rng)
+    },
+    "filing:approval": lambda rng: {
+        "filing_id": _id(rng), "action": "TAXPAYER_APPROVAL", "confirmed_by": _id(rng),
+        "ip_address": f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}", "timestamp": _ts(rng)
+    },
+    "filing:submission": lambda rng: {
+        "filing_case": {"id": _id(rng), "financial_year": "2024-25", "submitted_at": _ts(rng)},
+        "itr_determination": {"id": _id(rng), "itr_type": rng.choice(ITR_TYPES)},
+        "actor_id": _id(rng), "actor_role": rng.choice(["INDIVIDUAL", "BUSINESS"]), "timestamp": _ts(rng),
+        "confirmation_ref": hashlib.sha256(rng.randbytes(16)).hexdigest()
+    },
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--per-type", type=int, default=5000, help="held-out documents per action type")
+    parser.add_argument("--train", type=int, default=1000, help="training documents per action type")
+    parser.add_argument("--dictionary-size", type=int, default=16 * 1024)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    plain = EvidenceCodec()
+    trained = EvidenceCodec()
+    totals = [0, 0, 0]
+
+    print(f"{'action type':<20}{'raw':>12}{'deflate':>12}{'dict':>12}{'saved':>9}")
+    for action_type, generate in GENERATORS.items():
+        training = [canonical(generate(rng)) for _ in range(args.train)]
+        held_out = [canonical(generate(rng)) for _ in range(args.per_type)]
+        trained.add_dictionary(train_dictionary(training, args.dictionary_size), action_type)
+
+        for doc in held_out:
+            assert trained.decode(trained.encode(doc, action_type)) == doc
+
+        raw = sum(len(doc) for doc in held_out)
+        deflated = plain.compressed_size(held_out)
+        with_dict = trained.compressed_size(held_out, action_type)
+        totals = [totals[0] + raw, totals[1] + deflated, totals[2] + with_dict]
+        print(f"{action_type:<20}{raw:>12}{deflated:>12}{with_dict:>12}{1 - with_dict / raw:>8.1%}")
+
+    raw, deflated, with_dict = totals
+    print(f"{'total':<20}{raw:>12}{deflated:>12}{with_dict:>12}{1 - with_dict / raw:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
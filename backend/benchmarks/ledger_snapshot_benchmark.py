@@ -0,0 +1,89 @@
+"""
+Benchmark: Object-loop vs Columnar compliance rule evaluation.
+
+Compares BaseComplianceRule.evaluate (Decimal arithmetic over FinancialEntry
+objects) with evaluate_snapshot (NumPy arrays in integer paise) on a
+synthetic business ledger, and checks that both paths agree.
+
+Usage (from backend/, with the usual .env in place):
+    python -m benchmarks.ledger_snapshot_benchmark [--entries 200000] [--repeat 5]
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.models.financials import FinancialEntry
+from app.engines.ledger_snapshot import LedgerSnapshot
+from app.services.compliance_rules import HighTotalExpenseRule, ExpenseWithoutIncomeRule
+
+CATEGORIES = ["BUSINESS", "PROFESSION", "SALARY", "INTEREST", "RENT", "TRAVEL", "UTILITIES", "SUPPLIES"]
+FY_START = date(2024, 4, 1)
+
+
+def build_ledger(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    entries = []
+    rows = []
+    for _ in range(n):
+        entry_type = "INCOME" if rng.random() < 0.3 else "EXPENSE"
+        category = rng.choice(CATEGORIES)
+        paise = rng.randint(100, 5_000_000)
+        entry_date = FY_START + timedelta(days=rng.randint(0, 364))
+        entries.append(FinancialEntry(
+            entry_type=entry_type,
+            category=category,
+            amount=Decimal(paise).scaleb(-2),
+            financial_year="2024-25",
+            entry_date=entry_date
+        ))
+        rows.append((entry_type, category, paise, entry_date))
+    return entries, rows
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    entries, rows = build_ledger(args.entries)
+    rules = [HighTotalExpenseRule(), ExpenseWithoutIncomeRule()]
+
+    def object_path():
+        return [rule.evaluate(entries) for rule in rules]
+
+    def snapshot_build():
+        return LedgerSnapshot.from_rows(rows)
+
+    snapshot = snapshot_build()
+
+    def snapshot_path():
+        return [rule.evaluate_snapshot(snapshot) for rule in rules]
+
+    assert object_path() == snapshot_path(), "Object and columnar rule results differ"
+
+    t_object = best_of(args.repeat, object_path)
+    t_build = best_of(args.repeat, snapshot_build)
+    t_snapshot = best_of(args.repeat, snapshot_path)
+
+    print(f"entries:                 {args.entries}")
+    print(f"object loops (rules):    {t_object * 1000:9.2f} ms")
+    print(f"snapshot build:          {t_build * 1000:9.2f} ms")
+    print(f"vectorized (rules):      {t_snapshot * 1000:9.2f} ms")
+    print(f"speedup (rules only):    {t_object / t_snapshot:9.1f}x")
+    print(f"speedup (incl. build):   {t_object / (t_build + t_snapshot):9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,28 @@ for table in Base.metadata.tables.values():
             column.default = ColumnDefault(uuid.uuid4)
 
 
+# SQLite drops the offset of DateTime(timezone=True) values; read them back as
+# UTC-aware datetimes, as PostgreSQL does, so comparisons with aware values work
+from datetime import timezone
+from sqlalchemy import DateTime, TypeDecorator
+
+
+class SQLiteAwareDateTime(TypeDecorator):
+    impl = DateTime
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+
+for table in Base.metadata.tables.values():
+    for column in table.columns:
+        if isinstance(column.type, DateTime) and column.type.timezone:
+            column.type = SQLiteAwareDateTime(timezone=True)
+
+
 
 
 
@@ -132,6 +154,16 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@pytest.fixture
+def committing_session_factory() -> async_sessionmaker:
+    """
+    Session factory on the test engine whose commits really persist, for
+    workers that open and commit their own sessions.
+    Tests using it must delete the rows they create.
+    """
+    return TestSessionLocal
+
+
 # ---------------------------------------------------------------------------
 # FastAPI Test Client with DB Override
 # ---------------------------------------------------------------------------
@@ -167,3 +199,44 @@ def auth_headers():
     def _make_headers(token: str) -> dict:
         return {"Authorization": f"Bearer {token}"}
     return _make_headers
+
+
+# ---------------------------------------------------------------------------
+# SQL Round-Trip Recorder
+# ---------------------------------------------------------------------------
+class StatementLog:
+    """
+    Records every statement sent on the test connection while entered.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.connection = session.get_bind()
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.connection, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.connection, "before_cursor_execute", self._record)
+
+    def inserts_into(self, table: str):
+        return [s for s in self.statements if s.lstrip().upper().startswith(f"INSERT INTO {table.upper()}")]
+
+    def selects_from(self, table: str):
+        return [
+            s for s in self.statements
+            if s.lstrip().upper().startswith("SELECT") and f"FROM {table.upper()}" in s.upper()
+        ]
+
+
+@pytest.fixture
+def statement_log(db_session: AsyncSession) -> StatementLog:
+    """
+    Usage: with statement_log as log: ...; then inspect log.statements.
+    """
+    return StatementLog(db_session)
@@ -0,0 +1,111 @@
+import pytest
+import uuid
+from contextlib import asynccontextmanager
+from sqlalchemy import delete, func, select
+
+from app.models.audit import AuditLog
+from app.models.user import User
+from app.repositories.audit_repository import AuditLogRepository
+from app.services.audit_service import AuditService
+from app.services.audit_sink import AuditSinkQueue, AuditSinkWorker
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _count(db_session, action: str) -> int:
+    return (await db_session.execute(
+        select(func.count()).select_from(AuditLog).where(AuditLog.action == action)
+    )).scalar_one()
+
+
+async def test_audit_entries_written_as_one_insert_at_commit(db_session, statement_log):
+    """
+    log_action issues no SQL; the transaction's entries go out as a single
+    multi-row INSERT when it commits.
+    """
+    service = AuditService(AuditLogRepository())
+    with statement_log as log:
+        for n in range(5):
+            await service.log_action(db_session, None, "ADMIN", "TEST_BATCHED", after_value={"n": n})
+        assert log.statements == []
+        await db_session.commit()
+
+    assert len(log.inserts_into("audit_logs")) == 1
+    assert await _count(db_session, "TEST_BATCHED") == 5
+
+
+async def test_buffered_entries_follow_the_transaction(db_session):
+    """
+    Entries reference rows added in the same transaction, are visible to the
+    transaction's own reads, and are discarded on rollback.
+    """
+    user_id = uuid.uuid4()
+    db_session.add(User(
+        id=user_id, pan="ABCDA3901Z", legal_name="Audit Buffer",
+        email="audit_buffer@example.com", mobile="9876543901", primary_role="INDIVIDUAL"
+    ))
+    service = AuditService(AuditLogRepository())
+    await service.log_action(db_session, user_id, "INDIVIDUAL", "TEST_VISIBLE")
+    await db_session.commit()
+
+    await service.log_action(db_session, user_id, "INDIVIDUAL", "TEST_VISIBLE")
+    entries, next_cursor = await service.get_user_logs(db_session, user_id)
+    assert [entry.action for entry in entries] == ["TEST_VISIBLE"] * 2 and next_cursor is None
+
+    first, next_cursor = await service.get_user_logs(db_session, user_id, limit=1)
+    second, last_cursor = await service.get_user_logs(db_session, user_id, limit=1, cursor=next_cursor)
+    assert [first[0].id, second[0].id] == [entry.id for entry in entries] and last_cursor is None
+
+    await service.log_action(db_session, user_id, "INDIVIDUAL", "TEST_DISCARDED")
+    await db_session.rollback()
+    assert "buffered_inserts" not in db_session.info
+    assert await _count(db_session, "TEST_DISCARDED") == 0
+
+
+async def test_non_critical_entries_go_to_the_sink(db_session, statement_log):
+    """
+    critical=False hands the entry to the sink; the worker writes queued
+    entries in batches outside the caller's transaction.
+    """
+    queue = AuditSinkQueue(max_entries=3)
+    service = AuditService(AuditLogRepository(), sink=queue)
+    for n in range(4):
+        await service.log_action(db_session, None, "ADMIN", "TEST_SINK", after_value={"n": n}, critical=False)
+    assert len(queue) == 3 and queue.dropped == 1
+    assert db_session.info.get("buffered_inserts") is None
+
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    with statement_log as log:
+        written = await AuditSinkWorker(queue, _session_factory, batch_size=2).run_once()
+    assert written == 3 and len(queue) == 0
+    assert len(log.inserts_into("audit_logs")) == 2
+    assert await _count(db_session, "TEST_SINK") == 3
+
+
+async def test_poison_entry_is_dead_lettered_without_blocking_the_sink(committing_session_factory):
+    """
+    A batch that fails on one bad entry is retried row by row: the good
+    entries are written and the bad one is dropped after max_attempts passes.
+    """
+    queue = AuditSinkQueue(max_entries=10)
+    service = AuditService(AuditLogRepository(), sink=queue)
+    for n in range(3):
+        # object() cannot be serialised to JSON, so the middle entry never writes
+        after_value = {"n": object()} if n == 1 else {"n": n}
+        await service.log_action(None, None, "ADMIN", "TEST_SINK_POISON", after_value=after_value, critical=False)
+
+    worker = AuditSinkWorker(queue, committing_session_factory, batch_size=10, max_attempts=2)
+    try:
+        assert await worker.run_once() == 2
+        assert len(queue) == 1 and worker.dead_lettered == 0
+        assert await worker.run_once() == 0
+        assert len(queue) == 0 and worker.dead_lettered == 1
+        async with committing_session_factory() as session:
+            assert await _count(session, "TEST_SINK_POISON") == 2
+    finally:
+        async with committing_session_factory() as session:
+            await session.execute(delete(AuditLog).where(AuditLog.action == "TEST_SINK_POISON"))
+            await session.commit()
@@ -0,0 +1,61 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.models.user import User
+from app.repositories.audit_partition_repository import AuditPartitionRepository
+from app.repositories.audit_repository import AuditLogRepository
+from app.services.audit_partition_service import (
+    AuditPartitionService, add_months, month_start, partition_month, partition_name
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_month_arithmetic_and_partition_names():
+    """
+    Partitions are named after their UTC month and map back to it.
+    """
+    month = month_start(datetime(2026, 12, 31, 23, 30, tzinfo=timezone(timedelta(hours=-5))))
+    assert month == datetime(2027, 1, 1, tzinfo=timezone.utc)
+    assert add_months(month, -1) == datetime(2026, 12, 1, tzinfo=timezone.utc)
+    assert add_months(month, 14) == datetime(2028, 3, 1, tzinfo=timezone.utc)
+    assert partition_name(month) == "audit_logs_p2027_01"
+    assert partition_month("audit_logs_p2027_01") == month
+    assert partition_month("audit_logs_default") is None
+
+
+async def test_partition_maintenance_is_noop_without_partitioning(db_session):
+    """
+    On the SQLite harness (no declarative partitioning) maintenance does nothing.
+    """
+    service = AuditPartitionService(AuditPartitionRepository())
+    now = datetime.now(timezone.utc)
+    assert await service.ensure_partitions(db_session, now, 3) == []
+    assert await service.detach_partitions_before(db_session, now) == []
+
+
+async def test_get_by_user_time_window(db_session):
+    """
+    since/until bound the scan to [since, until), newest first.
+    """
+    user_id = uuid4()
+    db_session.add(User(
+        id=user_id, pan="ABCDA4401Z", legal_name="Audit Window",
+        email="audit_window@example.com", mobile="9876544401", primary_role="INDIVIDUAL"
+    ))
+    await db_session.flush()
+    repo = AuditLogRepository()
+    for month in (1, 2, 3):
+        await repo.create_logs(db_session, [{
+            "id": uuid4(), "actor_id": user_id, "actor_role": "INDIVIDUAL", "action": f"TEST_MONTH_{month}",
+            "before_value": None, "after_value": None, "ip_address": None, "device_id": None,
+            "created_at": datetime(2026, month, 15, tzinfo=timezone.utc)
+        }])
+
+    logs = await repo.get_by_user(
+        db_session, user_id,
+        since=datetime(2026, 2, 1, tzinfo=timezone.utc), until=datetime(2026, 4, 1, tzinfo=timezone.utc)
+    )
+    assert [log.action for log in logs] == ["TEST_MONTH_3", "TEST_MONTH_2"]
+    assert len(await repo.get_by_user(db_session, user_id)) == 3
@@ -0,0 +1,137 @@
+import pytest
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.audit_repository import AuditLogRepository, search_statement
+from app.services.audit_sink import audit_sink_queue
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _register(client: AsyncClient, role: str, n: int) -> tuple:
+    password = "StrongPassword123!"
+    email = f"audit_query_{role.lower()}_{n}@example.com"
+    resp = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": email,
+            "password": password,
+            "legal_name": f"Audit Query {role}",
+            "mobile": f"98765450{n:02d}",
+            "pan": f"ABCDQ45{n:02d}Z",
+            "primary_role": role
+        }
+    )
+    login = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return UUID(resp.json()["id"]), {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+async def _seed(db_session, actor_id: UUID, role: str, action: str, day: int, count: int = 1) -> None:
+    await AuditLogRepository().create_logs(db_session, [{
+        "id": uuid4(), "actor_id": actor_id, "actor_role": role, "action": action,
+        "before_value": None, "after_value": {"day": day}, "ip_address": "10.0.0.1", "device_id": None,
+        "created_at": datetime(2026, 3, day, tzinfo=timezone.utc)
+    } for _ in range(count)])
+
+
+async def test_admin_pages_through_logs_with_filters(client: AsyncClient, db_session):
+    """
+    Keyset pages are disjoint and newest first (ties broken by id); filters
+    and the time window narrow the result.
+    """
+    admin_id, headers = await _register(client, "ADMIN", 1)
+    await _seed(db_session, admin_id, "ADMIN", "TEST_QUERY_A", 1)
+    await _seed(db_session, admin_id, "ADMIN", "TEST_QUERY_B", 2, count=3)
+    await _seed(db_session, admin_id, "ADMIN", "TEST_QUERY_A", 3)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "actor_id": str(admin_id), **({"cursor": cursor} if cursor else {})}
+        page = (await client.get("/api/v1/audit/logs", params=params, headers=headers)).json()
+        assert len(page["items"]) <= 2
+        seen.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 5 and len({item["id"] for item in seen}) == 5
+    keys = [(item["created_at"], item["id"]) for item in seen]
+    assert keys == sorted(keys, reverse=True)
+    assert seen[0]["after_value"] == {"day": 3} and seen[0]["ip_address"] == "10.0.0.1"
+
+    resp = await client.get("/api/v1/audit/logs", params={"action": "TEST_QUERY_A"}, headers=headers)
+    assert [item["after_value"]["day"] for item in resp.json()["items"]] == [3, 1]
+
+    resp = await client.get(
+        "/api/v1/audit/logs",
+        params={"actor_role": "ADMIN", "since": "2026-03-02T00:00:00Z", "until": "2026-03-03T00:00:00Z"},
+        headers=headers
+    )
+    assert [item["action"] for item in resp.json()["items"]] == ["TEST_QUERY_B"] * 3
+
+    # Each search leaves an access-trail entry in the audit sink
+    searches = [entry for entry in audit_sink_queue.pop_batch(len(audit_sink_queue)) if entry["actor_id"] == admin_id]
+    assert [entry["action"] for entry in searches] == ["AUDIT_LOGS_SEARCHED"] * 5
+    assert searches[-1]["after_value"]["since"] == "2026-03-02T00:00:00+00:00"
+
+
+async def test_audit_search_scope_and_limits(client: AsyncClient, db_session):
+    """
+    A CA only sees their own (and consented clients') logs; taxpayers are
+    refused; oversized pages and malformed cursors are rejected.
+    """
+    ca_id, ca_headers = await _register(client, "CA", 2)
+    taxpayer_id, taxpayer_headers = await _register(client, "INDIVIDUAL", 3)
+    await _seed(db_session, ca_id, "CA", "TEST_SCOPE_CA", 4)
+    await _seed(db_session, taxpayer_id, "INDIVIDUAL", "TEST_SCOPE_TAXPAYER", 4)
+
+    resp = await client.get("/api/v1/audit/logs", headers=ca_headers)
+    assert [item["action"] for item in resp.json()["items"]] == ["TEST_SCOPE_CA"]
+    resp = await client.get("/api/v1/audit/logs", params={"actor_id": str(taxpayer_id)}, headers=ca_headers)
+    assert resp.json()["items"] == []
+
+    assert (await client.get("/api/v1/audit/logs", headers=taxpayer_headers)).status_code == 403
+    assert (await client.get("/api/v1/audit/logs", params={"limit": 1000}, headers=ca_headers)).status_code == 422
+    assert (await client.get("/api/v1/audit/logs", params={"cursor": "not-a-cursor"}, headers=ca_headers)).status_code == 400
+
+
+async def test_search_over_several_actors_pages_in_keyset_order(client: AsyncClient, db_session):
+    """
+    With several actor_ids the page is merged from per-actor walks; paging
+    still yields every matching row once, newest first, and no other actor's.
+    """
+    actors = [(await _register(client, "INDIVIDUAL", n))[0] for n in (5, 6, 7)]
+    for day, actor in enumerate(actors * 2, start=1):
+        await _seed(db_session, actor, "INDIVIDUAL", "TEST_MULTI_ACTOR", day)
+
+    repo = AuditLogRepository()
+    seen, before = [], None
+    while True:
+        page = await repo.search(db_session, 2, before, actor_ids=actors[:2], action="TEST_MULTI_ACTOR")
+        seen.extend(page)
+        if len(page) < 2:
+            break
+        before = (page[-1].created_at, page[-1].id)
+    assert [entry.after_value["day"] for entry in seen] == [5, 4, 2, 1]
+    assert {entry.actor_id for entry in seen} == set(actors[:2])
+
+
+async def test_search_over_a_large_actor_set(client: AsyncClient, db_session):
+    """
+    Tens of thousands of actor_ids travel as one array parameter rather than
+    one per actor, so the query stays under the driver's bind limit.
+    """
+    actor, _ = await _register(client, "INDIVIDUAL", 8)
+    await _seed(db_session, actor, "INDIVIDUAL", "TEST_MANY_ACTORS", 3, count=2)
+    actor_ids = [uuid4() for _ in range(40000)] + [actor]
+
+    page = await AuditLogRepository().search(db_session, 10, actor_ids=actor_ids, action="TEST_MANY_ACTORS")
+    assert [entry.actor_id for entry in page] == [actor, actor]
+
+    for ids in (actor_ids[:2], actor_ids):
+        compiled = search_statement("postgresql", 10, actor_ids=ids, action="TEST_MANY_ACTORS").compile(
+            dialect=postgresql.dialect()
+        )
+        assert "LATERAL" in str(compiled)
+        assert len(compiled.params) == 4
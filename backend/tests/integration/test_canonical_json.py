@@ -0,0 +1,76 @@
+import random
+import pytest
+from datetime import datetime, timezone
+from uuid import UUID
+
+from app.core.canonical_json import canonical_json, canonical_json_stdlib
+
+# Characters that exercise escaping, sort order and multi-byte UTF-8
+ALPHABET = (
+    [chr(c) for c in range(0x00, 0x80)]
+    + ["\x7f", "é", "ÿ", "Ā", " ", " ", "₹", "﻿", "￿",
+       "\U0001f600", "\U0010ffff", "हि"]
+)
+
+
+def _string(rng: random.Random) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 12)))
+
+
+def _scalar(rng: random.Random, allow_float: bool):
+    choice = rng.randint(0, 9 if allow_float else 7)
+    if choice <= 2:
+        return _string(rng)
+    if choice == 3:
+        return rng.randint(-2**63, 2**64 - 1)
+    if choice == 4:
+        return rng.choice([0, -1, 1, 2**63 - 1, -2**63, 2**64, -(2**70), 10**30])
+    if choice == 5:
+        return rng.choice([True, False])
+    if choice <= 7:
+        return None
+    if choice == 8:
+        return rng.choice([0.0, -0.0, 0.1, 1e-05, 1e16, 1.5e300, 5e-324, 123456.789, float("nan"), float("inf")])
+    return rng.uniform(-1e20, 1e20)
+
+
+def _value(rng: random.Random, depth: int, allow_float: bool):
+    if depth <= 0 or rng.random() < 0.4:
+        return _scalar(rng, allow_float)
+    if rng.random() < 0.5:
+        return {_string(rng): _value(rng, depth - 1, allow_float) for _ in range(rng.randint(0, 6))}
+    container = [_value(rng, depth - 1, allow_float) for _ in range(rng.randint(0, 6))]
+    return tuple(container) if rng.random() < 0.2 else container
+
+
+def _outcome(encode, value):
+    try:
+        return encode(value)
+    except Exception as e:  # the same failure must surface from both encoders
+        return type(e)
+
+
+@pytest.mark.parametrize("allow_float", [False, True])
+def test_canonical_json_matches_stdlib_on_random_corpus(allow_float):
+    """
+    Property: for generated nested JSON values (unicode, control characters,
+    64-bit edges and big ints, floats, tuples), output is byte-identical to the
+    stdlib canonical form.
+    """
+    rng = random.Random(20261018 + allow_float)
+    for _ in range(3000):
+        value = {_string(rng): _value(rng, 4, allow_float) for _ in range(rng.randint(0, 8))}
+        assert _outcome(canonical_json, value) == _outcome(canonical_json_stdlib, value)
+
+
+@pytest.mark.parametrize("value", [
+    {"a": "\ud800"},                      # lone surrogate: not encodable as UTF-8
+    {1: "int key", "b": 2},               # non-string keys
+    {"id": UUID(int=1)},                  # types json.dumps rejects
+    {"at": datetime(2025, 1, 1, tzinfo=timezone.utc)},
+    {"s": {1, 2}},
+    {"big": 2**64, "neg": -(2**64)},
+    {"nan": float("nan"), "inf": float("-inf")},
+])
+def test_canonical_json_edge_cases_match_stdlib(value):
+    assert _outcome(canonical_json, value) == _outcome(canonical_json_stdlib, value)
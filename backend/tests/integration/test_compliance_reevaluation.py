@@ -0,0 +1,181 @@
+import pytest
+import uuid
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+from httpx import AsyncClient
+from sqlalchemy import delete, select
+
+from app.models.compliance import ComplianceFlag
+from app.models.financials import FinancialEntry
+from app.models.user import User
+from app.services.compliance_reevaluation import (
+    ComplianceDirtySet, ComplianceReevaluationWorker, compliance_dirty_set
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _get_auth_token(client: AsyncClient, email: str) -> str:
+    """Helper to register and login an INDIVIDUAL user."""
+    password = "StrongPassword123!"
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": email,
+            "password": password,
+            "legal_name": "Ledger Owner",
+            "mobile": "9876543001",
+            "pan": "ABCDP3001Z",
+            "primary_role": "INDIVIDUAL"
+        }
+    )
+    response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+async def test_ledger_burst_coalesces_into_single_evaluation(client: AsyncClient, db_session):
+    """
+    Several ledger writes for the same (user, FY) leave one dirty slot,
+    and a single worker pass raises the expected flag.
+    """
+    token = await _get_auth_token(client, "ledger_burst@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    compliance_dirty_set.pop_settled(0, 0)
+
+    for amount in ("1000.00", "2000.00", "3000.00"):
+        resp = await client.post(
+            "/api/v1/financial/",
+            json={
+                "entry_type": "EXPENSE",
+                "category": "RENT",
+                "amount": amount,
+                "financial_year": "2024-25",
+                "entry_date": "2024-06-01"
+            },
+            headers=headers
+        )
+        assert resp.status_code == 201
+
+    assert len(compliance_dirty_set) == 1
+
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    worker = ComplianceReevaluationWorker(
+        compliance_dirty_set,
+        _session_factory,
+        debounce_seconds=60,
+        max_delay_seconds=60
+    )
+    # Still inside the debounce window: nothing is evaluated yet
+    assert await worker.run_once() == 0
+    assert await worker.run_once(flush=True) == 1
+    assert len(compliance_dirty_set) == 0
+
+    flags_resp = await client.get("/api/v1/compliance/", params={"financial_year": "2024-25"}, headers=headers)
+    assert flags_resp.status_code == 200
+    assert [f["flag_code"] for f in flags_resp.json()] == ["C002"]
+
+
+async def test_repeated_evaluation_does_not_duplicate_open_flags(client: AsyncClient, db_session):
+    """
+    Re-running evaluate_user against an unchanged ledger inserts nothing:
+    the open flag already occupies its slot in uq_compliance_flags_open.
+    """
+    token = await _get_auth_token(client, "ledger_repeat@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = await client.post(
+        "/api/v1/financial/",
+        json={
+            "entry_type": "EXPENSE",
+            "category": "TRAVEL",
+            "amount": "500.00",
+            "financial_year": "2024-25",
+            "entry_date": "2024-07-01"
+        },
+        headers=headers
+    )
+    assert resp.status_code == 201
+
+    for _ in range(3):
+        eval_resp = await client.post("/api/v1/compliance/evaluate", json={"financial_year": "2024-25"}, headers=headers)
+        assert eval_resp.status_code == 200
+
+    flags_resp = await client.get("/api/v1/compliance/", params={"financial_year": "2024-25"}, headers=headers)
+    assert [f["flag_code"] for f in flags_resp.json()] == ["C002"]
+
+
+async def test_worker_commits_in_its_own_session(committing_session_factory):
+    """
+    Without an injected session the worker opens one from its factory,
+    evaluates, and commits: the flag is visible from a fresh session.
+    """
+    user_id = uuid.uuid4()
+    async with committing_session_factory() as session:
+        session.add(User(
+            id=user_id, pan="ABCDP3002Z", legal_name="Own Session", email="own_session@example.com",
+            mobile="9876543002", primary_role="INDIVIDUAL"
+        ))
+        await session.flush()
+        session.add(FinancialEntry(
+            user_id=user_id, entry_type="EXPENSE", category="RENT", amount=Decimal("1000.00"),
+            financial_year="2024-25", entry_date=date(2024, 6, 1)
+        ))
+        await session.commit()
+
+    dirty_set = ComplianceDirtySet()
+    dirty_set.mark_dirty(user_id, "2024-25")
+    worker = ComplianceReevaluationWorker(dirty_set, committing_session_factory, debounce_seconds=0)
+    try:
+        assert await worker.run_once() == 1
+        async with committing_session_factory() as session:
+            codes = (await session.execute(
+                select(ComplianceFlag.flag_code).where(ComplianceFlag.user_id == user_id)
+            )).scalars().all()
+        assert codes == ["C002"]
+    finally:
+        async with committing_session_factory() as session:
+            for model in (ComplianceFlag, FinancialEntry):
+                await session.execute(delete(model).where(model.user_id == user_id))
+            await session.execute(delete(User).where(User.id == user_id))
+            await session.commit()
+
+
+async def test_failing_pair_backs_off_and_is_dropped(db_session):
+    """
+    A pair whose evaluation keeps failing waits out its backoff before the
+    next attempt and is dropped after max_attempts failures.
+    """
+    class _FailingService:
+        calls = 0
+
+        async def evaluate_user(self, session, user_id, financial_year):
+            _FailingService.calls += 1
+            raise RuntimeError("rule crashed")
+
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    dirty_set = ComplianceDirtySet()
+    user_id = uuid.uuid4()
+    dirty_set.mark_dirty(user_id, "2024-25")
+    worker = ComplianceReevaluationWorker(
+        dirty_set, _session_factory, service_factory=_FailingService,
+        debounce_seconds=0, retry_base_seconds=60, max_attempts=3
+    )
+
+    assert await worker.run_once() == 1
+    # Backing off: queued, but not settled yet
+    assert len(dirty_set) == 1
+    assert await worker.run_once() == 0
+
+    # A flush ignores the backoff; the third failure drops the pair
+    assert await worker.run_once(flush=True) == 1
+    assert len(dirty_set) == 1
+    assert await worker.run_once(flush=True) == 1
+    assert _FailingService.calls == 3
+    assert len(dirty_set) == 0
@@ -0,0 +1,107 @@
+import pytest
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _get_auth_token(client: AsyncClient, email: str, pan: str) -> str:
+    """Helper to register and login an INDIVIDUAL user."""
+    password = "StrongPassword123!"
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": email,
+            "password": password,
+            "legal_name": "ETag Owner",
+            "mobile": "9876543301",
+            "pan": pan,
+            "primary_role": "INDIVIDUAL"
+        }
+    )
+    response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+async def _add_entry(client: AsyncClient, headers: dict, entry_type: str, category: str):
+    resp = await client.post(
+        "/api/v1/financial/",
+        json={
+            "entry_type": entry_type,
+            "category": category,
+            "amount": "2500.00",
+            "financial_year": "2024-25",
+            "entry_date": "2024-06-01"
+        },
+        headers=headers
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+async def test_ledger_etag_revalidates_until_ledger_changes(client: AsyncClient):
+    """
+    An unchanged ledger answers If-None-Match with 304; a write changes the ETag.
+    """
+    token = await _get_auth_token(client, "etag_ledger@example.com", "ABCDP3301Z")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await _add_entry(client, headers, "INCOME", "SALARY")
+
+    first = await client.get("/api/v1/financial/", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = await client.get("/api/v1/financial/", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    # Filtered views are distinct representations
+    filtered = await client.get("/api/v1/financial/", params={"entry_type": "INCOME"}, headers=headers)
+    assert filtered.headers["ETag"] != etag
+
+    await _add_entry(client, headers, "EXPENSE", "RENT")
+
+    changed = await client.get("/api/v1/financial/", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 2
+
+
+async def test_compliance_and_itr_etags(client: AsyncClient):
+    """
+    Compliance flag and ITR determination GETs revalidate with 304 and
+    change their ETag when the underlying rows change.
+    """
+    token = await _get_auth_token(client, "etag_itr@example.com", "ABCDP3302Z")
+    headers = {"Authorization": f"Bearer {token}"}
+    params = {"financial_year": "2024-25"}
+
+    missing = await client.get("/api/v1/itr/", params=params, headers=headers)
+    assert missing.status_code == 404
+
+    await _add_entry(client, headers, "EXPENSE", "TRAVEL")
+
+    flags = await client.get("/api/v1/compliance/", params=params, headers=headers)
+    flags_etag = flags.headers["ETag"]
+    await client.post("/api/v1/compliance/evaluate", json=params, headers=headers)
+    flags_after = await client.get("/api/v1/compliance/", params=params, headers={**headers, "If-None-Match": flags_etag})
+    assert flags_after.status_code == 200
+    assert [f["flag_code"] for f in flags_after.json()] == ["C002"]
+    flags_cached = await client.get(
+        "/api/v1/compliance/", params=params, headers={**headers, "If-None-Match": flags_after.headers["ETag"]}
+    )
+    assert flags_cached.status_code == 304
+
+    await client.post("/api/v1/itr/determine", json=params, headers=headers)
+    itr = await client.get("/api/v1/itr/", params=params, headers=headers)
+    assert itr.status_code == 200
+    itr_etag = itr.headers["ETag"]
+    itr_cached = await client.get("/api/v1/itr/", params=params, headers={**headers, "If-None-Match": f"W/{itr_etag}"})
+    assert itr_cached.status_code == 304
+
+    lock = await client.post("/api/v1/itr/2024-25/lock", headers=headers)
+    assert lock.status_code == 200
+    itr_locked = await client.get("/api/v1/itr/", params=params, headers={**headers, "If-None-Match": itr_etag})
+    assert itr_locked.status_code == 200
+    assert itr_locked.json()["is_locked"] is True
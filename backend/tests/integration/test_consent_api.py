@@ -1,6 +1,16 @@
 import pytest
 from httpx import AsyncClient
-from uuid import uuid4
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+
+from app.core.exceptions import UnauthorizedError
+from app.models.user import User
+from app.repositories.auth_repository import AuthRepository
+from app.repositories.consent_repository import CAAssignmentRepository, ConsentAuditRepository, ConsentRepository
+from app.repositories.filing_repository import FilingCaseRepository
+from app.services.ca_access_cache import CAAccessCache, ca_access_cache
+from app.services.ca_assignment_service import CAAssignmentService
 
 pytestmark = pytest.mark.asyncio
 
@@ -167,3 +177,194 @@ async def test_ca_discovery_api(client: AsyncClient):
     # 2. CA attempts to discover CAs (Should get 403 Forbidden)
     ca_unauth_resp = await client.get("/api/v1/auth/cas", headers=headers_ca)
     assert ca_unauth_resp.status_code == 403
+
+
+async def _create_assigned_filing(client: AsyncClient, ca_email: str, email: str) -> dict:
+    """Helper: taxpayer with a locked ITR, a filing case, a consent and a CA assignment."""
+    token = await create_user_and_login(client, email, "INDIVIDUAL")
+    headers = {"Authorization": f"Bearer {token}"}
+    params = {"financial_year": "2024-25"}
+
+    entry_resp = await client.post(
+        "/api/v1/financial/",
+        json={
+            "entry_type": "EXPENSE",
+            "category": "RENT",
+            "amount": "1500.00",
+            "financial_year": "2024-25",
+            "entry_date": "2024-05-01"
+        },
+        headers=headers
+    )
+    assert entry_resp.status_code == 201
+    await client.post("/api/v1/compliance/evaluate", json=params, headers=headers)
+
+    itr_resp = await client.post("/api/v1/itr/determine", json=params, headers=headers)
+    assert itr_resp.status_code == 200
+    assert (await client.post("/api/v1/itr/2024-25/lock", headers=headers)).status_code == 200
+
+    filing_resp = await client.post(
+        "/api/v1/filing/",
+        json={"financial_year": "2024-25", "itr_determination_id": itr_resp.json()["id"]},
+        headers=headers
+    )
+    assert filing_resp.status_code == 201, filing_resp.text
+
+    consent_resp = await client.post(
+        "/api/v1/consent/",
+        json={"purpose": "Filing review", "scope": "FULL_ACCESS", "expiry_at": "2099-12-31T23:59:59Z"},
+        headers=headers
+    )
+    assert consent_resp.status_code == 201
+
+    cas = (await client.get("/api/v1/auth/cas", headers=headers)).json()
+    ca_id = next(c["id"] for c in cas if c["email"] == ca_email)
+    assign_resp = await client.post(
+        "/api/v1/consent/assignments",
+        json={"filing_id": filing_resp.json()["id"], "ca_user_id": ca_id, "consent_id": consent_resp.json()["id"]},
+        headers=headers
+    )
+    assert assign_resp.status_code == 201, assign_resp.text
+    return {
+        "headers": headers,
+        "filing_id": filing_resp.json()["id"],
+        "consent_id": consent_resp.json()["id"],
+        "itr_type": itr_resp.json()["itr_type"]
+    }
+
+
+async def test_ca_portfolio_lists_assigned_filings(client: AsyncClient):
+    """
+    Test GET /api/v1/consent/ca/portfolio
+    - Returns every actively assigned filing with dashboard columns.
+    - Paginates with a stable total.
+    - Only CAs may call it.
+    """
+    ca_token = await create_user_and_login(client, "ca_portfolio@example.com", "CA")
+    ca_headers = {"Authorization": f"Bearer {ca_token}"}
+
+    first = await _create_assigned_filing(client, "ca_portfolio@example.com", "portfolio_client1@example.com")
+    second = await _create_assigned_filing(client, "ca_portfolio@example.com", "portfolio_client2@example.com")
+
+    resp = await client.get("/api/v1/consent/ca/portfolio", headers=ca_headers)
+    assert resp.status_code == 200
+    page = resp.json()
+    assert page["total"] == 2
+    assert {item["filing_id"] for item in page["items"]} == {first["filing_id"], second["filing_id"]}
+    item = next(i for i in page["items"] if i["filing_id"] == first["filing_id"])
+    assert item["client_name"].startswith("INDIVIDUAL User")
+    assert item["current_state"] == "DRAFT"
+    assert item["itr_type"] == first["itr_type"]
+    assert item["open_flag_count"] == 1
+    assert item["consent_expiry_at"].startswith("2099-12-31")
+
+    paged = await client.get("/api/v1/consent/ca/portfolio", params={"limit": 1, "offset": 1}, headers=ca_headers)
+    assert paged.json()["total"] == 2
+    assert len(paged.json()["items"]) == 1
+
+    past_end = await client.get("/api/v1/consent/ca/portfolio", params={"offset": 10}, headers=ca_headers)
+    assert past_end.json() == {"items": [], "total": 2, "limit": 50, "offset": 10}
+
+    taxpayer_resp = await client.get("/api/v1/consent/ca/portfolio", headers=first["headers"])
+    assert taxpayer_resp.status_code == 403
+
+
+async def test_ca_filing_get_revalidates_before_loading_the_case(client: AsyncClient, statement_log):
+    """
+    A CA's conditional GET of an assigned filing answers 304 from the
+    (id, version) lookup alone, with the same validator the taxpayer sees.
+    """
+    ca_token = await create_user_and_login(client, "ca_filing_etag@example.com", "CA")
+    ca_headers = {"Authorization": f"Bearer {ca_token}"}
+    assigned = await _create_assigned_filing(client, "ca_filing_etag@example.com", "filing_etag_client@example.com")
+    params = {"financial_year": "2024-25"}
+
+    resp = await client.get("/api/v1/filing/", params=params, headers=ca_headers)
+    assert resp.status_code == 200
+    assert resp.json()["id"] == assigned["filing_id"]
+    etag = resp.headers["ETag"]
+    own = await client.get("/api/v1/filing/", params=params, headers=assigned["headers"])
+    assert own.headers["ETag"] == etag
+
+    with statement_log as log:
+        cached = await client.get("/api/v1/filing/", params=params, headers={**ca_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    filing_reads = [sql for sql in log.statements if "FROM filing_cases" in sql]
+    assert len(filing_reads) == 1 and "filing_cases.current_state" not in filing_reads[0]
+
+
+async def test_ca_access_check_is_one_query_then_cached(client: AsyncClient, db_session, statement_log):
+    """
+    validate_ca_access
+    - Reads assignment and consent in a single joined query.
+    - Serves repeat checks from the cache until the consent is revoked.
+    - Never caches past the consent's expiry.
+    """
+    await create_user_and_login(client, "ca_cache@example.com", "CA")
+    assigned = await _create_assigned_filing(client, "ca_cache@example.com", "cache_client@example.com")
+    filing_id, consent_id = UUID(assigned["filing_id"]), UUID(assigned["consent_id"])
+    ca_id = (await db_session.execute(select(User.id).where(User.email == "ca_cache@example.com"))).scalar_one()
+    service = CAAssignmentService(
+        ConsentRepository(), CAAssignmentRepository(), ConsentAuditRepository(),
+        AuthRepository(), FilingCaseRepository(), None
+    )
+
+    with statement_log as log:
+        assignment = await service.validate_ca_access(db_session, filing_id, ca_id)
+    assert assignment.consent_id == consent_id
+    assert len(log.selects_from("ca_assignments")) == len(log.statements) == 1
+    assert "JOIN consent_artifacts" in log.statements[0]
+
+    with statement_log as log:
+        cached = await service.validate_ca_access(db_session, filing_id, ca_id)
+    assert log.statements == []
+    assert cached.id == assignment.id and cached.status == "ACTIVE"
+
+    with pytest.raises(UnauthorizedError):
+        await service.validate_ca_access(db_session, filing_id, uuid4())
+
+    revoke = await client.post(
+        f"/api/v1/consent/{consent_id}/revoke", json={"reason": "Done"}, headers=assigned["headers"]
+    )
+    assert revoke.status_code == 204
+    assert ca_access_cache.get(ca_id, filing_id) is None
+    with pytest.raises(UnauthorizedError, match="revoked"):
+        await service.validate_ca_access(db_session, filing_id, ca_id)
+
+    # A consent expiring within the TTL bounds the entry's lifetime
+    cache = CAAccessCache(ttl_seconds=60)
+    cache.put(ca_id, filing_id, {"consent_id": consent_id}, datetime.now(timezone.utc) - timedelta(seconds=1), cache.generation)
+    assert cache.get(ca_id, filing_id) is None
+    cache.put(ca_id, filing_id, {"consent_id": consent_id}, datetime.now(timezone.utc) + timedelta(seconds=1), cache.generation)
+    assert cache.get(ca_id, filing_id) is not None
+    stale = cache.generation
+    cache.invalidate_filing(filing_id)
+    cache.put(ca_id, filing_id, {"consent_id": consent_id}, datetime(2099, 1, 1, tzinfo=timezone.utc), stale)
+    assert len(cache) == 0
+
+
+async def test_assign_ca_validates_in_one_query(client: AsyncClient, db_session, statement_log):
+    """
+    Test POST /api/v1/consent/assignments
+    - Filing, CA user, consent and existing assignment are checked in a single query.
+    - Each check still fails with its own error.
+    """
+    await create_user_and_login(client, "ca_checks@example.com", "CA")
+    assigned = await _create_assigned_filing(client, "ca_checks@example.com", "checks_client@example.com")
+    ca_id = (await db_session.execute(select(User.id).where(User.email == "ca_checks@example.com"))).scalar_one()
+    body = {"filing_id": assigned["filing_id"], "ca_user_id": str(ca_id), "consent_id": assigned["consent_id"]}
+
+    with statement_log as log:
+        duplicate = await client.post("/api/v1/consent/assignments", json=body, headers=assigned["headers"])
+    assert duplicate.status_code == 400
+    assert "active CA assignment already exists" in duplicate.text
+    checks = [s for s in log.statements if s.lstrip().upper().startswith("WITH")]
+    assert len(checks) == 1
+    for table in ("filing_cases", "consent_artifacts", "ca_assignments"):
+        assert log.selects_from(table) == []
+
+    for field, status_code in (("consent_id", 404), ("ca_user_id", 404), ("filing_id", 404)):
+        resp = await client.post(
+            "/api/v1/consent/assignments", json={**body, field: str(uuid4())}, headers=assigned["headers"]
+        )
+        assert resp.status_code == status_code, field
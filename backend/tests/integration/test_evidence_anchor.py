@@ -0,0 +1,160 @@
+import pytest
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.core import merkle
+from app.models.evidence import EvidenceRecord
+from app.repositories.evidence_anchor_repository import EvidenceAnchorRepository
+from app.repositories.evidence_repository import EvidenceRepository
+from app.services.evidence_anchor_service import EvidenceAnchorWorker
+from app.services.evidence_service import EvidenceService
+from app.services.file_storage_service import FileStorageService
+
+
+async def _admin_headers(client: AsyncClient) -> dict:
+    password = "StrongPassword123!"
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "anchor_admin@example.com",
+            "password": password,
+            "legal_name": "Anchor Admin",
+            "mobile": "9876543701",
+            "pan": "ABCDP3701Z",
+            "primary_role": "ADMIN"
+        }
+    )
+    login = await client.post("/api/v1/auth/login", json={"email": "anchor_admin@example.com", "password": password})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _worker(db_session, max_leaves: int) -> EvidenceAnchorWorker:
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    return EvidenceAnchorWorker(_session_factory, max_leaves=max_leaves, settle_seconds=0)
+
+
+def test_proofs_reproduce_root_for_every_leaf():
+    """
+    Every leaf of odd- and even-sized trees folds back to the root in ceil(log2 n) steps or fewer.
+    """
+    for n in (1, 2, 5, 8, 13):
+        leaves = [merkle.leaf_hash(i, f"{i:064x}") for i in range(n)]
+        levels = merkle.build_levels(leaves)
+        for index, leaf in enumerate(leaves):
+            positions = merkle.proof_positions(index, n)
+            assert len(positions) <= max(0, (n - 1).bit_length())
+            proof = [
+                ("left" if position < position ^ 1 else "right", levels[level][position])
+                for level, position in positions
+            ]
+            assert merkle.root_from_proof(leaf, proof) == levels[-1][0]
+
+
+@pytest.mark.asyncio
+async def test_anchor_chain_and_inclusion_proof(client: AsyncClient, db_session, tmp_path):
+    """
+    Records are anchored into chained trees; a proof verifies until the
+    record's hash is altered.
+    """
+    service = EvidenceService(EvidenceRepository(), FileStorageService(str(tmp_path)))
+    records = [
+        await service.capture_evidence(db_session, {"n": i}, f"urn:test:anchor:{i}")
+        for i in range(5)
+    ]
+    headers = await _admin_headers(client)
+
+    worker = _worker(db_session, max_leaves=3)
+    assert await worker.run_once() == 2
+    assert await worker.run_once() == 0
+
+    latest = await client.get("/api/v1/evidence/anchors/latest", headers=headers)
+    assert latest.status_code == 200
+    assert latest.json()["sequence"] == 2
+
+    resp = await client.get(f"/api/v1/evidence/{records[1].id}/proof", headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["verified"] is True
+    assert body["anchor"]["sequence"] == 1
+    assert body["anchor"]["leaf_count"] == 3
+    steps = [(step["side"], step["hash"]) for step in body["proof"]]
+    assert merkle.root_from_proof(body["leaf_hash"], steps) == body["anchor"]["root_hash"]
+
+    second = (await client.get(f"/api/v1/evidence/{records[4].id}/proof", headers=headers)).json()
+    assert second["anchor"]["previous_chain_hash"] == body["anchor"]["chain_hash"]
+    assert second["anchor"]["chain_hash"] == merkle.chain_hash(
+        body["anchor"]["chain_hash"], second["anchor"]["root_hash"]
+    )
+
+    await db_session.execute(
+        update(EvidenceRecord).where(EvidenceRecord.id == records[1].id).values(hash="0" * 64)
+    )
+    tampered = await client.get(f"/api/v1/evidence/{records[1].id}/proof", headers=headers)
+    assert tampered.json()["verified"] is False
+
+
+@pytest.mark.asyncio
+async def test_unanchored_record_and_role_guard(client: AsyncClient, db_session, tmp_path):
+    """
+    Records not yet anchored have no proof; non-admins cannot request proofs.
+    """
+    service = EvidenceService(EvidenceRepository(), FileStorageService(str(tmp_path)))
+    record = await service.capture_evidence(db_session, {"n": "pending"}, "urn:test:anchor:pending")
+    headers = await _admin_headers(client)
+
+    resp = await client.get(f"/api/v1/evidence/{record.id}/proof", headers=headers)
+    assert resp.status_code == 404
+
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "anchor_user@example.com",
+            "password": "StrongPassword123!",
+            "legal_name": "Anchor User",
+            "mobile": "9876543702",
+            "pan": "ABCDP3702Z",
+            "primary_role": "INDIVIDUAL"
+        }
+    )
+    login = await client.post(
+        "/api/v1/auth/login", json={"email": "anchor_user@example.com", "password": "StrongPassword123!"}
+    )
+    user_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert (await client.get(f"/api/v1/evidence/{record.id}/proof", headers=user_headers)).status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_record_committed_behind_the_cursor_is_anchored(client: AsyncClient, db_session, tmp_path):
+    """
+    A record whose created_at falls before the anchored range (its transaction
+    committed after the cursor passed) goes into the next tree without moving
+    the cursor back.
+    """
+    service = EvidenceService(EvidenceRepository(), FileStorageService(str(tmp_path)))
+    for i in range(3):
+        await service.capture_evidence(db_session, {"n": i}, f"urn:test:anchor:late:{i}")
+    worker = _worker(db_session, max_leaves=10)
+    assert await worker.run_once() == 1
+    first = await EvidenceAnchorRepository().get_latest_anchor(db_session)
+    cursor = (first.last_created_at, first.last_record_id)
+
+    late = await service.capture_evidence(db_session, {"n": "late"}, "urn:test:anchor:late:late")
+    await db_session.execute(
+        update(EvidenceRecord).where(EvidenceRecord.id == late.id)
+        .values(created_at=first.last_created_at - timedelta(seconds=1))
+    )
+    assert await worker.run_once() == 1
+    assert await worker.run_once() == 0
+
+    headers = await _admin_headers(client)
+    body = (await client.get(f"/api/v1/evidence/{late.id}/proof", headers=headers)).json()
+    assert body["verified"] is True
+    assert body["anchor"]["sequence"] == 2
+    assert body["anchor"]["leaf_count"] == 1
+    second = await EvidenceAnchorRepository().get_latest_anchor(db_session)
+    assert (second.last_created_at, second.last_record_id) == cursor
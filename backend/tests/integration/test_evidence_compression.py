@@ -0,0 +1,76 @@
+import hashlib
+import pytest
+from contextlib import asynccontextmanager
+
+from app.core.config import settings
+from app.core.evidence_codec import EvidenceCodec
+from app.repositories.evidence_repository import EvidenceRepository
+from app.services.evidence_compression import EvidenceDictionaryTrainer
+from app.services.evidence_service import EvidenceService
+from app.services.evidence_verification import EvidenceIntegrityVerifier
+from app.services.file_storage_service import FileStorageService
+
+pytestmark = pytest.mark.asyncio
+
+
+def _grant(i: int) -> dict:
+    return {
+        "id": f"00000000-0000-4000-8000-{i:012d}",
+        "user_id": f"11111111-0000-4000-8000-{i:012d}",
+        "purpose": "ITR Filing FY 2024-25",
+        "scope": "FULL_ACCESS",
+        "expiry_at": "2099-01-01T00:00:00+00:00",
+        "status": "ACTIVE"
+    }
+
+
+async def test_trained_dictionary_compresses_transparently(db_session, tmp_path, monkeypatch):
+    """
+    After training, new blobs of the action type are stored compressed with its
+    dictionary; the hash stays over the canonical bytes and reads decompress.
+    """
+    monkeypatch.setattr(settings, "EVIDENCE_COMPRESSION_ENABLED", True)
+    storage = FileStorageService(str(tmp_path))
+    codec = EvidenceCodec()
+    service = EvidenceService(EvidenceRepository(), storage)
+    service.blob_store.codec = codec
+
+    for i in range(20):
+        await service.capture_evidence(db_session, _grant(i), f"urn:consent:{i}:grant")
+
+    trainer = EvidenceDictionaryTrainer(EvidenceRepository(), storage, codec=codec)
+    report = await trainer.train(db_session, "consent:grant", sample_size=20)
+    assert report["samples"] == 20
+    assert report["dictionary_deflate_bytes"] < report["plain_deflate_bytes"] < report["raw_bytes"]
+    assert await trainer.train(db_session, "consent:revoke") is None
+
+    record = await service.capture_evidence(db_session, _grant(99), "urn:consent:99:grant")
+    canonical = service._canonicalize(_grant(99))
+    stored = (tmp_path / record.storage_location).read_bytes()
+    assert codec.is_compressed(stored)
+    assert codec.dictionary_of(stored) == report["dictionary_id"]
+    assert len(stored) < len(canonical)
+    assert record.hash == hashlib.sha256(canonical).hexdigest()
+    assert await service.read_evidence(db_session, record.id) == canonical
+
+    # A process that has not loaded the dictionary yet fetches it on demand
+    service.blob_store.codec = EvidenceCodec()
+    assert await service.read_evidence(db_session, record.id) == canonical
+
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    verifier = EvidenceIntegrityVerifier(
+        _session_factory, storage_service=storage, workers=1, settle_seconds=0, codec=codec
+    )
+    verification = await verifier.run(incremental=False)
+    assert verification["checked"] == 21
+    assert verification["missing"] == [] and verification["corrupt"] == []
+    assert verification["unknown_dictionary"] == []
+
+    # Without the dictionary the blob is unverifiable, not corrupt
+    verifier.codec = EvidenceCodec()
+    verification = await verifier.run(incremental=False)
+    assert verification["corrupt"] == []
+    assert [r["related_action"] for r in verification["unknown_dictionary"]] == ["urn:consent:99:grant"]
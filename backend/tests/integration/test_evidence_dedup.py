@@ -0,0 +1,93 @@
+import pytest
+from contextlib import asynccontextmanager
+from sqlalchemy import select
+
+from app.core.bloom import BloomFilter
+from app.models.evidence import EvidenceBlob
+from app.repositories.evidence_repository import EvidenceRepository
+from app.repositories.outbox_repository import OutboxRepository
+from app.services.evidence_blob_store import EvidenceBlobStore, warm_evidence_blob_index
+from app.services.evidence_service import EvidenceService
+from app.services.file_storage_service import FileStorageService
+
+
+@pytest.mark.asyncio
+async def test_identical_payloads_share_one_blob(db_session, tmp_path):
+    """
+    Two records with identical content reference one blob, written once,
+    with a reference count of 2.
+    """
+    service = EvidenceService(EvidenceRepository(), FileStorageService(str(tmp_path)))
+    payload = {"filing_id": "f-1", "action": "TEST_DEDUP"}
+
+    first = await service.capture_evidence(db_session, payload, "urn:test:dedup:1")
+    second = await service.capture_evidence(db_session, payload, "urn:test:dedup:2")
+
+    assert first.hash == second.hash
+    assert first.storage_location == second.storage_location == f"evidence/blobs/{first.hash[:2]}/{first.hash}.json"
+    assert (tmp_path / first.storage_location).read_bytes() == b'{"action":"TEST_DEDUP","filing_id":"f-1"}'
+
+    blob = (await db_session.execute(
+        select(EvidenceBlob).where(EvidenceBlob.hash == first.hash)
+    )).scalars().one()
+    await db_session.refresh(blob)
+    assert blob.ref_count == 2
+
+
+@pytest.mark.asyncio
+async def test_blob_store_skips_known_content(db_session, tmp_path):
+    """
+    The warmed Bloom filter routes known hashes through an existence check,
+    so an identical blob is not rewritten.
+    """
+    storage = FileStorageService(str(tmp_path))
+    service = EvidenceService(EvidenceRepository(), storage)
+    record = await service.capture_evidence(db_session, {"k": "warm"}, "urn:test:warm:1")
+
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    index = BloomFilter(capacity=1000)
+    assert await warm_evidence_blob_index(_session_factory, index=index) >= 1
+    assert record.hash in index
+
+    store = EvidenceBlobStore(storage, index=index)
+    data = (tmp_path / record.storage_location).read_bytes()
+    assert await store.put(record.storage_location, record.hash, data) is False
+
+    # Unknown content is written directly
+    assert await store.put("evidence/blobs/00/new.json", "new", b"{}") is True
+    assert "new" in index
+
+
+@pytest.mark.asyncio
+async def test_later_references_do_not_touch_storage(db_session, tmp_path):
+    """
+    Only the first reference enqueues the blob write; later ones trust the
+    reference count and neither check storage nor enqueue anything.
+    """
+    class _NoLookups(FileStorageService):
+        async def exists(self, relative_path):
+            raise AssertionError("storage checked in the request path")
+
+    outbox_repo = OutboxRepository()
+    service = EvidenceService(EvidenceRepository(), _NoLookups(str(tmp_path)), outbox_repo)
+    await service.capture_evidence(db_session, {"k": "queued"}, "urn:test:queued:1")
+    await service.capture_evidence(db_session, {"k": "queued"}, "urn:test:queued:2")
+    assert await outbox_repo.get_by_dedup_key(db_session, "urn:test:queued:1") is not None
+    assert await outbox_repo.get_by_dedup_key(db_session, "urn:test:queued:2") is None
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """
+    Every added key is reported present; the false-positive rate stays near target.
+    """
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    keys = [f"{i:064x}" for i in range(5000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"absent-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
@@ -0,0 +1,116 @@
+import pytest
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from sqlalchemy import select, update
+
+from app.models.evidence import EvidenceBlob, EvidenceRecord
+from app.repositories.evidence_repository import EvidenceRepository
+from app.services.evidence_purge_service import EvidencePurgeService
+from app.services.evidence_service import EvidenceService
+from app.services.file_storage_service import FileStorageService
+
+pytestmark = pytest.mark.asyncio
+
+
+def _purge(storage, **kwargs) -> EvidencePurgeService:
+    return EvidencePurgeService(
+        EvidenceRepository(), storage, batch_pause_seconds=0, max_deletes_per_second=0, **kwargs
+    )
+
+
+async def _expire(db_session, *records) -> None:
+    await db_session.execute(
+        update(EvidenceRecord)
+        .where(EvidenceRecord.id.in_([record.id for record in records]))
+        .values(retention_expiry=date.today() - timedelta(days=1))
+    )
+
+
+async def _blob(db_session, file_hash):
+    return (await db_session.execute(
+        select(EvidenceBlob).where(EvidenceBlob.hash == file_hash).execution_options(populate_existing=True)
+    )).scalars().one_or_none()
+
+
+async def test_purge_expired_records_and_unreferenced_blobs(db_session, tmp_path):
+    """
+    Expired records are deleted batch by batch; a blob still shared with an
+    unexpired record survives, an unreferenced one is deleted with its row.
+    """
+    storage = FileStorageService(str(tmp_path))
+    service = EvidenceService(EvidenceRepository(), storage)
+    shared_expired = await service.capture_evidence(db_session, {"k": "shared"}, "urn:test:purge:1")
+    shared_kept = await service.capture_evidence(db_session, {"k": "shared"}, "urn:test:purge:2")
+    alone = await service.capture_evidence(db_session, {"k": "alone"}, "urn:test:purge:3")
+    await _expire(db_session, shared_expired, alone)
+
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    report = await _purge(storage, batch_size=1).run(_session_factory)
+
+    assert report["records"] == 2 and report["blobs_deleted"] == 1 and report["blobs_missing"] == 0
+    assert report["batches"] == 3
+    remaining = (await db_session.execute(select(EvidenceRecord.id))).scalars().all()
+    assert set(remaining) == {shared_kept.id}
+    assert (await _blob(db_session, shared_kept.hash)).ref_count == 1
+    assert (tmp_path / shared_kept.storage_location).exists()
+    assert await _blob(db_session, alone.hash) is None
+    assert not (tmp_path / alone.storage_location).exists()
+
+    # Nothing left to purge
+    report = await _purge(storage).run(_session_factory)
+    assert report["records"] == 0 and report["batches"] == 0
+
+
+async def test_purge_legacy_date_partitioned_blobs(db_session, tmp_path):
+    """
+    Legacy records of one hash may sit in different month directories; each
+    file is deleted once no record references it, the registered one last.
+    """
+    storage = FileStorageService(str(tmp_path))
+    file_hash = "ab" * 32
+    january, february = f"evidence/2025/01/{file_hash}.json", f"evidence/2025/02/{file_hash}.json"
+    for location in (january, february):
+        await storage.write_blob(location, b'{"k":"legacy"}')
+    db_session.add(EvidenceBlob(hash=file_hash, storage_location=january, ref_count=2))
+    older = EvidenceRecord(hash=file_hash, storage_location=january, retention_expiry=date.today() + timedelta(days=1))
+    newer = EvidenceRecord(hash=file_hash, storage_location=february, retention_expiry=date.today())
+    db_session.add_all([older, newer])
+    await db_session.flush()
+
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    report = await _purge(storage).run(_session_factory)
+    assert report["records"] == 1 and report["legacy_files_deleted"] == 1 and report["blobs_deleted"] == 0
+    assert not (tmp_path / february).exists() and (tmp_path / january).exists()
+
+    report = await _purge(storage).run(_session_factory, as_of=date.today() + timedelta(days=1))
+    assert report["records"] == 1 and report["blobs_deleted"] == 1
+    assert not (tmp_path / january).exists()
+    assert await _blob(db_session, file_hash) is None
+
+
+async def test_recapture_after_purge_rewrites_blob(db_session, tmp_path):
+    """
+    Content captured again after its blob was purged is registered and
+    written afresh rather than pointing at deleted bytes.
+    """
+    storage = FileStorageService(str(tmp_path))
+    service = EvidenceService(EvidenceRepository(), storage)
+    record = await service.capture_evidence(db_session, {"k": "again"}, "urn:test:again:1")
+    await _expire(db_session, record)
+
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    await _purge(storage).run(_session_factory)
+    assert not (tmp_path / record.storage_location).exists()
+
+    again = await service.capture_evidence(db_session, {"k": "again"}, "urn:test:again:2")
+    assert (await _blob(db_session, again.hash)).ref_count == 1
+    assert await service.read_evidence(db_session, again.id) == b'{"k":"again"}'
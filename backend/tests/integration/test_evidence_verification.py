@@ -0,0 +1,96 @@
+import hashlib
+import pytest
+from contextlib import asynccontextmanager
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.models.outbox import OutboxEvent
+from app.repositories.evidence_repository import EvidenceRepository
+from app.repositories.outbox_repository import OutboxRepository
+from app.services.evidence_service import EvidenceService
+from app.services.evidence_verification import EvidenceIntegrityVerifier
+from app.services.file_storage_service import FileStorageService
+from app.services.outbox_dispatcher import OutboxDispatcher
+from app.services.pack_storage_service import PackFileStorageService
+
+pytestmark = pytest.mark.asyncio
+
+
+def _verifier(db_session, storage) -> EvidenceIntegrityVerifier:
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    return EvidenceIntegrityVerifier(_session_factory, storage_service=storage, workers=2, chunk_size=2, settle_seconds=0)
+
+
+async def test_verification_reports_missing_and_corrupt_blobs(db_session, tmp_path):
+    """
+    A full run re-hashes every blob and reports the records whose blob is
+    missing or altered; shared blobs are reported for every referencing record.
+    """
+    storage = FileStorageService(str(tmp_path))
+    service = EvidenceService(EvidenceRepository(), storage)
+    intact = await service.capture_evidence(db_session, {"k": "intact"}, "urn:test:verify:1")
+    altered = await service.capture_evidence(db_session, {"k": "altered"}, "urn:test:verify:2")
+    shared = await service.capture_evidence(db_session, {"k": "altered"}, "urn:test:verify:3")
+    deleted = await service.capture_evidence(db_session, {"k": "deleted"}, "urn:test:verify:4")
+
+    verifier = _verifier(db_session, storage)
+    report = await verifier.run(incremental=False)
+    assert report["checked"] == 4
+    assert report["missing"] == [] and report["corrupt"] == []
+
+    (tmp_path / altered.storage_location).write_bytes(b'{"k":"tampered"}')
+    (tmp_path / deleted.storage_location).unlink()
+
+    report = await verifier.run(incremental=False)
+    assert report["checked"] == 4
+    assert {r["related_action"] for r in report["corrupt"]} == {altered.related_action, shared.related_action}
+    assert [r["related_action"] for r in report["missing"]] == [deleted.related_action]
+    assert intact.related_action not in {r["related_action"] for r in report["corrupt"] + report["missing"]}
+
+
+async def test_incremental_run_resumes_after_checkpoint(db_session, tmp_path):
+    """
+    Incremental runs only verify records captured since the last checkpoint.
+    """
+    storage = PackFileStorageService(str(tmp_path), fsync=False)
+    service = EvidenceService(EvidenceRepository(), storage)
+    for i in range(3):
+        await service.capture_evidence(db_session, {"n": i}, f"urn:test:incremental:{i}")
+
+    verifier = _verifier(db_session, storage)
+    assert (await verifier.run())["checked"] == 3
+    assert (await verifier.run())["checked"] == 0
+
+    await service.capture_evidence(db_session, {"n": 3}, "urn:test:incremental:3")
+    report = await verifier.run()
+    assert report["checked"] == 1
+    assert report["missing"] == [] and report["corrupt"] == []
+
+
+async def test_missing_blob_rearms_its_given_up_outbox_write(db_session, tmp_path):
+    """
+    A blob whose outbox write ran out of attempts is reported missing and
+    its write re-armed, so the dispatcher restores it.
+    """
+    storage = FileStorageService(str(tmp_path))
+    service = EvidenceService(EvidenceRepository(), storage, OutboxRepository())
+    record = await service.capture_evidence(db_session, {"k": "gave-up"}, "urn:test:verify:rearm")
+    await db_session.execute(
+        update(OutboxEvent)
+        .where(OutboxEvent.dedup_key == record.related_action)
+        .values(attempts=settings.OUTBOX_MAX_ATTEMPTS, last_error="storage down")
+    )
+
+    report = await _verifier(db_session, storage).run(incremental=False)
+    assert [r["related_action"] for r in report["missing"]] == [record.related_action]
+    assert report["rearmed"] == 1
+
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    assert await OutboxDispatcher(_session_factory, storage_service=storage).drain() == 1
+    assert hashlib.sha256((tmp_path / record.storage_location).read_bytes()).hexdigest() == record.hash
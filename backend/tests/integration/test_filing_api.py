@@ -0,0 +1,118 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.api import deps
+from app.main import app
+from app.models.filing import FilingCase
+from app.repositories.filing_repository import FilingCaseRepository
+
+pytestmark = pytest.mark.asyncio
+
+
+class RacingFilingCaseRepository(FilingCaseRepository):
+    """
+    Simulates a concurrent writer: bumps the case version right before
+    each of the first `races` compare-and-set updates.
+    """
+
+    def __init__(self, races: int):
+        self.races = races
+
+    async def update_case_if_version(self, session, filing_id, expected_version, updated_data):
+        if self.races > 0:
+            self.races -= 1
+            await session.execute(
+                update(FilingCase)
+                .where(FilingCase.id == filing_id)
+                .values(version=FilingCase.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+        return await super().update_case_if_version(session, filing_id, expected_version, updated_data)
+
+
+async def _create_filing_case(client: AsyncClient, email: str, pan: str) -> dict:
+    """Helper: register, lock an ITR determination and open a DRAFT filing case."""
+    password = "StrongPassword123!"
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": email,
+            "password": password,
+            "legal_name": "Filing Owner",
+            "mobile": "9876543401",
+            "pan": pan,
+            "primary_role": "INDIVIDUAL"
+        }
+    )
+    login = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    itr_resp = await client.post("/api/v1/itr/determine", json={"financial_year": "2024-25"}, headers=headers)
+    await client.post("/api/v1/itr/2024-25/lock", headers=headers)
+    case_resp = await client.post(
+        "/api/v1/filing/",
+        json={"financial_year": "2024-25", "itr_determination_id": itr_resp.json()["id"]},
+        headers=headers
+    )
+    assert case_resp.status_code == 201
+    return {"headers": headers, "case": case_resp.json()}
+
+
+async def test_transition_increments_version(client: AsyncClient):
+    """
+    Each transition is a version-checked update that bumps the version.
+    """
+    ctx = await _create_filing_case(client, "filing_version@example.com", "ABCDP3401Z")
+    assert ctx["case"]["version"] == 1
+
+    resp = await client.post(
+        "/api/v1/filing/2024-25/transition",
+        json={"next_state": "READY_FOR_REVIEW"},
+        headers=ctx["headers"]
+    )
+    assert resp.status_code == 200
+    assert resp.json()["current_state"] == "READY_FOR_REVIEW"
+    assert resp.json()["version"] == 2
+
+    invalid = await client.post(
+        "/api/v1/filing/2024-25/transition",
+        json={"next_state": "SUBMITTED"},
+        headers=ctx["headers"]
+    )
+    assert invalid.status_code == 400
+
+
+async def test_transition_retries_after_lost_race(client: AsyncClient):
+    """
+    A concurrent version bump makes the first compare-and-set miss;
+    the case is re-read and the transition succeeds on retry.
+    """
+    ctx = await _create_filing_case(client, "filing_race@example.com", "ABCDP3402Z")
+    app.dependency_overrides[deps.get_filing_repository] = lambda: RacingFilingCaseRepository(races=1)
+
+    resp = await client.post(
+        "/api/v1/filing/2024-25/transition",
+        json={"next_state": "READY_FOR_REVIEW"},
+        headers=ctx["headers"]
+    )
+    assert resp.status_code == 200
+    assert resp.json()["current_state"] == "READY_FOR_REVIEW"
+    # 1 -> 2 by the concurrent writer, 2 -> 3 by the transition
+    assert resp.json()["version"] == 3
+
+
+async def test_transition_conflict_returns_409(client: AsyncClient):
+    """
+    If every attempt loses the race, the transition fails with 409.
+    """
+    ctx = await _create_filing_case(client, "filing_conflict@example.com", "ABCDP3403Z")
+    app.dependency_overrides[deps.get_filing_repository] = lambda: RacingFilingCaseRepository(races=10)
+
+    resp = await client.post(
+        "/api/v1/filing/2024-25/transition",
+        json={"next_state": "READY_FOR_REVIEW"},
+        headers=ctx["headers"]
+    )
+    assert resp.status_code == 409
+    assert resp.json()["error"]["code"] == "CONFLICT"
@@ -0,0 +1,99 @@
+import re
+import pytest
+from httpx import AsyncClient
+
+from app.models.user import User
+from app.repositories.auth_repository import AuthRepository
+from app.repositories.sql_helpers import flush_returning
+
+pytestmark = pytest.mark.asyncio
+
+REGISTER = {
+    "email": "round_trips@example.com",
+    "password": "StrongPassword123!",
+    "legal_name": "Round Trip User",
+    "mobile": "9876543290",
+    "pan": "ABCDE1290Z",
+    "primary_role": "INDIVIDUAL"
+}
+
+
+def _refreshes(statements):
+    """
+    Post-insert reloads: a SELECT by primary key of a table this request inserted into.
+    """
+    inserted = set()
+    found = []
+    for statement in statements:
+        insert = re.match(r"\s*INSERT INTO (\w+)", statement)
+        if insert:
+            inserted.add(insert.group(1))
+            continue
+        for table in inserted:
+            if statement.lstrip().startswith("SELECT") and f"WHERE {table}.id = ?" in statement:
+                found.append(statement)
+    return found
+
+
+async def test_create_endpoints_need_no_refresh(client: AsyncClient, statement_log):
+    """
+    Server defaults come back via INSERT ... RETURNING: each create endpoint
+    costs exactly its lookups plus one statement per inserted row.
+    """
+    with statement_log as log:
+        assert (await client.post("/api/v1/auth/register", json=REGISTER)).status_code == 201
+    # 2 uniqueness lookups + users + user_credentials (was 6 with refreshes)
+    assert len(log.statements) == 4 and _refreshes(log.statements) == []
+    assert log.inserts_into("users")[0].rstrip().endswith("RETURNING account_status, created_at, updated_at")
+
+    with statement_log as log:
+        response = await client.post(
+            "/api/v1/auth/login", json={"email": REGISTER["email"], "password": REGISTER["password"]}
+        )
+        assert response.status_code == 200
+    # user + credentials lookups, auth_sessions insert, last_login_at update (was 6)
+    assert len(log.statements) == 5 and _refreshes(log.statements) == []
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    with statement_log as log:
+        response = await client.post(
+            "/api/v1/financial/",
+            json={
+                "entry_type": "EXPENSE",
+                "category": "RENT",
+                "amount": "1500.00",
+                "financial_year": "2024-25",
+                "entry_date": "2024-05-01"
+            },
+            headers=headers
+        )
+        assert response.status_code == 201
+    # user lookup, financial_entries insert, ledger version bump (was 5)
+    assert len(log.statements) == 3 and _refreshes(log.statements) == []
+    assert response.json()["created_at"]
+
+    with statement_log as log:
+        response = await client.post(
+            "/api/v1/consent/",
+            json={"purpose": "Filing review", "scope": "FULL_ACCESS", "expiry_at": "2099-12-31T23:59:59Z"},
+            headers=headers
+        )
+        assert response.status_code == 201
+    # user lookup, consent, evidence blob + outbox + record, consent audit entry (was 8)
+    assert len(log.statements) == 6 and _refreshes(log.statements) == []
+
+
+async def test_update_returns_onupdate_values(db_session, statement_log):
+    """
+    An UPDATE fetches onupdate timestamps in the same statement, so they are
+    readable straight after the flush.
+    """
+    user = await AuthRepository().create_user(db_session, User(
+        pan="ABCDE1291Z", legal_name="Before", email="onupdate@example.com", mobile="9876543291", primary_role="INDIVIDUAL"
+    ))
+    with statement_log as log:
+        user.legal_name = "After"
+        await flush_returning(db_session, user)
+        assert user.updated_at is not None
+    assert len(log.statements) == 1
+    assert log.statements[0].startswith("UPDATE users") and "RETURNING updated_at" in log.statements[0]
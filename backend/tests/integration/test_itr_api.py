@@ -0,0 +1,221 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, update
+
+from app.models.audit import AuditLog
+from app.models.itr import ITRDetermination
+from app.models.user import User
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _get_auth_token(client: AsyncClient, email: str, pan: str, role: str = "INDIVIDUAL") -> str:
+    """Helper to register and login a user (INDIVIDUAL unless role is given)."""
+    password = "StrongPassword123!"
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": email,
+            "password": password,
+            "legal_name": "ITR Owner",
+            "mobile": "9876543201",
+            "pan": pan,
+            "primary_role": role
+        }
+    )
+    response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+async def _add_income(client: AsyncClient, headers: dict, category: str):
+    resp = await client.post(
+        "/api/v1/financial/",
+        json={
+            "entry_type": "INCOME",
+            "category": category,
+            "amount": "100000.00",
+            "financial_year": "2024-25",
+            "entry_date": "2024-06-01"
+        },
+        headers=headers
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+async def _create_assigned_filing(client: AsyncClient, ca_email: str, email: str, pan: str) -> dict:
+    """Helper: taxpayer with a locked ITR, a filing case, a consent and a CA assignment."""
+    headers = {"Authorization": f"Bearer {await _get_auth_token(client, email, pan)}"}
+    params = {"financial_year": "2024-25"}
+
+    entry_resp = await client.post(
+        "/api/v1/financial/",
+        json={
+            "entry_type": "EXPENSE",
+            "category": "RENT",
+            "amount": "1500.00",
+            "financial_year": "2024-25",
+            "entry_date": "2024-05-01"
+        },
+        headers=headers
+    )
+    assert entry_resp.status_code == 201
+
+    itr_resp = await client.post("/api/v1/itr/determine", json=params, headers=headers)
+    assert itr_resp.status_code == 200
+    assert (await client.post("/api/v1/itr/2024-25/lock", headers=headers)).status_code == 200
+
+    filing_resp = await client.post(
+        "/api/v1/filing/",
+        json={"financial_year": "2024-25", "itr_determination_id": itr_resp.json()["id"]},
+        headers=headers
+    )
+    assert filing_resp.status_code == 201, filing_resp.text
+
+    consent_resp = await client.post(
+        "/api/v1/consent/",
+        json={"purpose": "Filing review", "scope": "FULL_ACCESS", "expiry_at": "2099-12-31T23:59:59Z"},
+        headers=headers
+    )
+    assert consent_resp.status_code == 201
+
+    cas = (await client.get("/api/v1/auth/cas", headers=headers)).json()
+    ca_id = next(c["id"] for c in cas if c["email"] == ca_email)
+    assign_resp = await client.post(
+        "/api/v1/consent/assignments",
+        json={"filing_id": filing_resp.json()["id"], "ca_user_id": ca_id, "consent_id": consent_resp.json()["id"]},
+        headers=headers
+    )
+    assert assign_resp.status_code == 201, assign_resp.text
+    return {"headers": headers, "filing_id": filing_resp.json()["id"]}
+
+
+async def test_determine_is_memoized_on_ledger_version(client: AsyncClient):
+    """
+    Repeated determine calls against an unchanged ledger return the stored
+    determination untouched; a ledger write forces re-determination.
+    """
+    token = await _get_auth_token(client, "itr_memo@example.com", "ABCDP3201Z")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await _add_income(client, headers, "salary")
+
+    first = await client.post("/api/v1/itr/determine", json={"financial_year": "2024-25"}, headers=headers)
+    assert first.status_code == 200
+    assert first.json()["itr_type"] == "ITR-1"
+    assert first.json()["reason"] == "Salary Income only."
+
+    again = await client.post("/api/v1/itr/determine", json={"financial_year": "2024-25"}, headers=headers)
+    assert again.json()["determined_at"] == first.json()["determined_at"]
+
+    await _add_income(client, headers, " Freelance ")
+
+    changed = await client.post("/api/v1/itr/determine", json={"financial_year": "2024-25"}, headers=headers)
+    assert changed.json()["id"] == first.json()["id"]
+    assert changed.json()["itr_type"] == "ITR-3"
+
+
+async def test_determine_salary_and_other_sources(client: AsyncClient):
+    """
+    Salary plus a non-business category yields ITR-2.
+    """
+    token = await _get_auth_token(client, "itr_other@example.com", "ABCDP3202Z")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await _add_income(client, headers, "SALARY")
+    interest = await _add_income(client, headers, "INTEREST")
+
+    resp = await client.post("/api/v1/itr/determine", json={"financial_year": "2024-25"}, headers=headers)
+    assert resp.json()["itr_type"] == "ITR-2"
+
+    delete_resp = await client.delete(f"/api/v1/financial/{interest['id']}", headers=headers)
+    assert delete_resp.status_code == 204
+
+    resp = await client.post("/api/v1/itr/determine", json={"financial_year": "2024-25"}, headers=headers)
+    assert resp.json()["itr_type"] == "ITR-1"
+
+
+async def test_ca_batch_itr_determination(client: AsyncClient, db_session):
+    """
+    Test POST /api/v1/itr/batch-determine
+    - Determines the ITR of every client assigned to the CA for the requested year.
+    - Clients assigned for another year only are not touched.
+    - Locked determinations are skipped; unchanged ledgers are not rewritten.
+    - Each written determination is audited with the CA as actor.
+    """
+    ca_token = await _get_auth_token(client, "ca_batch@example.com", "ABCDP3210Z", role="CA")
+    ca_headers = {"Authorization": f"Bearer {ca_token}"}
+
+    first = await _create_assigned_filing(client, "ca_batch@example.com", "batch_client1@example.com", "ABCDP3211Z")
+    await _create_assigned_filing(client, "ca_batch@example.com", "batch_client2@example.com", "ABCDP3212Z")
+    payload = {"financial_year": "2024-25"}
+
+    # 2024-25 determinations were locked before the filings were created
+    locked = await client.post("/api/v1/itr/batch-determine", json=payload, headers=ca_headers)
+    assert locked.status_code == 200
+    assert locked.json()["locked"] == 2
+    assert locked.json()["determined"] == 0
+
+    # No 2025-26 filing is assigned to the CA: no client is in scope for that year
+    other_year = await client.post("/api/v1/itr/batch-determine", json={"financial_year": "2025-26"}, headers=ca_headers)
+    assert other_year.json()["total_clients"] == 0
+    missing = await client.get("/api/v1/itr/", params={"financial_year": "2025-26"}, headers=first["headers"])
+    assert missing.status_code == 404
+
+    first_client_id = (await db_session.execute(
+        select(User.id).where(User.email == "batch_client1@example.com")
+    )).scalar_one()
+    await db_session.execute(
+        update(ITRDetermination)
+        .where(ITRDetermination.user_id == first_client_id, ITRDetermination.financial_year == "2024-25")
+        .values(is_locked=False)
+    )
+
+    async def add_income(category: str):
+        resp = await client.post(
+            "/api/v1/financial/",
+            json={
+                "entry_type": "INCOME",
+                "category": category,
+                "amount": "50000.00",
+                "financial_year": "2024-25",
+                "entry_date": "2024-06-01"
+            },
+            headers=first["headers"]
+        )
+        assert resp.status_code == 201
+
+    await add_income("SALARY")
+    run = await client.post("/api/v1/itr/batch-determine", json=payload, headers=ca_headers)
+    assert run.json() == {
+        "financial_year": "2024-25",
+        "total_clients": 2,
+        "determined": 1,
+        "unchanged": 0,
+        "locked": 1,
+        "itr_type_counts": {"ITR-1": 1}
+    }
+
+    rerun = await client.post("/api/v1/itr/batch-determine", json=payload, headers=ca_headers)
+    assert rerun.json()["unchanged"] == 1
+    assert rerun.json()["determined"] == 0
+
+    await add_income("Business")
+    changed = await client.post("/api/v1/itr/batch-determine", json=payload, headers=ca_headers)
+    assert changed.json()["determined"] == 1
+    assert changed.json()["itr_type_counts"] == {"ITR-3": 1}
+
+    itr_resp = await client.get("/api/v1/itr/", params=payload, headers=first["headers"])
+    assert itr_resp.json()["itr_type"] == "ITR-3"
+
+    ca_id = (await db_session.execute(select(User.id).where(User.email == "ca_batch@example.com"))).scalar_one()
+    audited = (await db_session.execute(
+        select(AuditLog.after_value)
+        .where(AuditLog.action == "ITR_DETERMINED", AuditLog.actor_id == ca_id)
+        .order_by(AuditLog.created_at)
+    )).scalars().all()
+    assert [entry["itr_type"] for entry in audited] == ["ITR-1", "ITR-3"]
+    assert {entry["user_id"] for entry in audited} == {str(first_client_id)}
+
+    forbidden = await client.post("/api/v1/itr/batch-determine", json=payload, headers=first["headers"])
+    assert forbidden.status_code == 403
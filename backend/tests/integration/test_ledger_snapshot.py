@@ -0,0 +1,72 @@
+import pytest
+from decimal import Decimal
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.models.user import User
+from app.repositories.financial_repository import FinancialEntryRepository
+from app.services.compliance_rules import HighTotalExpenseRule, ExpenseWithoutIncomeRule
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_ledger_snapshot_matches_object_ledger(client: AsyncClient, db_session):
+    """
+    The columnar snapshot built from the Core query agrees with the ORM
+    ledger on totals, category groups, monthly buckets and rule outcomes.
+    """
+    password = "StrongPassword123!"
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "snapshot@example.com",
+            "password": password,
+            "legal_name": "Snapshot Owner",
+            "mobile": "9876543101",
+            "pan": "ABCDP3101Z",
+            "primary_role": "INDIVIDUAL"
+        }
+    )
+    login = await client.post("/api/v1/auth/login", json={"email": "snapshot@example.com", "password": password})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    ledger = [
+        ("INCOME", "SALARY", "120000.50", "2024-04-30"),
+        ("INCOME", " freelance ", "30000.25", "2024-05-15"),
+        ("EXPENSE", "RENT", "25000.00", "2024-05-01"),
+        ("EXPENSE", "RENT", "25000.00", "2025-03-01"),
+        ("EXPENSE", "TRAVEL", "4999.99", "2025-03-31"),
+    ]
+    for entry_type, category, amount, entry_date in ledger:
+        resp = await client.post(
+            "/api/v1/financial/",
+            json={
+                "entry_type": entry_type,
+                "category": category,
+                "amount": amount,
+                "financial_year": "2024-25",
+                "entry_date": entry_date
+            },
+            headers=headers
+        )
+        assert resp.status_code == 201
+
+    repo = FinancialEntryRepository()
+    user_id = (await db_session.execute(select(User.id).where(User.email == "snapshot@example.com"))).scalar_one()
+    snapshot = await repo.get_ledger_snapshot(db_session, user_id, "2024-25")
+    entries = await repo.get_by_user_id_and_year(db_session, user_id, "2024-25")
+
+    assert len(snapshot) == 5
+    assert snapshot.total("INCOME") == 15000075
+    assert snapshot.total("EXPENSE") == 5499999
+    assert snapshot.sum_by_category(snapshot.type_mask("EXPENSE")) == {"RENT": 5000000, "TRAVEL": 499999}
+    assert snapshot.category_mask({"FREELANCE"}).sum() == 1
+
+    monthly = snapshot.monthly_totals(snapshot.type_mask("EXPENSE"))
+    assert monthly[1] == 2500000   # May
+    assert monthly[11] == 2999999  # March
+    assert int(monthly.sum()) == snapshot.total("EXPENSE")
+
+    assert sum(e.amount for e in entries if e.entry_type == "EXPENSE") == Decimal("54999.99")
+    for rule in (HighTotalExpenseRule(), ExpenseWithoutIncomeRule()):
+        assert rule.evaluate(entries) == rule.evaluate_snapshot(snapshot)
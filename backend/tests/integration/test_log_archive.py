@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import uuid
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from sqlalchemy import select
+
+from app.models.archive import LogArchiveSegment
+from app.models.audit import AuditLog
+from app.repositories.audit_repository import AuditLogRepository
+from app.repositories.log_archive_repository import LogArchiveRepository
+from app.services import log_archive_service
+from app.services.file_storage_service import FileStorageService
+from app.services.log_archive_service import ArchiveIntegrityError, LogArchiveService
+
+pytestmark = pytest.mark.asyncio
+
+ACTOR = uuid.uuid4()
+
+
+def _row(day: int, action: str, actor_id=None) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "actor_id": actor_id,
+        "actor_role": "ADMIN" if actor_id else None,
+        "action": action,
+        "before_value": None,
+        "after_value": {"day": day},
+        "ip_address": "10.0.0.1",
+        "device_id": None,
+        "created_at": datetime(2025, 1, day, tzinfo=timezone.utc)
+    }
+
+
+async def test_archive_moves_old_rows_into_hashed_segments(db_session, tmp_path):
+    """
+    Rows before the cutoff end up in gzip NDJSON segments (batch_size rows
+    each) recorded with their SHA-256; newer rows stay in the table.
+    """
+    await AuditLogRepository().create_logs(db_session, [
+        _row(1, "LOGIN", ACTOR), _row(2, "FILING_SUBMITTED"), _row(3, "LOGIN", ACTOR), _row(20, "LOGIN", ACTOR)
+    ])
+    storage = FileStorageService(str(tmp_path))
+    service = LogArchiveService(LogArchiveRepository(), storage, batch_size=2, batch_pause_seconds=0)
+
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    report = await service.run(_session_factory, datetime(2025, 1, 10, tzinfo=timezone.utc))
+
+    assert report["audit_logs"] == 3 and report["consent_audit_logs"] == 0 and report["segments"] == 2
+    remaining = (await db_session.execute(select(AuditLog.after_value))).scalars().all()
+    assert remaining == [{"day": 20}]
+
+    segments = (await db_session.execute(
+        select(LogArchiveSegment).order_by(LogArchiveSegment.first_created_at)
+    )).scalars().all()
+    assert [segment.row_count for segment in segments] == [2, 1]
+    stored = (tmp_path / segments[0].storage_location).read_bytes()
+    assert segments[0].storage_location.startswith("archive/audit_logs/2025/01/")
+    assert hashlib.sha256(stored).hexdigest() == segments[0].sha256
+    lines = gzip.decompress(stored).splitlines()
+    assert len(lines) == 2 and b'"action":"LOGIN"' in lines[0]
+
+    # Nothing left before the cutoff
+    report = await service.run(_session_factory, datetime(2025, 1, 10, tzinfo=timezone.utc))
+    assert report["segments"] == 0
+
+
+async def test_archive_search_streams_matching_records(db_session, tmp_path, monkeypatch):
+    """
+    Search reads only overlapping segments, applies the filters, and rejects
+    a segment whose bytes no longer match its manifest hash. Local segments
+    are streamed from the file in chunks, never loaded whole; a remote
+    segment is fetched once.
+    """
+    await AuditLogRepository().create_logs(db_session, [
+        _row(1, "LOGIN", ACTOR), _row(2, "FILING_SUBMITTED"), _row(3, "LOGIN", ACTOR), _row(4, "LOGIN")
+    ])
+    storage = FileStorageService(str(tmp_path))
+    service = LogArchiveService(LogArchiveRepository(), storage, batch_size=2, batch_pause_seconds=0)
+    for _ in range(2):
+        await service.archive_batch(db_session, "audit_logs", datetime(2025, 2, 1, tzinfo=timezone.utc))
+
+    read_blob = storage.read_blob
+
+    async def _read_whole(relative_path):
+        raise AssertionError("segment loaded whole")
+
+    monkeypatch.setattr(storage, "read_blob", _read_whole)
+    monkeypatch.setattr(log_archive_service, "READ_CHUNK_SIZE", 16)
+    found = [
+        record async for record in service.search(db_session, "audit_logs", actor_id=ACTOR, action="LOGIN")
+    ]
+    assert [record["after_value"] for record in found] == [{"day": 1}, {"day": 3}]
+    assert found[0]["actor_id"] == str(ACTOR) and found[0]["ip_address"] == "10.0.0.1"
+
+    found = [
+        record async for record in service.search(
+            db_session, "audit_logs",
+            since=datetime(2025, 1, 2, tzinfo=timezone.utc), until=datetime(2025, 1, 4, tzinfo=timezone.utc)
+        )
+    ]
+    assert [record["action"] for record in found] == ["FILING_SUBMITTED", "LOGIN"]
+
+    fetched = []
+
+    async def _fetch(relative_path):
+        fetched.append(relative_path)
+        return await read_blob(relative_path)
+
+    monkeypatch.setattr(storage, "locate", lambda relative_path: None)
+    monkeypatch.setattr(storage, "read_blob", _fetch)
+    found = [record async for record in service.search(db_session, "audit_logs", actor_id=ACTOR)]
+    assert [record["after_value"] for record in found] == [{"day": 1}, {"day": 3}]
+    assert len(fetched) == len(set(fetched)) == 2
+
+    segment = (await db_session.execute(
+        select(LogArchiveSegment).order_by(LogArchiveSegment.first_created_at)
+    )).scalars().first()
+    (tmp_path / segment.storage_location).write_bytes(gzip.compress(b'{"action":"FORGED"}\n'))
+    with pytest.raises(ArchiveIntegrityError):
+        [record async for record in service.search(db_session, "audit_logs")]
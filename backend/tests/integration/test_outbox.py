@@ -0,0 +1,152 @@
+import hashlib
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+from sqlalchemy import select, update
+
+from app.models.audit import AuditLog
+from app.models.evidence import EvidenceRecord
+from app.models.outbox import OutboxEvent
+from app.repositories.outbox_repository import OutboxRepository
+from app.services.audit_service import AUDIT_LOG_EVENT
+from app.services.file_storage_service import FileStorageService
+from app.services.outbox_dispatcher import OutboxDispatcher
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _get_auth_token(client: AsyncClient, email: str, pan: str) -> str:
+    """Helper to register and login an INDIVIDUAL user."""
+    password = "StrongPassword123!"
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": email,
+            "password": password,
+            "legal_name": "Outbox Owner",
+            "mobile": "9876543501",
+            "pan": pan,
+            "primary_role": "INDIVIDUAL"
+        }
+    )
+    response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return response.json()["access_token"]
+
+
+def _dispatcher(db_session, storage_root) -> OutboxDispatcher:
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    return OutboxDispatcher(_session_factory, storage_service=FileStorageService(str(storage_root)))
+
+
+async def test_evidence_blob_is_written_by_dispatcher(client: AsyncClient, db_session, tmp_path):
+    """
+    Granting consent commits the evidence record and an outbox event, but no
+    file; the dispatcher writes the blob once, and a replay is harmless.
+    """
+    token = await _get_auth_token(client, "outbox_evidence@example.com", "ABCDP3501Z")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = await client.post(
+        "/api/v1/consent/",
+        json={"purpose": "Outbox", "scope": "FULL_ACCESS", "expiry_at": "2099-01-01T00:00:00Z"},
+        headers=headers
+    )
+    assert resp.status_code == 201
+    urn = f"urn:consent:{resp.json()['id']}:grant"
+
+    record = (await db_session.execute(
+        select(EvidenceRecord).where(EvidenceRecord.related_action == urn)
+    )).scalars().one()
+    blob_path = tmp_path / record.storage_location
+    assert not blob_path.exists()
+
+    payload = (await db_session.execute(
+        select(OutboxEvent.payload).where(OutboxEvent.dedup_key == urn)
+    )).scalar_one()
+    dispatcher = _dispatcher(db_session, tmp_path)
+    assert await dispatcher.drain() == 1
+    assert hashlib.sha256(blob_path.read_bytes()).hexdigest() == record.hash
+
+    event = (await db_session.execute(
+        select(OutboxEvent).where(OutboxEvent.dedup_key == urn)
+    )).scalars().one()
+    await db_session.refresh(event)
+    assert event.dispatched_at is not None
+    # The evidence bytes now live only in the blob store
+    assert "content" not in event.payload and event.payload["hash"] == record.hash
+    assert await dispatcher.run_once() == 0
+
+    # At-least-once: an event redelivered before its dispatch committed rewrites identical content
+    await db_session.execute(
+        update(OutboxEvent).where(OutboxEvent.id == event.id).values(dispatched_at=None, payload=payload)
+    )
+    assert await dispatcher.run_once() == 1
+    assert hashlib.sha256(blob_path.read_bytes()).hexdigest() == record.hash
+
+
+async def test_dispatched_events_are_pruned_after_retention(db_session, tmp_path):
+    """
+    prune() deletes events dispatched before the retention window and keeps
+    recent and undispatched ones.
+    """
+    now = datetime.now(timezone.utc)
+    repo = OutboxRepository()
+    ids = {}
+    for key in ("old", "recent", "pending"):
+        ids[key] = await repo.enqueue(db_session, AUDIT_LOG_EVENT, f"outbox-prune-{key}", {"n": key})
+    await db_session.execute(update(OutboxEvent).where(OutboxEvent.id == ids["old"]).values(dispatched_at=now - timedelta(days=2)))
+    await db_session.execute(update(OutboxEvent).where(OutboxEvent.id == ids["recent"]).values(dispatched_at=now))
+
+    dispatcher = _dispatcher(db_session, tmp_path)
+    dispatcher.batch_size = 1
+    assert await dispatcher.prune() == 1
+    remaining = (await db_session.execute(
+        select(OutboxEvent.dedup_key).where(OutboxEvent.dedup_key.like("outbox-prune-%"))
+    )).scalars().all()
+    assert sorted(remaining) == ["outbox-prune-pending", "outbox-prune-recent"]
+
+
+async def test_transition_audit_row_is_idempotent(client: AsyncClient, db_session, tmp_path):
+    """
+    A filing transition enqueues its audit row; redelivery does not duplicate it.
+    """
+    token = await _get_auth_token(client, "outbox_audit@example.com", "ABCDP3502Z")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    itr_resp = await client.post("/api/v1/itr/determine", json={"financial_year": "2024-25"}, headers=headers)
+    await client.post("/api/v1/itr/2024-25/lock", headers=headers)
+    case_resp = await client.post(
+        "/api/v1/filing/",
+        json={"financial_year": "2024-25", "itr_determination_id": itr_resp.json()["id"]},
+        headers=headers
+    )
+    case_id = case_resp.json()["id"]
+    transition = await client.post(
+        "/api/v1/filing/2024-25/transition",
+        json={"next_state": "READY_FOR_REVIEW"},
+        headers=headers
+    )
+    assert transition.status_code == 200
+
+    def transition_logs():
+        return select(AuditLog).where(AuditLog.action == "FILING_STATE_TRANSITION")
+
+    assert (await db_session.execute(transition_logs())).scalars().all() == []
+
+    dispatcher = _dispatcher(db_session, tmp_path)
+    await dispatcher.drain()
+    logs = (await db_session.execute(transition_logs())).scalars().all()
+    assert len(logs) == 1
+    assert logs[0].after_value["id"] == case_id
+
+    await db_session.execute(
+        update(OutboxEvent)
+        .where(OutboxEvent.dedup_key == f"urn:filing:{case_id}:v2:audit")
+        .values(dispatched_at=None)
+    )
+    assert await dispatcher.run_once() == 1
+    assert len((await db_session.execute(transition_logs())).scalars().all()) == 1
@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+
+from app.services.periodic_worker import PeriodicWorker
+
+
+class _CountingWorker(PeriodicWorker):
+    name = "Counting worker"
+
+    def __init__(self, run_at_start: bool):
+        super().__init__(interval_seconds=3600)
+        self.run_at_start = run_at_start
+        self.passes = 0
+
+    async def run_once(self) -> int:
+        self.passes += 1
+        raise RuntimeError("pass failed")
+
+
+@pytest.mark.asyncio
+async def test_loop_logs_errors_and_stops_cleanly():
+    """
+    A failing pass is logged rather than ending the loop; run_at_start runs
+    the first pass before the first sleep; stop() ends the loop and allows a restart.
+    """
+    eager, lazy = _CountingWorker(run_at_start=True), _CountingWorker(run_at_start=False)
+    for worker in (eager, lazy):
+        worker.start()
+    await asyncio.sleep(0.01)
+    assert eager.passes == 1 and lazy.passes == 0
+    assert not eager._task.done()
+
+    for worker in (eager, lazy):
+        await worker.stop()
+        assert worker._task is None
+    eager.start()
+    await asyncio.sleep(0.01)
+    assert eager.passes == 2
+    await eager.stop()
+
+
+def test_worker_without_run_once_cannot_be_built():
+    class _Idle(PeriodicWorker):
+        name = "Idle worker"
+
+    with pytest.raises(TypeError):
+        _Idle(interval_seconds=1)
@@ -0,0 +1,224 @@
+import hashlib
+import hmac
+import uuid
+import pytest
+from contextlib import asynccontextmanager
+from urllib.parse import parse_qsl
+from xml.etree import ElementTree
+
+import httpx
+
+from app.repositories.evidence_repository import EvidenceRepository
+from app.services.evidence_service import EvidenceService
+from app.services.evidence_verification import EvidenceIntegrityVerifier
+from app.services.s3_storage_service import S3StorageError, S3StorageService
+
+pytestmark = pytest.mark.asyncio
+
+ACCESS_KEY = "minio-access"
+SECRET_KEY = "minio-secret"
+
+
+class FakeS3:
+    """
+    Minimal MinIO-style stand-in (ASGI): path-style objects, multipart uploads,
+    independent SigV4 verification, and injectable 503s / part failures.
+    """
+
+    def __init__(self, secret_key: str = SECRET_KEY):
+        self.secret_key = secret_key
+        self.objects = {}
+        self.uploads = {}
+        self.requests = []
+        self.fail_next = 0
+        self.failing_part = None
+
+    def _signature_ok(self, method, raw_path, query, headers, body) -> bool:
+        auth = headers.get("authorization", "")
+        if not auth.startswith("AWS4-HMAC-SHA256 ") or headers.get("x-amz-content-sha256") != hashlib.sha256(body).hexdigest():
+            return False
+        fields = dict(part.strip().split("=", 1) for part in auth[len("AWS4-HMAC-SHA256 "):].split(","))
+        access_key, date_stamp, region, service, _ = fields["Credential"].split("/")
+        signed = fields["SignedHeaders"].split(";")
+        canonical = "\n".join([
+            method,
+            raw_path,
+            "&".join(sorted(query.split("&"))) if query else "",
+            "".join(f"{name}:{headers[name]}\n" for name in signed),
+            fields["SignedHeaders"],
+            headers["x-amz-content-sha256"]
+        ])
+        to_sign = "\n".join([
+            "AWS4-HMAC-SHA256", headers["x-amz-date"], f"{date_stamp}/{region}/{service}/aws4_request",
+            hashlib.sha256(canonical.encode()).hexdigest()
+        ])
+        key = ("AWS4" + self.secret_key).encode()
+        for part in (date_stamp, region, service, "aws4_request"):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        expected = hmac.new(key, to_sign.encode(), hashlib.sha256).hexdigest()
+        return access_key == ACCESS_KEY and hmac.compare_digest(expected, fields["Signature"])
+
+    async def __call__(self, scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        method = scope["method"]
+        raw_path = scope["raw_path"].decode()
+        query = scope["query_string"].decode()
+        params = dict(parse_qsl(query, keep_blank_values=True))
+        headers = {k.decode(): v.decode() for k, v in scope["headers"]}
+        self.requests.append((method, raw_path, params))
+        key = scope["path"].split("/", 2)[2]
+
+        async def respond(status, content=b"", extra=()):
+            await send({
+                "type": "http.response.start", "status": status,
+                "headers": [(b"content-length", str(len(content)).encode()), *extra]
+            })
+            await send({"type": "http.response.body", "body": content if method != "HEAD" else b""})
+
+        if self.fail_next:
+            self.fail_next -= 1
+            return await respond(503, b"<Error><Code>SlowDown</Code></Error>")
+        if not self._signature_ok(method, raw_path, query, headers, body):
+            return await respond(403, b"<Error><Code>SignatureDoesNotMatch</Code></Error>")
+
+        if method == "POST" and "uploads" in params:
+            upload_id = uuid.uuid4().hex
+            self.uploads[upload_id] = {}
+            return await respond(200, (
+                f"<InitiateMultipartUploadResult xmlns=\"http://s3.amazonaws.com/doc/2006-03-01/\">"
+                f"<UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>"
+            ).encode())
+        if method == "PUT" and "uploadId" in params:
+            number = int(params["partNumber"])
+            if number == self.failing_part:
+                return await respond(400, b"<Error><Code>InvalidPart</Code></Error>")
+            self.uploads[params["uploadId"]][number] = body
+            return await respond(200, extra=[(b"etag", f'"{hashlib.md5(body).hexdigest()}"'.encode())])
+        if method == "POST" and "uploadId" in params:
+            parts = self.uploads.pop(params["uploadId"])
+            listed = [
+                (int(p.find("PartNumber").text), p.find("ETag").text)
+                for p in ElementTree.fromstring(body).iter("Part")
+            ]
+            assert [etag for _, etag in listed] == [f'"{hashlib.md5(parts[n]).hexdigest()}"' for n, _ in listed]
+            self.objects[key] = b"".join(parts[n] for n, _ in listed)
+            return await respond(200, b"<CompleteMultipartUploadResult/>")
+        if method == "DELETE" and "uploadId" in params:
+            self.uploads.pop(params["uploadId"], None)
+            return await respond(204)
+        if method == "PUT":
+            self.objects[key] = body
+            return await respond(200, extra=[(b"etag", f'"{hashlib.md5(body).hexdigest()}"'.encode())])
+        if method in ("GET", "HEAD"):
+            if key not in self.objects:
+                return await respond(404, b"<Error><Code>NoSuchKey</Code></Error>")
+            return await respond(200, self.objects[key])
+        if method == "DELETE":
+            self.objects.pop(key, None)
+            return await respond(204)
+        return await respond(405)
+
+
+def _storage(fake: FakeS3, secret_key: str = SECRET_KEY, **kwargs) -> S3StorageService:
+    return S3StorageService(
+        "http://minio.local:9000", "evidence", ACCESS_KEY, secret_key,
+        prefix="maav", retry_base_seconds=0, transport=httpx.ASGITransport(app=fake), **kwargs
+    )
+
+
+async def test_s3_round_trip():
+    """
+    Signed PUT/GET/HEAD/DELETE against the stand-in; absent objects read as missing.
+    """
+    fake = FakeS3()
+    storage = _storage(fake)
+    location = await storage.write_blob("evidence/blobs/ab/abc.json", b'{"a":1}')
+
+    assert location == "s3://evidence/maav/evidence/blobs/ab/abc.json"
+    assert fake.objects["maav/evidence/blobs/ab/abc.json"] == b'{"a":1}'
+    assert await storage.exists("evidence/blobs/ab/abc.json")
+    assert await storage.read_blob("evidence/blobs/ab/abc.json") == b'{"a":1}'
+    assert not await storage.exists("evidence/blobs/ff/missing.json")
+    with pytest.raises(FileNotFoundError):
+        await storage.read_blob("evidence/blobs/ff/missing.json")
+
+    assert await storage.delete_blob("evidence/blobs/ab/abc.json")
+    assert not await storage.exists("evidence/blobs/ab/abc.json")
+    await storage.close()
+
+
+async def test_s3_multipart_upload_and_abort():
+    """
+    Large blobs go up as concurrent parts; a failed part aborts the upload.
+    """
+    fake = FakeS3()
+    storage = _storage(fake, multipart_threshold=1024, part_size=256, max_concurrency=3)
+    data = bytes(range(256)) * 4 + b"tail"
+    await storage.write_blob("artifacts/large.bin", data)
+
+    assert fake.objects["maav/artifacts/large.bin"] == data
+    assert sum(1 for method, _, params in fake.requests if method == "PUT" and "partNumber" in params) == 5
+    assert fake.uploads == {}
+
+    fake.failing_part = 2
+    with pytest.raises(S3StorageError):
+        await storage.write_blob("artifacts/broken.bin", data)
+    assert "maav/artifacts/broken.bin" not in fake.objects
+    assert fake.uploads == {}
+    assert fake.requests[-1][0] == "DELETE"
+    await storage.close()
+
+
+async def test_s3_retries_and_rejections():
+    """
+    503s are retried up to max_retries; signature failures are not retried.
+    """
+    fake = FakeS3()
+    storage = _storage(fake, max_retries=2)
+
+    fake.fail_next = 2
+    await storage.write_blob("retry.json", b"{}")
+    assert fake.objects["maav/retry.json"] == b"{}"
+
+    fake.fail_next = 3
+    with pytest.raises(S3StorageError):
+        await storage.write_blob("retry.json", b"{}")
+
+    fake.fail_next = 0
+    fake.requests.clear()
+    wrong = _storage(fake, secret_key="not-the-secret")
+    with pytest.raises(S3StorageError) as excinfo:
+        await wrong.write_blob("denied.json", b"{}")
+    assert excinfo.value.status_code == 403
+    assert len(fake.requests) == 1
+    await storage.close()
+    await wrong.close()
+
+
+async def test_verification_reads_objects_from_s3(db_session):
+    """
+    Evidence stored in S3 has no local region; the verifier fetches and hashes it.
+    """
+    fake = FakeS3()
+    storage = _storage(fake)
+    service = EvidenceService(EvidenceRepository(), storage)
+    record = await service.capture_evidence(db_session, {"k": "s3"}, "urn:test:s3:1")
+    await service.capture_evidence(db_session, {"k": "s3-other"}, "urn:test:s3:2")
+
+    @asynccontextmanager
+    async def _session_factory():
+        yield db_session
+
+    verifier = EvidenceIntegrityVerifier(_session_factory, storage_service=storage, workers=1, settle_seconds=0)
+    report = await verifier.run(incremental=False)
+    assert report["checked"] == 2 and report["corrupt"] == [] and report["missing"] == []
+
+    fake.objects[f"maav/{record.storage_location}"] = b'{"k":"tampered"}'
+    report = await verifier.run(incremental=False)
+    assert [r["related_action"] for r in report["corrupt"]] == ["urn:test:s3:1"]
+    await storage.close()
@@ -0,0 +1,111 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select
+
+from app.core.dependencies import get_unit_of_work
+from app.models.user import AuthSession, User, UserCredentials
+from app.repositories.unit_of_work import after_commit
+
+pytestmark = pytest.mark.asyncio
+
+EMAIL = "uow@example.com"
+PASSWORD = "StrongPassword123!"
+
+
+class _CommitCounter:
+    def __init__(self, session):
+        self.session = session.sync_session
+        self.count = 0
+
+    def _count(self, session):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.session, "after_commit", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.session, "after_commit", self._count)
+
+
+async def _register_and_login(client: AsyncClient) -> dict:
+    await client.post("/api/v1/auth/register", json={
+        "email": EMAIL, "password": PASSWORD, "legal_name": "UoW User",
+        "mobile": "9876543280", "pan": "ABCDE1280Z", "primary_role": "INDIVIDUAL"
+    })
+    response = await client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_each_request_commits_once(client: AsyncClient, db_session, statement_log):
+    """
+    Reads and multi-write requests alike end in exactly one commit, and the
+    user loaded by get_current_user is not fetched again by the service.
+    """
+    tokens = await _register_and_login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    with _CommitCounter(db_session) as commits, statement_log as log:
+        response = await client.post(
+            "/api/v1/financial/",
+            json={"entry_type": "INCOME", "category": "SALARY", "amount": "1000.00",
+                  "financial_year": "2024-25", "entry_date": "2024-06-01"},
+            headers=headers
+        )
+        assert response.status_code == 201
+    assert commits.count == 1
+    assert len(log.selects_from("users")) == 1
+
+    for method, url, body in [
+        ("POST", "/api/v1/consent/", {"purpose": "Review", "scope": "FULL_ACCESS", "expiry_at": "2099-12-31T23:59:59Z"}),
+        ("GET", "/api/v1/consent/", None),
+        ("POST", "/api/v1/itr/determine", {"financial_year": "2024-25"}),
+        ("POST", "/api/v1/itr/2024-25/lock", None),
+    ]:
+        with _CommitCounter(db_session) as commits:
+            response = await client.request(method, url, json=body, headers=headers)
+            assert response.status_code < 300, response.text
+        assert commits.count == 1, url
+
+
+async def test_failed_request_keeps_only_marked_writes(client: AsyncClient, db_session):
+    """
+    A failed login still records the failed attempt; a replayed refresh token
+    still revokes its session, although both requests fail.
+    """
+    tokens = await _register_and_login(client)
+
+    response = await client.post("/api/v1/auth/login", json={"email": EMAIL, "password": "WrongPassword123!"})
+    assert response.status_code == 401
+    credentials = (await db_session.execute(
+        select(UserCredentials).join(User).where(User.email == EMAIL).execution_options(populate_existing=True)
+    )).scalars().one()
+    assert credentials.failed_attempts == 1
+
+    sid = tokens["refresh_token"].split(":", 1)[0]
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": f"{sid}:{'0' * 128}"})
+    assert response.status_code == 401
+    auth_session = (await db_session.execute(
+        select(AuthSession).where(AuthSession.refresh_token_hash.is_not(None)).execution_options(populate_existing=True)
+    )).scalars().one()
+    assert auth_session.status == "REVOKED"
+
+
+async def test_unit_of_work_rolls_back_a_failed_request(db_session):
+    """
+    Writes of a request that raises are rolled back and its after-commit work dropped.
+    """
+    called = []
+    uow = get_unit_of_work(db_session)
+    session = await uow.__anext__()
+    session.add(User(pan="ABCDE1281Z", legal_name="Gone", email="gone@example.com", mobile="9876543281", primary_role="INDIVIDUAL"))
+    await session.flush()
+    after_commit(session, lambda: called.append(True))
+
+    with pytest.raises(RuntimeError):
+        await uow.athrow(RuntimeError("endpoint failed"))
+
+    assert (await db_session.execute(select(User).where(User.email == "gone@example.com"))).scalars().first() is None
+    assert called == []